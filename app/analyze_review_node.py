@@ -2,19 +2,31 @@ import logging
 import importlib
 import os
 from app.config_loader import get_model_config
+from app.deadline import DEADLINE_EXCEEDED_ERROR_CODE, DeadlineExceeded, check_deadline, remaining_seconds, run_with_deadline
+from app.keyword_extractor import DEFAULT_LEXICON_PATH, build_keyword_guidance, get_keyword_lexicon
+from app.metrics import get_provider_name, observe_llm_call, record_error
+from app.near_duplicate import get_near_duplicate_index, merge_regenerated_reply, reused_analysis_prompt_text
+from app.token_usage import build_token_usage, get_prompt_version
+from app.tracing import set_span_attributes, start_span
 from app.schemas import AgentState, ReviewInputs, ReviewAnalysisOutput
 
 # 이 모듈을 위한 로깅 설정
 logger = logging.getLogger(__name__)
 
-def analyze_review_for_graph(state: AgentState) -> dict:
+def analyze_review_for_graph(state: AgentState, near_duplicate: bool = True) -> dict:
     """
     LangGraph의 상태(AgentState Pydantic 모델)를 입력받아 리뷰 분석을 수행하고,
     분석 결과, 사용된 입력, 모델 키, 오류 정보 등을 포함하는 딕셔너리를 반환합니다.
     이 딕셔너리의 키는 AgentState의 필드명과 일치해야 LangGraph가 상태를 올바르게 업데이트합니다.
+    상태에 처리 기한(`deadline_at`)이 있으면 LLM 호출을 남은 시간 안으로 제한하고, 초과 시
+    `error_code`가 "DEADLINE_EXCEEDED"인 오류 결과를 반환합니다.
+    근사 중복 인덱스가 켜져 있고(`near_duplicate` 서비스 설정) 최근 분석한 근사 중복 리뷰가 있으면, 모드에 따라
+    그 분석 결과를 재사용하거나(답글만 다시 생성하는 옵션 포함) LLM 결과와 비교하여 오판을 감사합니다.
+    `near_duplicate`가 False면 인덱스를 조회하지도 갱신하지도 않습니다 (평가, 벤치마크 실행).
     """
     current_review_inputs: ReviewInputs | None = state.review_inputs
     selected_model_key = state.selected_model_config_key
+    deadline_at = state.deadline_at
     
     actual_model_name_to_store = None
 
@@ -41,10 +53,15 @@ def analyze_review_for_graph(state: AgentState) -> dict:
         }
 
     analysis_error_msg = None
+    error_code = None
     model_config_dict = None
+    prompt_version = None
+    token_usage = None
 
     try:
-        model_config_dict = get_model_config(config_key=selected_model_key)
+        check_deadline(deadline_at, "리뷰 분석")
+        with start_span("config.load_model_config", {"model_config_key": selected_model_key}):
+            model_config_dict = get_model_config(config_key=selected_model_key)
         
         if not model_config_dict:
             error_msg = f"모델 설정을 로드하지 못했습니다 (요청된 키: '{selected_model_key}'). 기본 설정도 사용 불가."
@@ -63,6 +80,7 @@ def analyze_review_for_graph(state: AgentState) -> dict:
         client_function_name = model_config_dict.get("client_function_name")
         llm_params_config = model_config_dict.get("llm_params", {})
         prompt_path_relative = model_config_dict.get("prompt_path")
+        prompt_version = get_prompt_version(prompt_path_relative)
         
         actual_model_name_to_store = llm_params_config.get("model_name")
         temperature = llm_params_config.get("temperature")
@@ -78,8 +96,33 @@ def analyze_review_for_graph(state: AgentState) -> dict:
                 "analysis_error_message": error_msg,
             }
 
+        near_duplicate_index = get_near_duplicate_index() if near_duplicate else None
+        near_duplicate_match = None
+        reuse_near_duplicate = False
+        if near_duplicate_index is not None:
+            with start_span("near_duplicate.lookup", {"near_duplicate.mode": near_duplicate_index.mode}) as lookup_span:
+                near_duplicate_match = near_duplicate_index.find(current_review_inputs, selected_model_key, prompt_version)
+                set_span_attributes(lookup_span, **{"near_duplicate.similarity": near_duplicate_match.similarity if near_duplicate_match else None})
+            reuse_near_duplicate = near_duplicate_match is not None and near_duplicate_index.should_reuse()
+        if reuse_near_duplicate and not near_duplicate_index.config.regenerate_reply:
+            near_duplicate_index.record_reuse()
+            logger.info(f"근사 중복 리뷰의 분석 결과 재사용 (요청된 키: '{selected_model_key}', 유사도: {near_duplicate_match.similarity:.2f})")
+            return {
+                "review_inputs": current_review_inputs,
+                "analysis_output": near_duplicate_match.analysis_output,
+                "model_key_used": selected_model_key,
+                "actual_model_name_used": actual_model_name_to_store,
+                "prompt_version": prompt_version,
+                "token_usage": None,
+                "near_duplicate_similarity": near_duplicate_match.similarity,
+                "analysis_error_message": None,
+            }
+
         project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
         full_prompt_path = os.path.join(project_root, prompt_path_relative)
+        if reuse_near_duplicate:
+            # 답글만 다시 생성: 재사용하는 분석 값을 답글 생성 프롬프트에 넣어 호출합니다.
+            full_prompt_path = os.path.join(project_root, near_duplicate_index.config.reply_prompt_path)
 
         logger.info(f"모듈 '{client_module_name}'에서 함수 '{client_function_name}' 로딩 시도...")
         imported_module = importlib.import_module(client_module_name)
@@ -90,12 +133,72 @@ def analyze_review_for_graph(state: AgentState) -> dict:
             f"LLM 함수 호출 (공통 인터페이스 사용). 함수: {client_function_name}, 모델: {actual_model_name_to_store}, 온도: {temperature}, 프롬프트: '{full_prompt_path}'"
         )
         
-        analysis_result: ReviewAnalysisOutput = invokable_function(
-            prompt_file_path=full_prompt_path,
-            params=current_review_inputs,
-            model_name=actual_model_name_to_store,
-            temperature=temperature
-        )
+        invoke_kwargs = {
+            "prompt_file_path": full_prompt_path,
+            "params": current_review_inputs,
+            "model_name": actual_model_name_to_store,
+            "temperature": temperature,
+        }
+        if model_config_dict.get("format_instructions") is not None:
+            # 응답 형식 지침의 형태(full/compact/none)는 설정에 명시된 경우에만 클라이언트로 전달합니다.
+            invoke_kwargs["format_instructions_mode"] = model_config_dict["format_instructions"]
+        keyword_extraction = model_config_dict.get("keyword_extraction")
+        keyword_candidates = None
+        if reuse_near_duplicate:
+            invoke_kwargs["prompt_variables"] = {"reused_analysis": reused_analysis_prompt_text(near_duplicate_match.analysis_output)}
+        elif keyword_extraction:
+            # 키워드 사전의 표기로 후보를 미리 찾아 프롬프트에 넣습니다 (lean 모드에서는 모델 대신 분석 결과의 키워드로 사용).
+            with start_span("keywords.extract", {"keyword_extraction": keyword_extraction}):
+                lexicon = get_keyword_lexicon(model_config_dict.get("keyword_lexicon_path", DEFAULT_LEXICON_PATH))
+                keyword_candidates = lexicon.extract(current_review_inputs.review_text)
+            invoke_kwargs["prompt_variables"] = {"keyword_guidance": build_keyword_guidance(keyword_candidates, keyword_extraction)}
+        if deadline_at is not None:
+            # 클라이언트 자체 타임아웃에도 남은 시간을 전달하여, 기한 초과 후 남은 호출이 스레드를 오래 붙잡지 않도록 합니다.
+            invoke_kwargs["timeout"] = max(remaining_seconds(deadline_at), 0.001)
+
+        provider = get_provider_name(model_config_dict)
+        span_attributes = {
+            "gen_ai.system": provider,
+            "gen_ai.request.model": actual_model_name_to_store,
+            "gen_ai.request.temperature": temperature,
+            "model_config_key": selected_model_key,
+            "prompt_version": prompt_version,
+        }
+        with start_span("llm.invoke", span_attributes) as llm_span, observe_llm_call(provider, selected_model_key) as usage_callback:
+            try:
+                analysis_result: ReviewAnalysisOutput = run_with_deadline(
+                    invokable_function, deadline_at, stage="LLM 호출", **invoke_kwargs
+                )
+            finally:
+                # 응답 파싱에 실패해도 제공자가 보고한 토큰은 과금되므로 사용량을 기록합니다.
+                token_usage = build_token_usage(
+                    usage_callback.prompt_tokens,
+                    usage_callback.completion_tokens,
+                    usage_callback.cached_prompt_tokens,
+                    actual_model_name_to_store,
+                )
+                set_span_attributes(
+                    llm_span,
+                    **{
+                        "gen_ai.usage.input_tokens": usage_callback.prompt_tokens,
+                        "gen_ai.usage.output_tokens": usage_callback.completion_tokens,
+                        "gen_ai.usage.cached_input_tokens": usage_callback.cached_prompt_tokens,
+                        "llm.estimated_cost_usd": token_usage.estimated_cost_usd if token_usage else None,
+                    },
+                )
+
+        if keyword_candidates is not None and keyword_extraction == "lean":
+            analysis_result = analysis_result.model_copy(update={"keywords": keyword_candidates})
+
+        near_duplicate_similarity = None
+        if reuse_near_duplicate:
+            analysis_result = merge_regenerated_reply(near_duplicate_match.analysis_output, analysis_result)
+            near_duplicate_similarity = near_duplicate_match.similarity
+            near_duplicate_index.record_reuse()
+        elif near_duplicate_index is not None:
+            if near_duplicate_match is not None:
+                near_duplicate_index.audit(current_review_inputs, near_duplicate_match, analysis_result)
+            near_duplicate_index.add(current_review_inputs, analysis_result, selected_model_key, prompt_version)
 
         logger.info(f"LLM 분석 성공 (요청된 키: '{selected_model_key}')")
         
@@ -104,28 +207,43 @@ def analyze_review_for_graph(state: AgentState) -> dict:
             "analysis_output": analysis_result,
             "model_key_used": selected_model_key,
             "actual_model_name_used": actual_model_name_to_store,
+            "prompt_version": prompt_version,
+            "token_usage": token_usage,
+            "near_duplicate_similarity": near_duplicate_similarity,
             "analysis_error_message": None,
         }
 
+    except DeadlineExceeded as e:
+        analysis_error_msg = f"처리 기한 초과 (요청된 키: '{selected_model_key}'): {e}"
+        error_code = DEADLINE_EXCEEDED_ERROR_CODE
+        logger.warning(analysis_error_msg)
+        record_error("analyze_review_node", e)
     except FileNotFoundError as e:
         analysis_error_msg = f"프롬프트 파일을 찾을 수 없습니다: {e} (요청된 키: '{selected_model_key}')"
         logger.error(analysis_error_msg, exc_info=True)
+        record_error("analyze_review_node", e)
     except (ImportError, AttributeError, TypeError) as e:
         cm_name = model_config_dict.get("client_module", "N/A") if isinstance(model_config_dict, dict) else "N/A"
         cf_name = model_config_dict.get("client_function_name", "N/A") if isinstance(model_config_dict, dict) else "N/A"
         analysis_error_msg = f"모델 함수 로딩 또는 경로 설정 오류: {cm_name}.{cf_name} (요청된 키: '{selected_model_key}'). 상세: {e}"
         logger.error(analysis_error_msg, exc_info=True)
+        record_error("analyze_review_node", e)
     except ValueError as e:
         analysis_error_msg = f"처리 중 값 오류 또는 LLM 파라미터 오류 (요청된 키: '{selected_model_key}'): {e}"
         logger.error(analysis_error_msg, exc_info=True)
+        record_error("analyze_review_node", e)
     except Exception as e:
         analysis_error_msg = f"analyze_review_for_graph 함수에서 예기치 않은 오류 발생 (요청된 키: '{selected_model_key}'): {e}"
         logger.error(analysis_error_msg, exc_info=True)
+        record_error("analyze_review_node", e)
     
     return {
         "review_inputs": current_review_inputs, 
         "analysis_output": None,
         "model_key_used": selected_model_key, 
-        "actual_model_name_used": llm_params_config.get("model_name") if isinstance(model_config_dict, dict) and isinstance(model_config_dict.get("llm_params"), dict) else None, 
+        "actual_model_name_used": model_config_dict.get("llm_params", {}).get("model_name") if isinstance(model_config_dict, dict) and isinstance(model_config_dict.get("llm_params"), dict) else None, 
+        "prompt_version": prompt_version,
+        "token_usage": token_usage,
         "analysis_error_message": analysis_error_msg,
+        "error_code": error_code,
     }
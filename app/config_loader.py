@@ -10,6 +10,9 @@ logger = logging.getLogger(__name__)
 
 _MODEL_CONFIGS_CACHE = {} # Module-level cache
 
+DEFAULT_SERVICE_CONFIG_PATH = "config/service_configurations.yaml"
+SERVICE_CONFIG_PATH_ENV = "REVIEW_ANALYSIS_SERVICE_CONFIG" # 서비스 설정 파일 경로를 바꿀 때 사용하는 환경 변수
+
 def load_model_configurations(config_path: str = "config/model_configurations.yaml") -> dict:
     """
     (내부 사용) 지정된 경로의 YAML 파일을 로드하여 전체 모델 설정 딕셔너리를 반환하고 캐시에 저장합니다.
@@ -114,6 +117,65 @@ def get_model_config(config_key: str | None = None, config_path: str = "config/m
     logger.info(f"Retrieved configuration for model key: {actual_config_key} from {config_path}")
     return final_config
 
+def get_model_pricing(model_name: str | None, config_path: str = "config/model_configurations.yaml") -> dict | None:
+    """
+    모델 설정 파일의 `model_pricing` 가격표에서 실제 모델명(`llm_params.model_name`)에 해당하는 가격을 반환합니다.
+
+    Args:
+        model_name: 가격을 조회할 LLM 모델명 (예: "gpt-4o-mini").
+        config_path: 로드할 설정 파일의 경로. 기본값은 "config/model_configurations.yaml"입니다.
+
+    Returns:
+        dict | None: `input`, `cached_input`, `output` (USD / 100만 토큰) 키를 갖는 가격 딕셔너리.
+                     모델명이 없거나 가격표에 없으면 `None`.
+    """
+    if not model_name:
+        return None
+    try:
+        configurations = load_model_configurations(config_path)
+    except Exception as e:
+        logger.debug(f"Failed to load configurations from {config_path} in get_model_pricing due to: {e}")
+        return None
+
+    pricing_table = configurations.get("model_pricing")
+    if not isinstance(pricing_table, dict):
+        return None
+    pricing = pricing_table.get(model_name)
+    if not isinstance(pricing, dict):
+        logger.info(f"No pricing found for model '{model_name}' in {config_path}.")
+        return None
+    return pricing
+
+def get_service_config(section: str, config_path: str | None = None) -> dict:
+    """
+    서비스 운영 설정 파일에서 특정 `section`에 해당하는 설정 딕셔너리를 반환합니다.
+    모델 설정과 동일한 YAML 캐시(`_MODEL_CONFIGS_CACHE`)를 사용합니다.
+
+    Args:
+        section: 가져올 설정 섹션 이름 (예: "result_store").
+        config_path: 로드할 서비스 설정 파일의 경로. 생략하면 `REVIEW_ANALYSIS_SERVICE_CONFIG` 환경 변수의 경로,
+                     없으면 "config/service_configurations.yaml"을 사용합니다 (부하 테스트 등에서 설정 파일 교체용).
+
+    Returns:
+        dict: 해당 섹션의 설정 딕셔너리. 파일이나 섹션이 없거나 유효하지 않으면 빈 딕셔너리.
+    """
+    if config_path is None:
+        config_path = os.getenv(SERVICE_CONFIG_PATH_ENV, DEFAULT_SERVICE_CONFIG_PATH)
+    try:
+        configurations = load_model_configurations(config_path)
+    except Exception as e:
+        logger.debug(f"Failed to load service configurations from {config_path} due to: {e}")
+        return {}
+
+    section_config = configurations.get(section)
+    if section_config is None:
+        logger.info(f"Service configuration section '{section}' not found in {config_path}. Using defaults.")
+        return {}
+    if not isinstance(section_config, dict):
+        logger.warning(f"Service configuration section '{section}' in {config_path} is not a dictionary.")
+        return {}
+    return section_config
+
 # Example of how to set up logging in the main application to see logs from this module
 # if __name__ == '__main__':
 #     logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -0,0 +1,92 @@
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, TypeVar
+
+from app.config_loader import get_service_config
+
+# 이 모듈을 위한 로깅 설정
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEADLINE_EXCEEDED_ERROR_CODE = "DEADLINE_EXCEEDED"
+
+DEFAULT_EXECUTOR_MAX_WORKERS = 32
+
+# 그래프 실행과 LLM 호출을 서로 다른 풀에서 실행하여, 그래프 스레드가 LLM 풀의 빈자리를 기다리며 교착되지 않도록 합니다.
+# 풀 크기(`deadline.executor_max_workers`)가 기한이 있는 실행의 동시 실행 수 상한입니다. 기한이 지난 작업은 취소되지 않고
+# 자체 타임아웃으로 끝날 때까지 스레드를 차지하므로, 느린 호출이 몰리면 새 요청이 풀의 빈자리를 기다리다 기한을 넘길 수 있습니다.
+_EXECUTORS: Dict[str, ThreadPoolExecutor] = {}
+_EXECUTORS_LOCK = threading.Lock()
+
+
+def _get_executor(name: str) -> ThreadPoolExecutor:
+    """서비스 설정의 크기로 만든 기한 실행용 스레드 풀 (`graph` 또는 `llm`)"""
+    executor = _EXECUTORS.get(name)
+    if executor is None:
+        with _EXECUTORS_LOCK:
+            executor = _EXECUTORS.get(name)
+            if executor is None:
+                max_workers = get_service_config("deadline").get("executor_max_workers", {}).get(name, DEFAULT_EXECUTOR_MAX_WORKERS)
+                executor = ThreadPoolExecutor(max_workers=int(max_workers), thread_name_prefix=f"{name}-deadline")
+                _EXECUTORS[name] = executor
+    return executor
+
+
+class DeadlineExceeded(Exception):
+    """요청에 주어진 처리 기한(deadline)을 초과한 경우"""
+
+
+def compute_deadline(timeout_seconds: float | None) -> float | None:
+    """현재 시각으로부터 `timeout_seconds` 뒤의 절대 기한(epoch 초)을 반환합니다. `None`이면 기한 없음."""
+    if timeout_seconds is None:
+        return None
+    return time.time() + timeout_seconds
+
+
+def remaining_seconds(deadline_at: float | None) -> float | None:
+    """기한까지 남은 시간(초)을 반환합니다. 기한이 없으면 `None`, 이미 지났으면 0 이하의 값."""
+    if deadline_at is None:
+        return None
+    return deadline_at - time.time()
+
+
+def check_deadline(deadline_at: float | None, stage: str) -> None:
+    """기한이 이미 지났으면 `DeadlineExceeded`를 발생시킵니다."""
+    remaining = remaining_seconds(deadline_at)
+    if remaining is not None and remaining <= 0:
+        raise DeadlineExceeded(f"{stage} 시작 전에 처리 기한을 {-remaining:.3f}초 초과했습니다.")
+
+
+def run_with_deadline(
+    fn: Callable[..., T],
+    deadline_at: float | None,
+    *args: Any,
+    stage: str = "작업",
+    executor: str = "llm",
+    **kwargs: Any,
+) -> T:
+    """
+    `fn(*args, **kwargs)`을 남은 기한 안에서 실행하고 결과를 반환합니다.
+
+    기한이 없으면 현재 스레드에서 바로 실행합니다. 기한이 있으면 전용 스레드 풀(`executor`)에서 실행하며,
+    기한이 지나면 결과를 기다리지 않고 `DeadlineExceeded`를 발생시킵니다. 이미 시작된 작업은 강제로
+    중단할 수 없어 끝날 때까지 풀의 스레드를 차지하므로, 호출되는 함수는 남은 시간을 자체 타임아웃
+    (예: HTTP 클라이언트 timeout)으로도 전달받아 스스로 끝나야 합니다.
+    현재 contextvars(트레이싱, 콜백 등)는 실행 스레드로 그대로 전달됩니다.
+    """
+    if deadline_at is None:
+        return fn(*args, **kwargs)
+
+    check_deadline(deadline_at, stage)
+    context = contextvars.copy_context()
+    future = _get_executor(executor).submit(context.run, fn, *args, **kwargs)
+    try:
+        return future.result(timeout=max(remaining_seconds(deadline_at), 0.0))
+    except FutureTimeoutError:
+        future.cancel()
+        logger.warning(f"{stage}이(가) 처리 기한 내에 끝나지 않아 결과를 기다리지 않고 반환합니다.")
+        raise DeadlineExceeded(f"{stage}이(가) 처리 기한 내에 완료되지 않았습니다.") from None
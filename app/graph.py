@@ -1,44 +1,86 @@
-from typing import TypedDict, Dict, Any, Optional
+from typing import TypedDict, Dict, Any, Callable, Collection, Optional
 
 from langgraph.constants import END
 from langgraph.graph import StateGraph
 from langgraph.pregel import Pregel
 
 from app.analyze_review_node import analyze_review_for_graph
+from app.metrics import instrument_node
+from app.tracing import trace_node
 from app.save_result_node import save_analysis_result_node
 from app.schemas import AgentState
 
 
-def create_graph() -> StateGraph:
+def create_graph(
+    analyze_node: Optional[Callable[[AgentState], dict]] = None,
+    save_result: bool = True,
+    skip_save_error_codes: Collection[str] = (),
+    near_duplicate: bool = True,
+) -> StateGraph:
     """
     정의된 상태, 노드, 엣지를 사용하여 StateGraph 인스턴스를 생성하고 반환합니다.
     app.schemas.AgentState를 그래프의 상태 정의로 사용합니다.
+    `analyze_node`를 주면 기본 분석 노드(`analyze_review_for_graph`) 대신 사용합니다
+    (예: 분석을 별도 LLM 게이트웨이 서비스에 위임하는 API 서비스).
+    `save_result`가 False면 결과 저장 노드 없이 분석 노드만 실행합니다 (평가 예측 생성처럼 운영 저장소에 기록하면 안 되는 경우).
+    분석 노드의 결과 `error_code`가 `skip_save_error_codes`에 있으면 저장 노드를 건너뜁니다
+    (예: LLM 게이트웨이의 과부하 거절이나 호출 실패처럼 분석이 아예 수행되지 않은 경우).
+    `near_duplicate`가 False면 기본 분석 노드가 프로세스의 근사 중복 인덱스를 사용하지 않습니다 (평가, 벤치마크처럼
+    운영 인덱스의 결과를 재사용하거나 인덱스에 항목을 더하면 안 되는 경우).
 
     Returns:
         StateGraph: 구성된 StateGraph 인스턴스입니다.
     """
     graph = StateGraph(AgentState)
+    if analyze_node is None:
+        if near_duplicate:
+            analyze_node = analyze_review_for_graph
+        else:
+            def analyze_node(state: AgentState) -> dict:
+                return analyze_review_for_graph(state, near_duplicate=False)
 
-    graph.add_node("analyze_review_node", analyze_review_for_graph)
-    graph.add_node("save_result_node", save_analysis_result_node)
-
+    # 노드별 실행 시간은 Prometheus 지표(review_analysis_graph_node_latency_seconds)와 추적 스팬(graph.<노드명>)으로 기록됩니다.
+    graph.add_node("analyze_review_node", instrument_node("analyze_review_node", trace_node("analyze_review_node", analyze_node)))
     graph.set_entry_point("analyze_review_node")
 
-    graph.add_edge("analyze_review_node", "save_result_node")
-    graph.add_edge("save_result_node", END)
+    if save_result:
+        graph.add_node("save_result_node", instrument_node("save_result_node", trace_node("save_result_node", save_analysis_result_node)))
+        if skip_save_error_codes:
+            skipped_codes = frozenset(skip_save_error_codes)
+
+            def route_after_analysis(state: AgentState) -> str:
+                return END if state.error_code in skipped_codes else "save_result_node"
+
+            graph.add_conditional_edges("analyze_review_node", route_after_analysis, ["save_result_node", END])
+        else:
+            graph.add_edge("analyze_review_node", "save_result_node")
+        graph.add_edge("save_result_node", END)
+    else:
+        graph.add_edge("analyze_review_node", END)
 
     return graph
 
 
-def get_compiled_graph() -> Pregel:
+def get_compiled_graph(
+    analyze_node: Optional[Callable[[AgentState], dict]] = None,
+    save_result: bool = True,
+    skip_save_error_codes: Collection[str] = (),
+    near_duplicate: bool = True,
+) -> Pregel:
     """
     create_graph()를 호출하여 StateGraph를 얻고, 이를 컴파일하여 실행 가능한 Pregel 인스턴스를 반환합니다.
     이 함수는 BentoML 서비스에서 그래프를 로드할 때 사용될 수 있습니다.
 
+    Args:
+        analyze_node: 기본 분석 노드 대신 사용할 함수 (생략 시 `analyze_review_for_graph`).
+        save_result: False면 결과 저장 노드를 포함하지 않습니다.
+        skip_save_error_codes: 분석 결과의 `error_code`가 이 중 하나면 결과를 저장하지 않습니다.
+        near_duplicate: False면 기본 분석 노드가 근사 중복 인덱스를 조회하거나 갱신하지 않습니다.
+
     Returns:
         Pregel: 컴파일된 그래프 (Pregel 인스턴스)입니다.
     """
-    graph = create_graph()
+    graph = create_graph(analyze_node, save_result, skip_save_error_codes, near_duplicate)
     compiled_graph = graph.compile()
     return compiled_graph
 
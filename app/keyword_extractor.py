@@ -0,0 +1,183 @@
+"""
+리뷰 본문에서 키워드 사전의 표기를 찾아 `KeywordSentiment` 후보를 만드는 로컬 키워드 추출기.
+
+버전이 있는 사전 파일(`models/keyword_lexicon/<버전>.yaml`)의 대표 키워드, 동의어, 활용형 표기를 Aho-Corasick
+오토마톤으로 컴파일하므로, 표기 수와 관계없이 리뷰 길이에 비례하는 시간에 모든 일치를 찾습니다.
+모델 설정의 `keyword_extraction`으로 사용 방식을 고릅니다.
+
+- `hint`: 후보를 프롬프트의 `{keyword_guidance}`로 전달하여 모델이 확인하고 감정을 다시 판단하게 합니다.
+- `lean`: 모델에게 키워드를 생성하지 않게 하고(출력 토큰 절감), 후보를 그대로 분석 결과의 `keywords`로 사용합니다.
+"""
+
+import functools
+import logging
+import os
+import re
+import unicodedata
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import yaml
+
+from app.memory import register_cache_size
+from app.schemas import KeywordSentiment
+
+# 이 모듈을 위한 로깅 설정
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_LEXICON_PATH = "models/keyword_lexicon/v1.yaml"
+KEYWORD_EXTRACTION_MODES = ("hint", "lean")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """NFC 정규화, 소문자 변환, 연속 공백을 공백 하나로 바꿉니다. 사전 표기와 리뷰 본문에 같은 규칙을 적용합니다."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text).lower()).strip()
+
+
+class AhoCorasick:
+    """
+    문자열 패턴 집합의 Aho-Corasick 오토마톤. 패턴마다 임의의 값(payload)을 붙이며,
+    `find_all`은 텍스트를 한 번 훑어 겹치는 일치를 포함한 모든 (시작, 끝, 값)을 반환합니다.
+    """
+
+    def __init__(self, patterns: List[Tuple[str, object]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[Tuple[int, object]]] = [[]] # 노드에서 끝나는 (패턴 길이, 값), 실패 링크의 출력 포함
+        for pattern, payload in patterns:
+            if pattern:
+                self._add(pattern, payload)
+        self._build_failure_links()
+
+    def _add(self, pattern: str, payload: object) -> None:
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            node = next_node
+        self._outputs[node].append((len(pattern), payload))
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                # 루트의 자식은 루트로 실패합니다. 더 깊은 노드는 부모의 실패 경로에서 같은 문자로 이어지는 가장 긴 접미사로 갑니다.
+                self._fail[child] = self._goto[fallback].get(char, 0) if node else 0
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+
+    @property
+    def node_count(self) -> int:
+        return len(self._goto)
+
+    def find_all(self, text: str) -> List[Tuple[int, int, object]]:
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        matches = []
+        node = 0
+        for position, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if outputs[node]:
+                end = position + 1
+                matches.extend((end - length, end, payload) for length, payload in outputs[node])
+        return matches
+
+
+class KeywordLexicon:
+    """컴파일된 키워드 사전. `extract`는 리뷰 본문에서 대표 키워드별 후보를 처음 나온 순서대로 반환합니다."""
+
+    def __init__(self, version: str, entries: List[KeywordSentiment], variants: List[List[str]], exclusions: List[str]):
+        self.version = version
+        self.entries = entries
+        patterns: List[Tuple[str, object]] = []
+        for index, entry_variants in enumerate(variants):
+            for variant in {normalize_text(variant) for variant in [entries[index].keyword, *entry_variants]}:
+                patterns.append((variant, index))
+        self.variants = [pattern for pattern, _ in patterns]
+        patterns.extend((normalize_text(exclusion), None) for exclusion in exclusions)
+        self.pattern_count = len(patterns)
+        self._automaton = AhoCorasick(patterns)
+
+    @property
+    def node_count(self) -> int:
+        return self._automaton.node_count
+
+    def extract(self, review_text: str, limit: Optional[int] = None) -> List[KeywordSentiment]:
+        """
+        사전 표기와 일치하는 키워드 후보를 반환합니다. 제외 단어와 겹치는 일치, 더 긴 다른 일치 안에 포함된 일치는 버리며,
+        같은 대표 키워드는 한 번만 포함합니다.
+        """
+        matches = self._automaton.find_all(normalize_text(review_text))
+        if not matches:
+            return []
+        excluded_spans = [(start, end) for start, end, index in matches if index is None]
+        # 시작 위치 오름차순, 길이 내림차순으로 훑으면 앞서 나온 일치의 최대 끝 위치로 포함 여부를 판단할 수 있습니다.
+        matches.sort(key=lambda match: (match[0], match[0] - match[1]))
+        candidates: List[KeywordSentiment] = []
+        seen = set()
+        covered_until = -1
+        for start, end, index in matches:
+            contained = end <= covered_until
+            covered_until = max(covered_until, end)
+            if index is None or contained or index in seen:
+                continue
+            if any(start < excluded_end and excluded_start < end for excluded_start, excluded_end in excluded_spans):
+                continue
+            seen.add(index)
+            candidates.append(self.entries[index])
+            if limit is not None and len(candidates) >= limit:
+                break
+        return candidates
+
+
+def load_keyword_lexicon(lexicon_path: str = DEFAULT_LEXICON_PATH) -> KeywordLexicon:
+    """사전 파일(YAML)을 읽어 오토마톤으로 컴파일합니다. 경로는 프로젝트 루트 기준 상대 경로나 절대 경로입니다."""
+    with open(os.path.join(PROJECT_ROOT, lexicon_path), "r", encoding="utf-8") as f:
+        document = yaml.safe_load(f)
+    if not isinstance(document, dict) or not isinstance(document.get("keywords"), list):
+        raise ValueError(f"키워드 사전 형식이 올바르지 않습니다 (keywords 목록 필요): {lexicon_path}")
+    entries, variants = [], []
+    for item in document["keywords"]:
+        entries.append(KeywordSentiment(keyword=item["keyword"], sentiment=item["sentiment"]))
+        variants.append([str(variant) for variant in item.get("variants", [])])
+    version = str(document.get("version") or os.path.splitext(os.path.basename(lexicon_path))[0])
+    lexicon = KeywordLexicon(version, entries, variants, [str(exclusion) for exclusion in document.get("exclusions", [])])
+    logger.info(f"키워드 사전 로드: {lexicon_path} (버전 {version}, 키워드 {len(entries)}개, 표기 {lexicon.pattern_count}개)")
+    return lexicon
+
+
+@functools.lru_cache(maxsize=8)
+def get_keyword_lexicon(lexicon_path: str = DEFAULT_LEXICON_PATH) -> KeywordLexicon:
+    """경로별로 컴파일한 사전을 재사용합니다. 사전 파일을 수정하면 프로세스를 재시작해야 합니다."""
+    return load_keyword_lexicon(lexicon_path)
+
+
+register_cache_size("keyword_lexicons", lambda: get_keyword_lexicon.cache_info().currsize)
+
+
+def build_keyword_guidance(candidates: List[KeywordSentiment], mode: str) -> str:
+    """프롬프트의 `{keyword_guidance}`에 넣을 키워드 지시문"""
+    if mode == "lean":
+        return "keywords는 로컬 키워드 사전으로 추출하므로 빈 리스트([])로 반환하십시오."
+    if mode != "hint":
+        raise ValueError(f"Unknown keyword_extraction mode: {mode} (expected one of {', '.join(KEYWORD_EXTRACTION_MODES)})")
+    if not candidates:
+        return "사전 추출 키워드 후보: 없음. 리뷰에서 주요 키워드를 직접 추출하십시오."
+    listed = ", ".join(f"{candidate.keyword}({candidate.sentiment})" for candidate in candidates)
+    return (
+        f"사전 추출 키워드 후보: {listed}. 후보가 리뷰 문맥에 맞는지 확인하여 맞는 것만 keywords에 포함하고 감정 분류를 다시 판단하며, "
+        "후보에 없는 주요 키워드도 추가할 수 있습니다."
+    )
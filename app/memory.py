@@ -0,0 +1,134 @@
+"""
+메모리 계측. 서비스 메모리 한도(`memory: "512Mi"`) 안에서 동작하는지 확인하기 위해 프로세스 RSS, tracemalloc 상위 할당 위치,
+크기 상한이 있는 프로세스 캐시들의 현재 크기를 스냅샷으로 제공합니다.
+
+tracemalloc은 할당마다 비용이 들므로 기본으로 꺼져 있으며, 서비스 설정(`memory.tracemalloc_frames`)이나 환경 변수
+`PYTHONTRACEMALLOC`으로 켭니다. 꺼져 있으면 스냅샷에는 RSS와 캐시 크기만 담깁니다.
+"""
+
+import logging
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+import psutil
+from pydantic import BaseModel
+
+# 이 모듈을 위한 로깅 설정
+logger = logging.getLogger(__name__)
+
+_PROCESS = psutil.Process()
+_CACHE_SIZES: Dict[str, Callable[[], int]] = {}
+_LAST_SNAPSHOT: Optional[tracemalloc.Snapshot] = None
+_SNAPSHOT_LOCK = threading.Lock()
+
+
+class AllocationStat(BaseModel):
+    """tracemalloc 할당 위치별 통계 (diff 스냅샷이면 직전 스냅샷 대비 증감)"""
+    location: str
+    size_bytes: int
+    count: int
+
+
+class MemorySnapshot(BaseModel):
+    """프로세스 메모리 스냅샷"""
+    rss_bytes: int
+    tracemalloc_enabled: bool
+    traced_current_bytes: Optional[int] = None
+    traced_peak_bytes: Optional[int] = None
+    diff: bool = False # True면 top_allocations가 직전 스냅샷 대비 증가량 순
+    top_allocations: List[AllocationStat] = []
+    cache_sizes: Dict[str, int] = {}
+
+
+class AllocationCounter:
+    """`count_allocations` 블록 안에서 할당된 메모리. tracemalloc이 꺼져 있으면 모두 0입니다."""
+
+    def __init__(self):
+        self.peak_bytes = 0 # 블록 시작 시점 대비 최대 추가 사용량
+        self.retained_bytes = 0 # 블록이 끝난 뒤에도 남아 있는 추가 사용량
+
+
+def get_rss_bytes() -> int:
+    """현재 프로세스의 RSS(상주 메모리) 바이트 수"""
+    return _PROCESS.memory_info().rss
+
+
+def configure_tracemalloc(frames: int) -> bool:
+    """`frames`가 1 이상이면 그 깊이로 tracemalloc을 시작합니다. 이미 추적 중이면 그대로 둡니다. 추적 여부를 반환합니다."""
+    if frames > 0 and not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+        logger.info(f"tracemalloc 시작 (프레임 {frames}개)")
+    return tracemalloc.is_tracing()
+
+
+def register_cache_size(name: str, size_function: Callable[[], int]) -> None:
+    """스냅샷의 `cache_sizes`에 표시할 프로세스 캐시의 현재 크기 함수를 등록합니다 (같은 이름이면 교체)."""
+    _CACHE_SIZES[name] = size_function
+
+
+def cache_sizes() -> Dict[str, int]:
+    sizes = {}
+    for name, size_function in list(_CACHE_SIZES.items()):
+        try:
+            sizes[name] = int(size_function())
+        except Exception as e:
+            logger.debug(f"캐시 크기 조회 실패 ({name}): {e}")
+    return sizes
+
+
+def _format_location(traceback: tracemalloc.Traceback) -> str:
+    frame = traceback[0]
+    return f"{frame.filename}:{frame.lineno}"
+
+
+def take_memory_snapshot(top: int = 20, diff: bool = False) -> MemorySnapshot:
+    """
+    RSS와 캐시 크기, (tracemalloc이 켜져 있으면) 할당 위치별 상위 `top`개를 반환합니다.
+    `diff`가 True면 직전 스냅샷 대비 증가량이 큰 위치를 반환하므로, 부하 전후로 두 번 호출하여 누수 위치를 찾을 수 있습니다.
+    """
+    global _LAST_SNAPSHOT
+    snapshot = MemorySnapshot(rss_bytes=get_rss_bytes(), tracemalloc_enabled=tracemalloc.is_tracing(), cache_sizes=cache_sizes())
+    if not snapshot.tracemalloc_enabled:
+        return snapshot
+
+    snapshot.traced_current_bytes, snapshot.traced_peak_bytes = tracemalloc.get_traced_memory()
+    with _SNAPSHOT_LOCK:
+        current = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ))
+        previous, _LAST_SNAPSHOT = _LAST_SNAPSHOT, current
+    if diff and previous is not None:
+        snapshot.diff = True
+        snapshot.top_allocations = [
+            AllocationStat(location=_format_location(stat.traceback), size_bytes=stat.size_diff, count=stat.count_diff)
+            for stat in current.compare_to(previous, "lineno")[:top]
+        ]
+    else:
+        snapshot.top_allocations = [
+            AllocationStat(location=_format_location(stat.traceback), size_bytes=stat.size, count=stat.count)
+            for stat in current.statistics("lineno")[:top]
+        ]
+    return snapshot
+
+
+@contextmanager
+def count_allocations() -> Iterator[AllocationCounter]:
+    """
+    블록 안의 추가 할당량(최대, 잔류)을 셉니다 (벤치마크의 요청당 할당량 측정용). tracemalloc의 최대값을 초기화하므로
+    동시에 실행되는 다른 스레드의 할당도 함께 집계되며, 중첩해서 사용할 수 없습니다.
+    """
+    counter = AllocationCounter()
+    if not tracemalloc.is_tracing():
+        yield counter
+        return
+    tracemalloc.reset_peak()
+    started_bytes, _ = tracemalloc.get_traced_memory()
+    try:
+        yield counter
+    finally:
+        current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+        counter.peak_bytes = max(peak_bytes - started_bytes, 0)
+        counter.retained_bytes = current_bytes - started_bytes
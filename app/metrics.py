@@ -0,0 +1,174 @@
+import functools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.exceptions import OutputParserException
+from langchain_core.outputs import LLMResult
+from langchain_core.tracers.context import register_configure_hook
+from prometheus_client import Counter, Histogram
+from pydantic import ValidationError
+
+# 이 모듈을 위한 로깅 설정
+logger = logging.getLogger(__name__)
+
+# 요청 처리 구간별 Prometheus 지표 (BentoML /metrics 엔드포인트로 노출).
+# 관측 비용은 레이블 조회와 카운터 증가 정도이므로 운영 환경에서도 항상 켜 둡니다.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+WRITE_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+GRAPH_NODE_LATENCY = Histogram(
+    name="review_analysis_graph_node_latency_seconds",
+    documentation="LangGraph 노드별 실행 시간",
+    labelnames=["node"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_CALL_LATENCY = Histogram(
+    name="review_analysis_llm_call_latency_seconds",
+    documentation="LLM 제공자 호출 시간 (제공자, 모델 설정 키, 결과별)",
+    labelnames=["provider", "model_config_key", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_PROMPT_TOKENS = Counter(
+    name="review_analysis_llm_prompt_tokens",
+    documentation="LLM 호출에 사용된 프롬프트(입력) 토큰 수",
+    labelnames=["provider", "model_config_key"],
+)
+LLM_COMPLETION_TOKENS = Counter(
+    name="review_analysis_llm_completion_tokens",
+    documentation="LLM 호출에 사용된 응답(출력) 토큰 수",
+    labelnames=["provider", "model_config_key"],
+)
+LLM_PARSE_FAILURES = Counter(
+    name="review_analysis_llm_parse_failures",
+    documentation="LLM 응답을 ReviewAnalysisOutput으로 변환하지 못한 횟수 (예외 클래스별)",
+    labelnames=["provider", "model_config_key", "exception"],
+)
+ERRORS = Counter(
+    name="review_analysis_errors",
+    documentation="처리 단계별 오류 수 (예외 클래스별)",
+    labelnames=["stage", "exception"],
+)
+RESULT_WRITE_LATENCY = Histogram(
+    name="review_analysis_result_write_latency_seconds",
+    documentation="분석 결과 저장 시간 (저장 대상별)",
+    labelnames=["target"],
+    buckets=WRITE_LATENCY_BUCKETS,
+)
+NEAR_DUPLICATE_LOOKUPS = Counter(
+    name="review_analysis_near_duplicate_lookups",
+    documentation="근사 중복 인덱스 조회 수 (hit: 근사 중복 발견, filtered: 평점 구간/메뉴 조건으로 제외, miss: 없음)",
+    labelnames=["outcome"],
+)
+NEAR_DUPLICATE_AUDITS = Counter(
+    name="review_analysis_near_duplicate_audits",
+    documentation="근사 중복 재사용 후보와 LLM 결과를 비교한 감사 수 (agree, false_match)",
+    labelnames=["result"],
+)
+NEAR_DUPLICATE_EVICTIONS = Counter(
+    name="review_analysis_near_duplicate_evictions",
+    documentation="용량 또는 보관 기간 초과로 근사 중복 인덱스에서 제거된 항목 수",
+)
+
+# LLM 응답 파싱 실패로 분류하는 예외
+PARSE_FAILURE_EXCEPTIONS = (OutputParserException, ValidationError)
+
+
+class TokenUsageCallbackHandler(BaseCallbackHandler):
+    """LangChain 채팅 모델 응답의 `usage_metadata`에서 토큰 사용량을 누적하는 콜백"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._lock = threading.Lock()
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cached_prompt_tokens = 0
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if not usage:
+                    continue
+                with self._lock:
+                    self.prompt_tokens += usage.get("input_tokens", 0)
+                    self.completion_tokens += usage.get("output_tokens", 0)
+                    self.cached_prompt_tokens += (usage.get("input_token_details") or {}).get("cache_read", 0) or 0
+
+
+# `observe_llm_call` 블록 안에서 실행되는 모든 LangChain 호출에 토큰 사용량 콜백을 자동으로 연결합니다.
+_token_usage_callback: ContextVar[Optional[TokenUsageCallbackHandler]] = ContextVar("review_analysis_token_usage", default=None)
+register_configure_hook(_token_usage_callback, inheritable=True)
+
+
+def get_provider_name(model_config: Dict[str, Any]) -> str:
+    """모델 설정의 `provider` 값을 반환합니다. 없으면 클라이언트 모듈 이름(예: models.gemini_model → gemini)으로 추정합니다."""
+    provider = model_config.get("provider")
+    if provider:
+        return str(provider)
+    module_name = str(model_config.get("client_module", "unknown")).rsplit(".", 1)[-1]
+    return module_name.removesuffix("_model") or "unknown"
+
+
+def record_error(stage: str, error: BaseException) -> None:
+    """처리 단계(`stage`)에서 발생한 오류를 예외 클래스별로 집계합니다."""
+    ERRORS.labels(stage=stage, exception=type(error).__name__).inc()
+
+
+def instrument_node(node_name: str, node_function: Callable[..., Any]) -> Callable[..., Any]:
+    """LangGraph 노드 함수의 실행 시간을 `GRAPH_NODE_LATENCY`에 기록하도록 감쌉니다."""
+    histogram = GRAPH_NODE_LATENCY.labels(node=node_name)
+
+    @functools.wraps(node_function)
+    def _instrumented(*args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return node_function(*args, **kwargs)
+        finally:
+            histogram.observe(time.perf_counter() - started)
+
+    return _instrumented
+
+
+@contextmanager
+def observe_llm_call(provider: str, model_config_key: Optional[str]) -> Iterator[TokenUsageCallbackHandler]:
+    """
+    `with` 블록 안의 LLM 호출 시간, 토큰 사용량, 파싱 실패/오류를 기록합니다.
+    토큰 사용량은 LangChain 콜백으로 수집하며, 콜백 핸들러를 반환하므로 호출자도 사용량을 읽을 수 있습니다.
+    """
+    model_config_key = model_config_key or "default"
+    usage_callback = TokenUsageCallbackHandler()
+    token = _token_usage_callback.set(usage_callback)
+    started = time.perf_counter()
+    outcome = "success"
+    try:
+        yield usage_callback
+    except BaseException as e:
+        outcome = "error"
+        if isinstance(e, PARSE_FAILURE_EXCEPTIONS):
+            outcome = "parse_failure"
+            LLM_PARSE_FAILURES.labels(provider=provider, model_config_key=model_config_key, exception=type(e).__name__).inc()
+        raise
+    finally:
+        _token_usage_callback.reset(token)
+        LLM_CALL_LATENCY.labels(provider=provider, model_config_key=model_config_key, outcome=outcome).observe(
+            time.perf_counter() - started
+        )
+        if usage_callback.prompt_tokens:
+            LLM_PROMPT_TOKENS.labels(provider=provider, model_config_key=model_config_key).inc(usage_callback.prompt_tokens)
+        if usage_callback.completion_tokens:
+            LLM_COMPLETION_TOKENS.labels(provider=provider, model_config_key=model_config_key).inc(usage_callback.completion_tokens)
+
+
+@contextmanager
+def observe_result_write(target: str) -> Iterator[None]:
+    """결과 저장(`target`: 저장소 백엔드 이름 또는 index) 시간을 기록합니다."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        RESULT_WRITE_LATENCY.labels(target=target).observe(time.perf_counter() - started)
@@ -0,0 +1,371 @@
+"""
+근사 중복 리뷰 인덱스. 문장 부호, 이모지, 강조 부사 정도만 다른 리뷰("너무 맛있어요!!"와 "정말 맛있어요~")의
+분석 결과를 재사용하기 위해, 정규화한 `review_text`의 문자 n-gram MinHash 서명을 LSH(밴드별 버킷) 표에 보관합니다.
+
+- 새 리뷰의 서명과 같은 밴드 버킷에 있는 최근 항목 중 추정 유사도가 임계값 이상이고, 평점 구간이 같고,
+  주문 메뉴가 겹치며, 같은 모델 설정 키와 프롬프트 버전으로 분석된 항목을 근사 중복으로 봅니다.
+- 인덱스는 프로세스 메모리에만 있으며 `max_entries`개를 넘거나 `max_age_seconds`가 지난 항목은 오래된 것부터 제거합니다.
+- 서비스 설정(`near_duplicate` 섹션)의 `mode`로 동작을 고릅니다: `off`, `shadow`(찾기만 하고 LLM 결과와 비교하여
+  오판을 감사), `reuse`(점수, 감정, 키워드를 재사용하고 `audit_sample_rate` 비율은 LLM도 호출하여 감사).
+"""
+
+import logging
+import random
+import re
+import threading
+import time
+import zlib
+from bisect import bisect_right
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Literal, Optional, Sequence, Set
+
+import numpy as np
+from pydantic import BaseModel
+
+from app.config_loader import get_service_config
+from app.keyword_extractor import normalize_text
+from app.memory import register_cache_size
+from app.metrics import NEAR_DUPLICATE_AUDITS, NEAR_DUPLICATE_EVICTIONS, NEAR_DUPLICATE_LOOKUPS
+from app.schemas import ReviewAnalysisOutput, ReviewInputs
+
+# 이 모듈을 위한 로깅 설정
+logger = logging.getLogger(__name__)
+
+DEFAULT_IGNORED_WORDS = ("너무", "정말", "진짜", "완전", "넘", "아주", "엄청", "매우", "되게", "짱")
+DEFAULT_REPLY_PROMPT_PATH = "models/reply_prompt/v0.1.md"
+
+# MinHash 해시 함수 h(x) = (a * x + b) mod p. p가 2^31보다 작으므로 uint64 곱셈이 넘치지 않습니다.
+_MERSENNE_PRIME = (1 << 31) - 1
+_NON_WORD = re.compile(r"[^\w\s]|_")
+
+
+class NearDuplicateConfig(BaseModel):
+    """근사 중복 인덱스 설정"""
+    mode: Literal["off", "shadow", "reuse"] = "off"
+    similarity_threshold: float = 0.8 # 추정 자카드 유사도가 이 값 이상이면 근사 중복
+    ngram_size: int = 2 # 문자 n-gram 길이 (공백 제거 후)
+    num_perm: int = 64 # MinHash 서명 길이
+    bands: int = 16 # LSH 밴드 수 (num_perm의 약수)
+    max_entries: int = 5000
+    max_age_seconds: float = 86400.0
+    rating_band_edges: List[float] = [2.5, 3.5] # 평점 구간 경계 (기본: 1~2 / 3 / 4~5)
+    min_shared_items: int = 1 # 같다고 볼 최소 공통 주문 메뉴 수
+    ignored_words: List[str] = list(DEFAULT_IGNORED_WORDS) # 정규화 시 지우는 강조 부사
+    regenerate_reply: bool = True # 재사용 시 답글(reply)과 요약만 LLM으로 다시 생성 (False면 다른 고객에게 쓴 답글을 그대로 반환)
+    reply_prompt_path: str = DEFAULT_REPLY_PROMPT_PATH
+    audit_sample_rate: float = 0.05 # reuse 모드에서 재사용 대신 LLM을 호출하여 결과를 비교할 비율
+    audit_score_tolerance: float = 0.15 # 감사 시 이보다 큰 점수 차이는 오판으로 집계
+    seed: int = 1
+
+
+class NearDuplicateAudit(BaseModel):
+    """재사용 후보와 LLM 결과를 비교한 감사 기록"""
+    review_text: str
+    matched_review_text: str
+    similarity: float
+    score_difference: float
+    sentiment_agrees: bool
+    false_match: bool
+
+
+class NearDuplicateStats(BaseModel):
+    """근사 중복 인덱스의 재사용률과 오판 감사 통계"""
+    mode: str
+    entries: int
+    max_entries: int
+    evictions_total: int
+    lookups_total: int
+    hits_total: int # 유사도 임계값과 평점 구간, 메뉴 조건을 모두 통과한 근사 중복 수
+    filtered_total: int # 유사도는 넘었지만 평점 구간이나 메뉴 조건으로만 제외되어 근사 중복이 없었던 조회 수
+    reused_total: int # 실제로 LLM 호출 없이(또는 답글만 생성하여) 결과를 재사용한 수
+    reuse_rate: Optional[float] = None # reused_total / lookups_total
+    audits_total: int
+    false_matches_total: int
+    false_match_rate: Optional[float] = None # false_matches_total / audits_total
+    mean_audit_score_difference: Optional[float] = None
+    recent_false_matches: List[NearDuplicateAudit] = []
+
+
+class NearDuplicateMatch:
+    """조회된 근사 중복 항목"""
+
+    def __init__(self, entry: "_Entry", similarity: float):
+        self.review_text = entry.review_text
+        self.analysis_output = entry.analysis_output
+        self.similarity = similarity
+
+
+class _Entry:
+    __slots__ = ("signature", "review_text", "rating_band", "items", "scope", "analysis_output", "added_at")
+
+    def __init__(
+        self,
+        signature: np.ndarray,
+        review_text: str,
+        rating_band: int,
+        items: Set[str],
+        scope: tuple,
+        analysis_output: ReviewAnalysisOutput,
+        added_at: float,
+    ):
+        self.signature = signature
+        self.review_text = review_text
+        self.rating_band = rating_band
+        self.items = items
+        self.scope = scope
+        self.analysis_output = analysis_output
+        self.added_at = added_at
+
+
+class NearDuplicateIndex:
+    """
+    MinHash/LSH 근사 중복 인덱스. 서명을 `bands`개의 밴드로 나눠 밴드별 버킷에 항목 번호를 넣고,
+    조회 시 한 밴드라도 같은 항목만 후보로 삼아 서명 일치 비율(추정 자카드 유사도)을 계산합니다.
+    """
+
+    def __init__(self, config: Optional[NearDuplicateConfig] = None):
+        self.config = config or NearDuplicateConfig()
+        if self.config.num_perm % self.config.bands:
+            raise ValueError(f"num_perm({self.config.num_perm})은 bands({self.config.bands})의 배수여야 합니다.")
+        self.mode = self.config.mode
+        self._rows = self.config.num_perm // self.config.bands
+        generator = np.random.default_rng(self.config.seed)
+        self._a = generator.integers(1, _MERSENNE_PRIME, size=self.config.num_perm, dtype=np.uint64)
+        self._b = generator.integers(0, _MERSENNE_PRIME, size=self.config.num_perm, dtype=np.uint64)
+        self._ignored_words = {normalize_text(word) for word in self.config.ignored_words}
+        self._random = random.Random(self.config.seed)
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._buckets: List[Dict[bytes, Set[int]]] = [{} for _ in range(self.config.bands)]
+        self._next_id = 0
+        self._evictions_total = 0
+        self._lookups_total = 0
+        self._hits_total = 0
+        self._filtered_total = 0
+        self._reused_total = 0
+        self._audits_total = 0
+        self._false_matches_total = 0
+        self._audit_score_difference_sum = 0.0
+        self._recent_false_matches: Deque[NearDuplicateAudit] = deque(maxlen=20)
+
+    def normalize(self, review_text: str) -> str:
+        """문장 부호와 이모지, 강조 부사, 공백을 지운 비교용 텍스트"""
+        words = _NON_WORD.sub(" ", normalize_text(review_text)).split()
+        return "".join(word for word in words if word not in self._ignored_words)
+
+    def shingles(self, review_text: str) -> Set[str]:
+        text = self.normalize(review_text)
+        size = self.config.ngram_size
+        if len(text) <= size:
+            return {text} if text else set()
+        return {text[start:start + size] for start in range(len(text) - size + 1)}
+
+    def signature(self, review_text: str) -> Optional[np.ndarray]:
+        """문자 n-gram 집합의 MinHash 서명. 비교할 글자가 없으면 `None`."""
+        shingles = self.shingles(review_text)
+        if not shingles:
+            return None
+        hashes = np.fromiter((zlib.crc32(shingle.encode("utf-8")) for shingle in shingles), dtype=np.uint64, count=len(shingles))
+        hashes %= _MERSENNE_PRIME
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % _MERSENNE_PRIME
+        return permuted.min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[band * self._rows:(band + 1) * self._rows].tobytes() for band in range(self.config.bands)]
+
+    def _rating_band(self, rating: float) -> int:
+        return bisect_right(self.config.rating_band_edges, rating)
+
+    @staticmethod
+    def _items(ordered_items: Sequence[str]) -> Set[str]:
+        return {normalize_text(str(item)) for item in ordered_items}
+
+    def _remove(self, entry_id: int) -> None:
+        entry = self._entries.pop(entry_id)
+        for bucket, key in zip(self._buckets, self._band_keys(entry.signature)):
+            members = bucket.get(key)
+            if members is not None:
+                members.discard(entry_id)
+                if not members:
+                    del bucket[key]
+
+    def _evict(self, now: float) -> None:
+        """용량을 넘거나 보관 기간이 지난 항목을 오래된 것부터 제거합니다. 잠금은 호출하는 쪽이 보유합니다."""
+        while self._entries:
+            oldest_id, oldest = next(iter(self._entries.items()))
+            if len(self._entries) <= self.config.max_entries and now - oldest.added_at <= self.config.max_age_seconds:
+                break
+            self._remove(oldest_id)
+            self._evictions_total += 1
+            NEAR_DUPLICATE_EVICTIONS.inc()
+
+    def add(
+        self,
+        review_inputs: ReviewInputs,
+        analysis_output: ReviewAnalysisOutput,
+        model_config_key: Optional[str],
+        prompt_version: Optional[str],
+    ) -> None:
+        """LLM으로 분석한 결과를 인덱스에 추가합니다. 재사용한 결과는 추가하지 않아야 오차가 누적되지 않습니다."""
+        signature = self.signature(review_inputs.review_text)
+        if signature is None:
+            return
+        now = time.monotonic()
+        entry = _Entry(
+            signature=signature,
+            review_text=review_inputs.review_text,
+            rating_band=self._rating_band(review_inputs.rating),
+            items=self._items(review_inputs.ordered_items),
+            scope=(model_config_key, prompt_version),
+            analysis_output=analysis_output,
+            added_at=now,
+        )
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = entry
+            for bucket, key in zip(self._buckets, self._band_keys(signature)):
+                bucket.setdefault(key, set()).add(entry_id)
+            self._evict(now)
+
+    def find(
+        self,
+        review_inputs: ReviewInputs,
+        model_config_key: Optional[str],
+        prompt_version: Optional[str],
+    ) -> Optional[NearDuplicateMatch]:
+        """조건을 모두 만족하는 가장 유사한(같으면 가장 최근) 항목을 반환합니다."""
+        signature = self.signature(review_inputs.review_text)
+        rating_band = self._rating_band(review_inputs.rating)
+        items = self._items(review_inputs.ordered_items)
+        scope = (model_config_key, prompt_version)
+        best: Optional[NearDuplicateMatch] = None
+        filtered = False
+        with self._lock:
+            self._lookups_total += 1
+            self._evict(time.monotonic())
+            candidate_ids: Set[int] = set()
+            if signature is not None:
+                for bucket, key in zip(self._buckets, self._band_keys(signature)):
+                    candidate_ids.update(bucket.get(key, ()))
+            for entry_id in sorted(candidate_ids, reverse=True):
+                entry = self._entries[entry_id]
+                if entry.scope != scope:
+                    continue
+                similarity = float(np.mean(entry.signature == signature))
+                if similarity < self.config.similarity_threshold or (best is not None and similarity <= best.similarity):
+                    continue
+                if entry.rating_band != rating_band or len(entry.items & items) < self.config.min_shared_items:
+                    filtered = True
+                    continue
+                best = NearDuplicateMatch(entry, similarity)
+            if best is not None:
+                self._hits_total += 1
+            elif filtered:
+                self._filtered_total += 1
+        NEAR_DUPLICATE_LOOKUPS.labels(outcome="hit" if best else "filtered" if filtered else "miss").inc()
+        return best
+
+    def should_reuse(self) -> bool:
+        """근사 중복을 찾았을 때 결과를 재사용할지 여부. reuse 모드에서도 `audit_sample_rate` 비율은 감사용으로 LLM을 호출합니다."""
+        if self.mode != "reuse":
+            return False
+        with self._lock:
+            return self._random.random() >= self.config.audit_sample_rate
+
+    def record_reuse(self) -> None:
+        with self._lock:
+            self._reused_total += 1
+
+    def audit(self, review_inputs: ReviewInputs, match: NearDuplicateMatch, fresh_output: ReviewAnalysisOutput) -> NearDuplicateAudit:
+        """재사용했을 결과를 LLM 결과와 비교하여, 감정이 다르거나 점수 차이가 허용 범위를 넘으면 오판으로 집계합니다."""
+        reused = match.analysis_output
+        score_difference = abs(reused.score - fresh_output.score)
+        sentiment_agrees = reused.overall_sentiment == fresh_output.overall_sentiment
+        record = NearDuplicateAudit(
+            review_text=review_inputs.review_text,
+            matched_review_text=match.review_text,
+            similarity=round(match.similarity, 4),
+            score_difference=round(score_difference, 4),
+            sentiment_agrees=sentiment_agrees,
+            false_match=not sentiment_agrees or score_difference > self.config.audit_score_tolerance,
+        )
+        with self._lock:
+            self._audits_total += 1
+            self._audit_score_difference_sum += score_difference
+            if record.false_match:
+                self._false_matches_total += 1
+                self._recent_false_matches.append(record)
+        NEAR_DUPLICATE_AUDITS.labels(result="false_match" if record.false_match else "agree").inc()
+        if record.false_match:
+            logger.info(f"근사 중복 오판 감사: 유사도 {record.similarity}, 점수 차이 {record.score_difference}, 감정 일치 {sentiment_agrees}")
+        return record
+
+    def stats(self) -> NearDuplicateStats:
+        with self._lock:
+            return NearDuplicateStats(
+                mode=self.mode,
+                entries=len(self._entries),
+                max_entries=self.config.max_entries,
+                evictions_total=self._evictions_total,
+                lookups_total=self._lookups_total,
+                hits_total=self._hits_total,
+                filtered_total=self._filtered_total,
+                reused_total=self._reused_total,
+                reuse_rate=self._reused_total / self._lookups_total if self._lookups_total else None,
+                audits_total=self._audits_total,
+                false_matches_total=self._false_matches_total,
+                false_match_rate=self._false_matches_total / self._audits_total if self._audits_total else None,
+                mean_audit_score_difference=self._audit_score_difference_sum / self._audits_total if self._audits_total else None,
+                recent_false_matches=list(self._recent_false_matches),
+            )
+
+
+def merge_regenerated_reply(reused: ReviewAnalysisOutput, regenerated: ReviewAnalysisOutput) -> ReviewAnalysisOutput:
+    """재사용한 점수, 감정, 키워드는 유지하고 답글 생성 프롬프트로 새로 만든 요약과 답글만 가져옵니다."""
+    return reused.model_copy(update={
+        "summary": regenerated.summary,
+        "reply": regenerated.reply,
+        "analysis_reply": regenerated.analysis_reply,
+    })
+
+
+def reused_analysis_prompt_text(reused: ReviewAnalysisOutput) -> str:
+    """답글 생성 프롬프트의 `{reused_analysis}`에 넣을, 재사용하는 분석 값"""
+    return reused.model_dump_json(include={"score", "is_question_review", "overall_sentiment", "keywords", "analysis_score"})
+
+
+_NEAR_DUPLICATE_INDEX: NearDuplicateIndex | None = None
+_NEAR_DUPLICATE_INDEX_INITIALIZED = False
+_NEAR_DUPLICATE_INDEX_LOCK = threading.Lock()
+
+
+def get_near_duplicate_index() -> Optional[NearDuplicateIndex]:
+    """서비스 설정(`near_duplicate` 섹션)에 따른 프로세스 단위 근사 중복 인덱스를 반환합니다. `off`이면 `None`."""
+    global _NEAR_DUPLICATE_INDEX, _NEAR_DUPLICATE_INDEX_INITIALIZED
+    if not _NEAR_DUPLICATE_INDEX_INITIALIZED:
+        with _NEAR_DUPLICATE_INDEX_LOCK:
+            if not _NEAR_DUPLICATE_INDEX_INITIALIZED:
+                config = NearDuplicateConfig(**get_service_config("near_duplicate"))
+                if config.mode != "off":
+                    _NEAR_DUPLICATE_INDEX = NearDuplicateIndex(config)
+                    logger.info(f"근사 중복 인덱스 초기화: 모드 {config.mode}, 최대 {config.max_entries}개")
+                _NEAR_DUPLICATE_INDEX_INITIALIZED = True
+    return _NEAR_DUPLICATE_INDEX
+
+
+def _near_duplicate_entries() -> int:
+    index = _NEAR_DUPLICATE_INDEX
+    return index.stats().entries if index is not None else 0
+
+
+register_cache_size("near_duplicate_entries", _near_duplicate_entries)
+
+
+def set_near_duplicate_index(index: NearDuplicateIndex | None) -> None:
+    """프로세스 단위 근사 중복 인덱스를 교체합니다 (테스트 및 도구용). `None`이면 비활성화합니다."""
+    global _NEAR_DUPLICATE_INDEX, _NEAR_DUPLICATE_INDEX_INITIALIZED
+    with _NEAR_DUPLICATE_INDEX_LOCK:
+        _NEAR_DUPLICATE_INDEX = index
+        _NEAR_DUPLICATE_INDEX_INITIALIZED = True
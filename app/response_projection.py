@@ -0,0 +1,54 @@
+import logging
+from typing import Any, Iterable, List, Optional, Set, Tuple
+
+import orjson
+
+from app.schemas import AgentState
+
+# 이 모듈을 위한 로깅 설정
+logger = logging.getLogger(__name__)
+
+FULL_SHAPE = "full"
+RESULT_SHAPE = "result"
+# 결과만 필요한 호출자(배치 재분석 등)를 위한 최소 응답 필드. 입력(review_inputs) 에코와 내부 필드를 제외합니다.
+RESULT_ONLY_FIELDS = ("analysis_output", "saved_record_id", "error_code", "analysis_error_message")
+
+
+def resolve_projection(fields: Optional[List[str]], response_shape: Optional[str]) -> Tuple[Optional[Set[str]], bool]:
+    """
+    요청의 필드 선택(`fields`)과 응답 형태(`response_shape`)를 (응답에 포함할 AgentState 필드 집합, 값 없는 필드 생략 여부)로
+    변환합니다. 필드 집합이 `None`이면 전체 필드를 포함하며, `result` 형태만 값이 없는 필드를 생략합니다.
+    알 수 없는 필드나 형태가 있으면 `ValueError`를 발생시킵니다.
+    """
+    if response_shape not in (None, FULL_SHAPE, RESULT_SHAPE):
+        raise ValueError(f"지원하지 않는 response_shape입니다: {response_shape!r} (full, result 중 선택)")
+    if fields:
+        unknown_fields = set(fields) - set(AgentState.model_fields)
+        if unknown_fields:
+            raise ValueError(f"AgentState에 없는 필드입니다: {sorted(unknown_fields)}")
+        return set(fields), False
+    if response_shape == RESULT_SHAPE:
+        return set(RESULT_ONLY_FIELDS), True
+    return None, False
+
+
+def project_state(state: AgentState, include: Optional[Set[str]] = None, exclude_none: bool = False) -> dict:
+    """AgentState를 JSON 호환 딕셔너리로 변환합니다. `include`가 있으면 해당 필드만 포함합니다."""
+    return state.model_dump(mode="json", include=include, exclude_none=exclude_none)
+
+
+def serialize_states(states: Iterable[AgentState], fields: Optional[List[str]] = None, response_shape: Optional[str] = None) -> bytes:
+    """여러 상태를 투영하여 JSON 배열 바이트로 직렬화합니다 (orjson)."""
+    include, exclude_none = resolve_projection(fields, response_shape)
+    return dumps([project_state(state, include, exclude_none) for state in states])
+
+
+def serialize_state(state: AgentState, fields: Optional[List[str]] = None, response_shape: Optional[str] = None) -> bytes:
+    """상태 하나를 투영하여 JSON 바이트로 직렬화합니다 (orjson)."""
+    include, exclude_none = resolve_projection(fields, response_shape)
+    return dumps(project_state(state, include, exclude_none))
+
+
+def dumps(payload: Any) -> bytes:
+    """orjson으로 UTF-8 JSON 바이트를 만듭니다. 한글을 이스케이프하지 않아 표준 json 모듈보다 작고 빠릅니다."""
+    return orjson.dumps(payload)
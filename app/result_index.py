@@ -0,0 +1,334 @@
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.config_loader import get_service_config
+from app.result_store import PROJECT_ROOT, StoredResultRef
+from app.schemas import StoredAnalysisPage, StoredAnalysisSummary, UsageAggregate
+
+# 이 모듈을 위한 로깅 설정
+logger = logging.getLogger(__name__)
+
+MAX_PAGE_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    record_id TEXT NOT NULL UNIQUE,
+    location TEXT,
+    saved_at REAL NOT NULL,
+    model_key TEXT,
+    model_name TEXT,
+    overall_sentiment TEXT,
+    score REAL,
+    is_question_review INTEGER,
+    rating REAL,
+    summary TEXT,
+    analysis_error_message TEXT,
+    prompt_version TEXT,
+    prompt_tokens INTEGER,
+    completion_tokens INTEGER,
+    cached_prompt_tokens INTEGER,
+    estimated_cost_usd REAL
+);
+CREATE INDEX IF NOT EXISTS idx_results_saved_at ON results(saved_at);
+CREATE INDEX IF NOT EXISTS idx_results_model_key ON results(model_key, seq);
+CREATE INDEX IF NOT EXISTS idx_results_sentiment ON results(overall_sentiment, seq);
+CREATE INDEX IF NOT EXISTS idx_results_question ON results(is_question_review, seq);
+CREATE INDEX IF NOT EXISTS idx_results_score ON results(score);
+CREATE INDEX IF NOT EXISTS idx_results_usage_group ON results(saved_at, model_key, prompt_version);
+CREATE TABLE IF NOT EXISTS result_menu_items (
+    menu_item TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    PRIMARY KEY (menu_item, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_result_menu_items_seq ON result_menu_items(seq);
+"""
+
+# 인덱스 도입 이후 추가된 컬럼. 기존 인덱스 파일은 열 때 ALTER TABLE로 채워 넣습니다.
+_ADDED_COLUMNS = {
+    "prompt_version": "TEXT",
+    "prompt_tokens": "INTEGER",
+    "completion_tokens": "INTEGER",
+    "cached_prompt_tokens": "INTEGER",
+    "estimated_cost_usd": "REAL",
+}
+
+
+class ResultIndex:
+    """
+    저장된 분석 결과를 조회하기 위한 SQLite 기반 로컬 인덱스.
+
+    결과 저장 시마다 `add`로 한 건씩 갱신되며, 시간 범위·모델·감정·점수·문의형 여부·주문 메뉴로
+    필터링한 결과를 최신순으로 커서 기반(keyset) 페이지네이션하여 반환합니다.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        conn = self._connection()
+        existing_columns = {row[1] for row in conn.execute("PRAGMA table_info(results)")}
+        for column, column_type in _ADDED_COLUMNS.items():
+            if existing_columns and column not in existing_columns:
+                conn.execute(f"ALTER TABLE results ADD COLUMN {column} {column_type}")
+        conn.executescript(_SCHEMA)
+        conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 연결은 스레드 간 공유하지 않고 스레드마다 하나씩 사용합니다.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def add(self, ref: StoredResultRef, record: Dict[str, Any]) -> None:
+        """결과 저장소에 기록된 레코드 한 건을 인덱스에 추가합니다."""
+        self.add_many([(ref, record)])
+
+    def add_many(self, entries: Iterable[tuple[StoredResultRef, Dict[str, Any]]]) -> int:
+        """여러 레코드를 하나의 트랜잭션으로 인덱싱하고 새로 추가된 건수를 반환합니다."""
+        conn = self._connection()
+        added = 0
+        with conn:
+            for ref, record in entries:
+                review_inputs = record.get("review_inputs") or {}
+                analysis_output = record.get("analysis_output") or {}
+                token_usage = record.get("token_usage") or {}
+                is_question = analysis_output.get("is_question_review")
+                cursor = conn.execute(
+                    """
+                    INSERT OR IGNORE INTO results (
+                        record_id, location, saved_at, model_key, model_name, overall_sentiment,
+                        score, is_question_review, rating, summary, analysis_error_message,
+                        prompt_version, prompt_tokens, completion_tokens, cached_prompt_tokens, estimated_cost_usd
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        ref.record_id,
+                        ref.location,
+                        datetime.fromisoformat(record["saved_at"]).timestamp(),
+                        record.get("model_key_used"),
+                        record.get("actual_model_name_used"),
+                        analysis_output.get("overall_sentiment"),
+                        analysis_output.get("score"),
+                        None if is_question is None else int(is_question),
+                        review_inputs.get("rating"),
+                        analysis_output.get("summary"),
+                        record.get("analysis_error_message"),
+                        record.get("prompt_version"),
+                        token_usage.get("prompt_tokens"),
+                        token_usage.get("completion_tokens"),
+                        token_usage.get("cached_prompt_tokens"),
+                        token_usage.get("estimated_cost_usd"),
+                    ),
+                )
+                if cursor.rowcount == 0:
+                    continue
+                seq = cursor.lastrowid
+                menu_items = set(review_inputs.get("ordered_items") or [])
+                conn.executemany(
+                    "INSERT OR IGNORE INTO result_menu_items (menu_item, seq) VALUES (?, ?)",
+                    [(item, seq) for item in menu_items],
+                )
+                added += 1
+        return added
+
+    def query(
+        self,
+        saved_from: Optional[datetime] = None,
+        saved_to: Optional[datetime] = None,
+        model_key: Optional[str] = None,
+        overall_sentiment: Optional[str] = None,
+        min_score: Optional[float] = None,
+        max_score: Optional[float] = None,
+        is_question_review: Optional[bool] = None,
+        menu_item: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> StoredAnalysisPage:
+        """
+        조건에 맞는 저장 결과를 최신순으로 최대 `limit`건 반환합니다.
+        `cursor`에는 이전 페이지 응답의 `next_cursor`를 전달합니다.
+        """
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        clauses: List[str] = []
+        params: List[Any] = []
+
+        if cursor:
+            try:
+                cursor_seq = int(cursor)
+            except ValueError:
+                raise ValueError(f"유효하지 않은 커서입니다: '{cursor}'")
+            clauses.append("r.seq < ?")
+            params.append(cursor_seq)
+        if saved_from is not None:
+            clauses.append("r.saved_at >= ?")
+            params.append(saved_from.timestamp())
+        if saved_to is not None:
+            clauses.append("r.saved_at < ?")
+            params.append(saved_to.timestamp())
+        if model_key is not None:
+            clauses.append("r.model_key = ?")
+            params.append(model_key)
+        if overall_sentiment is not None:
+            clauses.append("r.overall_sentiment = ?")
+            params.append(overall_sentiment)
+        if min_score is not None:
+            clauses.append("r.score >= ?")
+            params.append(min_score)
+        if max_score is not None:
+            clauses.append("r.score <= ?")
+            params.append(max_score)
+        if is_question_review is not None:
+            clauses.append("r.is_question_review = ?")
+            params.append(int(is_question_review))
+        if menu_item is not None:
+            clauses.append("r.seq IN (SELECT seq FROM result_menu_items WHERE menu_item = ?)")
+            params.append(menu_item)
+
+        where_sql = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        conn = self._connection()
+        rows = conn.execute(
+            f"""
+            SELECT r.seq, r.record_id, r.location, r.saved_at, r.model_key, r.model_name,
+                   r.overall_sentiment, r.score, r.is_question_review, r.rating, r.summary,
+                   r.analysis_error_message
+            FROM results r
+            {where_sql}
+            ORDER BY r.seq DESC
+            LIMIT ?
+            """,
+            (*params, limit + 1),
+        ).fetchall()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        menu_items_by_seq: Dict[int, List[str]] = {row[0]: [] for row in rows}
+        if rows:
+            placeholders = ",".join("?" for _ in rows)
+            for item, seq in conn.execute(
+                f"SELECT menu_item, seq FROM result_menu_items WHERE seq IN ({placeholders})",
+                list(menu_items_by_seq),
+            ):
+                menu_items_by_seq[seq].append(item)
+
+        items = [
+            StoredAnalysisSummary(
+                record_id=row[1],
+                location=row[2],
+                saved_at=datetime.fromtimestamp(row[3]),
+                model_key_used=row[4],
+                actual_model_name_used=row[5],
+                overall_sentiment=row[6],
+                score=row[7],
+                is_question_review=None if row[8] is None else bool(row[8]),
+                rating=row[9],
+                ordered_items=sorted(menu_items_by_seq[row[0]]),
+                summary=row[10],
+                analysis_error_message=row[11],
+            )
+            for row in rows
+        ]
+        return StoredAnalysisPage(items=items, next_cursor=str(rows[-1][0]) if has_more else None)
+
+    def usage_summary(self, saved_from: datetime, saved_to: datetime) -> List[UsageAggregate]:
+        """
+        `saved_from` 이상 `saved_to` 미만에 저장된 결과의 토큰 사용량과 예상 비용을
+        모델 설정 키, 실제 모델명, 프롬프트 버전별로 집계합니다. 리뷰당 평균 비용이 큰 순서로 반환합니다.
+        """
+        rows = self._connection().execute(
+            """
+            SELECT model_key, model_name, prompt_version, COUNT(*),
+                   COALESCE(SUM(prompt_tokens), 0), COALESCE(SUM(completion_tokens), 0),
+                   COALESCE(SUM(cached_prompt_tokens), 0), SUM(estimated_cost_usd),
+                   AVG(prompt_tokens), AVG(completion_tokens), AVG(estimated_cost_usd)
+            FROM results
+            WHERE saved_at >= ? AND saved_at < ?
+            GROUP BY model_key, model_name, prompt_version
+            ORDER BY AVG(estimated_cost_usd) DESC, COUNT(*) DESC
+            """,
+            (saved_from.timestamp(), saved_to.timestamp()),
+        ).fetchall()
+        return [
+            UsageAggregate(
+                model_key_used=row[0],
+                actual_model_name_used=row[1],
+                prompt_version=row[2],
+                analyses=row[3],
+                prompt_tokens=row[4],
+                completion_tokens=row[5],
+                cached_prompt_tokens=row[6],
+                estimated_cost_usd=row[7],
+                avg_prompt_tokens=row[8],
+                avg_completion_tokens=row[9],
+                avg_cost_per_review_usd=row[10],
+            )
+            for row in rows
+        ]
+
+    def count(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def rebuild_from_store(self, store) -> int:
+        """
+        `iter_records`를 지원하는 결과 저장소의 모든 레코드를 인덱싱합니다 (이미 인덱싱된 레코드는 건너뜀).
+        인덱스 파일을 잃어버렸거나 인덱스 도입 이전에 저장된 결과를 채워 넣을 때 사용합니다.
+        """
+        added = 0
+        batch = []
+        for record_id, record in store.iter_records():
+            batch.append((StoredResultRef(record_id=record_id, location=store.location_of(record_id)), record))
+            if len(batch) >= 1000:
+                added += self.add_many(batch)
+                batch = []
+        if batch:
+            added += self.add_many(batch)
+        return added
+
+
+_RESULT_INDEX: ResultIndex | None = None
+_RESULT_INDEX_LOCK = threading.Lock()
+
+
+def get_result_index() -> Optional[ResultIndex]:
+    """서비스 설정(`result_index` 섹션)에 따른 프로세스 단위 결과 인덱스를 반환합니다. 비활성화 시 `None`."""
+    global _RESULT_INDEX
+    if _RESULT_INDEX is None:
+        index_config = get_service_config("result_index")
+        if not index_config.get("enabled", True):
+            return None
+        with _RESULT_INDEX_LOCK:
+            if _RESULT_INDEX is None:
+                db_path = os.path.join(PROJECT_ROOT, index_config.get("path", "data/result_index.sqlite3"))
+                _RESULT_INDEX = ResultIndex(db_path)
+                logger.info(f"결과 인덱스 초기화: {db_path}")
+    return _RESULT_INDEX
+
+
+def set_result_index(index: ResultIndex | None) -> ResultIndex | None:
+    """프로세스 단위 결과 인덱스를 교체하고 이전 인덱스를 반환합니다 (테스트 및 도구용)."""
+    global _RESULT_INDEX
+    with _RESULT_INDEX_LOCK:
+        previous, _RESULT_INDEX = _RESULT_INDEX, index
+    return previous
+
+
+if __name__ == "__main__":
+    from app.result_store import get_result_store
+
+    index = get_result_index()
+    if index is None:
+        print("result_index가 비활성화되어 있습니다.")
+    else:
+        store = get_result_store()
+        if not hasattr(store, "iter_records"):
+            print("현재 결과 저장소 백엔드는 재인덱싱을 지원하지 않습니다.")
+        else:
+            print(f"인덱싱된 레코드 수: {index.rebuild_from_store(store)} (전체 {index.count()})")
@@ -0,0 +1,433 @@
+import json
+import logging
+import os
+import struct
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from pydantic import BaseModel
+
+from app.config_loader import get_service_config
+from app.schemas import AgentState, KeywordSentiment
+
+# 이 모듈을 위한 로깅 설정
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# 오프셋 인덱스 엔트리: (세그먼트 내 바이트 오프셋 uint64, 레코드 길이 uint32)
+_INDEX_ENTRY = struct.Struct("<QI")
+_SEGMENT_PREFIX = "segment_"
+
+
+class StoredResultRef(BaseModel):
+    """결과 저장소에 기록된 레코드의 위치 정보"""
+    record_id: str
+    location: str # 레코드가 기록된 파일 경로
+
+
+def build_result_record(state: AgentState, saved_at: datetime) -> Dict[str, Any]:
+    """
+    AgentState에서 영속화할 분석 조건과 결과만 추려 JSON 직렬화 가능한 레코드 딕셔너리를 만듭니다.
+    """
+    return {
+        "saved_at": saved_at.isoformat(timespec="microseconds"),
+        "model_key_used": state.model_key_used,
+        "actual_model_name_used": state.actual_model_name_used,
+        "prompt_version": state.prompt_version,
+        "token_usage": state.token_usage.model_dump() if state.token_usage else None,
+        "near_duplicate_similarity": state.near_duplicate_similarity,
+        "review_inputs": state.review_inputs.model_dump() if state.review_inputs else None,
+        "analysis_output": state.analysis_output.model_dump() if state.analysis_output else None,
+        "analysis_error_message": state.analysis_error_message,
+    }
+
+
+def render_result_markdown(record: Dict[str, Any]) -> str:
+    """
+    결과 레코드를 기존 `data/result/*.md` 파일과 동일한 Markdown 레이아웃으로 렌더링합니다.
+    """
+    review_inputs = record.get("review_inputs")
+    analysis_output = record.get("analysis_output")
+    analysis_error = record.get("analysis_error_message")
+    saved_at = datetime.fromisoformat(record["saved_at"])
+
+    if review_inputs:
+        review_text = review_inputs.get("review_text")
+        rating = review_inputs.get("rating")
+        ordered_items_list = review_inputs.get("ordered_items") or []
+    else:
+        review_text = "N/A"
+        rating = "N/A"
+        ordered_items_list = []
+
+    if ordered_items_list:
+        ordered_items_md = "\n".join([f"- {item}" for item in ordered_items_list])
+    else:
+        ordered_items_md = "- N/A"
+
+    actual_model_name = record.get("actual_model_name_used")
+    model_name_display = actual_model_name if actual_model_name else "모델 정보 없음 (또는 기본 모델 사용)"
+
+    markdown_content = f"# 리뷰 분석 결과\n\n"
+    markdown_content += f"## 실행 정보\n"
+    markdown_content += f"- **저장 일시**: {saved_at.strftime('%Y-%m-%d %H:%M:%S.%f')}\n"
+    markdown_content += f"- **사용된 모델**: `{model_name_display}`\n"
+    token_usage = record.get("token_usage")
+    if token_usage:
+        cost = token_usage.get("estimated_cost_usd")
+        cost_display = f"${cost:.6f}" if cost is not None else "가격 정보 없음"
+        markdown_content += (
+            f"- **토큰 사용량**: 입력 {token_usage['prompt_tokens']} (캐시 {token_usage['cached_prompt_tokens']}), "
+            f"출력 {token_usage['completion_tokens']}, 예상 비용 {cost_display}\n"
+        )
+    markdown_content += "\n"
+
+    markdown_content += f"## 분석 조건 (Inputs)\n\n"
+    markdown_content += f"### 리뷰 원문\n> {review_text}\n\n"
+    markdown_content += f"### 평점\n{rating}\n\n"
+
+    markdown_content += f"### 주문 메뉴\n{ordered_items_md}\n\n"
+
+    markdown_content += f"## 분석 결과 (Outputs)\n\n"
+    if analysis_error:
+        markdown_content += f"### 분석 오류 발생\n"
+        markdown_content += f"`analyze_review_node`에서 다음 오류가 발생했습니다: {analysis_error}\n"
+    elif analysis_output:
+        markdown_content += f"### 리뷰 점수 (Score)\n{analysis_output['score']}\n\n"
+        markdown_content += f"### 요약 (Summary)\n{analysis_output['summary']}\n\n"
+
+        keywords = [KeywordSentiment(**kw) for kw in analysis_output.get("keywords") or []]
+        keywords_str = "\n".join([f"- {kw}" for kw in keywords]) if keywords else "N/A"
+        markdown_content += f"### 주요 키워드 (Keywords)\n{keywords_str}\n\n"
+
+        markdown_content += f"### 생성된 답변 (Reply)\n{analysis_output['reply']}\n\n"
+        markdown_content += f"### 점수 판단 근거 (Analysis Score)\n{analysis_output['analysis_score']}\n\n"
+        markdown_content += f"### 답변 생성 근거 (Analysis Reply)\n{analysis_output['analysis_reply']}\n"
+    else:
+        markdown_content += "분석 결과가 없거나 분석 오류 정보도 없습니다.\n"
+
+    return markdown_content
+
+
+def export_result_markdown(record: Dict[str, Any], output_dir: str) -> str:
+    """
+    결과 레코드를 Markdown 파일로 내보내고 생성된 파일 경로를 반환합니다.
+    파일명은 기존 결과 파일과 같은 `%Y%m%d_%H%M%S_%f_result.md` 형식을 따릅니다.
+    """
+    saved_at = datetime.fromisoformat(record["saved_at"])
+    os.makedirs(output_dir, exist_ok=True)
+    filepath = os.path.join(output_dir, saved_at.strftime("%Y%m%d_%H%M%S_%f") + "_result.md")
+    with open(filepath, "w", encoding="utf-8") as f:
+        f.write(render_result_markdown(record))
+    return filepath
+
+
+class ResultStore(ABC):
+    """결과 저장소 백엔드의 공통 인터페이스. `append`와 `get`을 구현하지 않은 백엔드는 생성 시점에 TypeError가 발생합니다."""
+
+    backend_name = "base" # 지표 레이블 등에 사용하는 백엔드 이름
+
+    @abstractmethod
+    def append(self, record: Dict[str, Any]) -> StoredResultRef:
+        """레코드를 저장하고 레코드 ID와 저장 위치를 반환합니다."""
+
+    @abstractmethod
+    def get(self, record_id: str) -> Optional[Dict[str, Any]]:
+        """레코드 ID로 저장된 레코드를 읽습니다. 없으면 None."""
+
+
+class MarkdownResultStore(ResultStore):
+    """
+    요청마다 타임스탬프 이름의 Markdown 파일 하나를 만드는 기존 저장 방식.
+    레코드 ID는 생성된 파일명입니다. 파일에서 레코드를 다시 읽을 수는 없으므로 `get`은 항상 `None`입니다.
+    """
+
+    backend_name = "markdown"
+
+    def __init__(self, base_dir: str):
+        self.base_dir = base_dir
+
+    def append(self, record: Dict[str, Any]) -> StoredResultRef:
+        filepath = export_result_markdown(record, self.base_dir)
+        return StoredResultRef(record_id=os.path.basename(filepath), location=filepath)
+
+    def get(self, record_id: str) -> Optional[Dict[str, Any]]:
+        return None
+
+
+class SegmentedJsonlResultStore(ResultStore):
+    """
+    결과 레코드를 JSONL 세그먼트 파일에 추가(append)만 하는 저장소.
+
+    - 세그먼트(`segment_XXXXXXXX.jsonl`)는 크기(`max_segment_bytes`) 또는 생성 후 경과 시간
+      (`max_segment_age_seconds`)을 넘으면 다음 번호의 새 세그먼트로 교체됩니다.
+    - 각 세그먼트 옆의 `.idx` 파일에는 레코드별 (오프셋, 길이)가 고정 길이로 기록되어,
+      레코드 ID(`<세그먼트 번호>-<세그먼트 내 순번>`)만으로 한 번의 seek로 레코드를 읽을 수 있습니다.
+    - 한 디렉토리에는 하나의 프로세스만 쓰는 것을 전제로 하며, 프로세스 내 동시 쓰기는 잠금으로 직렬화합니다.
+    """
+
+    backend_name = "segmented"
+
+    def __init__(
+        self,
+        base_dir: str,
+        max_segment_bytes: int = 64 * 1024 * 1024,
+        max_segment_age_seconds: float | None = 24 * 60 * 60,
+        fsync: bool = False,
+    ):
+        self.base_dir = base_dir
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_age_seconds = max_segment_age_seconds
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._data_file = None
+        self._index_file = None
+        self._segment_seq = 0
+        self._segment_bytes = 0
+        self._segment_records = 0
+        self._segment_opened_at = 0.0
+
+        os.makedirs(self.base_dir, exist_ok=True)
+        existing = self.list_segments()
+        if existing:
+            self._open_segment(existing[-1], recover=True)
+
+    # --- 경로 헬퍼 ---
+
+    def _data_path(self, seq: int) -> str:
+        return os.path.join(self.base_dir, f"{_SEGMENT_PREFIX}{seq:08d}.jsonl")
+
+    def _index_path(self, seq: int) -> str:
+        return os.path.join(self.base_dir, f"{_SEGMENT_PREFIX}{seq:08d}.idx")
+
+    def list_segments(self) -> List[int]:
+        """디렉토리에 존재하는 세그먼트 번호를 오름차순으로 반환합니다."""
+        seqs = []
+        for name in os.listdir(self.base_dir):
+            if name.startswith(_SEGMENT_PREFIX) and name.endswith(".jsonl"):
+                try:
+                    seqs.append(int(name[len(_SEGMENT_PREFIX):-len(".jsonl")]))
+                except ValueError:
+                    continue
+        return sorted(seqs)
+
+    # --- 세그먼트 관리 ---
+
+    def _open_segment(self, seq: int, recover: bool = False) -> None:
+        if recover:
+            self._recover_segment(seq)
+        self._data_file = open(self._data_path(seq), "ab")
+        self._index_file = open(self._index_path(seq), "ab")
+        self._segment_seq = seq
+        self._segment_bytes = self._data_file.tell()
+        self._segment_records = self._index_file.tell() // _INDEX_ENTRY.size
+        self._segment_opened_at = self._read_segment_start_time(seq) if self._segment_records else time.time()
+
+    def _close_segment(self) -> None:
+        for f in (self._data_file, self._index_file):
+            if f is not None:
+                f.close()
+        self._data_file = None
+        self._index_file = None
+
+    def _recover_segment(self, seq: int) -> None:
+        """
+        비정상 종료로 데이터 파일과 인덱스 파일이 어긋난 경우, 온전한 레코드만 남기도록 두 파일을 맞춥니다.
+        """
+        data_path = self._data_path(seq)
+        index_path = self._index_path(seq)
+        if not os.path.exists(index_path):
+            open(index_path, "wb").close()
+
+        data_size = os.path.getsize(data_path)
+        with open(index_path, "r+b") as index_f:
+            raw = index_f.read()
+            entry_count = len(raw) // _INDEX_ENTRY.size
+            valid_end = 0
+            valid_entries = 0
+            for i in range(entry_count):
+                offset, length = _INDEX_ENTRY.unpack_from(raw, i * _INDEX_ENTRY.size)
+                if offset != valid_end or offset + length > data_size:
+                    break
+                valid_end = offset + length
+                valid_entries += 1
+            index_f.truncate(valid_entries * _INDEX_ENTRY.size)
+            index_f.seek(0, os.SEEK_END)
+
+            if valid_end == data_size:
+                return
+
+            # 인덱스에 기록되지 못한 꼬리 레코드를 다시 인덱싱하고, 줄바꿈으로 끝나지 않은 조각은 잘라냅니다.
+            with open(data_path, "r+b") as data_f:
+                data_f.seek(valid_end)
+                tail = data_f.read()
+                position = valid_end
+                recovered = 0
+                for line in tail.splitlines(keepends=True):
+                    if not line.endswith(b"\n"):
+                        break
+                    index_f.write(_INDEX_ENTRY.pack(position, len(line)))
+                    position += len(line)
+                    recovered += 1
+                data_f.truncate(position)
+        logger.warning(f"세그먼트 {seq} 복구 완료: 인덱스 재생성 {recovered}건, 잘린 바이트 {data_size - position}")
+
+    def _read_segment_start_time(self, seq: int) -> float:
+        record = self._read_record(seq, 0)
+        try:
+            return datetime.fromisoformat(record["saved_at"]).timestamp()
+        except (TypeError, KeyError, ValueError):
+            return os.path.getmtime(self._data_path(seq))
+
+    def _should_rotate(self, incoming_bytes: int) -> bool:
+        if self._data_file is None:
+            return True
+        if self._segment_records == 0:
+            return False
+        if self._segment_bytes + incoming_bytes > self.max_segment_bytes:
+            return True
+        if self.max_segment_age_seconds is not None:
+            return time.time() - self._segment_opened_at >= self.max_segment_age_seconds
+        return False
+
+    # --- 읽기/쓰기 ---
+
+    def append(self, record: Dict[str, Any]) -> StoredResultRef:
+        line = (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+        with self._lock:
+            if self._should_rotate(len(line)):
+                next_seq = self._segment_seq + 1
+                self._close_segment()
+                self._open_segment(next_seq)
+                logger.info(f"새 결과 세그먼트를 시작합니다: {self._data_path(next_seq)}")
+
+            offset = self._segment_bytes
+            self._data_file.write(line)
+            self._data_file.flush()
+            self._index_file.write(_INDEX_ENTRY.pack(offset, len(line)))
+            self._index_file.flush()
+            if self.fsync:
+                os.fsync(self._data_file.fileno())
+                os.fsync(self._index_file.fileno())
+
+            record_index = self._segment_records
+            self._segment_bytes += len(line)
+            self._segment_records += 1
+            return StoredResultRef(
+                record_id=f"{self._segment_seq:08d}-{record_index:010d}",
+                location=self._data_path(self._segment_seq),
+            )
+
+    def _read_record(self, seq: int, record_index: int) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._index_path(seq), "rb") as index_f:
+                index_f.seek(record_index * _INDEX_ENTRY.size)
+                entry = index_f.read(_INDEX_ENTRY.size)
+            if len(entry) != _INDEX_ENTRY.size:
+                return None
+            offset, length = _INDEX_ENTRY.unpack(entry)
+            with open(self._data_path(seq), "rb") as data_f:
+                data_f.seek(offset)
+                return json.loads(data_f.read(length))
+        except FileNotFoundError:
+            return None
+
+    def get(self, record_id: str) -> Optional[Dict[str, Any]]:
+        """레코드 ID로 레코드 하나를 읽어 반환합니다. 존재하지 않으면 `None`."""
+        try:
+            seq_str, index_str = record_id.split("-", 1)
+            seq, record_index = int(seq_str), int(index_str)
+        except ValueError:
+            return None
+        return self._read_record(seq, record_index)
+
+    def location_of(self, record_id: str) -> str:
+        """레코드 ID가 가리키는 세그먼트 파일 경로를 반환합니다."""
+        return self._data_path(int(record_id.split("-", 1)[0]))
+
+    def iter_records(self) -> Iterator[tuple[str, Dict[str, Any]]]:
+        """모든 세그먼트의 레코드를 기록된 순서대로 (레코드 ID, 레코드) 쌍으로 순회합니다."""
+        for seq in self.list_segments():
+            with open(self._data_path(seq), "rb") as data_f:
+                for record_index, line in enumerate(data_f):
+                    if not line.endswith(b"\n"):
+                        break
+                    yield f"{seq:08d}-{record_index:010d}", json.loads(line)
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_segment()
+
+
+_RESULT_STORE: ResultStore | None = None
+_RESULT_STORE_LOCK = threading.Lock()
+
+
+def create_result_store(store_config: Dict[str, Any]) -> ResultStore:
+    """
+    `result_store` 설정 딕셔너리로 백엔드 인스턴스를 생성합니다.
+    상대 경로로 지정된 디렉토리는 프로젝트 루트를 기준으로 해석합니다.
+    """
+    backend = store_config.get("backend", "segmented")
+    backend_config = store_config.get(backend) or {}
+    if backend == "markdown":
+        base_dir = os.path.join(PROJECT_ROOT, backend_config.get("base_dir", "data/result"))
+        return MarkdownResultStore(base_dir)
+    if backend == "segmented":
+        base_dir = os.path.join(PROJECT_ROOT, backend_config.get("base_dir", "data/result_segments"))
+        return SegmentedJsonlResultStore(
+            base_dir,
+            max_segment_bytes=int(backend_config.get("max_segment_bytes", 64 * 1024 * 1024)),
+            max_segment_age_seconds=backend_config.get("max_segment_age_seconds", 24 * 60 * 60),
+            fsync=bool(backend_config.get("fsync", False)),
+        )
+    raise ValueError(f"지원하지 않는 결과 저장소 백엔드입니다: '{backend}'")
+
+
+def get_result_store() -> ResultStore:
+    """서비스 설정(`result_store` 섹션)에 따라 생성된 프로세스 단위 결과 저장소를 반환합니다."""
+    global _RESULT_STORE
+    if _RESULT_STORE is None:
+        with _RESULT_STORE_LOCK:
+            if _RESULT_STORE is None:
+                _RESULT_STORE = create_result_store(get_service_config("result_store"))
+                logger.info(f"결과 저장소 초기화: {type(_RESULT_STORE).__name__}")
+    return _RESULT_STORE
+
+
+def set_result_store(store: ResultStore | None) -> ResultStore | None:
+    """
+    프로세스 단위 결과 저장소를 교체하고 이전 저장소를 반환합니다 (테스트 및 도구용, 끝나면 이전 값으로 되돌릴 수 있습니다).
+    `None`이면 다음 호출 시 설정으로 다시 생성합니다.
+    """
+    global _RESULT_STORE
+    with _RESULT_STORE_LOCK:
+        previous, _RESULT_STORE = _RESULT_STORE, store
+    return previous
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="세그먼트 결과 저장소의 레코드를 Markdown으로 내보냅니다.")
+    parser.add_argument("record_ids", nargs="*", help="내보낼 레코드 ID (생략 시 전체)")
+    parser.add_argument("--output-dir", default=os.path.join(PROJECT_ROOT, "data/result"))
+    args = parser.parse_args()
+
+    store = get_result_store()
+    if not isinstance(store, SegmentedJsonlResultStore):
+        parser.error("Markdown 내보내기는 segmented 백엔드에서만 지원됩니다.")
+
+    if args.record_ids:
+        records = [(record_id, store.get(record_id)) for record_id in args.record_ids]
+    else:
+        records = store.iter_records()
+    for record_id, record in records:
+        if record is None:
+            print(f"레코드를 찾을 수 없습니다: {record_id}")
+            continue
+        print(f"{record_id} -> {export_result_markdown(record, args.output_dir)}")
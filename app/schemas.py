@@ -1,4 +1,5 @@
 from pydantic import BaseModel, Field
+from datetime import datetime
 from typing import List, Literal, Optional
 
 class KeywordSentiment(BaseModel):
@@ -27,6 +28,14 @@ class ReviewAnalysisOutput(BaseModel):
 
 
 
+class TokenUsage(BaseModel):
+    """한 번의 분석에서 사용된 LLM 토큰 수와 가격표 기준 예상 비용"""
+    prompt_tokens: int = 0 # 캐시에서 읽은 토큰을 포함한 입력 토큰 수
+    completion_tokens: int = 0
+    cached_prompt_tokens: int = 0 # 제공자 프롬프트 캐시에서 읽은 입력 토큰 수
+    estimated_cost_usd: Optional[float] = None # 가격표에 모델이 없으면 None
+
+
 class ReviewInputs(BaseModel):
     """리뷰 분석 노드에 전달되는 초기 입력 데이터 구조"""
     review_text: str
@@ -39,13 +48,66 @@ class AgentState(BaseModel):
     # 초기 입력 및 설정
     review_inputs: Optional[ReviewInputs] = None
     selected_model_config_key: Optional[str] = None
+    deadline_at: Optional[float] = None # 요청 처리 기한 (epoch 초). None이면 기한 없음
 
     # analyze_review_node의 결과
     analysis_output: Optional[ReviewAnalysisOutput] = None
     model_key_used: Optional[str] = None # 설정 파일 내의 모델 config 키
     actual_model_name_used: Optional[str] = None # 실제 사용된 LLM 모델명 (예: "gemini-1.5-flash-latest")
+    prompt_version: Optional[str] = None # 사용된 프롬프트 파일 버전 (예: "v0.2")
+    token_usage: Optional[TokenUsage] = None
+    near_duplicate_similarity: Optional[float] = None # 근사 중복 리뷰의 분석 결과를 재사용한 경우 추정 유사도
     analysis_error_message: Optional[str] = None
 
     # save_result_node의 결과
-    saved_filepath: Optional[str] = None
-    save_error_message: Optional[str] = None 
\ No newline at end of file
+    saved_filepath: Optional[str] = None # 결과가 기록된 파일 경로 (세그먼트 파일 또는 Markdown 파일)
+    saved_record_id: Optional[str] = None # 결과 저장소 내 레코드 ID
+    save_error_message: Optional[str] = None 
+
+    # 서비스 계층의 구조화된 오류 코드 (예: "IDEMPOTENCY_KEY_CONFLICT")
+    error_code: Optional[str] = None
+    retry_after_seconds: Optional[int] = None # error_code가 "OVERLOADED"일 때 권장 재시도 대기 시간(초)
+
+class StoredAnalysisSummary(BaseModel):
+    """결과 인덱스에서 조회된 저장 분석 결과의 요약 정보"""
+    record_id: str
+    location: Optional[str] = None
+    saved_at: datetime
+    model_key_used: Optional[str] = None
+    actual_model_name_used: Optional[str] = None
+    overall_sentiment: Optional[Literal["NEGATIVE", "NEUTRAL", "POSITIVE"]] = None
+    score: Optional[float] = None
+    is_question_review: Optional[bool] = None
+    rating: Optional[float] = None
+    ordered_items: List[str] = Field(default_factory=list)
+    summary: Optional[str] = None
+    analysis_error_message: Optional[str] = None
+
+
+class UsageAggregate(BaseModel):
+    """모델 설정 키와 프롬프트 버전별 토큰 사용량 및 예상 비용 집계"""
+    model_key_used: Optional[str] = None
+    actual_model_name_used: Optional[str] = None
+    prompt_version: Optional[str] = None
+    analyses: int # 집계 기간 내 저장된 분석 수
+    prompt_tokens: int
+    completion_tokens: int
+    cached_prompt_tokens: int
+    estimated_cost_usd: Optional[float] = None
+    avg_prompt_tokens: Optional[float] = None
+    avg_completion_tokens: Optional[float] = None
+    avg_cost_per_review_usd: Optional[float] = None # 비용이 계산된 분석 기준 평균
+
+
+class UsageSummary(BaseModel):
+    """기간별 토큰 사용량 및 예상 비용 집계 응답"""
+    saved_from: datetime
+    saved_to: datetime
+    groups: List[UsageAggregate]
+
+
+class StoredAnalysisPage(BaseModel):
+    """저장 분석 결과 목록 조회의 페이지 단위 응답"""
+    items: List[StoredAnalysisSummary]
+    next_cursor: Optional[str] = None # 다음 페이지 조회 시 전달할 커서 (마지막 페이지면 None)
+    error_message: Optional[str] = None # 조회 조건이 잘못된 경우(예: 유효하지 않은 커서)의 오류 메시지
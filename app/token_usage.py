@@ -0,0 +1,57 @@
+import os
+from typing import Any, Dict, Optional
+
+from app.config_loader import get_model_pricing
+from app.schemas import TokenUsage
+
+TOKENS_PER_PRICE_UNIT = 1_000_000 # 가격표 단위: USD / 100만 토큰
+
+
+def get_prompt_version(prompt_path: Optional[str]) -> Optional[str]:
+    """프롬프트 파일 경로에서 버전 이름을 추출합니다 (예: models/review_analysis_prompt/v0.2.md → v0.2)."""
+    if not prompt_path:
+        return None
+    return os.path.splitext(os.path.basename(prompt_path))[0]
+
+
+def estimate_cost_usd(
+    prompt_tokens: int,
+    completion_tokens: int,
+    cached_prompt_tokens: int,
+    pricing: Optional[Dict[str, Any]],
+) -> Optional[float]:
+    """
+    가격표(`input`, `cached_input`, `output`: USD / 100만 토큰)로 예상 비용을 계산합니다.
+    캐시에서 읽은 입력 토큰은 `cached_input` 가격(없으면 `input` 가격)을 적용합니다. 가격표가 없으면 `None`.
+    """
+    if not pricing:
+        return None
+    input_price = float(pricing.get("input", 0.0))
+    cached_input_price = float(pricing.get("cached_input", input_price))
+    output_price = float(pricing.get("output", 0.0))
+    uncached_prompt_tokens = max(prompt_tokens - cached_prompt_tokens, 0)
+    cost = (
+        uncached_prompt_tokens * input_price
+        + cached_prompt_tokens * cached_input_price
+        + completion_tokens * output_price
+    ) / TOKENS_PER_PRICE_UNIT
+    return round(cost, 10)
+
+
+def build_token_usage(
+    prompt_tokens: int,
+    completion_tokens: int,
+    cached_prompt_tokens: int,
+    model_name: Optional[str],
+) -> Optional[TokenUsage]:
+    """수집된 토큰 수로 `TokenUsage`를 만듭니다. 제공자가 사용량을 보고하지 않았으면 `None`."""
+    if not (prompt_tokens or completion_tokens):
+        return None
+    return TokenUsage(
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        cached_prompt_tokens=cached_prompt_tokens,
+        estimated_cost_usd=estimate_cost_usd(
+            prompt_tokens, completion_tokens, cached_prompt_tokens, get_model_pricing(model_name)
+        ),
+    )
@@ -0,0 +1,164 @@
+import functools
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional, Sequence
+
+from app.config_loader import get_service_config
+
+try:
+    from opentelemetry import propagate, trace
+    from opentelemetry.context import Context
+    from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+    from opentelemetry.sdk.trace.export import (
+        ConsoleSpanExporter,
+        SimpleSpanProcessor,
+        SpanExporter,
+        SpanExportResult,
+    )
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+    OTEL_AVAILABLE = True
+except ImportError: # OpenTelemetry는 선택 의존성입니다. 없으면 모든 추적 함수가 아무 일도 하지 않습니다.
+    OTEL_AVAILABLE = False
+
+# 이 모듈을 위한 로깅 설정
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+TRACER_NAME = "review_analysis"
+
+_tracer_provider: Optional["TracerProvider"] = None
+_span_exporter: Optional["SpanExporter"] = None
+_configured = False
+_configure_lock = threading.Lock()
+
+
+if OTEL_AVAILABLE:
+
+    class JsonLinesSpanExporter(SpanExporter):
+        """종료된 스팬을 한 줄에 하나씩 JSON으로 파일에 기록하는 익스포터 (오프라인 분석/테스트용)"""
+
+        def __init__(self, file_path: str):
+            self.file_path = file_path
+            self._lock = threading.Lock()
+            os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+
+        def export(self, spans: Sequence[ReadableSpan]) -> "SpanExportResult":
+            lines = [json.dumps(json.loads(span.to_json()), ensure_ascii=False) for span in spans]
+            with self._lock, open(self.file_path, "a", encoding="utf-8") as f:
+                f.write("".join(line + "\n" for line in lines))
+            return SpanExportResult.SUCCESS
+
+        def shutdown(self) -> None:
+            pass
+
+
+def configure_tracing(exporter: Optional[str] = None, file_path: Optional[str] = None) -> Optional["SpanExporter"]:
+    """
+    추적 익스포터를 설정하고 생성된 익스포터를 반환합니다.
+
+    - `none`(기본값): 전역 TracerProvider를 그대로 사용합니다. BentoML로 서빙할 때는 BentoML의 tracing 설정을 따릅니다.
+    - `memory`: 메모리에 스팬을 보관합니다 (테스트용, `get_finished_spans()`로 조회).
+    - `file`: `file_path`의 JSONL 파일에 스팬을 기록합니다.
+    - `console`: 표준 출력에 스팬을 출력합니다.
+    인자를 생략하면 `config/service_configurations.yaml`의 `tracing` 섹션을 사용합니다.
+    """
+    global _tracer_provider, _span_exporter, _configured
+    tracing_config = get_service_config("tracing")
+    exporter = exporter or tracing_config.get("exporter", "none")
+
+    with _configure_lock:
+        _configured = True
+        _tracer_provider = None
+        _span_exporter = None
+        if not OTEL_AVAILABLE or exporter == "none":
+            return None
+
+        if exporter == "memory":
+            _span_exporter = InMemorySpanExporter()
+        elif exporter == "file":
+            file_path = file_path or os.path.join(PROJECT_ROOT, tracing_config.get("file_path", "data/traces/spans.jsonl"))
+            _span_exporter = JsonLinesSpanExporter(file_path)
+        elif exporter == "console":
+            _span_exporter = ConsoleSpanExporter()
+        else:
+            raise ValueError(f"지원하지 않는 추적 익스포터입니다: '{exporter}'")
+
+        _tracer_provider = TracerProvider()
+        _tracer_provider.add_span_processor(SimpleSpanProcessor(_span_exporter))
+        logger.info(f"추적 익스포터 설정됨: {exporter}")
+        return _span_exporter
+
+
+def tracing_enabled() -> bool:
+    return OTEL_AVAILABLE and bool(get_service_config("tracing").get("enabled", True))
+
+
+def _get_tracer():
+    if not _configured:
+        configure_tracing()
+    if _tracer_provider is not None:
+        return _tracer_provider.get_tracer(TRACER_NAME)
+    return trace.get_tracer(TRACER_NAME)
+
+
+def extract_context(headers: Optional[Mapping[str, str]]) -> Optional["Context"]:
+    """
+    HTTP 요청 헤더(traceparent 등)에서 추적 컨텍스트를 추출합니다.
+    이미 활성화된 스팬(예: BentoML의 HTTP 서버 스팬)이 있으면 그 스팬을 부모로 쓰도록 `None`을 반환합니다.
+    """
+    if not OTEL_AVAILABLE or headers is None:
+        return None
+    if trace.get_current_span().get_span_context().is_valid:
+        return None
+    return propagate.extract({key.lower(): value for key, value in headers.items()})
+
+
+@contextmanager
+def start_span(name: str, attributes: Optional[Dict[str, Any]] = None, context: Optional["Context"] = None) -> Iterator[Any]:
+    """
+    `name` 스팬을 현재 컨텍스트(또는 `context`)의 자식으로 시작합니다.
+    추적이 비활성화되었거나 OpenTelemetry가 없으면 아무 일도 하지 않고 `None`을 반환합니다.
+    블록 안에서 발생한 예외는 스팬에 기록됩니다.
+    """
+    if not tracing_enabled():
+        yield None
+        return
+    with _get_tracer().start_as_current_span(
+        name,
+        context=context,
+        attributes={key: value for key, value in (attributes or {}).items() if value is not None},
+    ) as span:
+        yield span
+
+
+def set_span_attributes(span: Any, **attributes: Any) -> None:
+    """`start_span`이 반환한 스팬에 값이 있는 속성만 설정합니다. 스팬이 `None`이면 무시합니다."""
+    if span is None:
+        return
+    for key, value in attributes.items():
+        if value is not None:
+            span.set_attribute(key, value)
+
+
+def trace_node(node_name: str, node_function: Callable[..., Any]) -> Callable[..., Any]:
+    """LangGraph 노드 함수를 `graph.<node_name>` 스팬으로 감쌉니다."""
+
+    @functools.wraps(node_function)
+    def _traced(*args: Any, **kwargs: Any) -> Any:
+        with start_span(f"graph.{node_name}", {"langgraph.node": node_name}) as span:
+            result = node_function(*args, **kwargs)
+            if isinstance(result, dict):
+                set_span_attributes(span, error_code=result.get("error_code"))
+            return result
+
+    return _traced
+
+
+def get_finished_spans() -> list:
+    """`memory` 익스포터로 수집된 종료 스팬 목록을 반환합니다 (테스트용)."""
+    if OTEL_AVAILABLE and isinstance(_span_exporter, InMemorySpanExporter):
+        return list(_span_exporter.get_finished_spans())
+    return []
@@ -0,0 +1,95 @@
+import importlib
+import logging
+import os
+import time
+from typing import Dict, Optional
+
+from app.analyze_review_node import analyze_review_for_graph
+from app.config_loader import get_model_config, load_model_configurations
+from app.deadline import compute_deadline
+from app.schemas import AgentState, ReviewInputs
+from models.prompt_loader import load_prompt_template
+
+# 이 모듈을 위한 로깅 설정
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# 워밍업 요청에 사용하는 고정 리뷰. 결과는 저장하지 않습니다.
+WARMUP_REVIEW = ReviewInputs(review_text="음식이 맛있고 배달이 빨랐어요.", rating=5.0, ordered_items=["워밍업 메뉴"])
+
+
+def preload_prompts() -> int:
+    """모델 설정에 등록된 모든 프롬프트 파일을 캐시에 미리 읽어 둡니다. 읽은 파일 수를 반환합니다."""
+    model_configurations = load_model_configurations().get("model_configurations", {})
+    prompt_paths = {config.get("prompt_path") for config in model_configurations.values() if config.get("prompt_path")}
+    loaded = 0
+    for prompt_path in sorted(prompt_paths):
+        try:
+            load_prompt_template(os.path.join(PROJECT_ROOT, prompt_path))
+            loaded += 1
+        except FileNotFoundError:
+            logger.warning(f"워밍업 중 프롬프트 파일을 찾을 수 없습니다: {prompt_path}")
+    return loaded
+
+
+def warm_up_client(model_config_key: Optional[str]) -> Optional[str]:
+    """
+    모델 설정의 클라이언트 모듈을 임포트하고, 모듈에 `warm_up()`이 있으면 호출합니다
+    (제공자 SDK 임포트, .env 로드, format instructions 생성). 워밍업한 모듈 이름을 반환합니다.
+    """
+    model_config = get_model_config(config_key=model_config_key)
+    if not model_config or not model_config.get("client_module"):
+        logger.warning(f"워밍업할 모델 설정을 찾을 수 없습니다 (키: '{model_config_key}').")
+        return None
+    client_module = importlib.import_module(model_config["client_module"])
+    client_warm_up = getattr(client_module, "warm_up", None)
+    if callable(client_warm_up):
+        client_warm_up()
+    return model_config["client_module"]
+
+
+def send_warmup_request(model_config_key: Optional[str], timeout_seconds: Optional[float] = None) -> bool:
+    """
+    고정 리뷰로 분석 노드를 한 번 실행하여 HTTP 연결과 제공자 클라이언트를 미리 준비합니다 (결과는 저장하지 않음).
+    실패해도 서비스 시작을 막지 않고 경고만 남기며, 성공 여부를 반환합니다.
+    """
+    state = AgentState(
+        review_inputs=WARMUP_REVIEW,
+        selected_model_config_key=model_config_key,
+        deadline_at=compute_deadline(timeout_seconds),
+    )
+    result_dict = analyze_review_for_graph(state)
+    if result_dict.get("analysis_output") is None:
+        logger.warning(f"워밍업 요청이 실패했습니다: {result_dict.get('analysis_error_message')}")
+        return False
+    return True
+
+
+def warm_up_service(model_config_key: Optional[str], warmup_config: Dict) -> Dict[str, float]:
+    """
+    서비스 레플리카가 준비 완료를 알리기 전에 수행할 워밍업 단계를 실행하고, 단계별 소요 시간(초)을 반환합니다.
+
+    `warmup_config` (service_configurations.yaml의 `warmup` 섹션):
+        preload_prompts: 프롬프트 파일을 미리 읽을지 여부 (기본값 True)
+        warm_up_client: 제공자 클라이언트 모듈을 미리 로드할지 여부 (기본값 True)
+        warmup_request: 고정 리뷰로 실제 분석을 한 번 실행할지 여부 (기본값 False, 제공자 호출 비용 발생)
+        warmup_request_timeout_seconds: 워밍업 요청의 처리 기한
+    """
+    timings: Dict[str, float] = {}
+
+    def _timed(stage: str, fn, *args):
+        started = time.perf_counter()
+        result = fn(*args)
+        timings[stage] = time.perf_counter() - started
+        return result
+
+    if warmup_config.get("preload_prompts", True):
+        _timed("preload_prompts", preload_prompts)
+    if warmup_config.get("warm_up_client", True):
+        _timed("warm_up_client", warm_up_client, model_config_key)
+    if warmup_config.get("warmup_request", False):
+        _timed("warmup_request", send_warmup_request, model_config_key, warmup_config.get("warmup_request_timeout_seconds", 30))
+
+    logger.info("서비스 워밍업 완료: " + ", ".join(f"{stage}={seconds:.3f}s" for stage, seconds in timings.items()))
+    return timings
@@ -0,0 +1,118 @@
+# 로컬 키워드 사전 추출 처리량 벤치마크
+#
+# 키워드 사전(models/keyword_lexicon/<버전>.yaml)을 Aho-Corasick 오토마톤으로 컴파일하는 시간과, 리뷰 길이별
+# 리뷰 1건당 추출 시간(µs)과 초당 처리 리뷰 수를 측정합니다. 비교 기준으로 표기마다 `in`으로 본문을 훑는 단순 탐색의
+# 시간을 함께 기록하며, lean 모드에서 모델 대신 생성하게 되는 keywords 필드의 출력 토큰 수도 추정합니다.
+#
+#   python -m benchmarks.keyword_extraction --sample-size 200 --lengths 1,4,16
+
+import argparse
+import json
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Sequence
+
+from app.keyword_extractor import DEFAULT_LEXICON_PATH, KeywordLexicon, load_keyword_lexicon, normalize_text
+from benchmarks.prompt_ab import get_tokenizer, load_sample
+
+
+def naive_scanner(lexicon: KeywordLexicon) -> Callable[[str], int]:
+    """표기마다 본문 전체를 `in`으로 검사하는 단순 탐색 (비교 기준). 일치한 표기 수를 반환합니다."""
+    variants = list(lexicon.variants)
+
+    def _scan(text: str) -> int:
+        normalized = normalize_text(text)
+        return sum(1 for variant in variants if variant in normalized)
+
+    return _scan
+
+
+def measure_per_review(function: Callable[[str], Any], texts: Sequence[str], rounds: int) -> Dict[str, float]:
+    """라운드마다 모든 텍스트를 처리한 시간을 리뷰 수로 나눈 값의 중앙값과 최솟값"""
+    per_review = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for text in texts:
+            function(text)
+        per_review.append((time.perf_counter() - started) / len(texts))
+    median = statistics.median(per_review)
+    return {
+        "median_us": round(median * 1e6, 2),
+        "min_us": round(min(per_review) * 1e6, 2),
+        "reviews_per_second": round(1 / median) if median else None,
+    }
+
+
+def run(lexicon_path: str, sample_size: int, lengths: List[int], rounds: int = 5, tokenizer_name: str = "auto") -> Dict[str, Any]:
+    started = time.perf_counter()
+    lexicon = load_keyword_lexicon(lexicon_path)
+    compile_ms = (time.perf_counter() - started) * 1e3
+
+    reviews, _ = load_sample(None, sample_size)
+    base_texts = [review.review_inputs.review_text for review in reviews]
+    tokenizer = get_tokenizer(tokenizer_name)
+    candidates = [lexicon.extract(text) for text in base_texts]
+    keyword_tokens = [
+        tokenizer.count(json.dumps([candidate.model_dump() for candidate in found], ensure_ascii=False)) for found in candidates
+    ]
+
+    naive = naive_scanner(lexicon)
+    results = []
+    for length in lengths:
+        # 짧은 합성 리뷰를 이어 붙여 긴 리뷰를 흉내 냅니다.
+        texts = [" ".join([text] * length) for text in base_texts]
+        results.append({
+            "length_multiplier": length,
+            "chars_mean": round(statistics.mean(len(text) for text in texts), 1),
+            "aho_corasick": measure_per_review(lexicon.extract, texts, rounds),
+            "naive_scan": measure_per_review(naive, texts, rounds),
+        })
+    return {
+        "lexicon_path": lexicon_path,
+        "lexicon_version": lexicon.version,
+        "keywords": len(lexicon.entries),
+        "patterns": lexicon.pattern_count,
+        "automaton_nodes": lexicon.node_count,
+        "compile_ms": round(compile_ms, 2),
+        "sample_size": len(base_texts),
+        "candidates_mean": round(statistics.mean(len(found) for found in candidates), 2),
+        "reviews_with_candidates": round(sum(1 for found in candidates if found) / len(candidates), 3),
+        "tokenizer": tokenizer.name,
+        "keywords_output_tokens_mean": round(statistics.mean(keyword_tokens), 1),
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput of local Aho-Corasick keyword extraction")
+    parser.add_argument("--lexicon", type=str, default=DEFAULT_LEXICON_PATH)
+    parser.add_argument("--sample-size", type=int, default=200)
+    parser.add_argument("--lengths", type=str, default="1,4,16", help="Review length multipliers (synthetic reviews repeated N times)")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--tokenizer", type=str, default="auto", help="tiktoken encoding name, 'auto' or 'estimate'")
+    parser.add_argument("--output", type=str, default=None, help="Write results JSON to this path")
+    args = parser.parse_args()
+
+    report = run(args.lexicon, args.sample_size, [int(length) for length in args.lengths.split(",")], args.rounds, args.tokenizer)
+    print(
+        f"lexicon {report['lexicon_version']}: {report['keywords']} keywords, {report['patterns']} patterns, "
+        f"{report['automaton_nodes']} nodes, compiled in {report['compile_ms']:.2f} ms"
+    )
+    print(
+        f"candidates/review {report['candidates_mean']}, reviews with candidates {report['reviews_with_candidates']:.0%}, "
+        f"keywords output tokens/review {report['keywords_output_tokens_mean']} ({report['tokenizer']})"
+    )
+    print(f"{'length':>7} {'chars':>8} {'aho(us)':>10} {'reviews/s':>11} {'naive(us)':>11} {'speedup':>8}")
+    for result in report["results"]:
+        aho, naive = result["aho_corasick"], result["naive_scan"]
+        print(
+            f"{result['length_multiplier']:>6}x {result['chars_mean']:>8.1f} {aho['median_us']:>10.1f} "
+            f"{aho['reviews_per_second']:>11} {naive['median_us']:>11.1f} {naive['median_us'] / aho['median_us']:>7.1f}x"
+        )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,396 @@
+# 리뷰 분석 서비스 오프라인 부하 테스트
+#
+# 결정적 가짜 LLM 제공자(fake_deterministic)로 ReviewAnalysisService를 로컬에서 띄우고,
+# asyncio 개방형(open-loop) 부하 생성기로 지정한 도착률의 요청을 보내 처리량, 지연 시간 분위수,
+# 오류율, 서비스 프로세스의 CPU/RSS를 측정합니다. 결과는 커밋 간 비교를 위해 JSON으로 저장합니다.
+#
+#   python -m benchmarks.load_test --rates 5,10,20 --duration 20 --endpoints single,batch,stream
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import httpx
+import numpy as np
+import psutil
+import yaml
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_OUTPUT_DIR = os.path.join(PROJECT_ROOT, "benchmarks", "results")
+
+ENDPOINT_PATHS = {
+    "single": "/analyze_review",
+    "batch": "/analyze_reviews_batch",
+    "stream": "/analyze_reviews_stream",
+}
+
+_REVIEW_TEMPLATES = [
+    ("음식이 정말 맛있어요! 특히 {item}는 인생 최고였습니다.", 5.0),
+    ("{item} 양이 적고 식어서 왔어요. 다시는 안 시킬 것 같아요.", 1.0),
+    ("{item}는 무난했는데 배달이 조금 늦었네요.", 3.0),
+    ("{item} 맵기 조절 가능한가요? 아이가 먹을 거라서요.", 4.0),
+    ("포장이 깔끔하고 {item}도 바삭해서 좋았어요.", 4.5),
+]
+_MENU_ITEMS = ["크림 파스타", "마르게리따 피자", "양념치킨", "김치찌개", "떡볶이", "콜라"]
+
+
+def make_review(index: int) -> Dict[str, Any]:
+    """부하 테스트용 합성 리뷰. 같은 순번에는 항상 같은 리뷰를 만듭니다."""
+    template, rating = _REVIEW_TEMPLATES[index % len(_REVIEW_TEMPLATES)]
+    items = [_MENU_ITEMS[(index + offset) % len(_MENU_ITEMS)] for offset in range(1 + index % 3)]
+    return {"review_text": f"{template.format(item=items[0])} (#{index})", "rating": rating, "ordered_items": items}
+
+
+@dataclass
+class RequestSample:
+    """요청 한 건의 측정값"""
+    started_at: float
+    latency_seconds: float
+    reviews: int
+    errors: int # 실패한 리뷰 수 (HTTP 오류면 요청의 리뷰 전체)
+    status_code: Optional[int] = None
+    first_result_seconds: Optional[float] = None # 스트리밍 첫 결과까지의 시간
+
+
+@dataclass
+class ResourceSamples:
+    cpu_percent: List[float] = field(default_factory=list)
+    rss_bytes: List[int] = field(default_factory=list)
+
+
+def percentiles_ms(values: List[float]) -> Dict[str, Optional[float]]:
+    """초 단위 값 목록의 p50/p95/p99/최대/평균을 밀리초로 반환합니다."""
+    if not values:
+        return {"p50": None, "p95": None, "p99": None, "max": None, "mean": None}
+    array = np.asarray(values, dtype=float) * 1000.0
+    p50, p95, p99 = np.percentile(array, [50, 95, 99])
+    return {
+        "p50": round(float(p50), 3),
+        "p95": round(float(p95), 3),
+        "p99": round(float(p99), 3),
+        "max": round(float(array.max()), 3),
+        "mean": round(float(array.mean()), 3),
+    }
+
+
+def summarize_run(
+    endpoint: str,
+    offered_rate: float,
+    duration_seconds: float,
+    elapsed_seconds: float,
+    samples: List[RequestSample],
+    resources: ResourceSamples,
+) -> Dict[str, Any]:
+    """한 번의 (엔드포인트, 도착률) 실행 측정값을 요약합니다."""
+    total_reviews = sum(sample.reviews for sample in samples)
+    failed_reviews = sum(sample.errors for sample in samples)
+    failed_requests = sum(1 for sample in samples if sample.errors)
+    first_results = [sample.first_result_seconds for sample in samples if sample.first_result_seconds is not None]
+    return {
+        "endpoint": endpoint,
+        "offered_rate_rps": offered_rate,
+        "duration_seconds": duration_seconds,
+        "elapsed_seconds": round(elapsed_seconds, 3),
+        "requests": len(samples),
+        "reviews": total_reviews,
+        "failed_requests": failed_requests,
+        "failed_reviews": failed_reviews,
+        "error_rate": round(failed_reviews / total_reviews, 6) if total_reviews else None,
+        "throughput_rps": round(len(samples) / elapsed_seconds, 3) if elapsed_seconds else None,
+        "reviews_per_second": round((total_reviews - failed_reviews) / elapsed_seconds, 3) if elapsed_seconds else None,
+        "latency_ms": percentiles_ms([sample.latency_seconds for sample in samples]),
+        "first_result_latency_ms": percentiles_ms(first_results) if first_results else None,
+        "status_codes": {
+            str(code): sum(1 for sample in samples if sample.status_code == code)
+            for code in sorted({sample.status_code for sample in samples}, key=str)
+        },
+        "cpu_percent": {
+            "mean": round(float(np.mean(resources.cpu_percent)), 2) if resources.cpu_percent else None,
+            "max": round(float(np.max(resources.cpu_percent)), 2) if resources.cpu_percent else None,
+        },
+        "rss_mb": {
+            "mean": round(float(np.mean(resources.rss_bytes)) / 2**20, 2) if resources.rss_bytes else None,
+            "max": round(float(np.max(resources.rss_bytes)) / 2**20, 2) if resources.rss_bytes else None,
+        },
+    }
+
+
+def _count_item_errors(results: List[Dict[str, Any]]) -> int:
+    return sum(1 for result in results if result.get("error_code") or result.get("analysis_error_message"))
+
+
+async def send_request(client: httpx.AsyncClient, endpoint: str, request_index: int, batch_size: int) -> RequestSample:
+    """엔드포인트 종류에 맞는 요청 한 건을 보내고 측정값을 반환합니다."""
+    started_at = time.perf_counter()
+    if endpoint == "single":
+        payload = {**make_review(request_index), "priority": "interactive"}
+        reviews = 1
+    else:
+        payload = {"reviews": [make_review(request_index * batch_size + offset) for offset in range(batch_size)]}
+        reviews = batch_size
+
+    try:
+        if endpoint == "stream":
+            first_result_seconds = None
+            results = []
+            async with client.stream("POST", ENDPOINT_PATHS[endpoint], json=payload) as response:
+                async for line in response.aiter_lines():
+                    if not line.strip():
+                        continue
+                    if first_result_seconds is None:
+                        first_result_seconds = time.perf_counter() - started_at
+                    results.append(json.loads(line)["result"])
+            latency = time.perf_counter() - started_at
+            errors = reviews if response.status_code != 200 else _count_item_errors(results) + (reviews - len(results))
+            return RequestSample(started_at, latency, reviews, errors, response.status_code, first_result_seconds)
+
+        response = await client.post(ENDPOINT_PATHS[endpoint], json=payload)
+        latency = time.perf_counter() - started_at
+        if response.status_code != 200:
+            return RequestSample(started_at, latency, reviews, reviews, response.status_code)
+        body = response.json()
+        results = body if isinstance(body, list) else [body]
+        return RequestSample(started_at, latency, reviews, _count_item_errors(results), response.status_code)
+    except httpx.HTTPError:
+        return RequestSample(started_at, time.perf_counter() - started_at, reviews, reviews, None)
+
+
+async def sample_resources(pid: int, interval_seconds: float, samples: ResourceSamples, stop: asyncio.Event) -> None:
+    """서비스 프로세스(자식 프로세스 포함)의 CPU 사용률과 RSS를 주기적으로 수집합니다."""
+    root = psutil.Process(pid)
+    tracked: Dict[int, psutil.Process] = {}
+    while not stop.is_set():
+        try:
+            processes = [root, *root.children(recursive=True)]
+        except psutil.NoSuchProcess:
+            return
+        cpu_total = 0.0
+        rss_total = 0
+        for process in processes:
+            # cpu_percent는 같은 Process 객체의 이전 호출 이후 구간을 측정하므로 객체를 재사용합니다.
+            process = tracked.setdefault(process.pid, process)
+            try:
+                cpu_total += process.cpu_percent(interval=None)
+                rss_total += process.memory_info().rss
+            except psutil.NoSuchProcess:
+                tracked.pop(process.pid, None)
+        samples.cpu_percent.append(cpu_total)
+        samples.rss_bytes.append(rss_total)
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval_seconds)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_open_loop(
+    base_url: str,
+    endpoint: str,
+    rate: float,
+    duration_seconds: float,
+    batch_size: int,
+    arrival: str,
+    seed: int,
+    service_pid: Optional[int],
+    request_timeout_seconds: float,
+) -> Dict[str, Any]:
+    """
+    `rate`(요청/초)의 개방형 부하를 `duration_seconds` 동안 보냅니다.
+    응답을 기다리지 않고 도착 시각에 맞춰 요청을 시작하므로, 서비스가 포화되면 대기 시간이 그대로 지연에 반영됩니다.
+    """
+    rng = random.Random(seed)
+    samples: List[RequestSample] = []
+    resources = ResourceSamples()
+    stop = asyncio.Event()
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=256)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=request_timeout_seconds, limits=limits) as client:
+        sampler = asyncio.create_task(sample_resources(service_pid, 0.5, resources, stop)) if service_pid else None
+        tasks = []
+        started = time.perf_counter()
+        next_arrival = 0.0
+        request_index = 0
+        while next_arrival < duration_seconds:
+            delay = started + next_arrival - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(send_request(client, endpoint, request_index, batch_size)))
+            request_index += 1
+            # 일정 간격은 누적 오차가 없도록 순번으로 계산합니다.
+            next_arrival = next_arrival + rng.expovariate(rate) if arrival == "poisson" else request_index / rate
+
+        for result in await asyncio.gather(*tasks):
+            samples.append(result)
+        elapsed = time.perf_counter() - started
+        stop.set()
+        if sampler is not None:
+            await sampler
+
+    return summarize_run(endpoint, rate, duration_seconds, elapsed, samples, resources)
+
+
+def write_service_config(work_dir: str, keep_rate_limit: bool) -> str:
+    """기본 서비스 설정을 바탕으로, 가짜 제공자와 임시 저장 경로를 사용하는 부하 테스트용 설정 파일을 만듭니다."""
+    with open(os.path.join(PROJECT_ROOT, "config", "service_configurations.yaml"), "r", encoding="utf-8") as f:
+        service_config = yaml.safe_load(f)
+
+    service_config.setdefault("analysis", {})["model_config_key"] = "fake_deterministic"
+    store_config = service_config.setdefault("result_store", {})
+    store_config.setdefault("segmented", {})["base_dir"] = os.path.join(work_dir, "result_segments")
+    store_config.setdefault("markdown", {})["base_dir"] = os.path.join(work_dir, "result")
+    service_config.setdefault("result_index", {})["path"] = os.path.join(work_dir, "result_index.sqlite3")
+    service_config.setdefault("idempotency", {})["path"] = os.path.join(work_dir, "idempotency.sqlite3")
+    service_config.setdefault("tracing", {})["exporter"] = "none"
+    if not keep_rate_limit:
+        # 가짜 제공자에는 호출 한도가 없으므로, 서비스 자체의 처리 한계를 보기 위해 호출 예산을 해제합니다.
+        service_config.setdefault("admission", {}).pop("provider_rate_limit", None)
+
+    config_path = os.path.join(work_dir, "service_configurations.yaml")
+    with open(config_path, "w", encoding="utf-8") as f:
+        yaml.safe_dump(service_config, f, allow_unicode=True, sort_keys=False)
+    return config_path
+
+
+def start_service(port: int, service_config_path: str, fake_latency_seconds: float, log_path: str) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "REVIEW_ANALYSIS_SERVICE_CONFIG": service_config_path,
+        "FAKE_LLM_LATENCY_SECONDS": str(fake_latency_seconds),
+    }
+    log_file = open(log_path, "w", encoding="utf-8")
+    return subprocess.Popen(
+        [sys.executable, "-m", "bentoml", "serve", "bentos.service:ReviewAnalysisService", "--port", str(port)],
+        cwd=PROJECT_ROOT,
+        env=env,
+        stdout=log_file,
+        stderr=subprocess.STDOUT,
+    )
+
+
+def wait_until_ready(base_url: str, process: subprocess.Popen, timeout_seconds: float = 90.0) -> None:
+    deadline = time.monotonic() + timeout_seconds
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"서비스 프로세스가 종료되었습니다 (exit code {process.returncode}).")
+        try:
+            if httpx.get(f"{base_url}/readyz", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise TimeoutError(f"{timeout_seconds}초 안에 서비스가 준비되지 않았습니다.")
+
+
+def stop_service(process: subprocess.Popen) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def get_git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=PROJECT_ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline load test for ReviewAnalysisService with a deterministic fake LLM")
+    parser.add_argument("--rates", type=str, default="2,5,10", help="Comma separated arrival rates (requests/second)")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds of load per (endpoint, rate)")
+    parser.add_argument("--endpoints", type=str, default="single,batch,stream", help="Comma separated: single,batch,stream")
+    parser.add_argument("--batch-size", type=int, default=8, help="Reviews per batch/stream request")
+    parser.add_argument("--arrival", choices=["poisson", "constant"], default="poisson")
+    parser.add_argument("--fake-latency", type=float, default=0.3, help="Fake provider latency in seconds")
+    parser.add_argument("--request-timeout", type=float, default=120.0)
+    parser.add_argument("--port", type=int, default=3300)
+    parser.add_argument("--base-url", type=str, default=None, help="Use an already running service instead of starting one")
+    parser.add_argument("--keep-rate-limit", action="store_true", help="Keep admission.provider_rate_limit from the service config")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=str, default=None, help="Result JSON path (default: benchmarks/results/load_test_<timestamp>.json)")
+    args = parser.parse_args()
+
+    rates = [float(rate) for rate in args.rates.split(",") if rate.strip()]
+    endpoints = [endpoint.strip() for endpoint in args.endpoints.split(",") if endpoint.strip()]
+    unknown = set(endpoints) - set(ENDPOINT_PATHS)
+    if unknown:
+        parser.error(f"Unknown endpoints: {sorted(unknown)}")
+
+    with tempfile.TemporaryDirectory(prefix="review_load_test_") as work_dir:
+        process = None
+        base_url = args.base_url
+        if base_url is None:
+            base_url = f"http://127.0.0.1:{args.port}"
+            service_log = os.path.join(work_dir, "service.log")
+            process = start_service(args.port, write_service_config(work_dir, args.keep_rate_limit), args.fake_latency, service_log)
+            print(f"Starting service on {base_url} (fake latency {args.fake_latency}s)...")
+            try:
+                wait_until_ready(base_url, process)
+            except Exception:
+                stop_service(process)
+                with open(service_log, "r", encoding="utf-8") as f:
+                    print(f.read()[-4000:])
+                raise
+
+        results = []
+        try:
+            for endpoint in endpoints:
+                for rate in rates:
+                    print(f"Running {endpoint} at {rate} req/s for {args.duration}s...")
+                    summary = asyncio.run(
+                        run_open_loop(
+                            base_url,
+                            endpoint,
+                            rate,
+                            args.duration,
+                            args.batch_size,
+                            args.arrival,
+                            args.seed,
+                            process.pid if process else None,
+                            args.request_timeout,
+                        )
+                    )
+                    results.append(summary)
+                    latency = summary["latency_ms"]
+                    print(
+                        f"  throughput {summary['throughput_rps']} req/s ({summary['reviews_per_second']} reviews/s) | "
+                        f"p50 {latency['p50']}ms p95 {latency['p95']}ms p99 {latency['p99']}ms | "
+                        f"error rate {summary['error_rate']} | CPU max {summary['cpu_percent']['max']}% | "
+                        f"RSS max {summary['rss_mb']['max']}MB"
+                    )
+        finally:
+            if process is not None:
+                stop_service(process)
+
+    report = {
+        "meta": {
+            "git_commit": get_git_commit(),
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "args": vars(args),
+        },
+        "results": results,
+    }
+    output_path = args.output or os.path.join(DEFAULT_OUTPUT_DIR, f"load_test_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\nLoad test results written to: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
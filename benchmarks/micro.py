@@ -0,0 +1,285 @@
+# LLM 호출을 제외한 요청 처리 경로(hot path)의 마이크로 벤치마크
+#
+# 요청마다 반복되는 모델 설정 조회, 프롬프트 파일 읽기, format instructions 생성, AgentState 검증,
+# Markdown 렌더링, 결과 쓰기와 지연 없는 가짜 모델로의 그래프 전체 실행 시간을 측정하고,
+# 저장된 기준값(benchmarks/micro_baseline.json)보다 허용 범위 이상 느려지면 실패합니다.
+# 시간 측정이 끝난 뒤 tracemalloc을 켜고 호출당 할당량(최대, 잔류)도 따로 측정합니다 (--no-allocations로 생략).
+#
+#   python -m benchmarks.micro --check             # 기준값과 비교 (회귀 시 종료 코드 1)
+#   python -m benchmarks.micro --update-baseline   # 현재 측정값을 기준값으로 저장
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from app.config_loader import get_model_config
+from app.memory import count_allocations
+from app.result_index import ResultIndex, set_result_index
+from app.result_store import (
+    MarkdownResultStore,
+    SegmentedJsonlResultStore,
+    build_result_record,
+    render_result_markdown,
+    set_result_store,
+)
+from app.schemas import AgentState, KeywordSentiment, ReviewAnalysisOutput, ReviewInputs
+from models.fake_model import FAKE_LLM_LATENCY_ENV
+from models.prompt_loader import get_format_instructions, get_output_parser, load_prompt_template
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_BASELINE_PATH = os.path.join(PROJECT_ROOT, "benchmarks", "micro_baseline.json")
+DEFAULT_TOLERANCE = 1.0 # 기준값 대비 2배 이상 느려지면 회귀로 판단 (공유 머신의 측정 잡음 고려)
+ALLOCATION_CALLS = 20 # 호출당 할당량을 측정하는 호출 수 (tracemalloc이 켜져 있어 느리므로 시간 측정과 분리)
+PROMPT_PATH = os.path.join(PROJECT_ROOT, "models", "review_analysis_prompt", "v0.2.md")
+
+
+@dataclass
+class Benchmark:
+    name: str
+    function: Callable[[], Any]
+    iterations: int # 한 라운드에서 반복 실행하는 횟수
+
+
+def _sample_state() -> AgentState:
+    return AgentState(
+        review_inputs=ReviewInputs(
+            review_text="음식이 정말 맛있어요! 특히 파스타는 인생 최고였습니다. 다만, 대기 시간이 조금 길었어요.",
+            rating=4.5,
+            ordered_items=["크림 파스타", "마르게리따 피자", "레드 와인"],
+        ),
+        selected_model_config_key="fake_deterministic",
+        model_key_used="fake_deterministic",
+        actual_model_name_used="fake-deterministic",
+        prompt_version="v0.2",
+        analysis_output=ReviewAnalysisOutput(
+            score=0.82,
+            summary="파스타가 매우 맛있었지만 대기 시간이 길었다는 리뷰",
+            is_question_review=False,
+            overall_sentiment="POSITIVE",
+            keywords=[
+                KeywordSentiment(keyword="맛있다", sentiment="POSITIVE"),
+                KeywordSentiment(keyword="대기 시간", sentiment="NEGATIVE"),
+            ],
+            reply="소중한 리뷰 감사합니다. 대기 시간은 개선하겠습니다.",
+            analysis_score="맛에 대한 강한 긍정과 대기 시간에 대한 약한 부정",
+            analysis_reply="감사와 개선 약속에 초점",
+        ),
+    )
+
+
+def build_benchmarks(work_dir: str, scale: float = 1.0) -> List[Benchmark]:
+    """측정 대상 단계별 벤치마크 목록을 만듭니다. `scale`로 반복 횟수를 조절합니다 (테스트에서는 작게)."""
+    from app.graph import get_compiled_graph
+
+    def iterations(count: int) -> int:
+        return max(1, int(count * scale))
+
+    state = _sample_state()
+    graph_output = state.model_dump()
+    record = build_result_record(state, saved_at=datetime(2025, 1, 1))
+    segmented_store = SegmentedJsonlResultStore(os.path.join(work_dir, "segments"))
+    markdown_store = MarkdownResultStore(os.path.join(work_dir, "markdown"))
+
+    # 그래프 전체 실행은 지연 없는 가짜 모델(run_benchmarks에서 지연 0으로 설정)과 임시 저장소를 사용합니다.
+    set_result_store(SegmentedJsonlResultStore(os.path.join(work_dir, "graph_segments")))
+    set_result_index(ResultIndex(os.path.join(work_dir, "graph_index.sqlite3")))
+    compiled_graph = get_compiled_graph(near_duplicate=False)
+    graph_input = AgentState(review_inputs=state.review_inputs, selected_model_config_key="fake_deterministic")
+
+    def validate_graph_output_twice() -> AgentState:
+        # 그래프 출력 검증과 서비스의 AgentState(**result_dict_from_graph) 변환을 합한 비용
+        return AgentState(**AgentState.model_validate(graph_output).model_dump())
+
+    return [
+        Benchmark("get_model_config", lambda: get_model_config("fake_deterministic"), iterations(2000)),
+        # 파일 읽기와 스키마 직렬화 자체의 비용은 캐시를 거치지 않고(__wrapped__) 측정하고, 캐시 적중 비용은 따로 측정합니다.
+        Benchmark("prompt_file_read", lambda: load_prompt_template.__wrapped__(PROMPT_PATH), iterations(2000)),
+        Benchmark("prompt_file_read_cached", lambda: load_prompt_template(PROMPT_PATH), iterations(2000)),
+        Benchmark(
+            "format_instructions",
+            lambda: get_output_parser.__wrapped__().get_format_instructions(),
+            iterations(500),
+        ),
+        Benchmark("format_instructions_cached", get_format_instructions, iterations(2000)),
+        Benchmark("agent_state_validation_x2", validate_graph_output_twice, iterations(2000)),
+        Benchmark("markdown_render", lambda: render_result_markdown(record), iterations(2000)),
+        Benchmark("segmented_store_append", lambda: segmented_store.append(record), iterations(500)),
+        Benchmark("markdown_file_write", lambda: markdown_store.append(record), iterations(200)),
+        Benchmark("graph_invoke_zero_latency", lambda: compiled_graph.invoke(graph_input), iterations(100)),
+    ]
+
+
+def measure_allocations(benchmark: Benchmark, calls: int = ALLOCATION_CALLS) -> Dict[str, float]:
+    """
+    tracemalloc으로 호출당 추가 할당량을 측정합니다. 최대값은 호출 중 임시 객체를 포함한 최대 사용량의 중앙값,
+    잔류량은 호출이 끝난 뒤 남은 평균 사용량(캐시 적재, 누수)입니다. 단위는 KiB입니다.
+    """
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    peaks, retained = [], []
+    try:
+        for _ in range(max(1, min(calls, benchmark.iterations))):
+            with count_allocations() as counter:
+                benchmark.function()
+            peaks.append(counter.peak_bytes)
+            retained.append(counter.retained_bytes)
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+    return {
+        "alloc_peak_kib": round(statistics.median(peaks) / 1024, 2),
+        "alloc_retained_kib": round(statistics.mean(retained) / 1024, 2),
+    }
+
+
+def measure(benchmark: Benchmark, rounds: int) -> Dict[str, float]:
+    """라운드마다 `iterations`회 실행한 평균 시간을 구하고, 라운드들의 중앙값/최솟값을 마이크로초로 반환합니다."""
+    benchmark.function() # 워밍업 (캐시 적재, 지연 임포트)
+    per_call_seconds = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            started = time.perf_counter()
+            for _ in range(benchmark.iterations):
+                benchmark.function()
+            per_call_seconds.append((time.perf_counter() - started) / benchmark.iterations)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return {
+        "median_us": round(statistics.median(per_call_seconds) * 1e6, 3),
+        "min_us": round(min(per_call_seconds) * 1e6, 3),
+        "iterations": benchmark.iterations,
+        "rounds": rounds,
+    }
+
+
+def run_benchmarks(
+    rounds: int = 5,
+    scale: float = 1.0,
+    only: Optional[List[str]] = None,
+    allocations: bool = True,
+) -> Dict[str, Dict[str, float]]:
+    results = {}
+    previous_latency = os.environ.get(FAKE_LLM_LATENCY_ENV)
+    os.environ[FAKE_LLM_LATENCY_ENV] = "0"
+    with tempfile.TemporaryDirectory(prefix="review_micro_bench_") as work_dir:
+        try:
+            for benchmark in build_benchmarks(work_dir, scale):
+                if only and benchmark.name not in only:
+                    continue
+                results[benchmark.name] = measure(benchmark, rounds)
+                if allocations:
+                    results[benchmark.name].update(measure_allocations(benchmark))
+        finally:
+            set_result_store(None)
+            set_result_index(None)
+            if previous_latency is None:
+                os.environ.pop(FAKE_LLM_LATENCY_ENV, None)
+            else:
+                os.environ[FAKE_LLM_LATENCY_ENV] = previous_latency
+    return results
+
+
+def compare_to_baseline(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Any],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> List[str]:
+    """
+    기준값 대비 최솟값이 `tolerance` 비율을 넘게 느려진 벤치마크의 설명 목록을 반환합니다 (회귀 없으면 빈 목록).
+    최솟값은 다른 프로세스나 디스크 캐시로 인한 잡음이 가장 적어 중앙값보다 회귀 판정에 안정적입니다.
+    기준값에 없는 벤치마크는 비교하지 않습니다.
+    """
+    regressions = []
+    for name, result in results.items():
+        baseline_result = baseline.get("results", {}).get(name)
+        if not baseline_result:
+            continue
+        limit_us = baseline_result["min_us"] * (1.0 + tolerance)
+        if result["min_us"] > limit_us:
+            regressions.append(
+                f"{name}: {result['min_us']:.1f}us > 허용 상한 {limit_us:.1f}us "
+                f"(기준값 {baseline_result['min_us']:.1f}us, +{tolerance:.0%})"
+            )
+    return regressions
+
+
+def _environment() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for the non-LLM request path")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier for iterations per round")
+    parser.add_argument("--only", type=str, default=None, help="Comma separated benchmark names")
+    parser.add_argument("--baseline", type=str, default=DEFAULT_BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed slowdown ratio vs. baseline")
+    parser.add_argument("--check", action="store_true", help="Exit with status 1 on regression against the baseline")
+    parser.add_argument("--update-baseline", action="store_true", help="Store the current results as the baseline")
+    parser.add_argument("--no-allocations", action="store_true", help="Skip the per-call tracemalloc allocation pass")
+    parser.add_argument("--output", type=str, default=None, help="Write results JSON to this path")
+    args = parser.parse_args()
+
+    only = [name.strip() for name in args.only.split(",")] if args.only else None
+    results = run_benchmarks(rounds=args.rounds, scale=args.scale, only=only, allocations=not args.no_allocations)
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    print(f"{'benchmark':<28} {'median(us)':>12} {'min(us)':>12} {'baseline min(us)':>17} {'alloc peak(KiB)':>16} {'retained(KiB)':>14}")
+    for name, result in results.items():
+        baseline_us = (baseline or {}).get("results", {}).get(name, {}).get("min_us")
+        baseline_display = f"{baseline_us:.1f}" if baseline_us is not None else "-"
+        peak_display = f"{result['alloc_peak_kib']:.1f}" if "alloc_peak_kib" in result else "-"
+        retained_display = f"{result['alloc_retained_kib']:.1f}" if "alloc_retained_kib" in result else "-"
+        print(
+            f"{name:<28} {result['median_us']:>12.1f} {result['min_us']:>12.1f} {baseline_display:>17} "
+            f"{peak_display:>16} {retained_display:>14}"
+        )
+
+    report = {"created_at": datetime.now().isoformat(timespec="seconds"), "environment": _environment(), "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"\nBaseline updated: {args.baseline}")
+
+    if args.check:
+        if baseline is None:
+            print(f"\nBaseline not found: {args.baseline}")
+            sys.exit(1)
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print("\nRegressions detected:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            sys.exit(1)
+        print("\nNo regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
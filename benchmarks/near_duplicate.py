@@ -0,0 +1,149 @@
+# 근사 중복 재사용률과 오판 감사 리포트
+#
+# 리뷰 샘플에 문장 부호, 이모지, 강조 부사, 짧은 문구를 더한 변형을 섞은 스트림을 만들고, 선택한 모델 설정으로
+# 리뷰마다 한 번씩 분석한 뒤 유사도 임계값별로 근사 중복 인덱스를 재생합니다 (shadow 모드와 같은 방식).
+# 근사 중복으로 찾은 비율(재사용률)과, 재사용했을 결과를 실제 분석 결과와 비교한 오판 비율, 변형 종류별 적중률,
+# 조회 시간을 출력합니다. LLM은 임계값 수와 관계없이 리뷰마다 한 번만 호출합니다.
+#
+#   python -m benchmarks.near_duplicate --sample 200 --thresholds 0.6,0.7,0.8,0.9
+#   python -m benchmarks.near_duplicate --reviews-path data/labeled_reviews.jsonl --model-key gpt_4o_mini
+
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.analyze_review_node import analyze_review_for_graph
+from app.near_duplicate import NearDuplicateConfig, NearDuplicateIndex
+from app.schemas import AgentState, ReviewAnalysisOutput, ReviewInputs
+from benchmarks.prompt_ab import load_sample
+from models.fake_model import FAKE_LLM_LATENCY_ENV
+
+# 변형 이름과 변형 함수. 원본 리뷰는 "original"입니다.
+PERTURBATIONS: Dict[str, Callable[[str], str]] = {
+    "punctuation": lambda text: text.rstrip(".!~ ") + "!!",
+    "emoji": lambda text: f"{text} 😋👍",
+    "intensifier": lambda text: f"정말 {text}",
+    "extra_phrase": lambda text: f"{text} 다음에 또 시킬게요",
+}
+
+
+def build_stream(reviews: Sequence[Any], variants_per_review: int, seed: int) -> List[Tuple[str, ReviewInputs]]:
+    """원본 리뷰 뒤에 무작위 변형을 섞은 (변형 이름, 리뷰 입력) 스트림. 변형은 원본보다 뒤에 나옵니다."""
+    generator = random.Random(seed)
+    originals = [("original", review.review_inputs) for review in reviews]
+    variants = []
+    for review in reviews:
+        for name in generator.sample(sorted(PERTURBATIONS), min(variants_per_review, len(PERTURBATIONS))):
+            text = PERTURBATIONS[name](review.review_inputs.review_text)
+            variants.append((name, review.review_inputs.model_copy(update={"review_text": text})))
+    generator.shuffle(variants)
+    # 원본 절반을 먼저 분석한 뒤 나머지 원본과 변형을 섞어, 운영 중 들어오는 리뷰 순서를 흉내 냅니다.
+    head, tail = originals[: len(originals) // 2], originals[len(originals) // 2:] + variants
+    generator.shuffle(tail)
+    return head + tail
+
+
+def analyze_stream(stream: Sequence[Tuple[str, ReviewInputs]], model_config_key: str, concurrency: int) -> List[Optional[ReviewAnalysisOutput]]:
+    """근사 중복 인덱스 없이 리뷰마다 분석 노드를 한 번 실행한 결과 (실패하면 None)"""
+    def _analyze(item: Tuple[str, ReviewInputs]) -> Optional[ReviewAnalysisOutput]:
+        result = analyze_review_for_graph(AgentState(review_inputs=item[1], selected_model_config_key=model_config_key), near_duplicate=False)
+        return result.get("analysis_output")
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(_analyze, stream))
+
+
+def replay(
+    stream: Sequence[Tuple[str, ReviewInputs]],
+    outputs: Sequence[Optional[ReviewAnalysisOutput]],
+    config: NearDuplicateConfig,
+    model_config_key: str,
+) -> Dict[str, Any]:
+    """shadow 모드처럼 스트림 순서대로 조회, 감사, 추가를 반복하고 재사용률과 오판 통계를 반환합니다."""
+    index = NearDuplicateIndex(config)
+    hits_by_kind: Dict[str, List[bool]] = {}
+    lookup_seconds = []
+    for (kind, review_inputs), output in zip(stream, outputs):
+        if output is None:
+            continue
+        started = time.perf_counter()
+        match = index.find(review_inputs, model_config_key, None)
+        lookup_seconds.append(time.perf_counter() - started)
+        hits_by_kind.setdefault(kind, []).append(match is not None)
+        if match is not None:
+            index.audit(review_inputs, match, output)
+        index.add(review_inputs, output, model_config_key, None)
+    stats = index.stats()
+    return {
+        "similarity_threshold": config.similarity_threshold,
+        "lookups": stats.lookups_total,
+        "reuse_rate": round(stats.hits_total / stats.lookups_total, 4) if stats.lookups_total else None,
+        "filtered": stats.filtered_total,
+        "audits": stats.audits_total,
+        "false_matches": stats.false_matches_total,
+        "false_match_rate": round(stats.false_match_rate, 4) if stats.false_match_rate is not None else None,
+        "mean_score_difference": round(stats.mean_audit_score_difference, 4) if stats.mean_audit_score_difference is not None else None,
+        "hit_rate_by_kind": {kind: round(sum(hits) / len(hits), 4) for kind, hits in sorted(hits_by_kind.items())},
+        "lookup_us_median": round(statistics.median(lookup_seconds) * 1e6, 1) if lookup_seconds else None,
+        "entries": stats.entries,
+        "false_match_examples": [audit.model_dump() for audit in stats.recent_false_matches[-5:]],
+    }
+
+
+def run(
+    reviews: Sequence[Any],
+    thresholds: Sequence[float],
+    model_config_key: str = "fake_deterministic",
+    variants_per_review: int = 2,
+    concurrency: int = 4,
+    seed: int = 7,
+    base_config: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    stream = build_stream(reviews, variants_per_review, seed)
+    outputs = analyze_stream(stream, model_config_key, concurrency)
+    return [
+        replay(stream, outputs, NearDuplicateConfig(**{**(base_config or {}), "mode": "shadow", "similarity_threshold": threshold}), model_config_key)
+        for threshold in thresholds
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Near-duplicate reuse rate and false-match audit report")
+    parser.add_argument("--reviews-path", type=str, default=None, help="Labeled reviews JSON/JSONL (synthetic reviews if omitted)")
+    parser.add_argument("--sample", type=int, default=200)
+    parser.add_argument("--model-key", type=str, default="fake_deterministic")
+    parser.add_argument("--thresholds", type=str, default="0.6,0.7,0.8,0.9")
+    parser.add_argument("--variants-per-review", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--fake-latency", type=float, default=None, help="Override FAKE_LLM_LATENCY_SECONDS")
+    parser.add_argument("--output", type=str, default=None, help="Write results JSON to this path")
+    args = parser.parse_args()
+
+    if args.fake_latency is not None:
+        os.environ[FAKE_LLM_LATENCY_ENV] = str(args.fake_latency)
+    reviews, _ = load_sample(args.reviews_path, args.sample)
+    thresholds = [float(threshold) for threshold in args.thresholds.split(",")]
+    results = run(reviews, thresholds, args.model_key, args.variants_per_review, args.concurrency, args.seed)
+
+    kinds = ["original", *sorted(PERTURBATIONS)]
+    print(f"{'threshold':>9} {'reuse':>7} {'audits':>7} {'false':>6} {'false%':>7} {'|Δscore|':>9} {'lookup(us)':>11}  " + " ".join(f"{kind:>12}" for kind in kinds))
+    for result in results:
+        false_rate = result["false_match_rate"]
+        print(
+            f"{result['similarity_threshold']:>9.2f} {result['reuse_rate']:>7.1%} {result['audits']:>7} {result['false_matches']:>6} "
+            f"{(f'{false_rate:.1%}' if false_rate is not None else '-'):>7} {result['mean_score_difference'] or 0:>9.3f} "
+            f"{result['lookup_us_median']:>11.1f}  " + " ".join(f"{result['hit_rate_by_kind'].get(kind, 0):>12.0%}" for kind in kinds)
+        )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,458 @@
+# 프롬프트 버전 A/B 벤치마크
+#
+# 라벨링된 리뷰 샘플(없으면 합성 리뷰)로 프롬프트 버전(models/review_analysis_prompt/<버전>.md)마다
+# 실제 클라이언트와 같은 방식으로 프롬프트를 렌더링하여 입력 토큰 수를 오프라인 토크나이저로 세고,
+# 선택한 모델 설정(기본: 결정적 가짜 제공자)으로 그래프를 실행하여 출력 토큰 수와 종단 간 지연 시간을 측정합니다.
+# 라벨링된 데이터에서는 예측 파일을 만들어 감성 범주 평가기로 정확도까지 계산하고, 버전별 결과를 나란히 출력합니다.
+# 저장된 기준값(benchmarks/prompt_ab_baseline.json)보다 평균 입력 토큰이 허용 범위 이상 늘어나면 실패합니다.
+#
+#   python -m benchmarks.prompt_ab --versions v0.1,v0.2 --sample 50
+#   python -m benchmarks.prompt_ab --reviews-path data/labeled_reviews.jsonl --model-key gpt_4o_mini
+#   python -m benchmarks.prompt_ab --tokenizer estimate --check     # 기준값과 비교 (토큰 증가 시 종료 코드 1)
+
+import argparse
+import copy
+import functools
+import json
+import math
+import os
+import re
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.config_loader import get_model_config, load_model_configurations
+from app.schemas import AgentState, ReviewInputs
+from benchmarks.load_test import make_review, percentiles_ms
+from models import prompt_loader
+from models.prompt_loader import load_prompt_template
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+PROMPT_DIR = os.path.join("models", "review_analysis_prompt")
+DEFAULT_OUTPUT_DIR = os.path.join(PROJECT_ROOT, "benchmarks", "results")
+DEFAULT_BASELINE_PATH = os.path.join(PROJECT_ROOT, "benchmarks", "prompt_ab_baseline.json")
+DEFAULT_TOLERANCE = 0.05 # 기준값 대비 평균 입력 토큰이 5%를 넘게 늘어나면 회귀로 판단
+DEFAULT_ENCODING = "o200k_base" # gpt-4o 계열 토크나이저
+
+# 토크나이저 파일을 받을 수 없는 환경(오프라인 CI 등)에서 사용하는 추정 규칙:
+# 영문 단어는 4글자당 1토큰, 숫자는 3자리당 1토큰, 한글은 2음절당 1토큰, 그 밖의 기호는 글자마다 1토큰
+_ESTIMATE_PATTERN = re.compile(r"[A-Za-z]+|[0-9]+|[가-힣]+|[^\sA-Za-z0-9가-힣]")
+
+_MISSING = object()
+_shadowed_model_configs: Dict[str, List[Any]] = {} # 파생 설정 키별로 등록 전에 있던 설정 (해제할 때 되돌림)
+
+
+@dataclass(frozen=True)
+class Tokenizer:
+    name: str # "tiktoken:o200k_base" 또는 "estimate"
+    count: Callable[[str], int]
+
+
+def _estimate_token_count(text: str) -> int:
+    tokens = 0
+    for match in _ESTIMATE_PATTERN.finditer(text):
+        piece = match.group()
+        first = piece[0]
+        if first.isascii() and first.isalpha():
+            tokens += math.ceil(len(piece) / 4)
+        elif first.isdigit():
+            tokens += math.ceil(len(piece) / 3)
+        elif "가" <= first <= "힣":
+            tokens += math.ceil(len(piece) / 2)
+        else:
+            tokens += 1
+    return tokens
+
+
+@functools.lru_cache(maxsize=4)
+def get_tokenizer(preference: str = "auto") -> Tokenizer:
+    """
+    토큰 수를 세는 토크나이저를 반환합니다. `auto`는 tiktoken 인코딩을 사용할 수 있으면 사용하고,
+    인코딩 파일을 내려받을 수 없으면(오프라인) 추정 규칙으로 대체합니다. 결과에는 사용한 토크나이저 이름이 기록됩니다.
+    """
+    if preference not in ("auto", "tiktoken", "estimate"):
+        raise ValueError(f"알 수 없는 토크나이저입니다: {preference} (auto, tiktoken, estimate 중 하나)")
+    if preference != "estimate":
+        try:
+            import tiktoken
+
+            encoding = tiktoken.get_encoding(DEFAULT_ENCODING)
+            return Tokenizer(name=f"tiktoken:{DEFAULT_ENCODING}", count=lambda text: len(encoding.encode(text, disallowed_special=())))
+        except Exception as e:
+            if preference == "tiktoken":
+                raise
+            print(f"tiktoken 인코딩을 사용할 수 없어 추정 토크나이저를 사용합니다: {e}", file=sys.stderr)
+    return Tokenizer(name="estimate", count=_estimate_token_count)
+
+
+def prompt_path_for_version(version: str) -> str:
+    """프롬프트 버전 이름의 파일 경로 (프로젝트 루트 기준 상대 경로, 예: models/review_analysis_prompt/v0.2.md)"""
+    return os.path.join(PROMPT_DIR, f"{version}.md")
+
+
+def render_prompt(prompt_path: str, review_inputs: ReviewInputs, format_instructions_mode: Optional[str] = None) -> str:
+    """제공자 클라이언트와 같은 방식으로 프롬프트를 렌더링합니다 (템플릿에 없는 변수는 무시됩니다)."""
+    return prompt_loader.render_prompt(os.path.join(PROJECT_ROOT, prompt_path), review_inputs, format_instructions_mode)
+
+
+def load_sample(reviews_path: Optional[str], sample_size: int, human_score_key: str = "pre_score") -> tuple[list, bool]:
+    """
+    벤치마크에 사용할 리뷰 샘플과 라벨 여부를 반환합니다. 라벨링된 원본 리뷰 파일이 없으면
+    부하 테스트와 같은 합성 리뷰를 사용하며, 이때는 사람 점수가 없으므로 정확도를 계산하지 않습니다.
+    """
+    from evaluation.prediction_runner import LabeledReview, load_labeled_reviews
+
+    if reviews_path:
+        return load_labeled_reviews(reviews_path, human_score_key)[:sample_size], True
+    reviews = []
+    for index in range(sample_size):
+        review = make_review(index)
+        reviews.append(LabeledReview(
+            review_id=f"synthetic-{index}",
+            review_inputs=ReviewInputs(**review),
+            human_score=review["rating"] / 5.0,
+        ))
+    return reviews, False
+
+
+def measure_prompt_tokens(
+    prompt_path: str,
+    reviews: Sequence[Any],
+    tokenizer: Tokenizer,
+    format_instructions_mode: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    리뷰마다 렌더링한 프롬프트의 입력 토큰 수 분포. `format_instructions_mode`는 모델 설정의 `format_instructions`와 같은
+    의미이며, 샘플이 비어 있으면 토큰 값은 `None`입니다.
+    """
+    template_chars = len(load_prompt_template(os.path.join(PROJECT_ROOT, prompt_path)))
+    if not reviews:
+        return {"input_tokens_mean": None, "input_tokens_p95": None, "input_tokens_max": None, "template_chars": template_chars}
+    counts = np.array(
+        [tokenizer.count(render_prompt(prompt_path, review.review_inputs, format_instructions_mode)) for review in reviews],
+        dtype=float,
+    )
+    return {
+        "input_tokens_mean": round(float(counts.mean()), 1),
+        "input_tokens_p95": round(float(np.percentile(counts, 95)), 1),
+        "input_tokens_max": int(counts.max()),
+        "template_chars": template_chars,
+    }
+
+
+def register_prompt_variant(
+    model_config_key: str,
+    version: str,
+    prompt_path: Optional[str] = None,
+    overrides: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    모델 설정의 프롬프트 경로만 바꾼 파생 설정(`<모델 설정 키>@<버전>`)을 프로세스의 설정 캐시에 등록하고 그 키를 반환합니다.
+    그래프는 설정 키로 프롬프트를 고르므로, 설정 파일을 고치지 않고 같은 모델로 프롬프트 버전만 바꿔 실행할 때 사용합니다.
+    `prompt_path`를 생략하면 버전 이름의 프롬프트 파일을 사용하며, `overrides`로 다른 설정 값(예: `format_instructions`)도 바꿀 수 있습니다.
+    다른 스레드가 읽는 중인 설정 캐시를 직접 고치지 않도록 설정 목록을 복사해 교체하며, 같은 키로 이미 있던 설정은
+    `unregister_prompt_variant`에서 되돌립니다.
+    """
+    base_config = get_model_config(model_config_key)
+    if base_config is None:
+        raise ValueError(f"모델 설정 키 '{model_config_key}'를 찾을 수 없습니다.")
+    variant_key = f"{model_config_key}@{version}"
+    variant_config = copy.deepcopy(base_config)
+    variant_config["prompt_path"] = prompt_path or prompt_path_for_version(version)
+    variant_config.update(overrides or {})
+    configurations = load_model_configurations()
+    model_configurations = configurations["model_configurations"]
+    _shadowed_model_configs.setdefault(variant_key, []).append(model_configurations.get(variant_key, _MISSING))
+    configurations["model_configurations"] = {**model_configurations, variant_key: variant_config}
+    return variant_key
+
+
+def unregister_prompt_variant(variant_key: str) -> None:
+    """`register_prompt_variant`로 등록한 파생 설정을 제거하고, 등록 전에 같은 키의 설정이 있었으면 되돌립니다."""
+    shadowed = _shadowed_model_configs.get(variant_key)
+    previous = shadowed.pop() if shadowed else _MISSING
+    if not shadowed:
+        _shadowed_model_configs.pop(variant_key, None)
+    configurations = load_model_configurations()
+    model_configurations = {key: value for key, value in configurations["model_configurations"].items() if key != variant_key}
+    if previous is not _MISSING:
+        model_configurations[variant_key] = previous
+    configurations["model_configurations"] = model_configurations
+
+
+def _run_one(graph, review: Any, model_config_key: str, tokenizer: Tokenizer) -> Dict[str, Any]:
+    started = time.perf_counter()
+    final_state = AgentState.model_validate(graph.invoke(
+        AgentState(review_inputs=review.review_inputs, selected_model_config_key=model_config_key)
+    ))
+    latency_seconds = time.perf_counter() - started
+    output = final_state.analysis_output
+    token_usage = final_state.token_usage
+    return {
+        "review_id": review.review_id,
+        "latency_seconds": latency_seconds,
+        "score": output.score if output else None,
+        "output_tokens": tokenizer.count(output.model_dump_json()) if output else None,
+        "provider_prompt_tokens": token_usage.prompt_tokens if token_usage else None,
+        "provider_completion_tokens": token_usage.completion_tokens if token_usage else None,
+        "estimated_cost_usd": token_usage.estimated_cost_usd if token_usage else None,
+        "prompt_version": final_state.prompt_version,
+    }
+
+
+def _mean(values: List[Optional[float]], digits: int) -> Optional[float]:
+    present = [value for value in values if value is not None]
+    return round(float(np.mean(present)), digits) if present else None
+
+
+def run_version(
+    model_config_key: str,
+    version: str,
+    reviews: Sequence[Any],
+    labeled: bool,
+    tokenizer: Tokenizer,
+    concurrency: int = 4,
+    graph=None,
+) -> Dict[str, Any]:
+    """
+    프롬프트 버전 하나로 샘플 전체를 그래프로 실행하여 출력 토큰, 종단 간 지연 시간을 측정합니다.
+    라벨링된 샘플이면 예측 파일을 임시로 기록하고 정확도-지연-비용 분석(`evaluation.frontier`)으로 정확도를 계산합니다.
+    벤치마크 결과가 운영 결과 저장소에 섞이지 않도록 기본 그래프는 결과 저장 노드와 근사 중복 인덱스 없이 실행합니다.
+    """
+    from app.graph import get_compiled_graph
+    from evaluation.frontier import compute_config_metrics
+
+    result = {
+        "reviews": len(reviews),
+        "failed": 0,
+        "output_tokens_mean": None,
+        "provider_prompt_tokens_mean": None,
+        "provider_completion_tokens_mean": None,
+        "latency_p50_ms": None,
+        "latency_p95_ms": None,
+        "reviews_per_second": None,
+        "cost_per_1k_reviews_usd": None,
+        "accuracy": None,
+        "balanced_accuracy": None,
+    }
+    if not reviews:
+        return result
+
+    graph = graph or get_compiled_graph(save_result=False, near_duplicate=False)
+    variant_key = register_prompt_variant(model_config_key, version)
+    try:
+        # 첫 호출의 임포트와 초기화 비용이 먼저 측정되는 버전에만 더해지지 않도록 한 건을 먼저 실행합니다.
+        _run_one(graph, reviews[0], variant_key, tokenizer)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="prompt-ab") as executor:
+            runs = list(executor.map(lambda review: _run_one(graph, review, variant_key, tokenizer), reviews))
+        wall_clock_seconds = time.perf_counter() - started
+    finally:
+        unregister_prompt_variant(variant_key)
+
+    succeeded = [run for run in runs if run["score"] is not None]
+    latency = percentiles_ms([run["latency_seconds"] for run in succeeded])
+    result.update({
+        "failed": len(runs) - len(succeeded),
+        "output_tokens_mean": _mean([run["output_tokens"] for run in succeeded], 1),
+        "provider_prompt_tokens_mean": _mean([run["provider_prompt_tokens"] for run in succeeded], 1),
+        "provider_completion_tokens_mean": _mean([run["provider_completion_tokens"] for run in succeeded], 1),
+        "latency_p50_ms": latency["p50"],
+        "latency_p95_ms": latency["p95"],
+        "reviews_per_second": round(len(runs) / wall_clock_seconds, 3) if wall_clock_seconds > 0 else None,
+    })
+    cost = _mean([run["estimated_cost_usd"] for run in succeeded], 12)
+    if cost is not None:
+        result["cost_per_1k_reviews_usd"] = round(cost * 1000.0, 6)
+
+    if labeled and succeeded:
+        human_scores = {review.review_id: review.human_score for review in reviews}
+        with tempfile.TemporaryDirectory(prefix="prompt-ab-") as work_dir:
+            predictions_path = os.path.join(work_dir, f"{version}.jsonl")
+            with open(predictions_path, "w", encoding="utf-8") as f:
+                for run in succeeded:
+                    f.write(json.dumps({
+                        "review_id": run["review_id"],
+                        "pre_score": human_scores[run["review_id"]],
+                        "score": run["score"],
+                        "latency_seconds": run["latency_seconds"],
+                    }) + "\n")
+            metrics = compute_config_metrics(predictions_path, label=version)
+        result["accuracy"] = metrics.accuracy
+        result["balanced_accuracy"] = metrics.balanced_accuracy
+    return result
+
+
+def run_prompt_ab(
+    versions: Sequence[str],
+    reviews: Sequence[Any],
+    labeled: bool,
+    tokenizer: Tokenizer,
+    model_config_key: Optional[str] = "fake_deterministic",
+    concurrency: int = 4,
+    format_instructions_mode: Optional[str] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    버전별 입력 토큰 분포와 (모델 설정 키가 있으면) 실행 측정값을 합친 결과. `model_config_key`가 없으면 토큰만 셉니다.
+    입력 토큰은 `format_instructions_mode`(생략하면 모델 설정의 `format_instructions`)대로 렌더링한 프롬프트로 셉니다.
+    """
+    for version in versions:
+        prompt_path = prompt_path_for_version(version)
+        if not os.path.exists(os.path.join(PROJECT_ROOT, prompt_path)):
+            raise FileNotFoundError(f"프롬프트 파일을 찾을 수 없습니다: {prompt_path}")
+    if format_instructions_mode is None and model_config_key:
+        format_instructions_mode = (get_model_config(model_config_key) or {}).get("format_instructions")
+    results = {
+        version: measure_prompt_tokens(prompt_path_for_version(version), reviews, tokenizer, format_instructions_mode)
+        for version in versions
+    }
+    if not model_config_key:
+        return results
+
+    for version in versions:
+        results[version].update(run_version(model_config_key, version, reviews, labeled, tokenizer, concurrency))
+    return results
+
+
+def compare_to_baseline(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Any],
+    tokenizer_name: str,
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> List[str]:
+    """
+    기준값 대비 평균 입력 토큰이 `tolerance` 비율을 넘게 늘어난 버전의 설명 목록을 반환합니다 (회귀 없으면 빈 목록).
+    토크나이저가 다르면 토큰 수를 비교할 수 없으므로 비교하지 않으며, 기준값에 없는 버전도 비교하지 않습니다.
+    """
+    if baseline.get("tokenizer") != tokenizer_name:
+        return []
+    regressions = []
+    for version, result in results.items():
+        baseline_result = baseline.get("results", {}).get(version)
+        if not baseline_result:
+            continue
+        if result["input_tokens_mean"] is None:
+            continue
+        limit = baseline_result["input_tokens_mean"] * (1.0 + tolerance)
+        if result["input_tokens_mean"] > limit:
+            regressions.append(
+                f"{version}: 평균 입력 토큰 {result['input_tokens_mean']:.1f} > 허용 상한 {limit:.1f} "
+                f"(기준값 {baseline_result['input_tokens_mean']:.1f}, +{tolerance:.0%})"
+            )
+    return regressions
+
+
+def format_table(results: Dict[str, Dict[str, Any]]) -> str:
+    """버전을 열로 하는 비교표 (첫 버전 대비 평균 입력 토큰 증감 포함)"""
+    rows = [
+        ("input tokens (mean)", "input_tokens_mean"),
+        ("input tokens (p95)", "input_tokens_p95"),
+        ("output tokens (mean)", "output_tokens_mean"),
+        ("provider prompt tokens", "provider_prompt_tokens_mean"),
+        ("latency p50 (ms)", "latency_p50_ms"),
+        ("latency p95 (ms)", "latency_p95_ms"),
+        ("reviews/s", "reviews_per_second"),
+        ("cost / 1k reviews (USD)", "cost_per_1k_reviews_usd"),
+        ("accuracy", "accuracy"),
+        ("balanced accuracy", "balanced_accuracy"),
+        ("failed", "failed"),
+    ]
+    versions = list(results)
+    lines = [f"{'metric':<26}" + "".join(f"{version:>14}" for version in versions)]
+    for title, key in rows:
+        if all(results[version].get(key) is None for version in versions):
+            continue
+        cells = [results[version].get(key) for version in versions]
+        lines.append(f"{title:<26}" + "".join(f"{'-' if cell is None else cell:>14}" for cell in cells))
+    base = results[versions[0]]["input_tokens_mean"]
+    if base:
+        deltas = [f"{(results[version]['input_tokens_mean'] - base) / base:+.1%}" for version in versions]
+        lines.append(f"{'input tokens vs ' + versions[0]:<26}" + "".join(f"{delta:>14}" for delta in deltas))
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prompt version A/B benchmark (tokens, latency, accuracy)")
+    parser.add_argument("--versions", type=str, default="v0.1,v0.2", help="Comma separated prompt versions")
+    parser.add_argument("--reviews-path", type=str, default=None, help="Labeled raw reviews (JSONL/JSON); synthetic reviews if omitted")
+    parser.add_argument("--human-score-key", type=str, default="pre_score")
+    parser.add_argument("--sample", type=int, default=50, help="Number of reviews to use")
+    parser.add_argument("--model-key", type=str, default="fake_deterministic", help="Model config key for the graph run")
+    parser.add_argument("--tokens-only", action="store_true", help="Only count prompt tokens, do not run the graph")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--fake-latency", type=float, default=None, help="FAKE_LLM_LATENCY_SECONDS for the fake provider")
+    parser.add_argument("--tokenizer", choices=["auto", "tiktoken", "estimate"], default="auto")
+    parser.add_argument("--baseline", type=str, default=DEFAULT_BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed input token growth ratio vs. baseline")
+    parser.add_argument("--check", action="store_true", help="Exit with status 1 when input tokens grow beyond the baseline")
+    parser.add_argument("--update-baseline", action="store_true", help="Store the current token counts as the baseline")
+    parser.add_argument("--output", type=str, default=None, help="Write results JSON to this path")
+    args = parser.parse_args()
+
+    if args.fake_latency is not None:
+        from models.fake_model import FAKE_LLM_LATENCY_ENV
+
+        os.environ[FAKE_LLM_LATENCY_ENV] = str(args.fake_latency)
+
+    tokenizer = get_tokenizer(args.tokenizer)
+    reviews, labeled = load_sample(args.reviews_path, args.sample, args.human_score_key)
+    versions = [version.strip() for version in args.versions.split(",") if version.strip()]
+    model_config_key = None if args.tokens_only else args.model_key
+    # --tokens-only에서도 --model-key 설정의 응답 형식 지침 형태로 프롬프트를 렌더링합니다.
+    format_instructions_mode = (get_model_config(args.model_key) or {}).get("format_instructions")
+    results = run_prompt_ab(versions, reviews, labeled, tokenizer, model_config_key, args.concurrency, format_instructions_mode)
+
+    print(f"tokenizer: {tokenizer.name}, reviews: {len(reviews)} ({'labeled' if labeled else 'synthetic'}), model: {model_config_key or '-'}\n")
+    print(format_table(results))
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "tokenizer": tokenizer.name,
+        "model_config_key": model_config_key,
+        "reviews_path": args.reviews_path,
+        "sample": len(reviews),
+        "results": results,
+    }
+    output_path = args.output or os.path.join(DEFAULT_OUTPUT_DIR, f"prompt_ab_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\nResults written: {output_path}")
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    if args.update_baseline:
+        token_results = {version: {key: value for key, value in result.items() if key.startswith("input_tokens") or key == "template_chars"}
+                         for version, result in results.items()}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"created_at": report["created_at"], "tokenizer": tokenizer.name, "sample": len(reviews), "results": token_results},
+                      f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"Baseline updated: {args.baseline}")
+
+    if args.check:
+        if baseline is None:
+            print(f"\nBaseline not found: {args.baseline}")
+            sys.exit(1)
+        if baseline.get("tokenizer") != tokenizer.name:
+            print(f"\nBaseline tokenizer ({baseline.get('tokenizer')}) differs from {tokenizer.name}; use --tokenizer to match it.")
+            sys.exit(1)
+        regressions = compare_to_baseline(results, baseline, tokenizer.name, args.tolerance)
+        if regressions:
+            print("\nPrompt token regressions detected:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            sys.exit(1)
+        print("\nNo prompt token regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
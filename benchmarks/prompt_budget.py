@@ -0,0 +1,298 @@
+# 프롬프트 토큰 예산 분석과 자동 압축
+#
+# 렌더링된 프롬프트의 토큰을 구역별(지시문, 키워드 사전 코드 블록, 응답 형식 지침(스키마), 리뷰별 변수)로 나눠 세고,
+# 같은 지시를 유지하면서 토큰을 줄인 압축 변형(<버전>.compact.md)을 만듭니다. 압축은 Markdown 강조 기호와 들여쓰기,
+# 줄 끝 공백, 연속 빈 줄을 지우고 키워드 사전 코드 블록을 한 줄 목록으로 바꾸며, 템플릿 변수는 그대로 둡니다.
+# 응답 형식 지침은 모델 설정의 `format_instructions`(full/compact/none)로 고르며, 선택한 모델 설정으로 압축 변형을
+# 실행하여 응답이 여전히 ReviewAnalysisOutput 스키마로 파싱되는지 확인합니다.
+#
+#   python -m benchmarks.prompt_budget --version v0.1 --model-key fake_deterministic --format-instructions compact
+#   python -m benchmarks.prompt_budget --version v0.2 --write-compact --validate
+
+import argparse
+import os
+import re
+import string
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.config_loader import get_model_config
+from app.keyword_extractor import DEFAULT_LEXICON_PATH, build_keyword_guidance, get_keyword_lexicon
+from app.result_index import ResultIndex, set_result_index
+from app.result_store import SegmentedJsonlResultStore, set_result_store
+from app.schemas import AgentState, ReviewInputs
+from benchmarks.prompt_ab import (
+    PROJECT_ROOT,
+    Tokenizer,
+    get_tokenizer,
+    load_sample,
+    prompt_path_for_version,
+    register_prompt_variant,
+    unregister_prompt_variant,
+)
+from models.prompt_loader import FORMAT_INSTRUCTIONS_MODES, OPTIONAL_PROMPT_VARIABLES, get_format_instructions_for, load_prompt_template
+
+SECTIONS = ("instructions", "lexicon", "schema", "variables")
+COMPACT_SUFFIX = ".compact"
+DEFAULT_MIN_VALID_RATE = 1.0
+# 제공자 API에 스키마를 따로 전달하는(`with_structured_output`) 클라이언트. 프롬프트의 스키마는 중복이므로 `none`을 권장합니다.
+NATIVE_STRUCTURED_OUTPUT_CLIENTS = {"models.openai_model"}
+
+_FENCE = "```"
+_formatter = string.Formatter()
+
+
+def template_fields(template: str) -> set:
+    """템플릿에서 사용하는 변수 이름 집합"""
+    return {field for _, field, _, _ in _formatter.parse(template) if field}
+
+
+def split_prompt_sections(
+    template: str,
+    review_inputs: ReviewInputs,
+    format_instructions: str,
+    prompt_variables: Optional[Dict[str, str]] = None,
+) -> Dict[str, str]:
+    """
+    렌더링된 프롬프트를 구역별 텍스트로 나눕니다. 코드 블록(키워드 사전)과 `{keyword_guidance}` 자리는 `lexicon`,
+    `{format_instructions}` 자리는 `schema`, 리뷰 입력 변수 자리는 `variables`, 그 밖의 고정 문구는 `instructions`입니다.
+    각 구역의 길이를 더하면 렌더링 결과의 길이와 같습니다.
+    """
+    sections: Dict[str, List[str]] = {name: [] for name in SECTIONS}
+    values = review_inputs.model_dump()
+    in_fence = False
+    for literal, field, format_spec, conversion in _formatter.parse(template):
+        parts = literal.split(_FENCE)
+        for index, part in enumerate(parts):
+            if index > 0:
+                # 여는 펜스는 사전에, 닫는 펜스도 사전에 포함합니다.
+                sections["lexicon"].append(_FENCE)
+                in_fence = not in_fence
+            sections["lexicon" if in_fence else "instructions"].append(part)
+        if field is None:
+            continue
+        if field == "format_instructions":
+            value, section = format_instructions, "schema"
+        elif field in OPTIONAL_PROMPT_VARIABLES:
+            value, section = (prompt_variables or {}).get(field, OPTIONAL_PROMPT_VARIABLES[field]), "lexicon"
+        else:
+            value, section = values[field], "variables"
+        value = _formatter.convert_field(value, conversion)
+        sections[section].append(_formatter.format_field(value, format_spec or ""))
+    return {name: "".join(texts) for name, texts in sections.items()}
+
+
+def analyze_prompt_budget(
+    template: str,
+    reviews: Sequence[Any],
+    tokenizer: Tokenizer,
+    format_instructions_mode: Optional[str] = None,
+    keyword_extraction: Optional[str] = None,
+    keyword_lexicon_path: str = DEFAULT_LEXICON_PATH,
+) -> Dict[str, Any]:
+    """
+    샘플 리뷰마다 구역별 토큰 수를 세어 평균과 비율, 렌더링된 전체 프롬프트의 평균 토큰 수를 반환합니다.
+    `keyword_extraction`이 있으면 리뷰마다 키워드 후보 지시문을 만들어 `{keyword_guidance}` 자리에 넣습니다.
+    """
+    format_instructions = get_format_instructions_for(format_instructions_mode)
+    lexicon = get_keyword_lexicon(keyword_lexicon_path) if keyword_extraction else None
+    counts = {name: [] for name in SECTIONS}
+    totals = []
+    for review in reviews:
+        prompt_variables = None
+        if lexicon is not None:
+            candidates = lexicon.extract(review.review_inputs.review_text)
+            prompt_variables = {"keyword_guidance": build_keyword_guidance(candidates, keyword_extraction)}
+        sections = split_prompt_sections(template, review.review_inputs, format_instructions, prompt_variables)
+        for name, text in sections.items():
+            counts[name].append(tokenizer.count(text))
+        totals.append(tokenizer.count("".join(sections.values())))
+    means = {name: float(np.mean(values)) for name, values in counts.items()}
+    section_total = sum(means.values()) or 1.0
+    return {
+        "total_tokens_mean": round(float(np.mean(totals)), 1),
+        "sections": {
+            name: {"tokens_mean": round(mean, 1), "share": round(mean / section_total, 4)}
+            for name, mean in means.items()
+        },
+    }
+
+
+def _compact_lexicon(block: str) -> str:
+    """코드 블록 안의 사전 항목을 쉼표로 이은 한 줄 코드 블록으로 만듭니다."""
+    items = [item.strip() for line in block.splitlines() for item in line.split(",")]
+    return _FENCE + ", ".join(item for item in items if item) + _FENCE
+
+
+def compact_prompt_template(template: str) -> str:
+    """
+    지시 내용과 템플릿 변수는 유지하고 토큰만 줄인 압축 템플릿을 만듭니다.
+    Markdown 굵게(`**`), 들여쓰기, 줄 끝 공백, 줄 안의 연속 공백, 연속 빈 줄을 지우고 코드 블록 사전을 한 줄로 바꿉니다.
+    변수 집합이 달라지면 `ValueError`가 발생합니다.
+    """
+    parts = template.split(_FENCE)
+    if len(parts) % 2 == 0:
+        raise ValueError("프롬프트의 코드 블록 펜스(```)가 닫히지 않았습니다.")
+    pieces = []
+    for index, part in enumerate(parts):
+        if index % 2 == 1:
+            pieces.append(_compact_lexicon(part))
+            continue
+        part = part.replace("**", "")
+        lines = [re.sub(r"[ \t]{2,}", " ", line.strip()) for line in part.splitlines()]
+        text = "\n".join(lines)
+        if part.endswith("\n"):
+            text += "\n"
+        pieces.append(text)
+    compacted = "".join(pieces)
+    compacted = re.sub(r"[ \t]+\n", "\n", compacted)
+    compacted = re.sub(r"\n{3,}", "\n\n", compacted).strip() + "\n"
+    if template_fields(compacted) != template_fields(template):
+        raise ValueError("압축 중 템플릿 변수가 바뀌었습니다.")
+    return compacted
+
+
+def compact_prompt_path(version: str) -> str:
+    return prompt_path_for_version(f"{version}{COMPACT_SUFFIX}")
+
+
+def schema_channel(model_config: Dict[str, Any], template: str) -> str:
+    """
+    응답 스키마가 모델에 전달되는 경로: `native`(제공자 API의 구조화 출력), `prompt`(프롬프트의 응답 형식 지침),
+    `missing`(둘 다 아님 — 텍스트 응답을 파서로 검증하므로 스키마를 지키지 않은 응답이 늘어날 수 있음).
+    """
+    if model_config.get("client_module") in NATIVE_STRUCTURED_OUTPUT_CLIENTS:
+        return "native"
+    if "format_instructions" in template_fields(template) and model_config.get("format_instructions", "full") != "none":
+        return "prompt"
+    return "missing"
+
+
+def recommended_format_instructions(model_config: Dict[str, Any]) -> str:
+    return "none" if model_config.get("client_module") in NATIVE_STRUCTURED_OUTPUT_CLIENTS else "compact"
+
+
+def validate_outputs(
+    model_config_key: str,
+    prompt_path: str,
+    format_instructions_mode: Optional[str],
+    reviews: Sequence[Any],
+    concurrency: int = 4,
+) -> Dict[str, Any]:
+    """
+    프롬프트와 응답 형식 지침을 바꾼 파생 설정으로 샘플을 그래프에 실행하여, 응답이 ReviewAnalysisOutput으로
+    파싱된 비율을 반환합니다. 분석 결과는 임시 저장소에 기록하고 버립니다.
+    """
+    from app.graph import get_compiled_graph
+
+    overrides = {"format_instructions": format_instructions_mode} if format_instructions_mode else {}
+    variant_key = register_prompt_variant(model_config_key, "budget-validation", prompt_path=prompt_path, overrides=overrides)
+    # 근사 중복 재사용이 켜져 있으면 파싱 성공률이 새 프롬프트가 아닌 재사용 결과로 계산되므로 끕니다.
+    graph = get_compiled_graph(near_duplicate=False)
+
+    def _run(review) -> Optional[str]:
+        state = AgentState.model_validate(graph.invoke(
+            AgentState(review_inputs=review.review_inputs, selected_model_config_key=variant_key)
+        ))
+        return None if state.analysis_output is not None else (state.analysis_error_message or "분석 결과 없음")
+
+    with tempfile.TemporaryDirectory(prefix="review_prompt_budget_") as work_dir:
+        set_result_store(SegmentedJsonlResultStore(os.path.join(work_dir, "segments")))
+        set_result_index(ResultIndex(os.path.join(work_dir, "index.sqlite3")))
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="prompt-budget") as executor:
+                errors = list(executor.map(_run, reviews))
+        finally:
+            set_result_store(None)
+            set_result_index(None)
+            unregister_prompt_variant(variant_key)
+
+    failures = [error for error in errors if error is not None]
+    return {
+        "reviews": len(errors),
+        "schema_valid": len(errors) - len(failures),
+        "valid_rate": round((len(errors) - len(failures)) / len(errors), 4) if errors else None,
+        "errors": failures[:5],
+    }
+
+
+def format_budget_table(original: Dict[str, Any], compacted: Dict[str, Any]) -> str:
+    lines = [f"{'section':<14}{'original':>12}{'share':>8}{'compact':>12}{'share':>8}{'saved':>9}"]
+    for name in SECTIONS:
+        before, after = original["sections"][name], compacted["sections"][name]
+        saved = before["tokens_mean"] - after["tokens_mean"]
+        lines.append(
+            f"{name:<14}{before['tokens_mean']:>12.1f}{before['share']:>8.1%}"
+            f"{after['tokens_mean']:>12.1f}{after['share']:>8.1%}{saved:>9.1f}"
+        )
+    total_before, total_after = original["total_tokens_mean"], compacted["total_tokens_mean"]
+    reduction = (total_before - total_after) / total_before if total_before else 0.0
+    lines.append(f"{'total':<14}{total_before:>12.1f}{'':>8}{total_after:>12.1f}{'':>8}{total_before - total_after:>9.1f} ({reduction:.1%})")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prompt token budget analyzer and compaction")
+    parser.add_argument("--version", type=str, default="v0.2", help="Prompt version to analyze")
+    parser.add_argument("--model-key", type=str, default="fake_deterministic", help="Model config whose format_instructions setting is used")
+    parser.add_argument("--format-instructions", choices=FORMAT_INSTRUCTIONS_MODES, default=None,
+                        help="Format instructions for the compacted variant (default: recommended for the model config)")
+    parser.add_argument("--reviews-path", type=str, default=None, help="Labeled raw reviews (JSONL/JSON); synthetic reviews if omitted")
+    parser.add_argument("--sample", type=int, default=50)
+    parser.add_argument("--tokenizer", choices=["auto", "tiktoken", "estimate"], default="auto")
+    parser.add_argument("--write-compact", action="store_true", help="Write the compacted template next to the original (<version>.compact.md)")
+    parser.add_argument("--validate", action="store_true", help="Run the compacted variant through the graph and check schema validity")
+    parser.add_argument("--min-valid-rate", type=float, default=DEFAULT_MIN_VALID_RATE)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    model_config = get_model_config(args.model_key)
+    if model_config is None:
+        print(f"Model config not found: {args.model_key}")
+        sys.exit(1)
+    tokenizer = get_tokenizer(args.tokenizer)
+    reviews, _ = load_sample(args.reviews_path, args.sample)
+    prompt_path = prompt_path_for_version(args.version)
+    template = load_prompt_template(os.path.join(PROJECT_ROOT, prompt_path))
+    compacted_template = compact_prompt_template(template)
+    original_mode = model_config.get("format_instructions")
+    compact_mode = args.format_instructions or recommended_format_instructions(model_config)
+
+    keyword_options = (model_config.get("keyword_extraction"), model_config.get("keyword_lexicon_path", DEFAULT_LEXICON_PATH))
+    original = analyze_prompt_budget(template, reviews, tokenizer, original_mode, *keyword_options)
+    compacted = analyze_prompt_budget(compacted_template, reviews, tokenizer, compact_mode, *keyword_options)
+    print(f"tokenizer: {tokenizer.name}, reviews: {len(reviews)}, prompt: {prompt_path}, model: {args.model_key}")
+    print(f"format_instructions: {original_mode or 'full'} -> {compact_mode}\n")
+    print(format_budget_table(original, compacted))
+
+    channel = schema_channel({**model_config, "format_instructions": compact_mode}, compacted_template)
+    print(f"\nschema channel for the compacted variant: {channel}")
+    if channel == "missing":
+        print("  warning: the prompt has no {format_instructions} and the client parses plain text; responses may drift from the schema.")
+
+    compact_path = compact_prompt_path(args.version)
+    if args.write_compact:
+        with open(os.path.join(PROJECT_ROOT, compact_path), "w", encoding="utf-8") as f:
+            f.write(compacted_template)
+        print(f"\nCompacted template written: {compact_path}")
+        print(f"Select it per model config:\n  prompt_path: \"{compact_path}\"\n  format_instructions: \"{compact_mode}\"")
+
+    if args.validate:
+        with tempfile.TemporaryDirectory(prefix="review_prompt_compact_") as work_dir:
+            validation_path = os.path.join(work_dir, os.path.basename(compact_path))
+            with open(validation_path, "w", encoding="utf-8") as f:
+                f.write(compacted_template)
+            validation = validate_outputs(args.model_key, validation_path, compact_mode, reviews, args.concurrency)
+        print(f"\nschema-valid responses: {validation['schema_valid']}/{validation['reviews']} ({validation['valid_rate']:.1%})")
+        for error in validation["errors"]:
+            print(f"  - {error}")
+        if validation["valid_rate"] is None or validation["valid_rate"] < args.min_valid_rate:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
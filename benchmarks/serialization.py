@@ -0,0 +1,112 @@
+# 분석 API 응답 직렬화 벤치마크
+#
+# 응답 형태(기존 BentoML 기본 직렬화의 전체 AgentState / orjson 전체 / 필드 선택 / result 형태)별로
+# 배치 크기에 따른 페이로드 크기와 직렬화 시간을 비교합니다.
+#
+#   python -m benchmarks.serialization --batch-sizes 1,10,100
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from app.response_projection import serialize_state, serialize_states
+from app.schemas import AgentState
+from benchmarks.micro import _sample_state
+
+# 필드 선택 예시: 점주 답글 추천 화면에 필요한 필드
+SELECTED_FIELDS = ["analysis_output", "error_code"]
+
+
+def _bentoml_serializer(api_name: str) -> Callable[[object], bytes]:
+    """서비스 API의 출력 스펙으로 응답 본문을 만드는 BentoML 기본 직렬화 경로"""
+    from _bentoml_impl.serde import ALL_SERDE
+
+    from bentos.service import ReviewAnalysisService
+
+    output_spec = ReviewAnalysisService.apis[api_name].output_spec
+    serde = ALL_SERDE["application/json"]()
+    loop = asyncio.new_event_loop()
+
+    async def _render(payload) -> bytes:
+        response = await output_spec.to_http_response(payload, serde)
+        if hasattr(response, "body"):
+            return bytes(response.body)
+        # BentoML은 JSON 응답 본문을 (동기) 청크 이터레이터로 돌려줍니다.
+        return b"".join(chunk if isinstance(chunk, bytes) else chunk.encode("utf-8") for chunk in response.body_iterator)
+
+    return lambda payload: loop.run_until_complete(_render(payload))
+
+
+def build_serializers(batch_size: int) -> Dict[str, Callable[[List[AgentState]], bytes]]:
+    if batch_size == 1:
+        default = _bentoml_serializer("analyze_review")
+        return {
+            "bentoml_default_full": lambda states: default(states[0]),
+            "orjson_full": lambda states: serialize_state(states[0], response_shape="full"),
+            "orjson_fields": lambda states: serialize_state(states[0], fields=SELECTED_FIELDS),
+            "orjson_result": lambda states: serialize_state(states[0], response_shape="result"),
+        }
+    default = _bentoml_serializer("analyze_reviews_batch")
+    return {
+        "bentoml_default_full": default,
+        "orjson_full": lambda states: serialize_states(states, response_shape="full"),
+        "orjson_fields": lambda states: serialize_states(states, fields=SELECTED_FIELDS),
+        "orjson_result": lambda states: serialize_states(states, response_shape="result"),
+    }
+
+
+def measure_serializer(serializer: Callable[[List[AgentState]], bytes], states: List[AgentState], rounds: int, iterations: int) -> Dict[str, float]:
+    payload = serializer(states)
+    per_call = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            serializer(states)
+        per_call.append((time.perf_counter() - started) / iterations)
+    return {
+        "payload_bytes": len(payload),
+        "median_us": round(statistics.median(per_call) * 1e6, 2),
+        "min_us": round(min(per_call) * 1e6, 2),
+    }
+
+
+def run(batch_sizes: List[int], rounds: int = 5, iterations: int = 200) -> List[Dict]:
+    state = _sample_state().model_copy(update={"saved_record_id": "20250101T000000-000000-abcd1234"})
+    results = []
+    for batch_size in batch_sizes:
+        states = [state] * batch_size
+        scaled_iterations = max(1, iterations // batch_size)
+        for shape, serializer in build_serializers(batch_size).items():
+            measurement = measure_serializer(serializer, states, rounds, scaled_iterations)
+            results.append({"batch_size": batch_size, "shape": shape, **measurement})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Payload size and serialization time of analyze API responses")
+    parser.add_argument("--batch-sizes", type=str, default="1,10,100")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--iterations", type=int, default=200, help="Serializations per round for batch size 1 (scaled down for larger batches)")
+    parser.add_argument("--output", type=str, default=None, help="Write results JSON to this path")
+    args = parser.parse_args()
+
+    results = run([int(size) for size in args.batch_sizes.split(",")], args.rounds, args.iterations)
+    baseline_by_batch = {r["batch_size"]: r for r in results if r["shape"] == "bentoml_default_full"}
+    print(f"{'batch':>6} {'shape':<22} {'bytes':>10} {'size vs default':>16} {'median(us)':>12} {'speedup':>8}")
+    for result in results:
+        baseline = baseline_by_batch[result["batch_size"]]
+        print(
+            f"{result['batch_size']:>6} {result['shape']:<22} {result['payload_bytes']:>10} "
+            f"{result['payload_bytes'] / baseline['payload_bytes']:>15.0%} {result['median_us']:>12.1f} "
+            f"{baseline['median_us'] / result['median_us']:>7.1f}x"
+        )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+# 메모리 소크(soak) 테스트
+#
+# 결정적 가짜 LLM 제공자(fake_deterministic)와 임시 결과 저장소로 컴파일된 분석 그래프를 프로세스 안에서 오래 실행하여,
+# 서비스 메모리 한도(512Mi) 안에서 RSS가 평평하게 유지되는지 확인합니다. 워밍업 뒤 일정 요청 수마다 GC를 실행하고
+# RSS를 기록하여 증가량과 기울기(1,000건당 KiB), 프로세스 캐시 크기를 출력하며, --tracemalloc이면 요청당 할당량과
+# 워밍업 이후 가장 많이 늘어난 할당 위치도 함께 출력합니다. 증가량이 --max-growth-mb를 넘으면 종료 코드 1로 끝납니다.
+#
+#   python -m benchmarks.soak --requests 20000 --concurrency 16 --max-growth-mb 32
+#   python -m benchmarks.soak --requests 2000 --tracemalloc --output soak.json
+
+import argparse
+import gc
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.memory import cache_sizes, count_allocations, get_rss_bytes, take_memory_snapshot
+from app.result_index import ResultIndex, set_result_index
+from app.result_store import SegmentedJsonlResultStore, set_result_store
+from app.schemas import AgentState, ReviewInputs
+from benchmarks.load_test import make_review
+from models.fake_model import FAKE_LLM_LATENCY_ENV
+
+MIB = 1024 * 1024
+
+
+def _rss_slope_kib_per_1k(points: List[Dict[str, int]]) -> Optional[float]:
+    """(요청 수, RSS) 표본의 최소제곱 기울기. 첫 표본과 마지막 표본의 차이보다 일시적인 흔들림에 덜 민감합니다."""
+    if len(points) < 2:
+        return None
+    requests = np.array([point["requests"] for point in points], dtype=float)
+    rss_kib = np.array([point["rss_bytes"] for point in points], dtype=float) / 1024
+    slope, _ = np.polyfit(requests, rss_kib, 1)
+    return round(float(slope) * 1000, 2)
+
+
+def run_soak(
+    requests: int = 2000,
+    concurrency: int = 8,
+    warmup_requests: int = 200,
+    sample_every: int = 200,
+    model_config_key: str = "fake_deterministic",
+    trace_allocations: bool = False,
+) -> Dict[str, Any]:
+    """
+    워밍업 `warmup_requests`건 뒤 `requests`건을 `concurrency`개 스레드로 실행하고 RSS 표본과 요약을 반환합니다.
+    리뷰 텍스트는 요청마다 다르므로 근사 중복 인덱스를 사용하지 않는 그래프로 실행합니다 (켜면 max_entries까지 늘어나는 것이 정상입니다).
+    """
+    from app.graph import get_compiled_graph
+
+    previous_latency = os.environ.get(FAKE_LLM_LATENCY_ENV)
+    os.environ[FAKE_LLM_LATENCY_ENV] = "0"
+    started_tracing = trace_allocations and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    request_peaks: List[int] = []
+    with tempfile.TemporaryDirectory(prefix="review_soak_") as work_dir:
+        # 실행이 끝나면 호출한 쪽(테스트, 서비스 프로세스)이 쓰던 저장소와 인덱스로 되돌립니다.
+        previous_store = set_result_store(SegmentedJsonlResultStore(os.path.join(work_dir, "segments")))
+        previous_index = set_result_index(ResultIndex(os.path.join(work_dir, "index.sqlite3")))
+        try:
+            compiled_graph = get_compiled_graph(near_duplicate=False)
+
+            def _invoke(index: int) -> None:
+                state = AgentState(review_inputs=ReviewInputs(**make_review(index)), selected_model_config_key=model_config_key)
+                compiled_graph.invoke(state)
+
+            def _invoke_counted(index: int) -> None:
+                # count_allocations는 중첩할 수 없으므로 할당량은 단일 스레드 구간에서만 측정합니다.
+                with count_allocations() as counter:
+                    _invoke(index)
+                request_peaks.append(counter.peak_bytes)
+
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                list(executor.map(_invoke, range(warmup_requests)))
+                gc.collect()
+                if trace_allocations:
+                    take_memory_snapshot(top=0) # 워밍업 이후를 diff 기준으로 삼습니다.
+                    for index in range(warmup_requests, warmup_requests + min(sample_every, 50)):
+                        _invoke_counted(index)
+                points = [{"requests": 0, "rss_bytes": get_rss_bytes()}]
+                started = time.perf_counter()
+                completed = 0
+                while completed < requests:
+                    chunk = min(sample_every, requests - completed)
+                    offset = warmup_requests + completed
+                    list(executor.map(_invoke, range(offset, offset + chunk)))
+                    completed += chunk
+                    gc.collect()
+                    points.append({"requests": completed, "rss_bytes": get_rss_bytes()})
+                elapsed_seconds = time.perf_counter() - started
+            snapshot = take_memory_snapshot(top=10, diff=True) if trace_allocations else None
+        finally:
+            set_result_store(previous_store)
+            set_result_index(previous_index)
+            if started_tracing:
+                tracemalloc.stop()
+            if previous_latency is None:
+                os.environ.pop(FAKE_LLM_LATENCY_ENV, None)
+            else:
+                os.environ[FAKE_LLM_LATENCY_ENV] = previous_latency
+
+    rss_values = [point["rss_bytes"] for point in points]
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "warmup_requests": warmup_requests,
+        "elapsed_seconds": round(elapsed_seconds, 3),
+        "throughput_rps": round(requests / elapsed_seconds, 1) if elapsed_seconds > 0 else None,
+        "rss_start_mb": round(rss_values[0] / MIB, 2),
+        "rss_end_mb": round(rss_values[-1] / MIB, 2),
+        "rss_max_mb": round(max(rss_values) / MIB, 2),
+        "rss_growth_mb": round((rss_values[-1] - rss_values[0]) / MIB, 2),
+        "rss_slope_kib_per_1k_requests": _rss_slope_kib_per_1k(points),
+        "request_alloc_peak_kib_median": round(statistics.median(request_peaks) / 1024, 2) if request_peaks else None,
+        "cache_sizes": cache_sizes(),
+        "top_allocation_growth": [stat.model_dump() for stat in snapshot.top_allocations] if snapshot else [],
+        "samples": points,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="In-process memory soak test with the fake LLM provider")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup-requests", type=int, default=500)
+    parser.add_argument("--sample-every", type=int, default=500, help="Record RSS after this many requests")
+    parser.add_argument("--model-key", type=str, default="fake_deterministic")
+    parser.add_argument("--tracemalloc", action="store_true", help="Also report per-request allocations and top allocation growth")
+    parser.add_argument("--max-growth-mb", type=float, default=None, help="Exit with status 1 if RSS grows more than this after warm-up")
+    parser.add_argument("--output", type=str, default=None, help="Write results JSON to this path")
+    args = parser.parse_args()
+
+    result = run_soak(args.requests, args.concurrency, args.warmup_requests, args.sample_every, args.model_key, args.tracemalloc)
+
+    print(f"{'requests':>10} {'rss(MB)':>10}")
+    for point in result["samples"]:
+        print(f"{point['requests']:>10} {point['rss_bytes'] / MIB:>10.1f}")
+    print(
+        f"\nRSS {result['rss_start_mb']:.1f}MB -> {result['rss_end_mb']:.1f}MB (growth {result['rss_growth_mb']:+.2f}MB, "
+        f"slope {result['rss_slope_kib_per_1k_requests']}KiB/1k requests, max {result['rss_max_mb']:.1f}MB), "
+        f"{result['throughput_rps']} req/s"
+    )
+    print(f"Cache sizes: {result['cache_sizes']}")
+    if args.tracemalloc:
+        print(f"Per-request allocation peak (median): {result['request_alloc_peak_kib_median']}KiB")
+        for stat in result["top_allocation_growth"]:
+            print(f"  {stat['size_bytes'] / 1024:>+10.1f}KiB {stat['count']:>+8} {stat['location']}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+    if args.max_growth_mb is not None and result["rss_growth_mb"] > args.max_growth_mb:
+        print(f"\nRSS growth {result['rss_growth_mb']:.2f}MB exceeds {args.max_growth_mb:.2f}MB")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+# 서비스 워커 콜드 스타트 측정
+#
+# 새 파이썬 프로세스에서 `python -X importtime`으로 모듈별 임포트 시간을 수집하고,
+# 서비스 모듈 임포트부터 ReviewAnalysisService 초기화(그래프 컴파일, 워밍업) 완료까지의 준비 시간(time-to-ready)을
+# 단계별로 측정합니다. `--max-ready-seconds`를 주면 준비 시간이 예산을 넘을 때 종료 코드 1로 실패합니다.
+#
+#   python -m benchmarks.startup --top 20 --max-ready-seconds 10
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from benchmarks.load_test import write_service_config
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SERVICE_MODULE = "bentos.service"
+# 설정에서 실제로 사용하기 전까지는 로드되지 않아야 하는 제공자 SDK 모듈
+LAZY_PROVIDER_MODULES = ["langchain_openai", "langchain_google_genai", "openai", "google.generativeai"]
+
+_IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+# 새 프로세스에서 실행되어 준비 시간을 단계별로 측정하고 JSON 한 줄을 출력합니다.
+_TIME_TO_READY_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+from bentos.service import ReviewAnalysisService
+imported = time.perf_counter()
+lazy_modules_at_import = sorted(name for name in {lazy_modules!r} if name in sys.modules)
+service = ReviewAnalysisService.inner()
+ready = time.perf_counter()
+print(json.dumps({{
+    "import_seconds": imported - started,
+    "init_seconds": ready - imported,
+    "time_to_ready_seconds": ready - started,
+    "warmup_seconds": service.warmup_timings,
+    "provider_modules_loaded_at_import": lazy_modules_at_import,
+}}))
+"""
+
+
+@dataclass
+class ImportRecord:
+    """`-X importtime` 출력 한 줄 (마이크로초)"""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_import_times(stderr: str) -> List[ImportRecord]:
+    records = []
+    for line in stderr.splitlines():
+        match = _IMPORT_TIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        records.append(ImportRecord(module=module, self_us=int(self_us), cumulative_us=int(cumulative_us), depth=(len(indent) - 1) // 2))
+    return records
+
+
+def _subprocess_env(service_config_path: Optional[str]) -> Dict[str, str]:
+    env = {**os.environ, "FAKE_LLM_LATENCY_SECONDS": "0"}
+    if service_config_path:
+        env["REVIEW_ANALYSIS_SERVICE_CONFIG"] = service_config_path
+    return env
+
+
+def profile_imports(module: str = SERVICE_MODULE) -> List[ImportRecord]:
+    """새 프로세스에서 `module`을 임포트하며 모듈별 임포트 시간을 수집합니다."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        env=_subprocess_env(None),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_import_times(completed.stderr)
+
+
+def top_level_packages(records: List[ImportRecord]) -> Dict[str, float]:
+    """최상위 패키지별 자체 임포트 시간 합계(ms)를 큰 순서로 반환합니다."""
+    totals: Dict[str, int] = {}
+    for record in records:
+        package = record.module.split(".")[0]
+        totals[package] = totals.get(package, 0) + record.self_us
+    return {package: round(us / 1000, 1) for package, us in sorted(totals.items(), key=lambda item: -item[1])}
+
+
+def measure_time_to_ready(service_config_path: Optional[str] = None) -> Dict:
+    """새 프로세스에서 서비스 모듈 임포트부터 서비스 초기화 완료까지의 시간을 측정합니다."""
+    completed = subprocess.run(
+        [sys.executable, "-c", _TIME_TO_READY_SCRIPT.format(lazy_modules=LAZY_PROVIDER_MODULES)],
+        cwd=PROJECT_ROOT,
+        env=_subprocess_env(service_config_path),
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"서비스 초기화에 실패했습니다:\n{completed.stderr[-4000:]}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time profile and time-to-ready for ReviewAnalysisService workers")
+    parser.add_argument("--module", type=str, default=SERVICE_MODULE)
+    parser.add_argument("--top", type=int, default=20, help="Number of slowest modules to show")
+    parser.add_argument("--runs", type=int, default=3, help="Time-to-ready measurements (the median is reported)")
+    parser.add_argument("--real-config", action="store_true", help="Use the service config as is instead of the fake provider")
+    parser.add_argument("--max-ready-seconds", type=float, default=None, help="Exit with status 1 when time-to-ready exceeds this")
+    parser.add_argument("--output", type=str, default=None, help="Write the report JSON to this path")
+    args = parser.parse_args()
+
+    records = profile_imports(args.module)
+    total_us = max((record.cumulative_us for record in records if record.module == args.module), default=0)
+    print(f"Import of {args.module}: {total_us / 1000:.1f}ms ({len(records)} modules)")
+    print(f"\n{'module':<60} {'cumulative(ms)':>15} {'self(ms)':>10}")
+    for record in sorted(records, key=lambda r: -r.cumulative_us)[: args.top]:
+        print(f"{record.module:<60} {record.cumulative_us / 1000:>15.1f} {record.self_us / 1000:>10.1f}")
+    packages = top_level_packages(records)
+    print("\nSelf time by top-level package (ms): " + ", ".join(f"{name}={ms}" for name, ms in list(packages.items())[: args.top]))
+
+    with tempfile.TemporaryDirectory(prefix="review_startup_") as work_dir:
+        service_config_path = None if args.real_config else write_service_config(work_dir, keep_rate_limit=True)
+        runs = [measure_time_to_ready(service_config_path) for _ in range(max(1, args.runs))]
+    runs.sort(key=lambda run: run["time_to_ready_seconds"])
+    median_run = runs[len(runs) // 2]
+    print(
+        f"\nTime to ready (median of {len(runs)}): {median_run['time_to_ready_seconds']:.3f}s "
+        f"(import {median_run['import_seconds']:.3f}s, init {median_run['init_seconds']:.3f}s)"
+    )
+    print("Init stages: " + ", ".join(f"{stage}={seconds:.3f}s" for stage, seconds in median_run["warmup_seconds"].items()))
+    if median_run["provider_modules_loaded_at_import"]:
+        print(f"Provider SDKs loaded at import: {median_run['provider_modules_loaded_at_import']}")
+
+    if args.output:
+        report = {
+            "import_total_ms": round(total_us / 1000, 1),
+            "slowest_imports": [record.__dict__ for record in sorted(records, key=lambda r: -r.cumulative_us)[: args.top]],
+            "packages_self_ms": packages,
+            "time_to_ready": median_run,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.max_ready_seconds is not None and median_run["time_to_ready_seconds"] > args.max_ready_seconds:
+        print(f"\nTime to ready exceeds the budget of {args.max_ready_seconds}s")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
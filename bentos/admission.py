@@ -0,0 +1,456 @@
+import logging
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, List, Optional
+
+from prometheus_client import Counter, Gauge, Histogram
+from pydantic import BaseModel
+
+from app.config_loader import get_service_config
+
+# 이 모듈을 위한 로깅 설정
+logger = logging.getLogger(__name__)
+
+# 오토스케일링 판단용 Prometheus 지표 (BentoML /metrics 엔드포인트로 노출)
+ADMISSION_LIMIT = Gauge(
+    name="review_analysis_admission_concurrency_limit",
+    documentation="현재 적응형 동시 실행 한도",
+    multiprocess_mode="livesum",
+)
+ADMISSION_IN_FLIGHT = Gauge(
+    name="review_analysis_admission_in_flight",
+    documentation="실행 중인 분석 수",
+    multiprocess_mode="livesum",
+)
+ADMISSION_QUEUE_LENGTH = Gauge(
+    name="review_analysis_admission_queue_length",
+    documentation="우선순위 레인별로 실행 차례를 기다리는 분석 수",
+    labelnames=["lane"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_REJECTED = Counter(
+    name="review_analysis_admission_rejected",
+    documentation="수락 제어로 거절된 요청 수",
+    labelnames=["lane", "reason"],
+)
+ADMISSION_QUEUE_WAIT = Histogram(
+    name="review_analysis_admission_queue_wait_seconds",
+    documentation="우선순위 레인별로 실행 슬롯을 얻기까지 대기한 시간",
+    labelnames=["lane"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0),
+)
+
+OVERLOADED_ERROR_CODE = "OVERLOADED"
+
+INTERACTIVE_LANE = "interactive"
+BULK_LANE = "bulk"
+
+# stride 스케줄링의 기준 값. 레인의 stride는 STRIDE_BASE / weight 입니다.
+STRIDE_BASE = 1 << 20
+
+
+class AdmissionRejected(Exception):
+    """과부하로 요청을 받아들이지 않은 경우. `retry_after_seconds` 뒤에 재시도를 권장합니다."""
+
+    def __init__(self, message: str, reason: str, retry_after_seconds: int):
+        super().__init__(message)
+        self.reason = reason
+        self.retry_after_seconds = retry_after_seconds
+
+
+class LaneConfig(BaseModel):
+    """우선순위 레인 설정"""
+    weight: float = 1.0 # 경합 시 실행 슬롯과 호출 예산을 나누는 가중치
+    max_queue_size: int = 32
+    max_queue_time_seconds: float = 10.0
+
+
+class LaneStats(BaseModel):
+    """우선순위 레인별 수락 제어 통계"""
+    weight: float
+    queue_length: int
+    max_queue_size: int
+    admitted_total: int
+    rejected_total: Dict[str, int]
+    queue_wait_ewma_seconds: Optional[float] = None
+    queue_wait_p95_seconds: Optional[float] = None # 최근 대기 시간 표본 기준
+
+
+class AdmissionStats(BaseModel):
+    """오토스케일링 판단에 사용할 수 있는 수락 제어 통계"""
+    concurrency_limit: int
+    in_flight: int
+    queue_length: int
+    max_queue_size: int
+    admitted_total: int
+    completed_total: int
+    failed_total: int
+    rejected_total: Dict[str, int]
+    latency_ewma_seconds: Optional[float] = None
+    queue_wait_ewma_seconds: Optional[float] = None
+    target_latency_seconds: float
+    utilization: float # (in_flight + queue_length) / concurrency_limit
+    rate_limit_per_second: Optional[float] = None # LLM 제공자 호출 예산. None이면 제한 없음
+    lanes: Dict[str, LaneStats] = {}
+
+
+class AdmissionTicket:
+    """`admit` 블록 안에서 실행 결과를 수락 제어기에 알리기 위한 핸들"""
+
+    def __init__(self):
+        self.failed = False
+
+    def mark_failed(self) -> None:
+        """예외 없이 끝났지만 과부하 신호로 볼 실패(예: 처리 기한 초과)였음을 표시합니다."""
+        self.failed = True
+
+
+class TokenBucket:
+    """LLM 제공자 호출 예산을 표현하는 토큰 버킷. 잠금은 호출하는 쪽(AdmissionController)이 보유합니다."""
+
+    def __init__(self, rate_per_second: float, burst: float):
+        self.rate_per_second = rate_per_second
+        self.burst = max(burst, 1.0)
+        self._tokens = self.burst
+        self._updated_at = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate_per_second)
+        self._updated_at = now
+
+    def try_consume(self) -> bool:
+        self._refill(time.monotonic())
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return True
+        return False
+
+    def seconds_until_available(self) -> float:
+        self._refill(time.monotonic())
+        if self._tokens >= 1.0:
+            return 0.0
+        return (1.0 - self._tokens) / self.rate_per_second
+
+
+class _Lane:
+    """우선순위 레인 하나의 대기열과 stride 스케줄링 상태"""
+
+    def __init__(self, name: str, config: LaneConfig):
+        self.name = name
+        self.weight = config.weight
+        self.stride = STRIDE_BASE / config.weight
+        self.pass_value = 0.0
+        self.max_queue_size = config.max_queue_size
+        self.max_queue_time_seconds = config.max_queue_time_seconds
+        self.queue: Deque["_Waiter"] = deque()
+        self.admitted_total = 0
+        self.rejected_total = {"queue_full": 0, "queue_timeout": 0}
+        self.queue_wait_ewma: Optional[float] = None
+        self.recent_queue_waits: Deque[float] = deque(maxlen=1000)
+
+
+class _Waiter:
+    __slots__ = ("event", "granted", "enqueued_at", "lane")
+
+    def __init__(self, lane: _Lane):
+        self.event = threading.Event()
+        self.granted = False
+        self.enqueued_at = time.monotonic()
+        self.lane = lane
+
+
+class AdmissionController:
+    """
+    그래프 실행 앞단의 수락 제어기.
+
+    - 동시에 실행되는 분석 수를 `concurrency_limit` 이하로 제한하고, 나머지는 우선순위 레인별로 크기가 제한된
+      FIFO 대기열에서 기다립니다.
+    - 대기열이 가득 찼거나 레인의 `max_queue_time_seconds`(또는 요청의 남은 기한) 안에 차례가 오지 않으면
+      `AdmissionRejected`로 일찍 거절합니다.
+    - 빈 실행 슬롯과 LLM 제공자 호출 예산(토큰 버킷)은 stride 스케줄링으로 레인 가중치에 비례하여 나눕니다.
+      대량 재분석 작업이 대기열을 채워도 대화형 요청은 가중치만큼 먼저 차례를 받습니다.
+    - 동시 실행 한도는 관측된 LLM 처리 시간에 따라 AIMD 방식으로 조정됩니다. 처리 시간이 목표 이하이면 한도를
+      천천히 늘리고(한도당 +1), 목표를 넘거나 실패하면 곱셈 감소시킵니다.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        max_queue_size: int = 32,
+        max_queue_time_seconds: float = 10.0,
+        target_latency_seconds: float = 8.0,
+        decrease_factor: float = 0.7,
+        ewma_alpha: float = 0.2,
+        lanes: Optional[Dict[str, LaneConfig]] = None,
+        default_lane: str = INTERACTIVE_LANE,
+        rate_limit_per_second: Optional[float] = None,
+        rate_limit_burst: float = 1.0,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency_seconds = target_latency_seconds
+        self.decrease_factor = decrease_factor
+        self.ewma_alpha = ewma_alpha
+
+        # 레인 설정이 없으면 max_queue_size / max_queue_time_seconds를 쓰는 단일 레인으로 동작합니다.
+        if not lanes:
+            lanes = {default_lane: LaneConfig(max_queue_size=max_queue_size, max_queue_time_seconds=max_queue_time_seconds)}
+        if default_lane not in lanes:
+            raise ValueError(f"기본 레인 '{default_lane}'이(가) 레인 설정에 없습니다: {list(lanes)}")
+        self.default_lane = default_lane
+        self._lanes: Dict[str, _Lane] = {name: _Lane(name, config) for name, config in lanes.items()}
+        self.max_queue_size = sum(lane.max_queue_size for lane in self._lanes.values())
+        self._rate_bucket = TokenBucket(rate_limit_per_second, rate_limit_burst) if rate_limit_per_second else None
+
+        self._lock = threading.Lock()
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._in_flight = 0
+        self._queued = 0
+        self._virtual_time = 0.0
+        self._last_decrease_at = 0.0
+        self._latency_ewma: Optional[float] = None
+        self._queue_wait_ewma: Optional[float] = None
+        self._admitted_total = 0
+        self._completed_total = 0
+        self._failed_total = 0
+
+    @property
+    def concurrency_limit(self) -> int:
+        return max(self.min_limit, int(self._limit))
+
+    @property
+    def lane_names(self) -> List[str]:
+        return list(self._lanes)
+
+    # --- 수락/반환 ---
+
+    def _retry_after_seconds(self, lane: _Lane) -> int:
+        """레인의 대기열이 비워지는 데 걸릴 시간을 추정하여 재시도 권장 시간(초)으로 반환합니다."""
+        latency = self._latency_ewma or self.target_latency_seconds
+        estimate = (len(lane.queue) + 1) * latency / self.concurrency_limit
+        if self._rate_bucket is not None:
+            estimate = max(estimate, (self._queued + 1) / self._rate_bucket.rate_per_second)
+        return int(min(max(math.ceil(estimate), 1), 60))
+
+    def _publish_gauges(self) -> None:
+        """(잠금 보유 상태에서 호출) 현재 상태를 Prometheus 게이지에 반영합니다."""
+        ADMISSION_LIMIT.set(self.concurrency_limit)
+        ADMISSION_IN_FLIGHT.set(self._in_flight)
+        for lane in self._lanes.values():
+            ADMISSION_QUEUE_LENGTH.labels(lane=lane.name).set(len(lane.queue))
+
+    def _reject(self, lane: _Lane, reason: str, message: str) -> AdmissionRejected:
+        lane.rejected_total[reason] += 1
+        ADMISSION_REJECTED.labels(lane=lane.name, reason=reason).inc()
+        self._publish_gauges()
+        return AdmissionRejected(message, reason=reason, retry_after_seconds=self._retry_after_seconds(lane))
+
+    def _has_capacity(self) -> bool:
+        """(잠금 보유 상태에서 호출) 실행 슬롯이 비어 있으면 호출 예산 토큰을 하나 소비하고 True를 반환합니다."""
+        if self._in_flight >= self.concurrency_limit:
+            return False
+        return self._rate_bucket is None or self._rate_bucket.try_consume()
+
+    def _grant(self, lane: _Lane, wait_seconds: float) -> None:
+        self._in_flight += 1
+        self._admitted_total += 1
+        lane.admitted_total += 1
+        ADMISSION_QUEUE_WAIT.labels(lane=lane.name).observe(wait_seconds)
+        lane.recent_queue_waits.append(wait_seconds)
+        if lane.queue_wait_ewma is None:
+            lane.queue_wait_ewma = wait_seconds
+        else:
+            lane.queue_wait_ewma += self.ewma_alpha * (wait_seconds - lane.queue_wait_ewma)
+        if self._queue_wait_ewma is None:
+            self._queue_wait_ewma = wait_seconds
+        else:
+            self._queue_wait_ewma += self.ewma_alpha * (wait_seconds - self._queue_wait_ewma)
+
+    def _dispatch(self) -> None:
+        """
+        (잠금 보유 상태에서 호출) 빈 실행 슬롯과 호출 예산만큼 대기 중인 요청을 깨웁니다.
+        pass 값이 가장 작은 레인을 고르고 그 레인의 pass를 stride만큼 늘리므로, 레인은 가중치에 비례하여 차례를 받습니다.
+        """
+        while self._queued and self._has_capacity():
+            lane = min((lane for lane in self._lanes.values() if lane.queue), key=lambda lane: lane.pass_value)
+            self._virtual_time = lane.pass_value
+            lane.pass_value += lane.stride
+            waiter = lane.queue.popleft()
+            self._queued -= 1
+            waiter.granted = True
+            self._grant(lane, time.monotonic() - waiter.enqueued_at)
+            waiter.event.set()
+
+        if self._queued and self._in_flight < self.concurrency_limit:
+            # 실행 슬롯은 남았지만 호출 예산이 부족한 경우, 대기 중인 요청 하나를 깨워 다음 토큰 시각에 다시 배분하게 합니다.
+            next(lane for lane in self._lanes.values() if lane.queue).queue[0].event.set()
+
+    def _poll_interval(self, remaining: float) -> float:
+        """(잠금 보유 상태에서 호출) 호출 예산을 기다리는 경우 다음 토큰이 생길 때 다시 배분을 시도합니다."""
+        if self._rate_bucket is None or self._in_flight >= self.concurrency_limit:
+            return remaining
+        return min(remaining, max(self._rate_bucket.seconds_until_available(), 0.001))
+
+    def acquire(self, max_wait_seconds: Optional[float] = None, lane: Optional[str] = None) -> None:
+        """
+        `lane` 우선순위 레인(생략 시 기본 레인)에서 실행 슬롯 하나를 얻을 때까지 기다립니다.
+        `max_wait_seconds`가 주어지면 레인의 `max_queue_time_seconds`와 둘 중 짧은 시간만 기다립니다.
+        """
+        lane_name = lane or self.default_lane
+        if lane_name not in self._lanes:
+            raise ValueError(f"알 수 없는 우선순위 레인입니다: {lane_name} (사용 가능: {self.lane_names})")
+        selected_lane = self._lanes[lane_name]
+
+        wait_limit = selected_lane.max_queue_time_seconds
+        if max_wait_seconds is not None:
+            wait_limit = min(wait_limit, max(max_wait_seconds, 0.0))
+
+        with self._lock:
+            if not self._queued and self._has_capacity():
+                self._grant(selected_lane, 0.0)
+                self._publish_gauges()
+                return
+            if len(selected_lane.queue) >= selected_lane.max_queue_size:
+                raise self._reject(
+                    selected_lane,
+                    "queue_full",
+                    f"'{lane_name}' 레인의 대기열이 가득 찼습니다 (대기 {len(selected_lane.queue)}건, 실행 중 {self._in_flight}건).",
+                )
+            if not selected_lane.queue:
+                # 쉬고 있던 레인이 밀린 차례를 한꺼번에 가져가지 않도록 현재 가상 시각부터 다시 시작합니다.
+                selected_lane.pass_value = max(selected_lane.pass_value, self._virtual_time)
+            waiter = _Waiter(selected_lane)
+            selected_lane.queue.append(waiter)
+            self._queued += 1
+            self._dispatch()
+            self._publish_gauges()
+
+        give_up_at = waiter.enqueued_at + wait_limit
+        while True:
+            with self._lock:
+                timeout = self._poll_interval(give_up_at - time.monotonic())
+            waiter.event.wait(timeout=max(timeout, 0.0))
+
+            with self._lock:
+                if not waiter.granted:
+                    self._dispatch()
+                    waiter.event.clear()
+                if waiter.granted:
+                    self._publish_gauges()
+                    return
+                if time.monotonic() >= give_up_at:
+                    selected_lane.queue.remove(waiter)
+                    self._queued -= 1
+                    raise self._reject(
+                        selected_lane,
+                        "queue_timeout",
+                        f"'{lane_name}' 레인의 대기열에서 {wait_limit:.1f}초 안에 실행 차례가 오지 않았습니다.",
+                    )
+
+    def release(self, latency_seconds: float, success: bool = True) -> None:
+        """실행 슬롯을 반환하고, 관측된 처리 시간으로 동시 실행 한도를 조정합니다."""
+        with self._lock:
+            self._in_flight -= 1
+            if success:
+                self._completed_total += 1
+            else:
+                self._failed_total += 1
+
+            if self._latency_ewma is None:
+                self._latency_ewma = latency_seconds
+            else:
+                self._latency_ewma += self.ewma_alpha * (latency_seconds - self._latency_ewma)
+
+            now = time.monotonic()
+            if not success or latency_seconds > self.target_latency_seconds:
+                # 한 번의 혼잡 신호에 연속으로 여러 번 줄이지 않도록, 목표 처리 시간 간격으로 한 번만 감소시킵니다.
+                if now - self._last_decrease_at >= self.target_latency_seconds:
+                    self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+                    self._last_decrease_at = now
+                    logger.info(f"동시 실행 한도 감소: {self.concurrency_limit} (처리 시간 {latency_seconds:.2f}초, 성공 {success})")
+            elif self._in_flight + 1 >= self.concurrency_limit or self._queued:
+                # 한도를 실제로 채워 쓰고 있을 때만 늘립니다 (한도당 +1).
+                self._limit = min(float(self.max_limit), self._limit + 1.0 / self._limit)
+
+            self._dispatch()
+            self._publish_gauges()
+
+    @contextmanager
+    def admit(self, max_wait_seconds: Optional[float] = None, lane: Optional[str] = None) -> Iterator[AdmissionTicket]:
+        """`with controller.admit() as ticket:` 블록 동안 실행 슬롯을 점유합니다."""
+        self.acquire(max_wait_seconds=max_wait_seconds, lane=lane)
+        started = time.monotonic()
+        ticket = AdmissionTicket()
+        success = False
+        try:
+            yield ticket
+            success = not ticket.failed
+        finally:
+            self.release(time.monotonic() - started, success=success)
+
+    def stats(self) -> AdmissionStats:
+        with self._lock:
+            limit = self.concurrency_limit
+            rejected_total = {"queue_full": 0, "queue_timeout": 0}
+            lane_stats = {}
+            for lane in self._lanes.values():
+                for reason, count in lane.rejected_total.items():
+                    rejected_total[reason] += count
+                waits = sorted(lane.recent_queue_waits)
+                lane_stats[lane.name] = LaneStats(
+                    weight=lane.weight,
+                    queue_length=len(lane.queue),
+                    max_queue_size=lane.max_queue_size,
+                    admitted_total=lane.admitted_total,
+                    rejected_total=dict(lane.rejected_total),
+                    queue_wait_ewma_seconds=lane.queue_wait_ewma,
+                    queue_wait_p95_seconds=waits[min(len(waits) - 1, int(len(waits) * 0.95))] if waits else None,
+                )
+            return AdmissionStats(
+                concurrency_limit=limit,
+                in_flight=self._in_flight,
+                queue_length=self._queued,
+                max_queue_size=self.max_queue_size,
+                admitted_total=self._admitted_total,
+                completed_total=self._completed_total,
+                failed_total=self._failed_total,
+                rejected_total=rejected_total,
+                latency_ewma_seconds=self._latency_ewma,
+                queue_wait_ewma_seconds=self._queue_wait_ewma,
+                target_latency_seconds=self.target_latency_seconds,
+                utilization=(self._in_flight + self._queued) / limit,
+                rate_limit_per_second=self._rate_bucket.rate_per_second if self._rate_bucket else None,
+                lanes=lane_stats,
+            )
+
+
+def create_admission_controller(admission_config: dict) -> Optional[AdmissionController]:
+    """`admission` 설정 딕셔너리로 수락 제어기를 생성합니다. 비활성화 시 `None`."""
+    if not admission_config.get("enabled", True):
+        return None
+
+    lanes = {name: LaneConfig(**(lane_config or {})) for name, lane_config in (admission_config.get("lanes") or {}).items()}
+    rate_limit_config = admission_config.get("provider_rate_limit") or {}
+    requests_per_minute = rate_limit_config.get("requests_per_minute")
+    return AdmissionController(
+        initial_limit=int(admission_config.get("initial_limit", 4)),
+        min_limit=int(admission_config.get("min_limit", 1)),
+        max_limit=int(admission_config.get("max_limit", 16)),
+        max_queue_size=int(admission_config.get("max_queue_size", 32)),
+        max_queue_time_seconds=float(admission_config.get("max_queue_time_seconds", 10.0)),
+        target_latency_seconds=float(admission_config.get("target_latency_seconds", 8.0)),
+        decrease_factor=float(admission_config.get("decrease_factor", 0.7)),
+        lanes=lanes or None,
+        default_lane=admission_config.get("default_lane", INTERACTIVE_LANE),
+        rate_limit_per_second=float(requests_per_minute) / 60.0 if requests_per_minute else None,
+        rate_limit_burst=float(rate_limit_config.get("burst", 1)),
+    )
+
+
+def get_admission_config() -> dict:
+    return get_service_config("admission")
@@ -0,0 +1,97 @@
+import bentoml
+from app.config_loader import get_service_config
+from app.graph import get_compiled_graph
+from app.metrics import record_error
+from app.near_duplicate import NearDuplicateStats
+from app.schemas import AgentState
+from bentos.admission import OVERLOADED_ERROR_CODE, get_admission_config
+from bentos.llm_gateway import LLMGatewayService
+from bentos.service import ReviewAnalysisService
+import logging
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+LLM_GATEWAY_ERROR_CODE = "LLM_GATEWAY_ERROR"
+
+
+def get_api_service_config() -> dict:
+    return get_service_config("api_service")
+
+
+@bentoml.service(
+    name="review_analysis_api_service",
+    resources=get_api_service_config().get("resources", {"cpu": "1", "memory": "512Mi"}),
+    threads=int(get_api_service_config().get("worker_threads", get_admission_config().get("worker_threads", 64))),
+)
+class ReviewAnalysisAPIService(ReviewAnalysisService.inner):
+    """
+    분리 배포용 얇은 API 서비스. 요청 검증, 멱등성, 우선순위 수락 제어, 그래프 실행과 결과 저장은 이 서비스가 맡고,
+    분석 노드의 LLM 호출은 BentoML 서비스 의존성으로 연결된 LLMGatewayService에 위임합니다.
+    엔드포인트는 ReviewAnalysisService와 같습니다.
+
+        bentoml serve bentos.api_service:ReviewAnalysisAPIService
+    """
+
+    llm_gateway = bentoml.depends(LLMGatewayService)
+
+    def _compile_graph(self):
+        # 게이트웨이가 과부하로 거절했거나 호출에 실패한 요청은 분석 결과가 아니므로 저장하지 않습니다.
+        return get_compiled_graph(
+            analyze_node=self._analyze_via_gateway,
+            skip_save_error_codes=(OVERLOADED_ERROR_CODE, LLM_GATEWAY_ERROR_CODE),
+        )
+
+    def _admission_config(self) -> dict:
+        # 제공자 호출 예산은 게이트웨이가 소유하므로, API 쪽에서는 실행 슬롯과 레인 대기열만 관리합니다.
+        return {key: value for key, value in get_admission_config().items() if key != "provider_rate_limit"}
+
+    def _warm_up(self, warmup_config: dict) -> Dict[str, float]:
+        # 제공자 클라이언트와 프롬프트는 게이트웨이가 워밍업합니다.
+        return {}
+
+    def _analyze_via_gateway(self, state: AgentState) -> dict:
+        """분석 노드를 LLM 게이트웨이 호출로 대체합니다. 게이트웨이 호출 자체가 실패하면 오류 결과를 반환합니다."""
+        try:
+            result = self.llm_gateway.analyze(state=state)
+            result_state = result if isinstance(result, AgentState) else AgentState.model_validate(result)
+        except Exception as e:
+            logger.error(f"ReviewAnalysisAPIService: LLM gateway call failed: {e}", exc_info=True)
+            record_error("llm_gateway", e)
+            return {
+                "analysis_output": None,
+                "model_key_used": state.selected_model_config_key,
+                "analysis_error_message": f"LLM 게이트웨이 호출 실패: {e}",
+                "error_code": LLM_GATEWAY_ERROR_CODE,
+            }
+        return result_state.model_dump(
+            include={
+                "analysis_output",
+                "model_key_used",
+                "actual_model_name_used",
+                "prompt_version",
+                "token_usage",
+                "near_duplicate_similarity",
+                "analysis_error_message",
+                "error_code",
+                "retry_after_seconds",
+            }
+        )
+
+    @bentoml.api
+    def near_duplicate_stats(self) -> Optional[NearDuplicateStats]:
+        """POST /near_duplicate_stats 엔드포인트. 분석 노드는 게이트웨이에서 실행되므로 게이트웨이의 통계를 전달합니다."""
+        stats = self.llm_gateway.near_duplicate_stats()
+        return NearDuplicateStats.model_validate(stats) if stats is not None else None
+
+    def _finalize_response(self, result_state: AgentState, ctx: bentoml.Context) -> AgentState:
+        """게이트웨이의 호출 예산 초과(OVERLOADED)는 503으로, 게이트웨이 호출 실패는 502로 응답합니다."""
+        if result_state.error_code == OVERLOADED_ERROR_CODE:
+            ctx.response.status_code = 503
+            # 게이트웨이의 수락 제어기가 계산한 권장 대기 시간을 그대로 전달합니다.
+            ctx.response.headers["Retry-After"] = str(result_state.retry_after_seconds or 1)
+            return result_state
+        if result_state.error_code == LLM_GATEWAY_ERROR_CODE:
+            ctx.response.status_code = 502
+            return result_state
+        return super()._finalize_response(result_state, ctx)
@@ -0,0 +1,233 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Tuple
+
+from app.config_loader import get_service_config
+
+# 이 모듈을 위한 로깅 설정
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS idempotency_records (
+    idempotency_key TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    status TEXT NOT NULL,
+    response_payload TEXT,
+    claimed_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    claim_token TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_idempotency_expires_at ON idempotency_records(expires_at);
+"""
+
+_STATUS_PENDING = "pending"
+_STATUS_COMPLETED = "completed"
+
+
+class IdempotencyKeyConflict(Exception):
+    """같은 멱등성 키가 다른 요청 본문과 함께 재사용된 경우"""
+
+
+class IdempotencyWaitTimeout(Exception):
+    """같은 키로 진행 중인 요청의 완료를 기다리다 시간이 초과된 경우"""
+
+
+def compute_request_fingerprint(payload: Dict[str, Any]) -> str:
+    """요청 본문을 정규화된 JSON으로 직렬화한 SHA-256 지문을 반환합니다."""
+    canonical = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class IdempotencyStore:
+    """
+    멱등성 키별 완료 응답을 TTL과 함께 SQLite에 보관하는 저장소.
+
+    - 키를 처음 받은 요청이 `pending` 행을 선점(claim)하고 실제 작업을 수행합니다.
+    - 같은 키의 동시 요청은 선점한 요청이 끝날 때까지 기다렸다가 저장된 응답을 그대로 돌려받습니다.
+    - 선점한 요청이 실패하거나 응답을 저장하지 않기로 하면 선점을 해제하여 다음 재시도가 다시 실행되도록 합니다.
+    - 선점 후 `lease_seconds`가 지나도 완료되지 않은 행은 비정상 종료로 보고 다시 선점할 수 있습니다.
+      선점마다 토큰을 발급하므로, 선점을 빼앗긴 느린 원래 요청은 새 선점자의 결과를 덮어쓰거나 해제하지 못합니다.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        ttl_seconds: float = 24 * 60 * 60,
+        wait_timeout_seconds: float = 120.0,
+        lease_seconds: float = 300.0,
+        poll_interval_seconds: float = 0.05,
+    ):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.wait_timeout_seconds = wait_timeout_seconds
+        self.lease_seconds = lease_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self._local = threading.local()
+        # 같은 프로세스 안의 대기자는 폴링 주기를 기다리지 않고 완료 즉시 깨웁니다.
+        self._condition = threading.Condition()
+        self._claims_since_purge = 0
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        conn = self._connection()
+        conn.executescript(_SCHEMA)
+        # 선점 토큰 열이 없던 이전 버전의 데이터베이스에 열을 추가합니다.
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(idempotency_records)")}
+        if "claim_token" not in columns:
+            conn.execute("ALTER TABLE idempotency_records ADD COLUMN claim_token TEXT")
+        conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _try_claim(self, key: str, fingerprint: str) -> Tuple[str, str | None]:
+        """
+        키 선점을 시도합니다.
+        반환값: ("claimed", 선점 토큰) | ("completed", 저장된 응답) | ("pending", None)
+        """
+        now = time.time()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT fingerprint, status, response_payload, claimed_at, expires_at "
+                "FROM idempotency_records WHERE idempotency_key = ?",
+                (key,),
+            ).fetchone()
+            if row is not None:
+                stored_fingerprint, status, payload, claimed_at, expires_at = row
+                stale_pending = status == _STATUS_PENDING and now - claimed_at > self.lease_seconds
+                if expires_at <= now or stale_pending:
+                    conn.execute("DELETE FROM idempotency_records WHERE idempotency_key = ?", (key,))
+                elif stored_fingerprint != fingerprint:
+                    raise IdempotencyKeyConflict(f"멱등성 키 '{key}'가 다른 요청 본문과 함께 재사용되었습니다.")
+                elif status == _STATUS_COMPLETED:
+                    conn.execute("COMMIT")
+                    return _STATUS_COMPLETED, payload
+                else:
+                    conn.execute("COMMIT")
+                    return _STATUS_PENDING, None
+
+            claim_token = uuid.uuid4().hex
+            conn.execute(
+                "INSERT INTO idempotency_records "
+                "(idempotency_key, fingerprint, status, response_payload, claimed_at, expires_at, claim_token) "
+                "VALUES (?, ?, ?, NULL, ?, ?, ?)",
+                (key, fingerprint, _STATUS_PENDING, now, now + self.ttl_seconds, claim_token),
+            )
+            self._claims_since_purge += 1
+            if self._claims_since_purge >= 1000:
+                conn.execute("DELETE FROM idempotency_records WHERE expires_at <= ?", (now,))
+                self._claims_since_purge = 0
+            conn.execute("COMMIT")
+            return "claimed", claim_token
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _complete(self, key: str, claim_token: str, payload: str) -> None:
+        """선점이 아직 이 요청의 것일 때만 응답을 저장합니다."""
+        now = time.time()
+        cursor = self._connection().execute(
+            "UPDATE idempotency_records SET status = ?, response_payload = ?, expires_at = ? "
+            "WHERE idempotency_key = ? AND status = ? AND claim_token = ?",
+            (_STATUS_COMPLETED, payload, now + self.ttl_seconds, key, _STATUS_PENDING, claim_token),
+        )
+        if cursor.rowcount == 0:
+            logger.warning(f"멱등성 키 '{key}'의 선점 기간이 지나 다른 요청이 이어받았으므로 응답을 저장하지 않습니다.")
+
+    def _release(self, key: str, claim_token: str) -> None:
+        self._connection().execute(
+            "DELETE FROM idempotency_records WHERE idempotency_key = ? AND status = ? AND claim_token = ?",
+            (key, _STATUS_PENDING, claim_token),
+        )
+
+    def execute(
+        self,
+        key: str,
+        fingerprint: str,
+        compute: Callable[[], Tuple[str, bool]],
+        max_wait_seconds: float | None = None,
+    ) -> Tuple[str, bool]:
+        """
+        멱등성 키로 작업을 최대 한 번만 실행합니다.
+
+        Args:
+            key: 클라이언트가 전달한 멱등성 키.
+            fingerprint: 요청 본문 지문. 같은 키에 다른 지문이 오면 `IdempotencyKeyConflict`.
+            compute: 실제 작업. (직렬화된 응답, 응답 저장 여부)를 반환해야 합니다.
+            max_wait_seconds: 진행 중인 같은 키의 요청을 기다리는 최대 시간 (예: 요청의 남은 처리 기한).
+                `wait_timeout_seconds`보다 짧을 때만 적용됩니다.
+
+        Returns:
+            (직렬화된 응답, 저장된 응답을 재사용했는지 여부)
+
+        Raises:
+            IdempotencyKeyConflict: 키가 다른 요청 본문과 함께 재사용된 경우.
+            IdempotencyWaitTimeout: 진행 중인 같은 키의 요청을 `wait_timeout_seconds`(또는 `max_wait_seconds`) 동안
+                기다려도 끝나지 않은 경우.
+        """
+        wait_seconds = self.wait_timeout_seconds
+        if max_wait_seconds is not None:
+            wait_seconds = min(wait_seconds, max(max_wait_seconds, 0.0))
+        wait_deadline = time.monotonic() + wait_seconds
+        while True:
+            status, payload = self._try_claim(key, fingerprint)
+            if status == _STATUS_COMPLETED:
+                logger.info(f"멱등성 키 '{key}'의 저장된 응답을 반환합니다.")
+                return payload, True
+            if status == "claimed":
+                claim_token = payload
+                break
+            remaining = wait_deadline - time.monotonic()
+            if remaining <= 0:
+                raise IdempotencyWaitTimeout(f"멱등성 키 '{key}'로 진행 중인 요청이 제한 시간 내에 끝나지 않았습니다.")
+            with self._condition:
+                self._condition.wait(timeout=min(self.poll_interval_seconds, remaining))
+
+        try:
+            payload, cacheable = compute()
+            if cacheable:
+                self._complete(key, claim_token, payload)
+            else:
+                self._release(key, claim_token)
+            return payload, False
+        except BaseException:
+            self._release(key, claim_token)
+            raise
+        finally:
+            with self._condition:
+                self._condition.notify_all()
+
+
+_IDEMPOTENCY_STORE: IdempotencyStore | None = None
+_IDEMPOTENCY_STORE_LOCK = threading.Lock()
+
+
+def get_idempotency_store() -> IdempotencyStore | None:
+    """서비스 설정(`idempotency` 섹션)에 따른 프로세스 단위 멱등성 저장소를 반환합니다. 비활성화 시 `None`."""
+    global _IDEMPOTENCY_STORE
+    if _IDEMPOTENCY_STORE is None:
+        idempotency_config = get_service_config("idempotency")
+        if not idempotency_config.get("enabled", True):
+            return None
+        with _IDEMPOTENCY_STORE_LOCK:
+            if _IDEMPOTENCY_STORE is None:
+                _IDEMPOTENCY_STORE = IdempotencyStore(
+                    os.path.join(PROJECT_ROOT, idempotency_config.get("path", "data/idempotency.sqlite3")),
+                    ttl_seconds=float(idempotency_config.get("ttl_seconds", 24 * 60 * 60)),
+                    wait_timeout_seconds=float(idempotency_config.get("wait_timeout_seconds", 120)),
+                    lease_seconds=float(idempotency_config.get("lease_seconds", 300)),
+                )
+    return _IDEMPOTENCY_STORE
@@ -0,0 +1,82 @@
+import bentoml
+from app.analyze_review_node import analyze_review_for_graph
+from app.config_loader import get_service_config
+from app.deadline import DEADLINE_EXCEEDED_ERROR_CODE, remaining_seconds
+from app.memory import MemorySnapshot, configure_tracemalloc, take_memory_snapshot
+from app.near_duplicate import NearDuplicateStats, get_near_duplicate_index
+from app.schemas import AgentState
+from app.warmup import warm_up_service
+from bentos.admission import OVERLOADED_ERROR_CODE, AdmissionRejected, AdmissionStats, create_admission_controller
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+def get_llm_gateway_config() -> dict:
+    return get_service_config("llm_gateway")
+
+
+@bentoml.service(
+    name="llm_gateway_service",
+    resources=get_llm_gateway_config().get("resources", {"cpu": "1", "memory": "1Gi"}),
+    # LLM 호출은 대부분 I/O 대기이므로 CPU 대비 많은 스레드를 둡니다.
+    threads=int(get_llm_gateway_config().get("worker_threads", 128)),
+)
+class LLMGatewayService:
+    """
+    LLM 제공자 호출 전용 서비스. 제공자 클라이언트(SDK, 프롬프트/파서 캐시)와 호출 예산(수락 제어, 토큰 버킷)을 소유합니다.
+    ReviewAnalysisAPIService가 BentoML 서비스 의존성으로 호출하며, 결과 저장은 API 서비스가 담당합니다.
+    """
+
+    def __init__(self):
+        configure_tracemalloc(int(get_service_config("memory").get("tracemalloc_frames", 0)))
+        gateway_config = get_llm_gateway_config()
+        self.admission_controller = create_admission_controller(gateway_config.get("admission", {}))
+        self.model_config_key = get_service_config("analysis").get("model_config_key", "gpt_4o_mini")
+        warmup_config = get_service_config("warmup")
+        self.warmup_timings = warm_up_service(self.model_config_key, warmup_config) if warmup_config.get("enabled", True) else {}
+        logger.info(f"LLMGatewayService: Initialized. (model_config_key: {self.model_config_key})")
+
+    @bentoml.api
+    def analyze(self, state: AgentState) -> AgentState:
+        """
+        POST /analyze 엔드포인트 (내부용).
+        API 서비스가 보낸 그래프 상태로 분석 노드를 실행하고, 분석 결과가 반영된 상태를 반환합니다.
+        `deadline_at`은 epoch 초 기준의 절대 기한이므로 두 서비스의 시계가 동기화되어 있어야 합니다.
+        호출 예산이 소진되어 기한 안에 차례가 오지 않으면 `error_code`가 "OVERLOADED"인 상태를 반환합니다.
+        """
+        if self.admission_controller is None:
+            return state.model_copy(update=analyze_review_for_graph(state))
+
+        try:
+            with self.admission_controller.admit(max_wait_seconds=remaining_seconds(state.deadline_at)) as ticket:
+                result_dict = analyze_review_for_graph(state)
+                if result_dict.get("error_code") == DEADLINE_EXCEEDED_ERROR_CODE:
+                    ticket.mark_failed()
+        except AdmissionRejected as e:
+            logger.warning(f"LLMGatewayService: Rejected by admission control ({e.reason}): {e}")
+            result_dict = {
+                "analysis_error_message": f"LLM 게이트웨이가 과부하 상태입니다. {e.retry_after_seconds}초 후 다시 시도해주세요. ({e})",
+                "error_code": OVERLOADED_ERROR_CODE,
+                "retry_after_seconds": e.retry_after_seconds,
+            }
+        return state.model_copy(update=result_dict)
+
+    @bentoml.api
+    def admission_stats(self) -> Optional[AdmissionStats]:
+        """POST /admission_stats 엔드포인트. 게이트웨이의 수락 제어(호출 예산) 통계를 반환합니다. 비활성화 시 null."""
+        if self.admission_controller is None:
+            return None
+        return self.admission_controller.stats()
+
+    @bentoml.api
+    def near_duplicate_stats(self) -> Optional[NearDuplicateStats]:
+        """POST /near_duplicate_stats 엔드포인트. 게이트웨이 프로세스의 근사 중복 인덱스 통계를 반환합니다. `off` 모드면 null."""
+        index = get_near_duplicate_index()
+        return index.stats() if index is not None else None
+
+    @bentoml.api
+    def memory_snapshot(self, top: int = 20, diff: bool = False) -> MemorySnapshot:
+        """POST /memory_snapshot 엔드포인트. 게이트웨이 프로세스의 RSS, 캐시 크기, (켜져 있으면) tracemalloc 상위 할당 위치를 반환합니다."""
+        return take_memory_snapshot(top=top, diff=diff)
@@ -1,8 +1,38 @@
 import bentoml
-from app.schemas import ReviewInputs, AgentState
+from app.schemas import ReviewInputs, AgentState, StoredAnalysisPage, UsageSummary
+from app.config_loader import get_service_config
+from app.deadline import DEADLINE_EXCEEDED_ERROR_CODE, DeadlineExceeded, compute_deadline, remaining_seconds, run_with_deadline
 from app.graph import get_compiled_graph
+from app.memory import MemorySnapshot, configure_tracemalloc, take_memory_snapshot
+from app.near_duplicate import NearDuplicateStats, get_near_duplicate_index
+from app.result_index import get_result_index
+from app.response_projection import dumps, project_state, resolve_projection, serialize_state, serialize_states
+from app.result_store import get_result_store
+from app.tracing import extract_context, set_span_attributes, start_span
+from app.warmup import warm_up_service
+from bentos.admission import (
+    BULK_LANE,
+    INTERACTIVE_LANE,
+    OVERLOADED_ERROR_CODE,
+    AdmissionRejected,
+    AdmissionStats,
+    create_admission_controller,
+    get_admission_config,
+)
+from bentos.idempotency import (
+    IdempotencyKeyConflict,
+    IdempotencyWaitTimeout,
+    compute_request_fingerprint,
+    get_idempotency_store,
+)
+import asyncio
+import contextvars
 import logging
-from typing import List
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from starlette.responses import Response
+from typing import Any, AsyncGenerator, Dict, List, Literal, Optional, Set
 
 # 프롬프트 7. 의존성: logging 추가
 logger = logging.getLogger(__name__)
@@ -10,13 +40,49 @@ logger = logging.getLogger(__name__)
 # 프롬프트 3. 주요 기능 및 5.1. 서비스 클래스 및 데코레이터
 @bentoml.service(
     name="review_analysis_service",
-    resources={"cpu": "1", "memory": "512Mi"}
+    resources={"cpu": "1", "memory": "512Mi"},
+    # 동기 API는 이 스레드 수만큼만 동시에 실행됩니다. 대기와 거절은 수락 제어기가 담당하도록 넉넉히 둡니다.
+    threads=int(get_admission_config().get("worker_threads", 64)),
 )
 class ReviewAnalysisService:
     def __init__(self):
         logger.info("ReviewAnalysisService: Initializing and loading compiled graph...")
-        self.compiled_app = get_compiled_graph()
-        logger.info("ReviewAnalysisService: Compiled graph loaded successfully.")
+        init_started = time.perf_counter()
+        configure_tracemalloc(int(get_service_config("memory").get("tracemalloc_frames", 0)))
+        self.compiled_app = self._compile_graph()
+        graph_compile_seconds = time.perf_counter() - init_started
+        self.admission_controller = create_admission_controller(self._admission_config())
+        if self.admission_controller is not None:
+            missing_lanes = {INTERACTIVE_LANE, BULK_LANE} - set(self.admission_controller.lane_names)
+            if missing_lanes:
+                raise ValueError(f"admission.lanes 설정에 API priority 레인이 없습니다: {sorted(missing_lanes)}")
+        self.model_config_key = get_service_config("analysis").get("model_config_key", "gpt_4o_mini")
+        batch_config = get_service_config("batch")
+        self.max_batch_size = int(batch_config.get("max_batch_size", 100))
+        self.default_batch_priority = batch_config.get("default_priority", BULK_LANE)
+        self.batch_executor = ThreadPoolExecutor(
+            max_workers=int(batch_config.get("max_concurrency", 16)), thread_name_prefix="review-batch"
+        )
+        # 레플리카가 준비 완료(readyz)를 알리기 전에 프롬프트, 제공자 클라이언트(선택적으로 실제 요청까지)를 미리 준비합니다.
+        warmup_config = get_service_config("warmup")
+        self.warmup_timings = {"graph_compile": graph_compile_seconds}
+        if warmup_config.get("enabled", True):
+            self.warmup_timings.update(self._warm_up(warmup_config))
+        self.time_to_ready_seconds = time.perf_counter() - init_started
+        logger.info(
+            f"ReviewAnalysisService: Compiled graph loaded successfully. (model_config_key: {self.model_config_key}, "
+            f"init: {self.time_to_ready_seconds:.3f}s)"
+        )
+
+    def _compile_graph(self):
+        """분석 그래프를 컴파일합니다. LLM 게이트웨이를 쓰는 API 서비스는 분석 노드를 원격 호출로 바꿉니다."""
+        return get_compiled_graph()
+
+    def _admission_config(self) -> dict:
+        return get_admission_config()
+
+    def _warm_up(self, warmup_config: dict) -> Dict[str, float]:
+        return warm_up_service(self.model_config_key, warmup_config)
 
     @bentoml.api
     def analyze_review(
@@ -24,13 +90,66 @@ class ReviewAnalysisService:
         # 파라미터를 개별 필드로 다시 변경
         review_text: str,
         rating: float,
-        ordered_items: List[str]
+        ordered_items: List[str],
+        ctx: bentoml.Context,
+        idempotency_key: Optional[str] = None,
+        timeout_seconds: Optional[float] = None,
+        priority: Optional[Literal["interactive", "bulk"]] = None,
+        fields: Optional[List[str]] = None,
+        response_shape: Optional[Literal["full", "result"]] = None,
     ) -> AgentState:
         """
         POST /analyze_review 엔드포인트.
         입력된 리뷰 데이터를 사용하여 LangGraph를 통해 분석을 수행합니다.
+        `idempotency_key`가 주어지면 같은 키로 완료된 분석 결과를 LLM 재호출 없이 그대로 반환하고,
+        같은 키로 진행 중인 요청이 있으면 그 요청이 끝날 때까지 기다립니다.
+        `timeout_seconds`(생략 시 설정의 기본값) 안에 분석이 끝나지 않으면 `error_code`가
+        "DEADLINE_EXCEEDED"인 상태를 504 응답으로 반환합니다.
+        `priority`는 수락 제어의 우선순위 레인입니다. 대화형 요청은 "interactive"(기본값), 대량 재분석 작업은
+        "bulk"를 사용하면 대량 작업이 몰려도 대화형 요청이 가중치만큼 먼저 실행됩니다.
+        요청 헤더의 추적 컨텍스트(traceparent)를 이어받아 처리 전체를 하나의 스팬으로 기록합니다.
+        `fields`(AgentState 필드 목록)나 `response_shape`("result": 분석 결과, 저장 ID, 오류만 / "full": 전체)를 주면
+        해당 필드만 orjson으로 직렬화하여 응답합니다. 둘 다 생략하면 기존처럼 전체 AgentState를 반환합니다.
         """
-        
+        self._validate_projection(fields, response_shape)
+        span_attributes = {
+            "review.rating": rating,
+            "review.ordered_items_count": len(ordered_items),
+            "request.priority": priority,
+            "request.timeout_seconds": timeout_seconds,
+            "request.idempotent": idempotency_key is not None,
+        }
+        with start_span(
+            "ReviewAnalysisService.analyze_review",
+            span_attributes,
+            context=extract_context(ctx.request.headers if ctx.request is not None else None),
+        ) as span:
+            result_state = self._analyze_review(
+                review_text, rating, ordered_items, ctx, idempotency_key, timeout_seconds, priority
+            )
+            set_span_attributes(
+                span,
+                **{
+                    "error_code": result_state.error_code,
+                    "model_config_key": result_state.model_key_used,
+                    "http.response.status_code": ctx.response.status_code,
+                },
+            )
+            if fields or response_shape:
+                return Response(content=serialize_state(result_state, fields, response_shape), media_type="application/json")
+            return result_state
+
+    def _analyze_review(
+        self,
+        review_text: str,
+        rating: float,
+        ordered_items: List[str],
+        ctx: bentoml.Context,
+        idempotency_key: Optional[str],
+        timeout_seconds: Optional[float],
+        priority: Optional[str],
+    ) -> AgentState:
+        """`analyze_review`의 실제 처리 (멱등성 키 처리, 수락 제어, 그래프 실행)"""
         review_inputs_model = ReviewInputs(
             review_text=review_text,
             rating=rating,
@@ -39,27 +158,326 @@ class ReviewAnalysisService:
         
         initial_graph_state = AgentState(
             review_inputs=review_inputs_model,
-            selected_model_config_key="gpt_4o_mini"
+            selected_model_config_key=self.model_config_key,
+            deadline_at=compute_deadline(self._resolve_timeout_seconds(timeout_seconds)),
+        )
+        logger.debug("ReviewAnalysisService: Constructed initial_graph_state.")
+
+        idempotency_store = get_idempotency_store() if idempotency_key else None
+        if idempotency_store is None:
+            try:
+                return self._finalize_response(self._run_admitted(initial_graph_state, priority), ctx)
+            except AdmissionRejected as e:
+                return self._overloaded_response(review_inputs_model, e, ctx)
+
+        fingerprint = compute_request_fingerprint(
+            initial_graph_state.model_dump(include={"review_inputs", "selected_model_config_key"})
         )
-        logger.debug(f"ReviewAnalysisService: Constructed initial_graph_state: {{initial_graph_state.model_dump(exclude_none=True)}}")
 
-        # LangGraph 호출 결과가 딕셔너리라고 가정하고 AgentState로 변환
-        result_dict_from_graph = self.compiled_app.invoke(initial_graph_state)
+        def compute() -> tuple[str, bool]:
+            result_state = self._run_admitted(initial_graph_state, priority)
+            # 분석에 실패한 결과는 저장하지 않아 같은 키의 재시도가 다시 분석을 수행하도록 합니다.
+            return result_state.model_dump_json(), result_state.analysis_error_message is None
+
+        try:
+            payload, replayed = idempotency_store.execute(
+                idempotency_key, fingerprint, compute, max_wait_seconds=remaining_seconds(initial_graph_state.deadline_at)
+            )
+        except IdempotencyKeyConflict as e:
+            logger.warning(f"ReviewAnalysisService: {e}")
+            ctx.response.status_code = 409
+            return AgentState(review_inputs=review_inputs_model, analysis_error_message=str(e), error_code="IDEMPOTENCY_KEY_CONFLICT")
+        except AdmissionRejected as e:
+            return self._overloaded_response(review_inputs_model, e, ctx)
+        except IdempotencyWaitTimeout as e:
+            logger.warning(f"ReviewAnalysisService: {e}")
+            remaining = remaining_seconds(initial_graph_state.deadline_at)
+            if remaining is not None and remaining <= 0:
+                # 같은 키의 요청을 기다리는 동안 이 요청의 처리 기한이 지났습니다.
+                ctx.response.status_code = 504
+                return AgentState(
+                    review_inputs=review_inputs_model,
+                    analysis_error_message=f"같은 멱등성 키의 요청을 기다리는 동안 처리 기한을 초과했습니다. ({e})",
+                    error_code=DEADLINE_EXCEEDED_ERROR_CODE,
+                )
+            ctx.response.status_code = 409
+            return AgentState(review_inputs=review_inputs_model, analysis_error_message=str(e), error_code="IDEMPOTENCY_REQUEST_IN_PROGRESS")
+
+        ctx.response.headers["Idempotent-Replayed"] = "true" if replayed else "false"
+        return self._finalize_response(AgentState.model_validate_json(payload), ctx)
+
+    def _resolve_timeout_seconds(self, timeout_seconds: Optional[float]) -> Optional[float]:
+        """요청의 타임아웃을 설정(`deadline` 섹션)의 기본값과 상한으로 보정합니다."""
+        deadline_config = get_service_config("deadline")
+        if timeout_seconds is None:
+            timeout_seconds = deadline_config.get("default_timeout_seconds")
+        max_timeout_seconds = deadline_config.get("max_timeout_seconds")
+        if timeout_seconds is not None and max_timeout_seconds is not None:
+            timeout_seconds = min(timeout_seconds, max_timeout_seconds)
+        return timeout_seconds
+
+    def _validate_projection(self, fields: Optional[List[str]], response_shape: Optional[str]) -> None:
+        """응답 투영 파라미터가 잘못되었으면 분석을 시작하기 전에 400 오류로 거절합니다."""
+        try:
+            resolve_projection(fields, response_shape)
+        except ValueError as e:
+            raise bentoml.exceptions.InvalidArgument(str(e)) from None
+
+    def _finalize_response(self, result_state: AgentState, ctx: bentoml.Context) -> AgentState:
+        """구조화된 오류 코드에 맞는 HTTP 상태 코드를 응답에 설정합니다."""
+        if result_state.error_code == DEADLINE_EXCEEDED_ERROR_CODE:
+            ctx.response.status_code = 504
+        return result_state
+
+    def _overloaded_response(self, review_inputs: ReviewInputs, error: AdmissionRejected, ctx: bentoml.Context) -> AgentState:
+        """수락 제어로 거절된 요청에 503 응답과 Retry-After 헤더를 설정합니다."""
+        ctx.response.status_code = 503
+        ctx.response.headers["Retry-After"] = str(error.retry_after_seconds)
+        return self._overloaded_state(review_inputs, error)
+
+    def _overloaded_state(self, review_inputs: ReviewInputs, error: AdmissionRejected) -> AgentState:
+        """수락 제어로 거절된 분석의 결과 상태 (`error_code`: "OVERLOADED")"""
+        logger.warning(f"ReviewAnalysisService: Rejected by admission control ({error.reason}): {error}")
+        return AgentState(
+            review_inputs=review_inputs,
+            analysis_error_message=f"서비스가 과부하 상태입니다. {error.retry_after_seconds}초 후 다시 시도해주세요. ({error})",
+            error_code=OVERLOADED_ERROR_CODE,
+            retry_after_seconds=error.retry_after_seconds,
+        )
+
+    def _submit_batch(self, reviews: List[ReviewInputs], timeout_seconds: Optional[float], priority: Optional[str]) -> List[Future]:
+        """배치의 리뷰들을 하나의 처리 기한으로 묶어 배치 실행 풀에 제출합니다. 각 리뷰는 수락 제어를 거칩니다."""
+        if len(reviews) > self.max_batch_size:
+            raise bentoml.exceptions.InvalidArgument(
+                f"한 번에 분석할 수 있는 리뷰는 최대 {self.max_batch_size}건입니다 (요청: {len(reviews)}건)."
+            )
+        deadline_at = compute_deadline(self._resolve_timeout_seconds(timeout_seconds))
+        lane = priority or self.default_batch_priority
+
+        def analyze_one(review_inputs: ReviewInputs) -> AgentState:
+            initial_graph_state = AgentState(
+                review_inputs=review_inputs,
+                selected_model_config_key=self.model_config_key,
+                deadline_at=deadline_at,
+            )
+            try:
+                return self._run_admitted(initial_graph_state, lane)
+            except AdmissionRejected as e:
+                return self._overloaded_state(review_inputs, e)
+
+        # 요청 스레드의 추적 컨텍스트를 각 리뷰 실행으로 전달합니다.
+        return [
+            self.batch_executor.submit(contextvars.copy_context().run, analyze_one, review_inputs)
+            for review_inputs in reviews
+        ]
+
+    @bentoml.api
+    def analyze_reviews_batch(
+        self,
+        reviews: List[ReviewInputs],
+        timeout_seconds: Optional[float] = None,
+        priority: Optional[Literal["interactive", "bulk"]] = None,
+        fields: Optional[List[str]] = None,
+        response_shape: Optional[Literal["full", "result"]] = None,
+    ) -> List[AgentState]:
+        """
+        POST /analyze_reviews_batch 엔드포인트.
+        여러 리뷰를 동시에 분석하고 입력 순서대로 결과를 반환합니다. `priority`를 생략하면 설정의
+        `batch.default_priority`(기본 "bulk") 레인을 사용합니다. 수락 제어로 거절되거나 기한을 넘긴 리뷰는
+        해당 항목의 `error_code`로 표시되며, 응답 전체의 상태 코드는 200입니다.
+        `fields`, `response_shape`는 `analyze_review`와 같이 각 항목의 응답 필드를 줄입니다.
+        """
+        self._validate_projection(fields, response_shape)
+        with start_span("ReviewAnalysisService.analyze_reviews_batch", {"batch.size": len(reviews), "request.priority": priority}):
+            futures = self._submit_batch(reviews, timeout_seconds, priority)
+            results = [future.result() for future in futures]
+        if fields or response_shape:
+            return Response(content=serialize_states(results, fields, response_shape), media_type="application/json")
+        return results
+
+    @bentoml.api
+    def analyze_reviews_stream(
+        self,
+        reviews: List[ReviewInputs],
+        timeout_seconds: Optional[float] = None,
+        priority: Optional[Literal["interactive", "bulk"]] = None,
+        fields: Optional[List[str]] = None,
+        response_shape: Optional[Literal["full", "result"]] = None,
+    ) -> AsyncGenerator[str, None]:
+        """
+        POST /analyze_reviews_stream 엔드포인트.
+        여러 리뷰를 동시에 분석하고, 분석이 끝나는 순서대로 `{"index": <입력 순번>, "result": <AgentState>}`
+        형식의 JSON 한 줄(JSON Lines)씩 스트리밍합니다. `fields`, `response_shape`로 `result`의 필드를 줄일 수 있습니다.
+        입력 검증과 배치 제출은 스트리밍을 시작하기 전에 수행하므로, 잘못된 요청은 200 대신 400으로 거절됩니다.
+        """
+        self._validate_projection(fields, response_shape)
+        include, exclude_none = resolve_projection(fields, response_shape)
+        with start_span("ReviewAnalysisService.analyze_reviews_stream", {"batch.size": len(reviews), "request.priority": priority}):
+            futures = self._submit_batch(reviews, timeout_seconds, priority)
+        return self._stream_results(futures, include, exclude_none)
+
+    async def _stream_results(self, futures: List[Future], include: Optional[Set[str]], exclude_none: bool) -> AsyncGenerator[str, None]:
+        """제출된 분석을 이벤트 루프를 막지 않고 기다리며, 끝나는 순서대로 JSON 한 줄씩 내보냅니다."""
+
+        async def indexed(index: int, future: Future) -> tuple[int, AgentState]:
+            return index, await asyncio.wrap_future(future)
+
+        for next_result in asyncio.as_completed([indexed(index, future) for index, future in enumerate(futures)]):
+            index, result_state = await next_result
+            yield dumps({"index": index, "result": project_state(result_state, include, exclude_none)}).decode("utf-8") + "\n"
+
+    def _run_admitted(self, initial_graph_state: AgentState, priority: Optional[str] = None) -> AgentState:
+        """
+        수락 제어기의 `priority` 레인에서 실행 슬롯을 얻은 뒤 그래프를 실행합니다.
+        대기 시간은 남은 처리 기한으로도 제한됩니다.
+        """
+        if self.admission_controller is None:
+            return self._run_graph(initial_graph_state)
+
+        with self.admission_controller.admit(
+            max_wait_seconds=remaining_seconds(initial_graph_state.deadline_at),
+            lane=priority,
+        ) as ticket:
+            result_state = self._run_graph(initial_graph_state)
+            if result_state.error_code == DEADLINE_EXCEEDED_ERROR_CODE:
+                ticket.mark_failed()
+            return result_state
+
+    def _run_graph(self, initial_graph_state: AgentState) -> AgentState:
+        """컴파일된 그래프를 처리 기한 안에서 실행하고 결과를 AgentState로 변환합니다."""
+        try:
+            # LangGraph 호출 결과가 딕셔너리라고 가정하고 AgentState로 변환
+            result_dict_from_graph = run_with_deadline(
+                self.compiled_app.invoke,
+                initial_graph_state.deadline_at,
+                initial_graph_state,
+                stage="그래프 실행",
+                executor="graph",
+            )
+        except DeadlineExceeded as e:
+            logger.warning(f"ReviewAnalysisService: {e}")
+            return AgentState(
+                review_inputs=initial_graph_state.review_inputs,
+                selected_model_config_key=initial_graph_state.selected_model_config_key,
+                deadline_at=initial_graph_state.deadline_at,
+                analysis_error_message=f"처리 기한 초과: {e}",
+                error_code=DEADLINE_EXCEEDED_ERROR_CODE,
+            )
         
         if not isinstance(result_dict_from_graph, dict):
             logger.error(f"Graph did not return a dict. Got: {{type(result_dict_from_graph)}}. Content: {{result_dict_from_graph}}")
             # 적절한 오류 처리 또는 기본 AgentState 반환 필요
             # 예시: 오류 메시지를 포함한 AgentState 반환
             return AgentState(
-                review_inputs=review_inputs_model,
+                review_inputs=initial_graph_state.review_inputs,
                 analysis_error_message="Graph did not return a dictionary as expected."
             )
             
         final_result_state = AgentState(**result_dict_from_graph)
         
-        logger.info(f"ReviewAnalysisService: Analysis complete. Returning state: {{final_result_state.model_dump(exclude_none=True)}}")
+        logger.info(
+            f"ReviewAnalysisService: Analysis complete. (record_id: {final_result_state.saved_record_id}, "
+            f"error: {final_result_state.analysis_error_message is not None})"
+        )
         return final_result_state
 
+    @bentoml.api
+    def admission_stats(self) -> Optional[AdmissionStats]:
+        """
+        POST /admission_stats 엔드포인트.
+        동시 실행 한도, 실행 중/대기 중 요청 수, 거절 횟수 등 수락 제어 통계를 반환합니다. 비활성화 시 null.
+        같은 값이 `/metrics`의 `review_analysis_admission_*` 지표로도 노출됩니다.
+        """
+        if self.admission_controller is None:
+            return None
+        return self.admission_controller.stats()
+
+    @bentoml.api
+    def near_duplicate_stats(self) -> Optional[NearDuplicateStats]:
+        """
+        POST /near_duplicate_stats 엔드포인트.
+        근사 중복 인덱스의 항목 수, 재사용률, 오판 감사 결과(최근 오판 사례 포함)를 반환합니다. `off` 모드면 null.
+        인덱스는 분석 노드를 실행하는 프로세스에 있으므로, 분리 배포에서는 LLM 게이트웨이 쪽 값이 실제 통계입니다.
+        """
+        index = get_near_duplicate_index()
+        return index.stats() if index is not None else None
+
+    @bentoml.api
+    def memory_snapshot(self, top: int = 20, diff: bool = False) -> MemorySnapshot:
+        """
+        POST /memory_snapshot 엔드포인트.
+        프로세스 RSS, 프로세스 캐시 크기와 (memory.tracemalloc_frames로 켠 경우) 할당 위치별 상위 `top`개를 반환합니다.
+        `diff`가 true면 직전 호출 대비 증가량 순으로 반환하므로, 부하 전후로 호출하여 누수 위치를 찾을 수 있습니다.
+        """
+        return take_memory_snapshot(top=top, diff=diff)
+
+    @bentoml.api
+    def list_analyses(
+        self,
+        ctx: bentoml.Context,
+        saved_from: Optional[datetime] = None,
+        saved_to: Optional[datetime] = None,
+        model_key: Optional[str] = None,
+        overall_sentiment: Optional[Literal["NEGATIVE", "NEUTRAL", "POSITIVE"]] = None,
+        min_score: Optional[float] = None,
+        max_score: Optional[float] = None,
+        is_question_review: Optional[bool] = None,
+        menu_item: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> StoredAnalysisPage:
+        """
+        POST /list_analyses 엔드포인트.
+        결과 인덱스에서 조건에 맞는 저장 분석 결과를 최신순으로 페이지 단위 조회합니다.
+        다음 페이지는 응답의 `next_cursor`를 `cursor`로 전달하여 조회합니다. 커서가 잘못되었으면 400 응답과 함께
+        `error_message`가 담긴 빈 페이지를 반환합니다.
+        """
+        result_index = get_result_index()
+        if result_index is None:
+            logger.warning("ReviewAnalysisService: result_index is disabled. Returning an empty page.")
+            return StoredAnalysisPage(items=[])
+
+        try:
+            return result_index.query(
+                saved_from=saved_from,
+                saved_to=saved_to,
+                model_key=model_key,
+                overall_sentiment=overall_sentiment,
+                min_score=min_score,
+                max_score=max_score,
+                is_question_review=is_question_review,
+                menu_item=menu_item,
+                limit=limit,
+                cursor=cursor,
+            )
+        except ValueError as e:
+            logger.warning(f"ReviewAnalysisService: Invalid list_analyses query: {e}")
+            ctx.response.status_code = 400
+            return StoredAnalysisPage(items=[], error_message=str(e))
+
+    @bentoml.api
+    def usage_summary(self, window_hours: float = 24.0, saved_to: Optional[datetime] = None) -> UsageSummary:
+        """
+        POST /usage_summary 엔드포인트.
+        최근 `window_hours`시간(기준 시각 `saved_to`, 생략 시 현재) 동안 저장된 분석의 토큰 사용량과 예상 비용을
+        모델 설정 키와 프롬프트 버전별로 집계합니다. 프롬프트 변경 후 리뷰당 비용 변화를 확인하는 데 사용합니다.
+        """
+        saved_to = saved_to or datetime.now()
+        saved_from = saved_to - timedelta(hours=window_hours)
+        result_index = get_result_index()
+        if result_index is None:
+            logger.warning("ReviewAnalysisService: result_index is disabled. Returning an empty usage summary.")
+            return UsageSummary(saved_from=saved_from, saved_to=saved_to, groups=[])
+        return UsageSummary(saved_from=saved_from, saved_to=saved_to, groups=result_index.usage_summary(saved_from, saved_to))
+
+    @bentoml.api
+    def get_analysis(self, record_id: str) -> Optional[Dict[str, Any]]:
+        """
+        POST /get_analysis 엔드포인트.
+        레코드 ID로 결과 저장소에 기록된 분석 결과 레코드 전체를 반환합니다. 없으면 null.
+        """
+        return get_result_store().get(record_id)
+
 # BentoML 서비스 실행을 위한 주석 (참고용)
 # bentoml serve bentos.service:ReviewAnalysisService --reload
 # 또는 bentos 디렉토리 내에서: bentoml serve service:ReviewAnalysisService --reload
@@ -0,0 +1,282 @@
+"""
+여러 모델(및 프롬프트 버전)의 예측 파일을 리뷰 ID 기준으로 정렬하여 한 번에 비교합니다.
+
+모든 모델에 공통으로 있는 리뷰만 사용하여 모델별 혼동 행렬과 감성 범주별 일치율을 계산하고,
+같은 재표본을 모든 모델에 적용하는 대응(paired) 부트스트랩으로 정확도와 1위 모델 대비 차이의 신뢰구간을 구합니다.
+부트스트랩은 재표본을 다항 분포 가중치 행렬로 뽑아 행렬 곱으로 한 번에 계산하며, 블록 단위로 스레드 풀에서 병렬로 실행합니다.
+"""
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from pydantic import BaseModel
+
+from .llm_accuracy_evaluator import (
+    SENTIMENT_BIN_LABELS,
+    bin_sentiment_scores,
+    confusion_matrix_from_scores,
+    summarize_confusion_matrix,
+    valid_score_mask,
+)
+from .streaming import DEFAULT_CHUNK_SIZE, extract_score_columns, iter_record_chunks
+
+# 이 모듈을 위한 로깅 설정
+logger = logging.getLogger(__name__)
+
+DEFAULT_BOOTSTRAP_RESAMPLES = 2000
+_BOOTSTRAP_BLOCK_ELEMENTS = 1 << 22 # 블록 하나의 재표본 가중치 행렬 원소 수 상한 (float64 기준 32MB)
+
+
+@dataclass
+class SystemPredictions:
+    """예측 파일 하나(모델 설정 키 + 프롬프트 버전)에서 읽은 리뷰 ID와 점수 열"""
+    label: str
+    path: str
+    review_ids: List[str]
+    human_scores: np.ndarray
+    llm_scores: np.ndarray
+    model_config_key: Optional[str] = None
+    prompt_version: Optional[str] = None
+
+
+class ModelComparison(BaseModel):
+    """비교 대상 모델 하나의 지표. 순위는 균형 정확도(사람 감성 범주별 일치율의 평균) 기준입니다."""
+    rank: int
+    label: str
+    path: str
+    model_config_key: Optional[str] = None
+    prompt_version: Optional[str] = None
+    accuracy: float # 정렬된 리뷰 전체의 범주 일치율
+    accuracy_ci: Tuple[float, float]
+    balanced_accuracy: float
+    balanced_accuracy_ci: Tuple[float, float]
+    difference_from_best: float # 이 모델의 균형 정확도 - 1위 모델의 균형 정확도 (0 이하)
+    difference_from_best_ci: Tuple[float, float]
+    probability_best: float # 재표본 중 이 모델의 균형 정확도가 가장 높았던 비율
+    bin_results: List[dict] # evaluate_llm_accuracy_by_sentiment_bin과 같은 형식
+    confusion_matrix: List[List[int]]
+
+
+class ComparisonResult(BaseModel):
+    aligned_reviews: int
+    dropped_reviews: Dict[str, int] # 모델별로 정렬에서 제외된 리뷰 수 (다른 모델에 없거나 점수가 유효하지 않음)
+    bootstrap_resamples: int
+    confidence_level: float
+    models: List[ModelComparison]
+
+
+def _single_value(values: Sequence[Optional[str]]) -> Optional[str]:
+    distinct = {value for value in values if value}
+    return distinct.pop() if len(distinct) == 1 else None
+
+
+def load_system_predictions(
+    path: str,
+    label: Optional[str] = None,
+    human_score_key: str = "pre_score",
+    llm_score_key: str = "score",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> SystemPredictions:
+    """
+    예측 파일(JSON 배열 또는 JSONL)을 스트리밍으로 읽어 리뷰 ID와 점수 열을 만듭니다. `review_id`가 없는 레코드는 건너뜁니다.
+    `label`을 생략하면 파일에 기록된 `<모델 설정 키>@<프롬프트 버전>`을, 그것도 없으면 파일 이름을 사용합니다.
+    """
+    review_ids: List[str] = []
+    human_chunks, llm_chunks = [], []
+    model_keys, prompt_versions = set(), set()
+    for records in iter_record_chunks(path, chunk_size):
+        records = [record for record in records if isinstance(record, dict) and record.get("review_id") is not None]
+        columns = extract_score_columns(records, [human_score_key, llm_score_key], default=None)
+        review_ids.extend(str(record["review_id"]) for record in records)
+        human_chunks.append(columns[human_score_key])
+        llm_chunks.append(columns[llm_score_key])
+        model_keys.update(record.get("model_config_key") for record in records)
+        prompt_versions.update(record.get("prompt_version") for record in records)
+
+    model_config_key = _single_value(list(model_keys))
+    prompt_version = _single_value(list(prompt_versions))
+    if label is None:
+        if model_config_key:
+            label = f"{model_config_key}@{prompt_version}" if prompt_version else model_config_key
+        else:
+            label = os.path.splitext(os.path.basename(path))[0]
+    return SystemPredictions(
+        label=label,
+        path=path,
+        review_ids=review_ids,
+        human_scores=np.concatenate(human_chunks) if human_chunks else np.empty(0),
+        llm_scores=np.concatenate(llm_chunks) if llm_chunks else np.empty(0),
+        model_config_key=model_config_key,
+        prompt_version=prompt_version,
+    )
+
+
+def align_on_review_id(systems: Sequence[SystemPredictions]) -> Tuple[List[str], np.ndarray, np.ndarray, Dict[str, int]]:
+    """
+    모든 모델에 있고 점수가 모두 유효한 리뷰만 남겨 (리뷰 ID 목록, 사람 점수 (n,), 모델별 LLM 점수 (m, n), 모델별 제외 건수)를 반환합니다.
+    리뷰 순서와 사람 점수는 첫 번째 파일을 따르며, 한 파일 안에서 같은 리뷰 ID가 반복되면 마지막 값을 사용합니다.
+    """
+    positions = [{review_id: index for index, review_id in enumerate(system.review_ids)} for system in systems]
+    common = set(positions[0])
+    for position_map in positions[1:]:
+        common.intersection_update(position_map)
+    review_ids = [review_id for review_id in positions[0] if review_id in common]
+
+    human_scores = systems[0].human_scores[[positions[0][review_id] for review_id in review_ids]]
+    llm_scores = np.vstack([
+        system.llm_scores[[position_map[review_id] for review_id in review_ids]]
+        for system, position_map in zip(systems, positions)
+    ])
+
+    valid = valid_score_mask(human_scores, *llm_scores)
+    review_ids = [review_id for review_id, keep in zip(review_ids, valid) if keep]
+    human_scores, llm_scores = human_scores[valid], llm_scores[:, valid]
+    dropped = {system.label: len(position_map) - len(review_ids) for system, position_map in zip(systems, positions)}
+    return review_ids, human_scores, llm_scores, dropped
+
+
+def _bootstrap_block(
+    seed: np.random.SeedSequence,
+    size: int,
+    hits: np.ndarray,
+    bin_hits: np.ndarray,
+    bin_onehot: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """재표본 `size`개의 (정확도 (size, m), 균형 정확도 (size, m))를 계산합니다."""
+    n = hits.shape[0]
+    rng = np.random.default_rng(seed)
+    # 재표본 한 번 = 리뷰별 선택 횟수 벡터. 뽑힌 인덱스를 재표본마다 오프셋을 더해 한 번의 bincount로 세고,
+    # 모델별로 값을 모으는 대신 가중치 행렬 곱으로 모든 모델을 한 번에 집계합니다.
+    draws = rng.integers(0, n, size=(size, n))
+    draws += (np.arange(size) * n)[:, None]
+    weights = np.bincount(draws.ravel(), minlength=size * n).reshape(size, n).astype(np.float64)
+    accuracy = weights @ hits / n
+    bin_totals = weights @ bin_onehot # (size, 3)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        per_bin = (weights @ bin_hits).reshape(size, hits.shape[1], len(SENTIMENT_BIN_LABELS)) / bin_totals[:, None, :]
+    # 재표본에 특정 범주가 하나도 뽑히지 않으면 그 범주는 평균에서 제외합니다.
+    present = bin_totals[:, None, :] > 0
+    balanced = np.where(present, per_bin, 0.0).sum(axis=2) / np.maximum(present.sum(axis=2), 1)
+    return accuracy, balanced
+
+
+def paired_bootstrap(
+    correct: np.ndarray,
+    human_bins: np.ndarray,
+    n_resamples: int = DEFAULT_BOOTSTRAP_RESAMPLES,
+    seed: int = 0,
+    max_workers: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    모델별 정답 여부 행렬 `correct` (m, n)에 대해 모든 모델에 같은 재표본을 적용하는 대응 부트스트랩을 수행하고,
+    재표본별 (정확도 (B, m), 균형 정확도 (B, m))를 반환합니다. 블록별 난수 시드는 `seed`에서 파생되므로
+    스레드 수나 실행 순서와 관계없이 결과가 같습니다.
+    """
+    n = correct.shape[1]
+    if n == 0:
+        empty = np.full((n_resamples, correct.shape[0]), np.nan)
+        return empty, empty
+    hits = correct.T.astype(np.float64) # (n, m)
+    bin_onehot = (human_bins[:, None] == np.arange(len(SENTIMENT_BIN_LABELS))[None, :]).astype(np.float64) # (n, 3)
+    bin_hits = (hits[:, :, None] * bin_onehot[:, None, :]).reshape(n, -1) # (n, m * 3)
+
+    block_size = max(1, min(n_resamples, _BOOTSTRAP_BLOCK_ELEMENTS // n))
+    block_sizes = [min(block_size, n_resamples - start) for start in range(0, n_resamples, block_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(block_sizes))
+    with ThreadPoolExecutor(max_workers=max_workers or min(len(block_sizes), os.cpu_count() or 1)) as executor:
+        blocks = list(executor.map(lambda args: _bootstrap_block(args[0], args[1], hits, bin_hits, bin_onehot), zip(seeds, block_sizes)))
+    return np.vstack([block[0] for block in blocks]), np.vstack([block[1] for block in blocks])
+
+
+def _percentile_interval(samples: np.ndarray, confidence_level: float) -> Tuple[float, float]:
+    alpha = (1.0 - confidence_level) / 2
+    lower, upper = np.quantile(samples, [alpha, 1.0 - alpha])
+    return float(lower), float(upper)
+
+
+def _model_summary(human_scores: np.ndarray, llm_scores: np.ndarray, confidence_level: float) -> Tuple[np.ndarray, List[dict]]:
+    matrix = confusion_matrix_from_scores(human_scores, llm_scores)
+    return matrix, summarize_confusion_matrix(matrix, confidence_level)
+
+
+def _balanced_accuracy(bin_results: List[dict]) -> float:
+    rates = [result["match_rate"] for result in bin_results if result["total_reviews_in_bin"] > 0]
+    return float(np.mean(rates)) if rates else float("nan")
+
+
+def compare_models(
+    systems: Sequence[SystemPredictions],
+    n_resamples: int = DEFAULT_BOOTSTRAP_RESAMPLES,
+    confidence_level: float = 0.95,
+    seed: int = 0,
+    max_workers: Optional[int] = None,
+) -> ComparisonResult:
+    """
+    정렬된 리뷰로 모델별 혼동 행렬, 범주별 일치율(윌슨 구간), 정확도와 균형 정확도의 부트스트랩 신뢰구간을 계산하고
+    균형 정확도 순으로 순위를 매깁니다. 모델별 요약은 스레드 풀에서 병렬로 계산합니다.
+    """
+    if len({system.label for system in systems}) != len(systems):
+        raise ValueError("비교할 모델의 레이블이 중복됩니다. 레이블을 지정하세요 (예: gpt=path/to/predictions.jsonl).")
+
+    review_ids, human_scores, llm_scores, dropped = align_on_review_id(systems)
+    logger.info(f"{len(systems)}개 모델의 공통 리뷰 {len(review_ids)}건으로 비교합니다.")
+
+    with ThreadPoolExecutor(max_workers=max_workers or min(len(systems), os.cpu_count() or 1) or 1) as executor:
+        summaries = list(executor.map(lambda scores: _model_summary(human_scores, scores, confidence_level), llm_scores))
+
+    human_bins = bin_sentiment_scores(human_scores)
+    correct = bin_sentiment_scores(llm_scores) == human_bins[None, :]
+    accuracy_samples, balanced_samples = paired_bootstrap(correct, human_bins, n_resamples, seed, max_workers)
+
+    balanced = np.array([_balanced_accuracy(bin_results) for _, bin_results in summaries])
+    order = sorted(range(len(systems)), key=lambda index: -np.nan_to_num(balanced[index], nan=-1.0))
+    best = order[0] if order else None
+    best_counts = np.bincount(np.argmax(np.nan_to_num(balanced_samples, nan=-1.0), axis=1), minlength=len(systems))
+
+    models = []
+    for rank, index in enumerate(order, start=1):
+        system = systems[index]
+        matrix, bin_results = summaries[index]
+        differences = balanced_samples[:, index] - balanced_samples[:, best]
+        models.append(ModelComparison(
+            rank=rank,
+            label=system.label,
+            path=system.path,
+            model_config_key=system.model_config_key,
+            prompt_version=system.prompt_version,
+            accuracy=float(correct[index].mean()) if review_ids else float("nan"),
+            accuracy_ci=_percentile_interval(accuracy_samples[:, index], confidence_level),
+            balanced_accuracy=float(balanced[index]),
+            balanced_accuracy_ci=_percentile_interval(balanced_samples[:, index], confidence_level),
+            difference_from_best=float(balanced[index] - balanced[best]),
+            difference_from_best_ci=_percentile_interval(differences, confidence_level),
+            probability_best=float(best_counts[index] / n_resamples),
+            bin_results=bin_results,
+            confusion_matrix=matrix.tolist(),
+        ))
+    return ComparisonResult(
+        aligned_reviews=len(review_ids),
+        dropped_reviews=dropped,
+        bootstrap_resamples=n_resamples,
+        confidence_level=confidence_level,
+        models=models,
+    )
+
+
+def parse_system_argument(argument: str) -> Tuple[Optional[str], str]:
+    """`레이블=경로` 또는 `경로` 형식의 명령줄 인자를 (레이블, 경로)로 나눕니다."""
+    label, separator, path = argument.partition("=")
+    if separator and label and not os.path.exists(argument):
+        return label, path
+    return None, argument
+
+
+def load_systems(arguments: Sequence[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[SystemPredictions]:
+    """명령줄 인자 목록의 예측 파일을 병렬로 읽습니다."""
+    parsed = [parse_system_argument(argument) for argument in arguments]
+    with ThreadPoolExecutor(max_workers=min(len(parsed), os.cpu_count() or 1) or 1) as executor:
+        return list(executor.map(lambda item: load_system_predictions(item[1], label=item[0], chunk_size=chunk_size), parsed))
@@ -0,0 +1,157 @@
+"""
+모델 설정과 프롬프트 버전별 정확도-지연 시간-비용 분석과 파레토 프런티어.
+
+예측 파일(예측 생성 모드가 기록한 `latency_seconds`, 토큰 사용량, `estimated_cost_usd` 포함)마다 정확도, 지연 시간
+p50/p95, 리뷰 1,000건당 비용을 계산하고, 정확도는 높고 p95 지연과 비용은 낮은 방향으로 다른 설정에 지배되지 않는
+설정들을 프런티어로 표시합니다.
+"""
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence
+
+import numpy as np
+from pydantic import BaseModel
+
+from .comparison import parse_system_argument
+from .llm_accuracy_evaluator import confusion_matrix_from_scores, summarize_confusion_matrix
+from .streaming import DEFAULT_CHUNK_SIZE, extract_score_columns, iter_record_chunks
+
+# 이 모듈을 위한 로깅 설정
+logger = logging.getLogger(__name__)
+
+FRONTIER_SCHEMA_VERSION = 1
+_METRIC_KEYS = ["latency_seconds", "prompt_tokens", "completion_tokens", "estimated_cost_usd"]
+
+
+class ConfigMetrics(BaseModel):
+    """예측 파일 하나(모델 설정 키 + 프롬프트 버전)의 정확도, 지연 시간, 비용 지표"""
+    label: str
+    path: str
+    model_config_key: Optional[str] = None
+    prompt_version: Optional[str] = None
+    reviews: int # 점수가 유효하여 정확도에 반영된 리뷰 수
+    accuracy: Optional[float] = None
+    balanced_accuracy: Optional[float] = None # 사람 감성 범주별 일치율의 평균 (프런티어 기준)
+    latency_p50_ms: Optional[float] = None
+    latency_p95_ms: Optional[float] = None
+    avg_prompt_tokens: Optional[float] = None
+    avg_completion_tokens: Optional[float] = None
+    cost_per_1k_reviews_usd: Optional[float] = None # 비용이 계산된 예측 기준 평균 x 1,000
+    on_frontier: bool = False
+    dominated_by: List[str] = []
+
+
+class FrontierResult(BaseModel):
+    schema_version: int = FRONTIER_SCHEMA_VERSION
+    configs: List[ConfigMetrics] # 균형 정확도 내림차순
+    frontier: List[str] # 프런티어에 있는 설정의 레이블 (p95 지연 오름차순)
+
+
+def _finite(values: np.ndarray) -> np.ndarray:
+    return values[~np.isnan(values)]
+
+
+def _mean_or_none(values: np.ndarray, digits: int) -> Optional[float]:
+    values = _finite(values)
+    return round(float(values.mean()), digits) if values.size else None
+
+
+def compute_config_metrics(
+    path: str,
+    label: Optional[str] = None,
+    human_score_key: str = "pre_score",
+    llm_score_key: str = "score",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> ConfigMetrics:
+    """예측 파일을 스트리밍하며 혼동 행렬을 누적하고, 지연 시간과 비용 열을 모아 설정 하나의 지표를 계산합니다."""
+    matrix = np.zeros((3, 3), dtype=np.int64)
+    metric_chunks = {key: [] for key in _METRIC_KEYS}
+    model_keys, prompt_versions = set(), set()
+    for records in iter_record_chunks(path, chunk_size):
+        columns = extract_score_columns(records, [human_score_key, llm_score_key] + _METRIC_KEYS, default=None)
+        matrix += confusion_matrix_from_scores(columns[human_score_key], columns[llm_score_key])
+        for key in _METRIC_KEYS:
+            metric_chunks[key].append(columns[key])
+        model_keys.update(record.get("model_config_key") for record in records if isinstance(record, dict))
+        prompt_versions.update(record.get("prompt_version") for record in records if isinstance(record, dict))
+
+    metrics = {key: np.concatenate(chunks) if chunks else np.empty(0) for key, chunks in metric_chunks.items()}
+    model_keys.discard(None)
+    prompt_versions.discard(None)
+    model_config_key = model_keys.pop() if len(model_keys) == 1 else None
+    prompt_version = prompt_versions.pop() if len(prompt_versions) == 1 else None
+    if label is None:
+        if model_config_key:
+            label = f"{model_config_key}@{prompt_version}" if prompt_version else model_config_key
+        else:
+            label = os.path.splitext(os.path.basename(path))[0]
+
+    bin_results = summarize_confusion_matrix(matrix)
+    reviews = int(matrix.sum())
+    rates = [result["match_rate"] for result in bin_results if result["total_reviews_in_bin"] > 0]
+    latencies = _finite(metrics["latency_seconds"]) * 1000.0
+    cost_per_review = _mean_or_none(metrics["estimated_cost_usd"], 12)
+    return ConfigMetrics(
+        label=label,
+        path=path,
+        model_config_key=model_config_key,
+        prompt_version=prompt_version,
+        reviews=reviews,
+        accuracy=round(float(np.trace(matrix) / reviews), 6) if reviews else None,
+        balanced_accuracy=round(float(np.mean(rates)), 6) if rates else None,
+        latency_p50_ms=round(float(np.percentile(latencies, 50)), 3) if latencies.size else None,
+        latency_p95_ms=round(float(np.percentile(latencies, 95)), 3) if latencies.size else None,
+        avg_prompt_tokens=_mean_or_none(metrics["prompt_tokens"], 1),
+        avg_completion_tokens=_mean_or_none(metrics["completion_tokens"], 1),
+        cost_per_1k_reviews_usd=round(cost_per_review * 1000.0, 6) if cost_per_review is not None else None,
+    )
+
+
+def _dominates(a: ConfigMetrics, b: ConfigMetrics) -> bool:
+    """
+    `a`가 `b`를 지배하는지(모든 기준에서 같거나 낫고 하나 이상에서 나은지) 판단합니다.
+    기준은 균형 정확도(높을수록), p95 지연(낮을수록), 1,000건당 비용(낮을수록)이며,
+    두 설정 중 하나라도 값이 없는 기준은 비교에서 제외합니다 (예: 가격표에 없는 모델의 비용).
+    """
+    pairs = [
+        (a.balanced_accuracy, b.balanced_accuracy, True),
+        (a.latency_p95_ms, b.latency_p95_ms, False),
+        (a.cost_per_1k_reviews_usd, b.cost_per_1k_reviews_usd, False),
+    ]
+    compared = strictly_better = 0
+    for value_a, value_b, higher_is_better in pairs:
+        if value_a is None or value_b is None:
+            continue
+        compared += 1
+        if value_a == value_b:
+            continue
+        if (value_a > value_b) != higher_is_better:
+            return False
+        strictly_better += 1
+    return compared > 0 and strictly_better > 0
+
+
+def pareto_frontier(configs: Sequence[ConfigMetrics]) -> FrontierResult:
+    """설정 지표 목록에 지배 관계를 표시하고 프런티어를 계산합니다. 정확도가 없는(평가된 리뷰가 없는) 설정은 프런티어에서 제외합니다."""
+    configs = [config.model_copy(deep=True) for config in configs]
+    for config in configs:
+        config.dominated_by = [other.label for other in configs if other is not config and _dominates(other, config)]
+        config.on_frontier = config.balanced_accuracy is not None and not config.dominated_by
+    ordered = sorted(configs, key=lambda config: -(config.balanced_accuracy if config.balanced_accuracy is not None else -1.0))
+    frontier = sorted(
+        (config for config in configs if config.on_frontier),
+        key=lambda config: config.latency_p95_ms if config.latency_p95_ms is not None else float("inf"),
+    )
+    return FrontierResult(configs=ordered, frontier=[config.label for config in frontier])
+
+
+def build_frontier(arguments: Sequence[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> FrontierResult:
+    """`레이블=경로` 또는 `경로` 형식의 예측 파일 목록을 병렬로 읽어 프런티어를 계산합니다."""
+    parsed = [parse_system_argument(argument) for argument in arguments]
+    with ThreadPoolExecutor(max_workers=min(len(parsed), os.cpu_count() or 1) or 1) as executor:
+        configs = list(executor.map(lambda item: compute_config_metrics(item[1], label=item[0], chunk_size=chunk_size), parsed))
+    if len({config.label for config in configs}) != len(configs):
+        raise ValueError("예측 파일의 레이블이 중복됩니다. 레이블을 지정하세요 (예: gpt=path/to/predictions.jsonl).")
+    return pareto_frontier(configs)
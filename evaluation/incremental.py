@@ -0,0 +1,198 @@
+"""
+매일 추가되는 라벨링 데이터를 위한 증분 평가.
+
+범주별 집계(3x3 혼동 행렬: 범주별 리뷰 수, 일치 수, LLM 예측 분포)를 처리한 위치(워터마크)와 함께 상태 파일에 저장하고,
+다음 실행에서는 워터마크 뒤에 추가된 레코드만 읽어 집계에 더합니다. 윌슨 신뢰구간은 집계에서 바로 계산하므로
+실행 비용은 새 데이터의 크기에만 비례합니다.
+
+워터마크는 JSONL 파일의 바이트 오프셋입니다. 파일 앞부분의 해시와 크기로 파일이 교체되거나 잘리지 않았는지 확인하며,
+그런 경우와 데이터 파일 경로나 점수 키가 바뀐 경우에는 처음부터 다시 집계합니다. 추가 기록에 적합하지 않은 JSON 배열 파일은
+내용이 바뀌면 전체를 다시 집계합니다.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from .llm_accuracy_evaluator import confusion_matrix_from_scores, summarize_confusion_matrix
+from .streaming import DEFAULT_CHUNK_SIZE, extract_score_columns, is_json_array, iter_json_line_batches, iter_record_chunks
+
+# 이 모듈을 위한 로깅 설정
+logger = logging.getLogger(__name__)
+
+STATE_FORMAT_VERSION = 1
+_HEAD_DIGEST_BYTES = 4096 # 파일 동일성 확인에 사용하는 앞부분 크기
+
+
+class EvaluationState(BaseModel):
+    """증분 평가의 영속 상태: 누적 혼동 행렬과 처리한 위치"""
+    format_version: int = STATE_FORMAT_VERSION
+    data_path: str # 집계한 데이터 파일의 실제 절대 경로
+    human_score_key: str
+    llm_score_key: str
+    byte_offset: int = 0 # 여기까지의 완결된 레코드를 집계에 반영함
+    head_digest: Optional[str] = None # 파일 앞부분(최대 4KB, 워터마크 이내)의 해시
+    records_processed: int = 0
+    skipped_items: int = 0 # 점수가 없거나 숫자가 아닌 레코드 수
+    confusion_matrix: List[List[int]] = Field(default_factory=lambda: [[0] * 3 for _ in range(3)])
+    updated_at: Optional[datetime] = None
+
+
+class IncrementalRunInfo(BaseModel):
+    """증분 평가 한 번의 실행 정보"""
+    new_records: int
+    new_bytes: int
+    full_recompute: bool
+    reason: Optional[str] = None # 처음부터 다시 집계한 사유
+
+
+def _head_digest(file_path: str, length: int) -> str:
+    with open(file_path, "rb") as f:
+        return hashlib.sha256(f.read(min(length, _HEAD_DIGEST_BYTES))).hexdigest()
+
+
+def load_state(state_path: str) -> Optional[EvaluationState]:
+    """상태 파일을 읽습니다. 없거나 읽을 수 없으면 `None`을 반환하여 처음부터 집계하게 합니다."""
+    if not os.path.exists(state_path):
+        return None
+    try:
+        with open(state_path, "r", encoding="utf-8") as f:
+            return EvaluationState.model_validate_json(f.read())
+    except (OSError, ValueError) as e:
+        logger.warning(f"증분 평가 상태 파일을 읽을 수 없어 처음부터 집계합니다 ({state_path}): {e}")
+        return None
+
+
+def save_state(state: EvaluationState, state_path: str) -> None:
+    """상태 파일을 임시 파일에 쓴 뒤 교체하여, 중단되더라도 이전 상태나 새 상태 중 하나만 남도록 합니다."""
+    directory = os.path.dirname(os.path.abspath(state_path))
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=directory, suffix=".tmp", delete=False) as f:
+        f.write(state.model_dump_json(indent=2))
+        temp_path = f.name
+    os.replace(temp_path, state_path)
+
+
+def _reset_reason(state: Optional[EvaluationState], file_path: str, human_score_key: str, llm_score_key: str) -> Optional[str]:
+    """저장된 상태를 이어서 쓸 수 없으면 그 사유를, 이어서 쓸 수 있으면 `None`을 반환합니다."""
+    if state is None:
+        return "상태 없음"
+    if state.format_version != STATE_FORMAT_VERSION:
+        return "상태 형식 버전 변경"
+    if os.path.realpath(state.data_path) != os.path.realpath(file_path):
+        return "데이터 파일 경로 변경"
+    if (state.human_score_key, state.llm_score_key) != (human_score_key, llm_score_key):
+        return "점수 키 변경"
+    if os.path.getsize(file_path) < state.byte_offset:
+        return "파일이 워터마크보다 작아짐 (잘리거나 교체됨)"
+    if state.byte_offset and _head_digest(file_path, state.byte_offset) != state.head_digest:
+        return "파일 앞부분이 바뀜 (교체됨)"
+    return None
+
+
+def _fold_records(matrix: np.ndarray, records: List[Any], human_score_key: str, llm_score_key: str) -> int:
+    """레코드 청크를 혼동 행렬에 더하고, 점수가 없거나 숫자가 아니어서 제외된 레코드 수를 반환합니다."""
+    columns = extract_score_columns(records, [human_score_key, llm_score_key])
+    human_scores, llm_scores = columns[human_score_key], columns[llm_score_key]
+    matrix += confusion_matrix_from_scores(human_scores, llm_scores)
+    return int(np.count_nonzero(np.isnan(human_scores) | np.isnan(llm_scores)))
+
+
+def update_evaluation_state(
+    file_path: str,
+    state: Optional[EvaluationState],
+    human_score_key: str = "pre_score",
+    llm_score_key: str = "score",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Tuple[EvaluationState, IncrementalRunInfo]:
+    """
+    저장된 상태에 워터마크 이후의 레코드를 더한 새 상태를 반환합니다. 상태를 이어서 쓸 수 없으면 처음부터 집계합니다.
+    JSONL의 마지막 줄이 기록 중이어서 파싱할 수 없으면 그 줄은 다음 실행으로 미룹니다.
+    """
+    reason = _reset_reason(state, file_path, human_score_key, llm_score_key)
+    json_array = is_json_array(file_path)
+    if reason is None and json_array and os.path.getsize(file_path) != state.byte_offset:
+        reason = "JSON 배열 파일 변경"
+    if reason is not None:
+        if state is not None:
+            logger.warning(f"증분 평가 상태를 초기화하고 처음부터 집계합니다 ({file_path}): {reason}")
+        state = EvaluationState(data_path=os.path.realpath(file_path), human_score_key=human_score_key, llm_score_key=llm_score_key)
+
+    matrix = np.array(state.confusion_matrix, dtype=np.int64)
+    start_offset = state.byte_offset
+    records_processed = state.records_processed
+    skipped_items = state.skipped_items
+    new_records = 0
+
+    if json_array:
+        if reason is not None:
+            for records in iter_record_chunks(file_path, chunk_size):
+                skipped_items += _fold_records(matrix, records, human_score_key, llm_score_key)
+                new_records += len(records)
+            end_offset = os.path.getsize(file_path)
+        else:
+            end_offset = start_offset
+    else:
+        end_offset = start_offset
+        pending: List[Any] = []
+        for records, end_offset in iter_json_line_batches(file_path, start_offset, tolerate_partial_tail=True):
+            pending.extend(records)
+            while len(pending) >= chunk_size:
+                skipped_items += _fold_records(matrix, pending[:chunk_size], human_score_key, llm_score_key)
+                new_records += chunk_size
+                pending = pending[chunk_size:]
+        if pending:
+            skipped_items += _fold_records(matrix, pending, human_score_key, llm_score_key)
+            new_records += len(pending)
+
+    updated = EvaluationState(
+        data_path=os.path.realpath(file_path),
+        human_score_key=human_score_key,
+        llm_score_key=llm_score_key,
+        byte_offset=end_offset,
+        head_digest=_head_digest(file_path, end_offset) if end_offset else None,
+        records_processed=records_processed + new_records,
+        skipped_items=skipped_items,
+        confusion_matrix=matrix.tolist(),
+        updated_at=datetime.now(),
+    )
+    info = IncrementalRunInfo(
+        new_records=new_records,
+        new_bytes=end_offset - start_offset if reason is None else end_offset,
+        full_recompute=reason is not None,
+        reason=reason,
+    )
+    return updated, info
+
+
+def evaluate_incrementally(
+    file_path: str,
+    state_path: str,
+    human_score_key: str = "pre_score",
+    llm_score_key: str = "score",
+    confidence_level: float = 0.95,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Tuple[List[Dict[str, Any]], EvaluationState, IncrementalRunInfo]:
+    """
+    상태 파일(`state_path`)을 이어 받아 새 레코드만 집계하고 상태를 저장한 뒤,
+    누적 집계로 `evaluate_llm_accuracy_by_sentiment_bin`과 같은 형식의 범주별 결과를 반환합니다.
+    """
+    state, info = update_evaluation_state(file_path, load_state(state_path), human_score_key, llm_score_key, chunk_size)
+    save_state(state, state_path)
+    results = summarize_confusion_matrix(np.array(state.confusion_matrix, dtype=np.int64), confidence_level)
+    return results, state, info
+
+
+def default_state_path(data_path: str, state_dir: str = "data/benchmark/eval_state") -> str:
+    """
+    데이터 파일마다 하나의 상태 파일 (`<상태 디렉토리>/<데이터 파일 이름>.<실제 절대 경로의 해시>.state.json`).
+    이름이 같은 다른 디렉토리의 데이터 파일이 상태를 공유하지 않도록 전체 경로를 키로 사용합니다.
+    """
+    path_digest = hashlib.sha256(os.path.realpath(data_path).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(state_dir, f"{os.path.basename(data_path)}.{path_digest}.state.json")
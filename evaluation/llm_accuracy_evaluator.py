@@ -1,9 +1,11 @@
 import json
 import math
-from scipy.stats import binomtest
+import numpy as np
+from scipy.special import ndtri
 from typing import List, Dict, Any, Tuple
 import os
 from .reporter import generate_markdown_report
+from .streaming import DEFAULT_CHUNK_SIZE, iter_score_chunks
 
 # 경계값 정의 (예시 2 기준)
 NEGATIVE_THRESHOLD_UPPER = 1/3  # 0.0 <= score < 0.333...
@@ -22,22 +24,106 @@ def get_sentiment_bin_label(score: float) -> str:
     else:
         return "Positive"
 
+SENTIMENT_BIN_LABELS = ["Negative", "Neutral", "Positive"]
+# get_sentiment_bin_label과 같은 경계: score < 1/3 → 0, score < 2/3 → 1, 그 외 → 2
+_BIN_EDGES = np.array([NEGATIVE_THRESHOLD_UPPER, NEUTRAL_THRESHOLD_UPPER])
+
+
+def bin_sentiment_scores(scores: np.ndarray) -> np.ndarray:
+    """점수 배열을 감성 범주 인덱스(0: Negative, 1: Neutral, 2: Positive)로 변환합니다. 범위 검사는 호출자가 합니다."""
+    return np.digitize(scores, _BIN_EDGES)
+
+
+def valid_score_mask(*score_arrays: np.ndarray) -> np.ndarray:
+    """모든 점수가 0.0~1.0 범위인 행의 마스크. NaN(변환 실패)은 범위 밖으로 처리됩니다."""
+    mask = np.ones(len(score_arrays[0]), dtype=bool)
+    for scores in score_arrays:
+        mask &= (scores >= 0.0) & (scores <= 1.0)
+    return mask
+
+
+def confusion_matrix_from_scores(human_scores: np.ndarray, llm_scores: np.ndarray) -> np.ndarray:
+    """
+    (사람 범주, LLM 범주) 3x3 혼동 행렬을 계산합니다. 둘 중 하나라도 0.0~1.0 범위를 벗어난 행은 제외합니다.
+    행은 사람 범주, 열은 LLM 범주이며 순서는 `SENTIMENT_BIN_LABELS`와 같습니다.
+    """
+    mask = valid_score_mask(human_scores, llm_scores)
+    human_bins = bin_sentiment_scores(human_scores[mask])
+    llm_bins = bin_sentiment_scores(llm_scores[mask])
+    counts = np.bincount(human_bins * 3 + llm_bins, minlength=9)
+    return counts.reshape(3, 3).astype(np.int64)
+
+
+def wilson_interval(k: int, n: int, confidence_level: float = 0.95) -> Tuple[float, float]:
+    """
+    성공 k회 / 시행 n회의 윌슨 점수 신뢰구간 (양측, 연속성 보정 없음).
+    `scipy.stats.binomtest(k, n).proportion_ci(confidence_level, method="wilson")`와 같은 값을 같은 연산 순서로
+    계산하므로, 반복 호출이 많은 평가(순차 조기 종료, 부트스트랩 등)에서 scipy 객체 생성 비용 없이 사용할 수 있습니다.
+    """
+    p = k / n
+    z = ndtri(0.5 + 0.5 * confidence_level)
+    denom = 2 * (n + z**2)
+    center = (2 * n * p + z**2) / denom
+    q = 1 - p
+    delta = z / denom * math.sqrt(4 * n * p * q + z**2)
+    lo = 0.0 if k == 0 else center - delta
+    hi = 1.0 if k == n else center + delta
+    return lo, hi
+
+
+def summarize_confusion_matrix(matrix: np.ndarray, confidence_level: float = 0.95) -> List[Dict[str, Any]]:
+    """혼동 행렬을 사람 범주별 일치율과 윌슨 신뢰구간 결과 목록으로 변환합니다 (`evaluate_llm_accuracy_by_sentiment_bin`의 반환 형식)."""
+    results = []
+    for bin_index, bin_label in enumerate(SENTIMENT_BIN_LABELS):
+        row = [int(count) for count in matrix[bin_index]]
+        total_reviews = sum(row)
+        matched_reviews = row[bin_index]
+
+        if total_reviews == 0:
+            match_rate = 0.0
+            lower_bound = 0.0
+            upper_bound = 0.0
+        else:
+            match_rate = matched_reviews / total_reviews
+            lower_bound, upper_bound = wilson_interval(matched_reviews, total_reviews, confidence_level)
+
+            if math.isnan(lower_bound) or lower_bound < 0: lower_bound = 0.0
+            if math.isnan(upper_bound) or upper_bound > 1: upper_bound = 1.0
+
+        results.append({
+            "human_sentiment_bin_label": bin_label,
+            "total_reviews_in_bin": total_reviews,
+            "matched_reviews_in_bin": matched_reviews,
+            "match_rate": match_rate,
+            "wilson_lower_bound": lower_bound,
+            "wilson_upper_bound": upper_bound,
+            "llm_score_distribution": dict(zip(SENTIMENT_BIN_LABELS, row)),
+        })
+    return results
+
+
 def evaluate_llm_accuracy_by_sentiment_bin(
     json_file_path: str = "data/benchmark/sample.json",
     human_score_key: str = "pre_score",
     llm_score_key: str = "score",
-    confidence_level: float = 0.95
+    confidence_level: float = 0.95,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
 ) -> List[Dict[str, Any]]:
     """
     Evaluates LLM accuracy by comparing human scores and LLM scores binned into
     Negative, Neutral, and Positive sentiment categories, and calculates the Wilson 
     score confidence interval for the match rate within each human sentiment bin.
 
+    The file (a JSON array or JSON Lines) is streamed in chunks of `chunk_size` records,
+    so memory stays bounded regardless of the file size. Scores are binned with NumPy
+    and accumulated into a confusion matrix.
+
     Args:
-        json_file_path: Path to the JSON file containing evaluation data.
+        json_file_path: Path to the JSON or JSONL file containing evaluation data.
         human_score_key: Key for the human-assigned score in the JSON data.
         llm_score_key: Key for the LLM-assigned score in the JSON data.
         confidence_level: Confidence level for the Wilson score interval.
+        chunk_size: Number of records parsed and binned at a time.
 
     Returns:
         A list of dictionaries, where each dictionary represents a human_sentiment_bin and contains:
@@ -49,9 +135,12 @@ def evaluate_llm_accuracy_by_sentiment_bin(
         - 'wilson_upper_bound': Upper bound of the Wilson score confidence interval.
         - 'llm_score_distribution': Distribution of LLM scores (binned) for this human score bin.
     """
+    matrix = np.zeros((3, 3), dtype=np.int64)
+    skipped_items = 0
     try:
-        with open(json_file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        for human_scores, llm_scores in iter_score_chunks(json_file_path, human_score_key, llm_score_key, chunk_size):
+            matrix += confusion_matrix_from_scores(human_scores, llm_scores)
+            skipped_items += int(np.count_nonzero(np.isnan(human_scores) | np.isnan(llm_scores)))
     except FileNotFoundError:
         print(f"Error: File not found at {json_file_path}")
         return []
@@ -59,75 +148,7 @@ def evaluate_llm_accuracy_by_sentiment_bin(
         print(f"Error: Could not decode JSON from {json_file_path}")
         return []
 
-    sentiment_bin_labels = ["Negative", "Neutral", "Positive"]
-    human_sentiment_bins: Dict[str, Dict[str, Any]] = {}
-
-    for label in sentiment_bin_labels:
-        human_sentiment_bins[label] = {
-            "total_reviews_in_bin": 0,
-            "matched_reviews_in_bin": 0,
-            "llm_score_distribution": {bin_l: 0 for bin_l in sentiment_bin_labels}
-        }
-
-    for item in data:
-        try:
-            human_score = float(item.get(human_score_key, -1))
-            llm_score = float(item.get(llm_score_key, -1))
-
-            if not (0.0 <= human_score <= 1.0 and 0.0 <= llm_score <= 1.0):
-                # print(f"Skipping item with invalid score: {item}")
-                continue
-
-            human_bin_label = get_sentiment_bin_label(human_score)
-            llm_bin_label = get_sentiment_bin_label(llm_score)
-            
-            # This check is for safety, human_bin_label should always be one of the defined sentiment_bin_labels
-            if human_bin_label in human_sentiment_bins:
-                 human_sentiment_bins[human_bin_label]["total_reviews_in_bin"] += 1
-                 human_sentiment_bins[human_bin_label]["llm_score_distribution"][llm_bin_label] +=1
-                 if human_bin_label == llm_bin_label:
-                    human_sentiment_bins[human_bin_label]["matched_reviews_in_bin"] += 1
-            else:
-                # Should not happen with the current get_sentiment_bin_label logic
-                print(f"Warning: Human score {human_score} (bin {human_bin_label}) did not fall into a predefined sentiment bin.")
-
-
-        except (TypeError, ValueError) as e:
-            print(f"Skipping item due to data error: {item} - {e}")
-            continue
+    if skipped_items:
+        print(f"Skipped {skipped_items} items with missing or non-numeric scores.")
 
-    results = []
-    # Ensure a specific order for bins in the results
-    ordered_bin_labels = ["Negative", "Neutral", "Positive"]
-
-    for bin_label in ordered_bin_labels:
-        bin_data = human_sentiment_bins[bin_label]
-        total_reviews = bin_data["total_reviews_in_bin"]
-        matched_reviews = bin_data["matched_reviews_in_bin"]
-
-        if total_reviews == 0:
-            match_rate = 0.0
-            lower_bound = 0.0
-            upper_bound = 0.0
-        else:
-            match_rate = matched_reviews / total_reviews
-            ci_result = binomtest(k=matched_reviews, n=total_reviews) 
-            interval = ci_result.proportion_ci(confidence_level=confidence_level, method='wilson')
-            lower_bound = interval.low
-            upper_bound = interval.high
-            
-            if math.isnan(lower_bound) or lower_bound < 0: lower_bound = 0.0
-            if math.isnan(upper_bound) or upper_bound > 1: upper_bound = 1.0
-
-
-        results.append({
-            "human_sentiment_bin_label": bin_label,
-            "total_reviews_in_bin": total_reviews,
-            "matched_reviews_in_bin": matched_reviews,
-            "match_rate": match_rate,
-            "wilson_lower_bound": lower_bound,
-            "wilson_upper_bound": upper_bound,
-            "llm_score_distribution": bin_data["llm_score_distribution"]
-        })
-        
-    return results
+    return summarize_confusion_matrix(matrix, confidence_level)
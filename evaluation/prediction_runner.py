@@ -0,0 +1,342 @@
+"""
+라벨링된 원본 리뷰를 리뷰 분석 그래프(`get_compiled_graph`)로 동시에 실행하여 평가용 예측 파일을 생성합니다.
+평가 예측이 운영 결과 저장소와 색인(목록 조회, 사용량 집계)에 섞이지 않도록 결과 저장 노드가 없는 그래프를 사용하며,
+근사 중복 인덱스의 결과를 예측으로 재사용하지 않도록 인덱스도 끄고 실행합니다.
+
+예측은 (리뷰, 모델 설정 키, 프롬프트 해시) 단위로 JSONL 캐시에 기록되므로, 같은 데이터셋을 다시 실행하면
+새로 추가되었거나 프롬프트가 바뀐 항목만 LLM을 호출합니다. 생성된 예측 파일은 `pre_score`/`score` 형식이라
+`evaluate_llm_accuracy_by_sentiment_bin`에 그대로 넘길 수 있습니다.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import orjson
+from pydantic import BaseModel, ValidationError
+
+from app.config_loader import get_model_config
+from app.graph import get_compiled_graph
+from app.keyword_extractor import DEFAULT_LEXICON_PATH
+from app.schemas import AgentState, ReviewInputs
+from app.token_usage import get_prompt_version
+from .streaming import iter_records
+
+# 이 모듈을 위한 로깅 설정
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_CACHE_PATH = "data/benchmark/prediction_cache.jsonl"
+DEFAULT_PREDICTIONS_DIR = "data/benchmark/predictions"
+DEFAULT_CONCURRENCY = 8
+
+
+class LabeledReview(BaseModel):
+    """사람 평가 점수가 붙은 원본 리뷰 한 건"""
+    review_id: str
+    review_inputs: ReviewInputs
+    human_score: float
+
+
+class Prediction(BaseModel):
+    """리뷰 한 건에 대한 모델 예측 (캐시와 예측 파일에 기록되는 단위)"""
+    review_id: str
+    model_config_key: str
+    prompt_hash: str
+    score: Optional[float] = None
+    overall_sentiment: Optional[str] = None
+    actual_model_name_used: Optional[str] = None
+    prompt_version: Optional[str] = None
+    latency_seconds: Optional[float] = None
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    estimated_cost_usd: Optional[float] = None # 가격표에 모델이 없으면 None
+    error_code: Optional[str] = None
+    error_message: Optional[str] = None
+
+
+class ModelRunStatistics(BaseModel):
+    """모델 설정 키 하나에 대한 예측 생성 실행 통계"""
+    model_config_key: str
+    actual_model_name_used: Optional[str] = None
+    prompt_version: Optional[str] = None
+    prompt_hash: str
+    total_reviews: int
+    cache_hits: int
+    generated: int
+    failed: int
+    concurrency: int
+    wall_clock_seconds: float
+    reviews_per_second: Optional[float] = None # 캐시 적중을 포함해 결과가 준비된 리뷰 기준
+    generated_per_second: Optional[float] = None # 이번 실행에서 LLM을 호출한 리뷰 기준
+    latency_p50_ms: Optional[float] = None
+    latency_p95_ms: Optional[float] = None
+
+
+def review_content_hash(review_inputs: ReviewInputs) -> str:
+    """리뷰 입력(텍스트, 평점, 주문 메뉴)의 해시. 리뷰 ID가 같아도 내용이 바뀌면 캐시를 다시 사용하지 않습니다."""
+    payload = json.dumps(review_inputs.model_dump(), ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def prompt_hash(
+    prompt_path: str,
+    format_instructions_mode: Optional[str] = None,
+    keyword_extraction: Optional[str] = None,
+    keyword_lexicon_path: Optional[str] = None,
+) -> str:
+    """
+    프롬프트 파일 내용의 해시. 프롬프트를 수정하면 해당 모델 설정의 캐시가 모두 무효화됩니다.
+    모델 설정에서 응답 형식 지침의 형태(`format_instructions`)나 로컬 키워드 추출(`keyword_extraction`과 사전 파일 내용)을
+    바꾼 경우에도 렌더링된 프롬프트가 달라지므로 해시에 포함합니다.
+    """
+    with open(os.path.join(PROJECT_ROOT, prompt_path), "rb") as f:
+        digest = hashlib.sha256(f.read())
+    if format_instructions_mode not in (None, "full"):
+        digest.update(f"format_instructions={format_instructions_mode}".encode("utf-8"))
+    if keyword_extraction:
+        digest.update(f"keyword_extraction={keyword_extraction}".encode("utf-8"))
+        with open(os.path.join(PROJECT_ROOT, keyword_lexicon_path or DEFAULT_LEXICON_PATH), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def model_config_prompt_hash(model_config: Dict) -> str:
+    """
+    모델 설정에서 프롬프트 렌더링에 영향을 주는 값을 모두 반영한 프롬프트 해시.
+    같은 설정 키에서 제공자, 모델 이름, temperature(`provider`, `llm_params`)를 바꿔도 예측이 달라지므로 함께 반영합니다.
+    """
+    digest = prompt_hash(
+        model_config["prompt_path"],
+        model_config.get("format_instructions"),
+        model_config.get("keyword_extraction"),
+        model_config.get("keyword_lexicon_path"),
+    )
+    llm_params = model_config.get("llm_params") or {}
+    llm_identity = json.dumps(
+        {
+            "provider": model_config.get("provider"),
+            "model_name": llm_params.get("model_name"),
+            "temperature": llm_params.get("temperature"),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(f"{digest}:{llm_identity}".encode("utf-8")).hexdigest()[:16]
+
+
+def prediction_cache_key(review: LabeledReview, model_config_key: str, prompt_digest: str) -> str:
+    return f"{review_content_hash(review.review_inputs)}:{model_config_key}:{prompt_digest}"
+
+
+def load_labeled_reviews(file_path: str, human_score_key: str = "pre_score") -> List[LabeledReview]:
+    """
+    JSON 배열 또는 JSONL 파일에서 라벨링된 리뷰를 읽습니다. 각 항목에는 `review_text`, `rating`, `ordered_items`와
+    사람 평가 점수(`human_score_key`)가 있어야 하며, `review_id`가 없으면 리뷰 내용의 해시를 ID로 사용합니다.
+    필수 필드가 없거나 형식이 잘못된 항목은 경고를 남기고 건너뜁니다.
+    """
+    reviews = []
+    for position, record in enumerate(iter_records(file_path)):
+        try:
+            review_inputs = ReviewInputs.model_validate(record)
+            human_score = float(record[human_score_key])
+        except (ValidationError, KeyError, TypeError, ValueError) as e:
+            logger.warning(f"{file_path}의 {position}번째 항목을 건너뜁니다: {e}")
+            continue
+        review_id = record.get("review_id")
+        reviews.append(LabeledReview(
+            review_id=str(review_id) if review_id is not None else review_content_hash(review_inputs),
+            review_inputs=review_inputs,
+            human_score=human_score,
+        ))
+    return reviews
+
+
+class PredictionCache:
+    """
+    성공한 예측을 캐시 키별로 보관하는 추가 전용(append-only) JSONL 캐시.
+    시작 시 파일 전체를 읽어 메모리에 올리고, 새 예측은 한 줄씩 이어서 기록합니다. 같은 키가 여러 번 기록되면 마지막 값을 사용합니다.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self._entries: Dict[str, Prediction] = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, "rb") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = orjson.loads(line)
+                        self._entries[entry["cache_key"]] = Prediction.model_validate(entry["prediction"])
+                    except (orjson.JSONDecodeError, KeyError, ValidationError) as e:
+                        # 기록 도중 중단되어 잘린 마지막 줄 등은 무시하고 다시 생성합니다.
+                        logger.warning(f"예측 캐시의 손상된 줄을 건너뜁니다 ({path}): {e}")
+            logger.info(f"예측 캐시 로드: {path} ({len(self._entries)}건)")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, cache_key: str) -> Optional[Prediction]:
+        return self._entries.get(cache_key)
+
+    def put(self, cache_key: str, prediction: Prediction) -> None:
+        with self._lock:
+            self._entries[cache_key] = prediction
+            if not self.path:
+                return
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, "ab") as f:
+                f.write(orjson.dumps({"cache_key": cache_key, "prediction": prediction.model_dump()}) + b"\n")
+
+
+def _predict_one(graph, review: LabeledReview, model_config_key: str, prompt_digest: str) -> Prediction:
+    """리뷰 한 건을 그래프로 실행하여 예측을 만듭니다. 분석 실패도 예외 대신 오류 필드가 채워진 예측으로 반환합니다."""
+    started = time.perf_counter()
+    try:
+        final_state = graph.invoke(AgentState(review_inputs=review.review_inputs, selected_model_config_key=model_config_key))
+        state = AgentState.model_validate(final_state)
+    except Exception as e:
+        logger.error(f"리뷰 {review.review_id} 예측 중 오류 발생 ({model_config_key}): {e}", exc_info=True)
+        return Prediction(
+            review_id=review.review_id,
+            model_config_key=model_config_key,
+            prompt_hash=prompt_digest,
+            latency_seconds=time.perf_counter() - started,
+            error_message=str(e),
+        )
+    analysis_output = state.analysis_output
+    token_usage = state.token_usage
+    return Prediction(
+        review_id=review.review_id,
+        model_config_key=model_config_key,
+        prompt_hash=prompt_digest,
+        score=analysis_output.score if analysis_output else None,
+        overall_sentiment=analysis_output.overall_sentiment if analysis_output else None,
+        actual_model_name_used=state.actual_model_name_used,
+        prompt_version=state.prompt_version,
+        latency_seconds=time.perf_counter() - started,
+        prompt_tokens=token_usage.prompt_tokens if token_usage else None,
+        completion_tokens=token_usage.completion_tokens if token_usage else None,
+        estimated_cost_usd=token_usage.estimated_cost_usd if token_usage else None,
+        error_code=state.error_code,
+        error_message=state.analysis_error_message,
+    )
+
+
+def _percentile_ms(values: List[float], percentile: float) -> Optional[float]:
+    if not values:
+        return None
+    return round(float(np.percentile(np.asarray(values) * 1000.0, percentile)), 3)
+
+
+def generate_predictions(
+    reviews: List[LabeledReview],
+    model_config_key: str,
+    cache: PredictionCache,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    graph=None,
+) -> tuple[List[Prediction], ModelRunStatistics]:
+    """
+    모델 설정 키 하나로 리뷰 전체의 예측을 만듭니다. 캐시에 없는 리뷰만 `concurrency`개의 스레드로 그래프를 실행하며,
+    성공한 예측은 즉시 캐시에 기록되므로 실행이 중간에 중단되어도 다음 실행에서 이어서 진행할 수 있습니다.
+    반환되는 예측 목록은 입력 리뷰 순서를 따릅니다.
+    """
+    model_config = get_model_config(model_config_key)
+    if model_config is None:
+        raise ValueError(f"모델 설정 키 '{model_config_key}'를 찾을 수 없습니다.")
+    prompt_digest = model_config_prompt_hash(model_config)
+    graph = graph or get_compiled_graph(save_result=False, near_duplicate=False)
+
+    started = time.perf_counter()
+    predictions: List[Optional[Prediction]] = [None] * len(reviews)
+    pending = []
+    for position, review in enumerate(reviews):
+        cached = cache.get(prediction_cache_key(review, model_config_key, prompt_digest))
+        if cached is not None:
+            # 캐시는 리뷰 내용 기준이므로, 같은 내용의 다른 리뷰 ID에도 재사용할 수 있도록 ID를 현재 값으로 맞춥니다.
+            predictions[position] = cached.model_copy(update={"review_id": review.review_id})
+        else:
+            pending.append(position)
+    logger.info(f"{model_config_key}: 전체 {len(reviews)}건 중 캐시 적중 {len(reviews) - len(pending)}건, 생성 {len(pending)}건")
+
+    def _run(position: int) -> None:
+        review = reviews[position]
+        prediction = _predict_one(graph, review, model_config_key, prompt_digest)
+        predictions[position] = prediction
+        if prediction.score is not None:
+            cache.put(prediction_cache_key(review, model_config_key, prompt_digest), prediction)
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="eval-predict") as executor:
+            # 예외는 _predict_one에서 처리되므로 결과를 소비하는 것은 작업 완료를 기다리기 위함입니다.
+            list(executor.map(_run, pending))
+    wall_clock_seconds = time.perf_counter() - started
+
+    generated = [predictions[position] for position in pending]
+    failed = sum(1 for prediction in predictions if prediction.score is None)
+    latencies = [prediction.latency_seconds for prediction in generated if prediction.latency_seconds is not None]
+    actual_model_names = {prediction.actual_model_name_used for prediction in predictions if prediction.actual_model_name_used}
+    statistics = ModelRunStatistics(
+        model_config_key=model_config_key,
+        actual_model_name_used=actual_model_names.pop() if len(actual_model_names) == 1 else model_config["llm_params"].get("model_name"),
+        prompt_version=get_prompt_version(model_config.get("prompt_path")),
+        prompt_hash=prompt_digest,
+        total_reviews=len(reviews),
+        cache_hits=len(reviews) - len(pending),
+        generated=len(pending),
+        failed=failed,
+        concurrency=concurrency,
+        wall_clock_seconds=round(wall_clock_seconds, 3),
+        reviews_per_second=round((len(reviews) - failed) / wall_clock_seconds, 3) if wall_clock_seconds > 0 else None,
+        generated_per_second=round(len(pending) / wall_clock_seconds, 3) if pending and wall_clock_seconds > 0 else None,
+        latency_p50_ms=_percentile_ms(latencies, 50),
+        latency_p95_ms=_percentile_ms(latencies, 95),
+    )
+    return predictions, statistics
+
+
+def write_predictions_file(
+    reviews: Iterable[LabeledReview],
+    predictions: Iterable[Prediction],
+    output_path: str,
+    human_score_key: str = "pre_score",
+    llm_score_key: str = "score",
+) -> int:
+    """
+    성공한 예측을 평가기 입력 형식(JSONL, 한 줄에 `review_id`, 사람 점수, LLM 점수)으로 기록하고 기록한 건수를 반환합니다.
+    지연 시간과 토큰 사용량, 예상 비용도 함께 기록하여 정확도-지연-비용 분석(`evaluation.frontier`)에 사용합니다.
+    실패한 예측은 점수가 없으므로 기록하지 않으며, 실행 통계의 `failed`로 집계됩니다.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    written = 0
+    with open(output_path, "wb") as f:
+        for review, prediction in zip(reviews, predictions):
+            if prediction.score is None:
+                continue
+            f.write(orjson.dumps({
+                "review_id": review.review_id,
+                human_score_key: review.human_score,
+                llm_score_key: prediction.score,
+                "overall_sentiment": prediction.overall_sentiment,
+                "model_config_key": prediction.model_config_key,
+                "prompt_version": prediction.prompt_version,
+                "latency_seconds": prediction.latency_seconds,
+                "prompt_tokens": prediction.prompt_tokens,
+                "completion_tokens": prediction.completion_tokens,
+                "estimated_cost_usd": prediction.estimated_cost_usd,
+            }) + b"\n")
+            written += 1
+    return written
+
+
+def predictions_file_path(reviews_path: str, model_config_key: str, output_dir: str = DEFAULT_PREDICTIONS_DIR) -> str:
+    """`<데이터셋 이름>__<모델 설정 키>.jsonl` 형식의 예측 파일 경로"""
+    dataset_name = os.path.splitext(os.path.basename(reviews_path))[0]
+    return os.path.join(output_dir, f"{dataset_name}__{model_config_key}.jsonl")
@@ -1,11 +1,37 @@
 import datetime
+import json
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+
+# 실행 통계 표의 (항목명, 키, 값 형식)
+_RUN_STATISTICS_ROWS = [
+    ("모델 설정 키", "model_config_key", "`{}`"),
+    ("실제 모델명", "actual_model_name_used", "`{}`"),
+    ("프롬프트 버전", "prompt_version", "{}"),
+    ("프롬프트 해시", "prompt_hash", "`{}`"),
+    ("전체 리뷰 수", "total_reviews", "{}"),
+    ("캐시 적중", "cache_hits", "{}"),
+    ("새로 생성", "generated", "{}"),
+    ("실패", "failed", "{}"),
+    ("동시 실행 수", "concurrency", "{}"),
+    ("총 소요 시간 (wall-clock)", "wall_clock_seconds", "{:.3f}s"),
+    ("처리량 (완료 리뷰/초)", "reviews_per_second", "{:.3f}"),
+    ("생성 처리량 (생성 리뷰/초)", "generated_per_second", "{:.3f}"),
+    ("생성 지연 p50", "latency_p50_ms", "{:.1f}ms"),
+    ("생성 지연 p95", "latency_p95_ms", "{:.1f}ms"),
+    # 적응형(순차 조기 종료) 평가에서만 기록되는 항목
+    ("목표 신뢰구간 폭", "target_interval_width", "{:.3f}"),
+    ("평가 라운드", "rounds", "{}"),
+    ("표본 비율 (평가 리뷰 / 전체)", "sampled_fraction", "{:.1%}"),
+    ("범주별 표본 및 종료 사유", "bin_progress", "{}"),
+]
 
 def generate_markdown_report(
     evaluation_results: List[Dict[str, Any]],
     dataset_filename: str,
-    model_name: str = "LLM" # 모델 이름을 받을 수 있도록 추가
+    model_name: str = "LLM", # 모델 이름을 받을 수 있도록 추가
+    run_statistics: Optional[Dict[str, Any]] = None,
+    output_dir: str = "data/benchmark/result",
 ) -> str:
     """
     Generates a markdown report from LLM evaluation results.
@@ -15,6 +41,10 @@ def generate_markdown_report(
                             represents a human_sentiment_bin and contains evaluation metrics.
         dataset_filename: The name of the dataset file used for evaluation (e.g., "reviews_test_set_v1.csv").
         model_name: The name of the LLM model evaluated.
+        run_statistics: Optional prediction-generation statistics (wall-clock time, throughput,
+                        cache hits, latency) added as a separate section when predictions were
+                        generated through the graph.
+        output_dir: Directory where the report file is written.
 
     Returns:
         The filepath of the generated markdown report.
@@ -103,8 +133,19 @@ def generate_markdown_report(
             report_parts.append(f"  - 이 데이터셋에서 사람이 '{bin_label_korean}'(으)로 평가한 리뷰는 없습니다.")
         report_parts.append("")
 
+    # 4. Prediction Run Statistics (그래프로 예측을 생성한 경우)
+    if run_statistics:
+        report_parts.append("## 3. 예측 생성 실행 통계")
+        report_parts.append("| 항목 | 값 |")
+        report_parts.append("|---|---|")
+        for label, key, fmt in _RUN_STATISTICS_ROWS:
+            if key not in run_statistics:
+                continue
+            value = run_statistics[key]
+            report_parts.append(f"| {label} | {fmt.format(value) if value is not None else 'N/A'} |")
+        report_parts.append("")
+
     # File saving logic
-    output_dir = "data/benchmark/result"
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
@@ -128,6 +169,169 @@ def generate_markdown_report(
         print(f"Error writing markdown report to {report_filepath}: {e}")
         return ""
 
+def generate_comparison_report(
+    comparison: Dict[str, Any],
+    output_dir: str = "data/benchmark/result",
+) -> str:
+    """
+    Generates a single comparative markdown report that ranks several models.
+
+    Args:
+        comparison: `ComparisonResult.model_dump()` from `evaluation.comparison.compare_models`.
+                    Models are expected in rank order (highest balanced accuracy first).
+        output_dir: Directory where the report file is written.
+
+    Returns:
+        The filepath of the generated markdown report.
+    """
+    models = comparison["models"]
+    confidence = comparison["confidence_level"]
+    report_parts = []
+
+    # 1. Report Header
+    report_parts.append(f"# Model Comparison Report ({len(models)} models)")
+    report_parts.append(f"Generated on: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    report_parts.append("")
+    report_parts.append(f"- **비교에 사용된 공통 리뷰 수**: {comparison['aligned_reviews']} (리뷰 ID 기준 정렬, 모든 모델의 점수가 유효한 리뷰)")
+    report_parts.append(f"- **부트스트랩 재표본 수**: {comparison['bootstrap_resamples']} (대응 표본, 신뢰수준 {confidence:.0%})")
+    dropped = ", ".join(f"{label}: {count}" for label, count in comparison["dropped_reviews"].items())
+    report_parts.append(f"- **정렬에서 제외된 리뷰 수**: {dropped}")
+    report_parts.append("")
+    report_parts.append("---")
+
+    # 2. Ranking
+    report_parts.append("## 1. 모델 순위 (균형 정확도 기준)")
+    report_parts.append("균형 정확도는 사람 감성 범주(부정, 중립, 긍정)별 일치율의 평균이며, 1위와의 차이 구간이 0을 포함하지 않으면 1위 모델보다 유의하게 낮은 것입니다.")
+    report_parts.append("")
+    report_parts.append("| 순위 | 모델 | 프롬프트 | 균형 정확도 (CI) | 정확도 (CI) | 1위와의 차이 (CI) | 1위일 확률 |")
+    report_parts.append("|---|---|---|---|---|---|---|")
+    for model in models:
+        diff_lo, diff_hi = model["difference_from_best_ci"]
+        if model["rank"] == 1:
+            difference = "-"
+        else:
+            marker = " *" if diff_hi < 0 else ""
+            difference = f"{model['difference_from_best']:+.3f} ({diff_lo:.3f}, {diff_hi:.3f}){marker}"
+        report_parts.append(
+            f"| {model['rank']} | `{model['label']}` | {model.get('prompt_version') or 'N/A'} "
+            f"| {model['balanced_accuracy']:.2%} ({model['balanced_accuracy_ci'][0]:.3f}, {model['balanced_accuracy_ci'][1]:.3f}) "
+            f"| {model['accuracy']:.2%} ({model['accuracy_ci'][0]:.3f}, {model['accuracy_ci'][1]:.3f}) "
+            f"| {difference} | {model['probability_best']:.1%} |"
+        )
+    report_parts.append("")
+    report_parts.append("\\* 1위 모델보다 유의하게 낮음")
+    report_parts.append("")
+
+    # 3. Per-bin match rates
+    report_parts.append("## 2. 사람 감성 범주별 일치율 (윌슨 신뢰 구간)")
+    bin_labels = [result["human_sentiment_bin_label"] for result in models[0]["bin_results"]] if models else []
+    report_parts.append("| 모델 | " + " | ".join(bin_labels) + " |")
+    report_parts.append("|---|" + "---|" * len(bin_labels))
+    for model in models:
+        cells = [
+            f"{result['match_rate']:.2%} ({result['wilson_lower_bound']:.3f}, {result['wilson_upper_bound']:.3f}), n={result['total_reviews_in_bin']}"
+            for result in model["bin_results"]
+        ]
+        report_parts.append(f"| `{model['label']}` | " + " | ".join(cells) + " |")
+    report_parts.append("")
+
+    # 4. Confusion matrices
+    report_parts.append("## 3. 혼동 행렬 (행: 사람 범주, 열: 모델 예측 범주)")
+    for model in models:
+        report_parts.append(f"### {model['rank']}. `{model['label']}`")
+        report_parts.append("| 사람 \\ 모델 | " + " | ".join(bin_labels) + " |")
+        report_parts.append("|---|" + "---|" * len(bin_labels))
+        for bin_label, row in zip(bin_labels, model["confusion_matrix"]):
+            report_parts.append(f"| {bin_label} | " + " | ".join(str(count) for count in row) + " |")
+        report_parts.append("")
+
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    report_filepath = os.path.join(output_dir, f"model_comparison_{timestamp}.md")
+    try:
+        with open(report_filepath, 'w', encoding='utf-8') as f:
+            f.write("\n".join(report_parts))
+        print(f"Comparison report generated: {report_filepath}")
+        return report_filepath
+    except IOError as e:
+        print(f"Error writing comparison report to {report_filepath}: {e}")
+        return ""
+
+def _format_optional(value: Optional[float], fmt: str) -> str:
+    return fmt.format(value) if value is not None else "N/A"
+
+def generate_frontier_report(
+    frontier: Dict[str, Any],
+    output_dir: str = "data/benchmark/result",
+) -> Tuple[str, str]:
+    """
+    Generates the accuracy-latency-cost report as Markdown and as JSON for tracking over time.
+
+    Args:
+        frontier: `FrontierResult.model_dump()` from `evaluation.frontier.build_frontier`.
+        output_dir: Directory where both files are written.
+
+    Returns:
+        (markdown filepath, json filepath). Empty strings if writing failed.
+    """
+    generated_at = datetime.datetime.now()
+    configs = frontier["configs"]
+    report_parts = []
+
+    report_parts.append(f"# Accuracy-Latency-Cost Report ({len(configs)} configs)")
+    report_parts.append(f"Generated on: {generated_at.strftime('%Y-%m-%d %H:%M:%S')}")
+    report_parts.append("")
+    report_parts.append("---")
+
+    report_parts.append("## 1. 설정별 지표")
+    report_parts.append("| 설정 | 프롬프트 | 리뷰 수 | 균형 정확도 | 정확도 | 지연 p50 | 지연 p95 | 평균 토큰 (입력/출력) | 1,000건당 비용 | 프런티어 |")
+    report_parts.append("|---|---|---|---|---|---|---|---|---|---|")
+    for config in configs:
+        tokens = f"{_format_optional(config['avg_prompt_tokens'], '{:.0f}')} / {_format_optional(config['avg_completion_tokens'], '{:.0f}')}"
+        report_parts.append(
+            f"| `{config['label']}` | {config.get('prompt_version') or 'N/A'} | {config['reviews']} "
+            f"| {_format_optional(config['balanced_accuracy'], '{:.2%}')} | {_format_optional(config['accuracy'], '{:.2%}')} "
+            f"| {_format_optional(config['latency_p50_ms'], '{:.0f}ms')} | {_format_optional(config['latency_p95_ms'], '{:.0f}ms')} "
+            f"| {tokens} | {_format_optional(config['cost_per_1k_reviews_usd'], '${:.4f}')} "
+            f"| {'✅' if config['on_frontier'] else ''} |"
+        )
+    report_parts.append("")
+
+    report_parts.append("## 2. 파레토 프런티어")
+    report_parts.append("균형 정확도는 높을수록, p95 지연과 1,000건당 비용은 낮을수록 좋은 것으로 보고, 다른 설정에 지배되지 않는 설정만 남긴 목록입니다 (p95 지연 순). 값이 없는 기준(예: 가격표에 없는 모델의 비용)은 비교에서 제외됩니다.")
+    report_parts.append("")
+    for position, label in enumerate(frontier["frontier"], start=1):
+        config = next(config for config in configs if config["label"] == label)
+        report_parts.append(
+            f"{position}. `{label}`: 균형 정확도 {_format_optional(config['balanced_accuracy'], '{:.2%}')}, "
+            f"p95 {_format_optional(config['latency_p95_ms'], '{:.0f}ms')}, "
+            f"1,000건당 {_format_optional(config['cost_per_1k_reviews_usd'], '${:.4f}')}"
+        )
+    dominated = [config for config in configs if config["dominated_by"]]
+    if dominated:
+        report_parts.append("")
+        report_parts.append("### 프런티어 밖의 설정")
+        for config in dominated:
+            report_parts.append(f"- `{config['label']}`: " + ", ".join(f"`{label}`" for label in config["dominated_by"]) + "에 지배됨")
+    report_parts.append("")
+
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    timestamp = generated_at.strftime("%Y%m%d_%H%M%S")
+    markdown_path = os.path.join(output_dir, f"frontier_{timestamp}.md")
+    json_path = os.path.join(output_dir, f"frontier_{timestamp}.json")
+    try:
+        with open(markdown_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(report_parts))
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump({"generated_at": generated_at.isoformat(timespec="seconds"), **frontier}, f, ensure_ascii=False, indent=2)
+        print(f"Frontier report generated: {markdown_path} (JSON: {json_path})")
+        return markdown_path, json_path
+    except IOError as e:
+        print(f"Error writing frontier report to {output_dir}: {e}")
+        return "", ""
+
 if __name__ == '__main__':
     # Dummy data for testing the reporter
     # This structure matches what evaluate_llm_accuracy_by_sentiment_bin would return
@@ -1,63 +1,363 @@
 # evaluation/run_evaluation.py 의 내용입니다.
 
 import argparse
+import logging
 import os
-import json # 더미 데이터 생성 로직이 필요하다면 사용
+import time
 
 # 같은 evaluation 패키지 내의 모듈을 상대 경로로 임포트합니다.
 from .llm_accuracy_evaluator import evaluate_llm_accuracy_by_sentiment_bin
 from .reporter import generate_markdown_report
+from .streaming import DEFAULT_CHUNK_SIZE
+
+def evaluate_and_report(data_path, report_model_name, chunk_size=DEFAULT_CHUNK_SIZE, run_statistics=None, report_dataset_path=None, evaluation_results=None):
+    """
+    예측 파일을 평가하여 요약을 출력하고 Markdown 리포트를 생성합니다. 생성된 리포트 경로(실패 시 빈 문자열)를 반환합니다.
+    `evaluation_results`를 주면(예: 증분 평가의 누적 집계) 파일을 다시 읽지 않고 그 결과로 리포트를 만듭니다.
+    """
+    # 고정값 설정
+    human_score_key = "pre_score"
+    llm_score_key = "score"
+
+    if evaluation_results is None:
+        print(f"Starting evaluation for data: {data_path}")
+        evaluation_results = evaluate_llm_accuracy_by_sentiment_bin(
+            json_file_path=data_path,
+            human_score_key=human_score_key,
+            llm_score_key=llm_score_key,
+            chunk_size=chunk_size,
+        )
+
+    if not evaluation_results:
+        print("No evaluation results were generated. Please check the input file and keys.")
+        return ""
+
+    print("\nEvaluation Results by Sentiment Bin (Summary):")
+    for result in evaluation_results:
+        print(
+            f"  Human Sentiment Bin: {result['human_sentiment_bin_label']:<10} | "
+            f"Match Rate: {result['match_rate']:.2%} | "
+            f"LLM Dist: N:{result['llm_score_distribution']['Negative']}, Neu:{result['llm_score_distribution']['Neutral']}, P:{result['llm_score_distribution']['Positive']}"
+        )
+
+    report_file_path = generate_markdown_report(
+        evaluation_results,
+        report_dataset_path or data_path,
+        report_model_name,
+        run_statistics=run_statistics,
+    )
+    if report_file_path:
+        print(f"\nMarkdown report successfully generated at: {report_file_path}")
+    else:
+        print("\nFailed to generate markdown report.")
+    return report_file_path
+
+def run_prediction_evaluation(reviews_path, model_config_keys, concurrency, cache_path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    라벨링된 원본 리뷰로 모델 설정 키마다 예측을 생성(캐시 재사용)한 뒤 평가하고 리포트를 생성합니다.
+    모델별 실행 통계 목록을 반환합니다.
+    """
+    # 그래프와 LLM 클라이언트를 불러오는 비용이 크므로, 예측 생성 모드에서만 임포트합니다.
+    from .prediction_runner import (
+        PredictionCache,
+        generate_predictions,
+        load_labeled_reviews,
+        predictions_file_path,
+        write_predictions_file,
+    )
+
+    reviews = load_labeled_reviews(reviews_path)
+    print(f"Loaded {len(reviews)} labeled reviews from {reviews_path}")
+    cache = PredictionCache(cache_path)
+
+    all_statistics = []
+    predictions_paths = []
+    started = time.perf_counter()
+    for model_config_key in model_config_keys:
+        print(f"\nGenerating predictions with '{model_config_key}' (concurrency={concurrency})...")
+        predictions, statistics = generate_predictions(reviews, model_config_key, cache, concurrency=concurrency)
+        print(
+            f"  {statistics.total_reviews} reviews | cache hits: {statistics.cache_hits} | generated: {statistics.generated} | "
+            f"failed: {statistics.failed} | wall-clock: {statistics.wall_clock_seconds:.2f}s | "
+            f"throughput: {statistics.reviews_per_second or 0:.2f} reviews/s"
+        )
+        predictions_path = predictions_file_path(reviews_path, model_config_key)
+        write_predictions_file(reviews, predictions, predictions_path)
+        evaluate_and_report(
+            predictions_path,
+            model_config_key,
+            chunk_size=chunk_size,
+            run_statistics=statistics.model_dump(),
+            report_dataset_path=reviews_path,
+        )
+        all_statistics.append(statistics)
+        predictions_paths.append(predictions_path)
+    print(f"\nTotal wall-clock for {len(model_config_keys)} model(s): {time.perf_counter() - started:.2f}s")
+    # 예측마다 지연 시간과 토큰 사용량이 기록되므로, 실행한 모델 설정들의 정확도-지연-비용 리포트도 함께 남깁니다.
+    run_frontier_report(predictions_paths, chunk_size=chunk_size)
+    return all_statistics
+
+def run_adaptive_evaluation(reviews_path, model_config_keys, concurrency, cache_path, target_width, round_size, min_samples, seed=0):
+    """
+    라벨링된 원본 리뷰를 감성 범주별로 층화 추출하여, 범주별 윌슨 신뢰구간 폭이 `target_width` 이하가 될 때까지만
+    예측을 생성하며 평가합니다. 모델별 순차 평가 결과 목록을 반환합니다.
+    """
+    from .prediction_runner import PredictionCache, load_labeled_reviews, predictions_file_path, write_predictions_file
+    from .sequential import describe_bins, run_sequential_evaluation
+
+    reviews = load_labeled_reviews(reviews_path)
+    print(f"Loaded {len(reviews)} labeled reviews from {reviews_path}")
+    cache = PredictionCache(cache_path)
+
+    results = []
+    for model_config_key in model_config_keys:
+        print(f"\nAdaptive evaluation with '{model_config_key}' (target width={target_width}, round size={round_size})...")
+        result, sampled_reviews, predictions = run_sequential_evaluation(
+            reviews,
+            model_config_key,
+            cache,
+            target_width=target_width,
+            round_size=round_size,
+            min_samples=min_samples,
+            concurrency=concurrency,
+            seed=seed,
+        )
+        print(
+            f"  {result.rounds} rounds | sampled {len(sampled_reviews)}/{len(reviews)} ({result.sampled_fraction:.1%}) | "
+            f"LLM calls: {result.llm_calls} | cache hits: {result.cache_hits} | wall-clock: {result.wall_clock_seconds:.2f}s"
+        )
+        for progress in result.bins:
+            print(f"    {progress.human_sentiment_bin_label:<10} n={progress.evaluated_reviews:<5} width={progress.interval_width} ({progress.stop_reason})")
+
+        # 표본으로 평가한 리뷰만 예측 파일로 남겨, 같은 평가기와 리포터로 결과를 재현합니다.
+        predictions_path = predictions_file_path(reviews_path, f"{model_config_key}_adaptive")
+        write_predictions_file(sampled_reviews, predictions, predictions_path)
+        wall_clock = result.wall_clock_seconds
+        completed = len(sampled_reviews) - result.failed
+        evaluate_and_report(
+            predictions_path,
+            model_config_key,
+            run_statistics={
+                "model_config_key": model_config_key,
+                "total_reviews": len(sampled_reviews),
+                "cache_hits": result.cache_hits,
+                "generated": result.llm_calls,
+                "failed": result.failed,
+                "concurrency": concurrency,
+                "wall_clock_seconds": wall_clock,
+                "reviews_per_second": completed / wall_clock if wall_clock > 0 else None,
+                "target_interval_width": target_width,
+                "rounds": result.rounds,
+                "sampled_fraction": result.sampled_fraction,
+                "bin_progress": describe_bins(result),
+            },
+            report_dataset_path=reviews_path,
+        )
+        results.append(result)
+    return results
+
+def run_model_comparison(system_arguments, bootstrap_resamples, seed=0, chunk_size=DEFAULT_CHUNK_SIZE):
+    """여러 예측 파일을 리뷰 ID 기준으로 정렬하여 비교하고, 순위를 매긴 단일 비교 리포트를 생성합니다."""
+    from .comparison import compare_models, load_systems
+    from .reporter import generate_comparison_report
+
+    systems = load_systems(system_arguments, chunk_size=chunk_size)
+    comparison = compare_models(systems, n_resamples=bootstrap_resamples, seed=seed)
+    print(f"Compared {len(systems)} models on {comparison.aligned_reviews} aligned reviews:")
+    for model in comparison.models:
+        print(
+            f"  #{model.rank} {model.label:<30} | balanced acc: {model.balanced_accuracy:.2%} "
+            f"({model.balanced_accuracy_ci[0]:.3f}, {model.balanced_accuracy_ci[1]:.3f}) | "
+            f"acc: {model.accuracy:.2%} | P(best): {model.probability_best:.1%}"
+        )
+    report_file_path = generate_comparison_report(comparison.model_dump())
+    if report_file_path:
+        print(f"\nComparison report successfully generated at: {report_file_path}")
+    return comparison
+
+def run_incremental_evaluation(data_path, state_path, report_model_name, chunk_size=DEFAULT_CHUNK_SIZE):
+    """상태 파일의 누적 집계에 새로 추가된 레코드만 더하여 평가하고 리포트를 생성합니다."""
+    import json
+    from .incremental import evaluate_incrementally
+
+    started = time.perf_counter()
+    try:
+        evaluation_results, state, info = evaluate_incrementally(data_path, state_path, chunk_size=chunk_size)
+    except json.JSONDecodeError:
+        print(f"Error: Could not decode JSON from {data_path}")
+        return ""
+    mode = f"full recompute ({info.reason})" if info.full_recompute else "incremental"
+    print(
+        f"Incremental evaluation [{mode}]: {info.new_records} new records ({info.new_bytes} bytes) folded in "
+        f"{time.perf_counter() - started:.3f}s | total {state.records_processed} records | state: {state_path}"
+    )
+    return evaluate_and_report(data_path, report_model_name, evaluation_results=evaluation_results)
+
+def run_frontier_report(system_arguments, chunk_size=DEFAULT_CHUNK_SIZE):
+    """예측 파일별 정확도, 지연 시간, 비용을 계산하고 파레토 프런티어 리포트(Markdown, JSON)를 생성합니다."""
+    from .frontier import build_frontier
+    from .reporter import generate_frontier_report
+
+    frontier = build_frontier(system_arguments, chunk_size=chunk_size)
+    print("Accuracy-latency-cost by config:")
+    for config in frontier.configs:
+        cost = f"${config.cost_per_1k_reviews_usd:.4f}/1k" if config.cost_per_1k_reviews_usd is not None else "cost N/A"
+        p95 = f"{config.latency_p95_ms:.0f}ms" if config.latency_p95_ms is not None else "N/A"
+        balanced = f"{config.balanced_accuracy:.2%}" if config.balanced_accuracy is not None else "N/A"
+        print(f"  {'*' if config.on_frontier else ' '} {config.label:<30} | balanced acc: {balanced} | p95: {p95} | {cost}")
+    generate_frontier_report(frontier.model_dump())
+    return frontier
 
 def main():
     parser = argparse.ArgumentParser(description="LLM Accuracy Evaluator and Reporter")
-    parser.add_argument(
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
         "--data-path",
         type=str,
-        required=True,
-        help="Path to the JSON file containing evaluation data (e.g., data/benchmark/sample.json)"
+        help="Path to the JSON or JSONL file containing evaluation data (e.g., data/benchmark/sample.json)"
+    )
+    source.add_argument(
+        "--reviews-path",
+        type=str,
+        help="Path to a JSON or JSONL file of labeled raw reviews (review_text, rating, ordered_items, pre_score). "
+             "Predictions are generated through the review analysis graph before evaluation."
+    )
+    source.add_argument(
+        "--compare",
+        nargs="+",
+        metavar="[LABEL=]PATH",
+        help="Two or more predictions files (pre_score/score with review_id) to compare in one ranked report"
+    )
+    source.add_argument(
+        "--frontier",
+        nargs="+",
+        metavar="[LABEL=]PATH",
+        help="Predictions files with latency and token usage; writes per-config accuracy, p50/p95 latency, "
+             "cost per 1k reviews and the Pareto frontier as Markdown and JSON"
+    )
+    parser.add_argument(
+        "--bootstrap-resamples",
+        type=int,
+        default=2000,
+        help="Number of paired bootstrap resamples used by --compare"
+    )
+    parser.add_argument(
+        "--model-keys",
+        type=str,
+        default=None,
+        help="Comma-separated model config keys used with --reviews-path (default: default_model_config_key)"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Number of reviews analyzed concurrently per model when generating predictions"
+    )
+    parser.add_argument(
+        "--cache-path",
+        type=str,
+        default="data/benchmark/prediction_cache.jsonl",
+        help="Prediction cache file keyed by (review, model config key, prompt hash)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore and do not update the prediction cache"
+    )
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="With --reviews-path, sample reviews stratified by human bin in rounds and stop each bin "
+             "once its Wilson interval is narrower than --target-width"
+    )
+    parser.add_argument("--target-width", type=float, default=0.1, help="Target Wilson interval width per bin (adaptive mode)")
+    parser.add_argument("--round-size", type=int, default=20, help="Reviews sampled per bin per round (adaptive mode)")
+    parser.add_argument("--min-samples", type=int, default=30, help="Minimum evaluated reviews before a bin may stop (adaptive mode)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for stratified sampling (adaptive mode) and bootstrap resampling (--compare)")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="With --data-path, persist per-bin aggregates and a watermark and only fold in records appended since the last run"
+    )
+    parser.add_argument(
+        "--state-path",
+        type=str,
+        default=None,
+        help="Aggregate state file for --incremental (default: data/benchmark/eval_state/<data file>.state.json)"
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="Number of records parsed and binned per chunk while streaming the data file"
     )
 
     args = parser.parse_args()
 
-    # 고정값 설정
-    human_score_key = "pre_score"
-    llm_score_key = "score"
+    if args.compare:
+        missing = [path for path in args.compare if not os.path.exists(path) and not os.path.exists(path.partition("=")[2])]
+        if missing:
+            print(f"Error: Predictions file not found: {', '.join(missing)}")
+            return
+        run_model_comparison(args.compare, args.bootstrap_resamples, seed=args.seed, chunk_size=args.chunk_size)
+        return
+
+    if args.frontier:
+        missing = [path for path in args.frontier if not os.path.exists(path) and not os.path.exists(path.partition("=")[2])]
+        if missing:
+            print(f"Error: Predictions file not found: {', '.join(missing)}")
+            return
+        run_frontier_report(args.frontier, chunk_size=args.chunk_size)
+        return
+
+    if args.reviews_path:
+        if not os.path.exists(args.reviews_path):
+            print(f"Error: Reviews file not found at {args.reviews_path}")
+            return
+        logging.basicConfig(level=logging.WARNING)
+        if args.model_keys:
+            model_config_keys = [key.strip() for key in args.model_keys.split(",") if key.strip()]
+        else:
+            from app.config_loader import load_model_configurations
+            model_config_keys = [load_model_configurations()["default_model_config_key"]]
+        if args.adaptive:
+            run_adaptive_evaluation(
+                args.reviews_path,
+                model_config_keys,
+                concurrency=args.concurrency,
+                cache_path=None if args.no_cache else args.cache_path,
+                target_width=args.target_width,
+                round_size=args.round_size,
+                min_samples=args.min_samples,
+                seed=args.seed,
+            )
+            return
+        run_prediction_evaluation(
+            args.reviews_path,
+            model_config_keys,
+            concurrency=args.concurrency,
+            cache_path=None if args.no_cache else args.cache_path,
+            chunk_size=args.chunk_size,
+        )
+        return
 
     if not os.path.exists(args.data_path):
         print(f"Error: Data file not found at {args.data_path}")
         return
 
-    print(f"Starting evaluation for data: {args.data_path}")
-    evaluation_results = evaluate_llm_accuracy_by_sentiment_bin(
-        json_file_path=args.data_path,
-        human_score_key=human_score_key,
-        llm_score_key=llm_score_key,
-    )
-
-    if evaluation_results:
-        print("\nEvaluation Results by Sentiment Bin (Summary):")
-        for result in evaluation_results:
-            print(
-                f"  Human Sentiment Bin: {result['human_sentiment_bin_label']:<10} | "
-                f"Match Rate: {result['match_rate']:.2%} | "
-                f"LLM Dist: N:{result['llm_score_distribution']['Negative']}, Neu:{result['llm_score_distribution']['Neutral']}, P:{result['llm_score_distribution']['Positive']}"
-            )
-        
-        # 모델 이름 파생
-        model_name_from_file = os.path.splitext(os.path.basename(args.data_path))[0]
-        report_model_name = model_name_from_file if model_name_from_file.lower() not in ["sample", "dummy"] else "LLM_Output"
-        
-        report_file_path = generate_markdown_report(
-            evaluation_results, 
-            args.data_path, 
-            report_model_name
-        )
-        if report_file_path:
-            print(f"\nMarkdown report successfully generated at: {report_file_path}")
-        else:
-            print("\nFailed to generate markdown report.")
-    else:
-        print("No evaluation results were generated. Please check the input file and keys.")
+    # 모델 이름 파생
+    model_name_from_file = os.path.splitext(os.path.basename(args.data_path))[0]
+    report_model_name = model_name_from_file if model_name_from_file.lower() not in ["sample", "dummy"] else "LLM_Output"
+    if args.incremental:
+        from .incremental import default_state_path
+        run_incremental_evaluation(
+            args.data_path,
+            args.state_path or default_state_path(args.data_path),
+            report_model_name,
+            chunk_size=args.chunk_size,
+        )
+        return
+    evaluate_and_report(args.data_path, report_model_name, chunk_size=args.chunk_size)
 
 if __name__ == '__main__':
-    main() 
\ No newline at end of file
+    main()
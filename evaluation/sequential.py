@@ -0,0 +1,202 @@
+"""
+목표 신뢰구간 폭에 도달하면 멈추는 적응형(순차 조기 종료) 평가.
+
+라벨링된 리뷰를 사람 평가 감성 범주별로 층화하여 무작위 순서로 섞은 뒤, 아직 멈추지 않은 범주에서만 라운드마다
+`round_size`건씩 예측을 생성합니다. 라운드가 끝날 때마다 범주별 혼동 행렬과 윌슨 신뢰구간을 갱신하고, 구간 폭이
+`target_width` 이하가 된 범주는 더 이상 표본을 뽑지 않습니다. 전체 데이터셋을 모두 실행하지 않고도 같은 신뢰 수준의
+범주별 일치율을 얻을 수 있습니다.
+"""
+
+import logging
+import time
+from typing import List, Optional
+
+import numpy as np
+from pydantic import BaseModel
+
+from .llm_accuracy_evaluator import (
+    SENTIMENT_BIN_LABELS,
+    bin_sentiment_scores,
+    summarize_confusion_matrix,
+    valid_score_mask,
+)
+from .prediction_runner import (
+    DEFAULT_CONCURRENCY,
+    LabeledReview,
+    Prediction,
+    PredictionCache,
+    generate_predictions,
+)
+
+# 이 모듈을 위한 로깅 설정
+logger = logging.getLogger(__name__)
+
+DEFAULT_TARGET_WIDTH = 0.1
+DEFAULT_ROUND_SIZE = 20
+DEFAULT_MIN_SAMPLES = 30
+
+
+class BinProgress(BaseModel):
+    """사람 평가 감성 범주 하나의 순차 평가 진행 상태"""
+    human_sentiment_bin_label: str
+    available_reviews: int # 데이터셋에서 이 범주에 속하는 리뷰 수
+    sampled_reviews: int = 0 # 예측을 요청한 리뷰 수 (실패 포함)
+    evaluated_reviews: int = 0 # 점수가 유효하여 집계에 반영된 리뷰 수
+    match_rate: Optional[float] = None
+    wilson_lower_bound: Optional[float] = None
+    wilson_upper_bound: Optional[float] = None
+    interval_width: Optional[float] = None
+    stopped_after_round: Optional[int] = None
+    stop_reason: Optional[str] = None # "target_width" 또는 "exhausted"
+
+
+class SequentialEvaluationResult(BaseModel):
+    """순차 평가 결과. `evaluation_results`는 `evaluate_llm_accuracy_by_sentiment_bin`과 같은 형식입니다."""
+    model_config_key: str
+    target_width: float
+    confidence_level: float
+    rounds: int
+    bins: List[BinProgress]
+    evaluation_results: List[dict]
+    sampled_review_ids: List[str]
+    llm_calls: int # 이번 실행에서 실제로 그래프를 실행한 건수 (캐시 적중 제외)
+    cache_hits: int
+    failed: int
+    wall_clock_seconds: float
+
+    @property
+    def sampled_fraction(self) -> float:
+        available = sum(progress.available_reviews for progress in self.bins)
+        return len(self.sampled_review_ids) / available if available else 0.0
+
+
+def stratify_reviews(reviews: List[LabeledReview], seed: int = 0) -> List[List[LabeledReview]]:
+    """리뷰를 사람 점수 기준 감성 범주별로 나누고 각 범주를 재현 가능한 무작위 순서로 섞습니다. 범위 밖 점수는 제외합니다."""
+    human_scores = np.array([review.human_score for review in reviews], dtype=np.float64)
+    valid = valid_score_mask(human_scores)
+    bins = np.full(len(reviews), -1)
+    bins[valid] = bin_sentiment_scores(human_scores[valid])
+
+    rng = np.random.default_rng(seed)
+    strata = []
+    for bin_index in range(len(SENTIMENT_BIN_LABELS)):
+        positions = np.flatnonzero(bins == bin_index)
+        strata.append([reviews[position] for position in rng.permutation(positions)])
+    return strata
+
+
+def run_sequential_evaluation(
+    reviews: List[LabeledReview],
+    model_config_key: str,
+    cache: PredictionCache,
+    target_width: float = DEFAULT_TARGET_WIDTH,
+    round_size: int = DEFAULT_ROUND_SIZE,
+    min_samples: int = DEFAULT_MIN_SAMPLES,
+    confidence_level: float = 0.95,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    seed: int = 0,
+    graph=None,
+) -> tuple[SequentialEvaluationResult, List[LabeledReview], List[Prediction]]:
+    """
+    범주별 윌슨 신뢰구간 폭이 `target_width` 이하가 될 때까지 라운드 단위로 예측을 생성하며 평가합니다.
+
+    범주는 집계된 리뷰가 `min_samples`건 이상이고 구간 폭이 목표 이하이면 멈추며, 표본을 모두 소진해도 멈춥니다.
+    한 라운드의 리뷰(멈추지 않은 범주마다 최대 `round_size`건)는 `generate_predictions`로 한꺼번에 실행되므로
+    라운드 안에서는 모델 호출이 동시에 진행되고, 캐시에 있는 예측은 다시 호출하지 않습니다.
+
+    Returns:
+        (결과, 표본으로 뽑힌 리뷰 목록, 같은 순서의 예측 목록). 뒤의 두 값은 `write_predictions_file`에 그대로 넘길 수 있습니다.
+    """
+    if target_width <= 0 or round_size <= 0:
+        raise ValueError("target_width와 round_size는 0보다 커야 합니다.")
+
+    strata = stratify_reviews(reviews, seed)
+    progress = [
+        BinProgress(human_sentiment_bin_label=label, available_reviews=len(stratum))
+        for label, stratum in zip(SENTIMENT_BIN_LABELS, strata)
+    ]
+    matrix = np.zeros((3, 3), dtype=np.int64)
+    sampled_reviews: List[LabeledReview] = []
+    sampled_predictions: List[Prediction] = []
+    llm_calls = cache_hits = failed = 0
+    rounds = 0
+    started = time.perf_counter()
+
+    while True:
+        round_reviews, round_bins = [], []
+        for bin_index, bin_progress in enumerate(progress):
+            if bin_progress.stop_reason is not None:
+                continue
+            batch = strata[bin_index][bin_progress.sampled_reviews:bin_progress.sampled_reviews + round_size]
+            round_reviews.extend(batch)
+            round_bins.extend([bin_index] * len(batch))
+            bin_progress.sampled_reviews += len(batch)
+        if not round_reviews:
+            break
+        rounds += 1
+
+        predictions, statistics = generate_predictions(round_reviews, model_config_key, cache, concurrency=concurrency, graph=graph)
+        llm_calls += statistics.generated
+        cache_hits += statistics.cache_hits
+        failed += statistics.failed
+        sampled_reviews.extend(round_reviews)
+        sampled_predictions.extend(predictions)
+
+        # 라운드 결과만 혼동 행렬에 더합니다. 점수가 없거나 범위를 벗어난 예측은 집계하지 않습니다.
+        llm_scores = np.array([np.nan if p.score is None else p.score for p in predictions], dtype=np.float64)
+        human_bins = np.array(round_bins)
+        valid = valid_score_mask(llm_scores)
+        np.add.at(matrix, (human_bins[valid], bin_sentiment_scores(llm_scores[valid])), 1)
+
+        summaries = summarize_confusion_matrix(matrix, confidence_level)
+        for bin_index, bin_progress in enumerate(progress):
+            summary = summaries[bin_index]
+            bin_progress.evaluated_reviews = summary["total_reviews_in_bin"]
+            if bin_progress.evaluated_reviews:
+                bin_progress.match_rate = summary["match_rate"]
+                bin_progress.wilson_lower_bound = summary["wilson_lower_bound"]
+                bin_progress.wilson_upper_bound = summary["wilson_upper_bound"]
+                bin_progress.interval_width = summary["wilson_upper_bound"] - summary["wilson_lower_bound"]
+            if bin_progress.stop_reason is not None:
+                continue
+            if (
+                bin_progress.evaluated_reviews >= min_samples
+                and bin_progress.interval_width is not None
+                and bin_progress.interval_width <= target_width
+            ):
+                bin_progress.stop_reason = "target_width"
+            elif bin_progress.sampled_reviews >= bin_progress.available_reviews:
+                bin_progress.stop_reason = "exhausted"
+            if bin_progress.stop_reason is not None:
+                bin_progress.stopped_after_round = rounds
+                logger.info(
+                    f"{bin_progress.human_sentiment_bin_label} 범주 평가 종료 ({bin_progress.stop_reason}): "
+                    f"{bin_progress.evaluated_reviews}건, 구간 폭 {bin_progress.interval_width}"
+                )
+
+    result = SequentialEvaluationResult(
+        model_config_key=model_config_key,
+        target_width=target_width,
+        confidence_level=confidence_level,
+        rounds=rounds,
+        bins=progress,
+        evaluation_results=summarize_confusion_matrix(matrix, confidence_level),
+        sampled_review_ids=[review.review_id for review in sampled_reviews],
+        llm_calls=llm_calls,
+        cache_hits=cache_hits,
+        failed=failed,
+        wall_clock_seconds=round(time.perf_counter() - started, 3),
+    )
+    return result, sampled_reviews, sampled_predictions
+
+
+def describe_bins(result: SequentialEvaluationResult) -> str:
+    """범주별 표본 수, 구간 폭, 종료 사유를 한 줄로 요약합니다 (리포트 실행 통계용)."""
+    parts = []
+    for progress in result.bins:
+        width = f"{progress.interval_width:.3f}" if progress.interval_width is not None else "N/A"
+        parts.append(
+            f"{progress.human_sentiment_bin_label}: {progress.evaluated_reviews}/{progress.available_reviews}건, "
+            f"폭 {width}, {progress.stop_reason}"
+        )
+    return "; ".join(parts)
@@ -0,0 +1,266 @@
+"""
+대용량 평가 데이터(JSON 배열, JSONL)를 메모리를 일정하게 유지하며 읽는 스트리밍 리더.
+
+파일 전체를 `json.load`로 읽지 않고 레코드를 청크 단위로 파싱하여, 점수 필드를 NumPy 배열 청크로 넘겨줍니다.
+JSONL은 줄 단위로 orjson을 사용하므로 수 GB 크기의 예측 덤프에는 JSONL 형식이 가장 빠릅니다.
+"""
+
+import json
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import orjson
+
+DEFAULT_CHUNK_SIZE = 65536  # 청크당 레코드 수
+_READ_SIZE = 1 << 20  # 한 번에 읽는 크기 (JSON 배열은 문자 수, JSONL은 바이트 수)
+_NUMERIC_TYPES = frozenset({float, int, bool})
+_WHITESPACE = " \t\r\n"
+
+
+def is_json_array(file_path: str) -> bool:
+    """파일의 첫 번째 공백이 아닌 문자가 '['이면 JSON 배열, 아니면 JSONL로 판단합니다."""
+    with open(file_path, "r", encoding="utf-8") as f:
+        while True:
+            char = f.read(1)
+            if not char:
+                return False
+            if char not in _WHITESPACE:
+                return char == "["
+
+
+def _parse_object_batch(buffer: str, position: int) -> Optional[Tuple[List[Any], int]]:
+    """
+    버퍼의 `position`부터 마지막으로 완결된 객체 원소까지를 orjson으로 한 번에 파싱합니다.
+    잘라낸 범위가 원소 경계가 아니면(중첩 구조나 문자열 안) 유효한 JSON이 되지 않으므로 파싱에 실패하며,
+    이때는 `None`을 반환하여 원소 단위 파싱으로 전환하게 합니다. 자를 곳이 없으면 빈 목록을 반환합니다.
+    """
+    end = len(buffer)
+    for _ in range(4):
+        cut = buffer.rfind("}", position, end)
+        if cut < 0:
+            return [], position
+        next_position = cut + 1
+        while next_position < len(buffer) and buffer[next_position] in _WHITESPACE:
+            next_position += 1
+        if next_position < len(buffer) and buffer[next_position] in ",]":
+            try:
+                return orjson.loads("[" + buffer[position:cut + 1] + "]"), cut + 1
+            except orjson.JSONDecodeError:
+                return None
+        end = cut
+    return [], position
+
+
+def _iter_json_array(file_path: str) -> Iterator[List[Any]]:
+    """
+    JSON 배열의 원소를 순서대로 파싱하여 배치 단위로 반환합니다. 메모리에는 읽기 버퍼와 그 버퍼에서 파싱한 원소만 유지합니다.
+    객체 원소가 나열된 일반적인 덤프는 버퍼 단위로 orjson을 사용하고, 그렇지 않은 파일(NaN, 중첩 객체 등)은
+    `json.JSONDecoder.raw_decode`로 원소를 하나씩 파싱합니다.
+    """
+    decoder = json.JSONDecoder()
+    with open(file_path, "r", encoding="utf-8") as f:
+        buffer = f.read(_READ_SIZE).lstrip(_WHITESPACE)
+        if not buffer.startswith("["):
+            raise json.JSONDecodeError("Expecting '['", buffer, 0)
+        position = 1
+        eof = False
+        element_count = 0
+        expecting_value = True
+        fast_path = True
+
+        def _read_more() -> None:
+            nonlocal buffer, position, eof
+            chunk = f.read(_READ_SIZE)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+
+        while True:
+            # 원소 사이의 공백을 건너뜁니다.
+            while position < len(buffer) and buffer[position] in _WHITESPACE:
+                position += 1
+            if position >= len(buffer):
+                if eof:
+                    raise json.JSONDecodeError("Unterminated array", buffer, position)
+                _read_more()
+                continue
+
+            char = buffer[position]
+            if char == "]" and (not expecting_value or element_count == 0):
+                position += 1
+                break
+            if not expecting_value:
+                if char != ",":
+                    raise json.JSONDecodeError("Expecting ',' delimiter", buffer, position)
+                expecting_value = True
+                position += 1
+                continue
+
+            if fast_path:
+                batch = _parse_object_batch(buffer, position)
+                if batch is None:
+                    fast_path = False
+                elif batch[0]:
+                    values, position = batch
+                    yield values
+                    element_count += len(values)
+                    expecting_value = False
+                    continue
+
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                # 버퍼 끝에서 잘린 원소이면 다음 블록을 이어 붙여 다시 파싱합니다.
+                _read_more()
+                continue
+            if end == len(buffer) and not eof:
+                # 숫자처럼 끝을 알 수 없는 원소가 버퍼 끝에서 잘렸을 수 있으므로 더 읽고 다시 파싱합니다.
+                _read_more()
+                continue
+            yield [value]
+            element_count += 1
+            expecting_value = False
+            position = end
+
+        # json.load와 같이 배열 뒤에 공백 외의 내용이 있으면 오류로 처리합니다.
+        while True:
+            if buffer[position:].strip(_WHITESPACE):
+                raise json.JSONDecodeError("Extra data", buffer, position)
+            if eof:
+                return
+            _read_more()
+
+
+def _parse_json_lines(block: bytes) -> List[Any]:
+    """완결된 줄들로 이루어진 블록을 파싱합니다. 가능하면 블록 전체를 하나의 배열로 orjson에 넘깁니다."""
+    stripped = block.strip()
+    if not stripped:
+        return []
+    try:
+        return orjson.loads(b"[" + stripped.replace(b"\n", b",") + b"]")
+    except orjson.JSONDecodeError:
+        pass
+    records = []
+    for line in block.splitlines():
+        if not line.strip():
+            continue
+        try:
+            records.append(orjson.loads(line))
+        except orjson.JSONDecodeError:
+            # orjson은 NaN/Infinity를 허용하지 않으므로, 파이썬 json.dumps가 쓴 줄은 표준 json 모듈로 다시 읽습니다.
+            records.append(json.loads(line))
+    return records
+
+
+def iter_json_line_batches(
+    file_path: str,
+    start_offset: int = 0,
+    tolerate_partial_tail: bool = False,
+) -> Iterator[Tuple[List[Any], int]]:
+    """
+    JSONL 파일을 `start_offset` 바이트부터 블록 단위로 읽어 (파싱한 레코드 목록, 그 블록 끝의 바이트 오프셋)을 반환합니다.
+    오프셋은 항상 완결된 줄의 끝이므로 다음 실행에서 그 위치부터 이어 읽을 수 있습니다 (증분 평가의 워터마크).
+    마지막 줄에 줄바꿈이 없으면 파싱을 시도하고, `tolerate_partial_tail`이 참이면 파싱에 실패한 마지막 줄(기록 중인 줄)을
+    오류 대신 읽지 않은 것으로 남겨 둡니다.
+    """
+    with open(file_path, "rb") as f:
+        f.seek(start_offset)
+        offset = start_offset
+        remainder = b""
+        while True:
+            chunk = f.read(_READ_SIZE)
+            if not chunk:
+                if remainder.strip():
+                    try:
+                        records = _parse_json_lines(remainder)
+                    except json.JSONDecodeError:
+                        if not tolerate_partial_tail:
+                            raise
+                        return
+                    yield records, offset + len(remainder)
+                return
+            data = remainder + chunk
+            cut = data.rfind(b"\n")
+            if cut < 0:
+                remainder = data
+                continue
+            remainder = data[cut + 1:]
+            offset += cut + 1
+            yield _parse_json_lines(data[:cut + 1]), offset
+
+
+def _iter_json_lines(file_path: str) -> Iterator[List[Any]]:
+    """JSONL 파일을 블록 단위로 읽어, 블록마다 파싱한 레코드 목록을 반환합니다."""
+    for records, _ in iter_json_line_batches(file_path):
+        yield records
+
+
+def _iter_record_batches(file_path: str) -> Iterator[List[Any]]:
+    if is_json_array(file_path):
+        return _iter_json_array(file_path)
+    return _iter_json_lines(file_path)
+
+
+def iter_records(file_path: str) -> Iterator[Any]:
+    """
+    JSON 배열 또는 JSONL 파일의 레코드를 순서대로 반환합니다. 형식은 파일 내용으로 판단합니다.
+    파싱할 수 없는 내용이 있으면 `json.JSONDecodeError`(orjson의 오류도 이 클래스의 하위 클래스)가 발생합니다.
+    """
+    for batch in _iter_record_batches(file_path):
+        yield from batch
+
+
+def iter_record_chunks(file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[Any]]:
+    """레코드를 최대 `chunk_size`개씩 묶어 반환합니다. 파서가 만든 배치를 레코드 단위로 풀지 않고 이어 붙입니다."""
+    chunk: List[Any] = []
+    for batch in _iter_record_batches(file_path):
+        chunk.extend(batch)
+        while len(chunk) >= chunk_size:
+            yield chunk[:chunk_size]
+            chunk = chunk[chunk_size:]
+    if chunk:
+        yield chunk
+
+
+def _to_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def to_float_array(values: Sequence[Any]) -> np.ndarray:
+    """
+    값 목록을 `float(value)`와 같은 규칙으로 float64 배열로 변환합니다 (bool은 0/1).
+    변환할 수 없는 값(None, 숫자가 아닌 문자열 등)은 NaN이 됩니다. 모두 숫자이면 한 번에 변환합니다.
+    """
+    if set(map(type, values)) <= _NUMERIC_TYPES:
+        return np.array(values, dtype=np.float64)
+    return np.fromiter((_to_float(value) for value in values), dtype=np.float64, count=len(values))
+
+
+def extract_score_columns(records: Sequence[Any], keys: Sequence[str], default: Any = -1) -> Dict[str, np.ndarray]:
+    """레코드 청크에서 `keys`의 값을 float64 배열로 추출합니다. 키가 없으면 `default`, 레코드가 객체가 아니면 NaN."""
+    columns = {}
+    for key in keys:
+        try:
+            values = [record.get(key, default) for record in records]
+        except AttributeError:
+            # 객체가 아닌 레코드가 섞인 청크만 타입을 하나씩 확인합니다.
+            values = [record.get(key, default) if isinstance(record, dict) else None for record in records]
+        columns[key] = to_float_array(values)
+    return columns
+
+
+def iter_score_chunks(
+    file_path: str,
+    human_score_key: str,
+    llm_score_key: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """파일을 스트리밍하며 (사람 점수, LLM 점수) float64 배열 청크를 반환합니다. 잘못된 값은 NaN."""
+    for records in iter_record_chunks(file_path, chunk_size):
+        columns = extract_score_columns(records, [human_score_key, llm_score_key])
+        yield columns[human_score_key], columns[llm_score_key]
@@ -0,0 +1,82 @@
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+from app.config_loader import get_service_config
+from app.memory import register_cache_size
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CLIENT_CACHE_SIZE = 16
+
+
+class BoundedClientCache:
+    """
+    제공자 채팅 모델 클라이언트(ChatOpenAI, ChatGoogleGenerativeAI 등)의 LRU 캐시.
+    호출마다 SDK 클라이언트(HTTP 연결 풀, gRPC 채널)를 새로 만들지 않고 재사용하되, 항목 수를 `max_size`로 제한합니다.
+    키는 (제공자, 모델, 온도, 자격 증명 지문)처럼 설정과 환경에서 정해지는 값만 사용하고, 요청마다 달라지는 타임아웃은
+    호출 시 전달합니다. API 키를 교체하면 지문이 달라져 새 키로 클라이언트를 만듭니다.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_CLIENT_CACHE_SIZE):
+        self.max_size = max(max_size, 1)
+        self._clients: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._clients.move_to_end(key)
+                self.hits += 1
+                return client
+        # 클라이언트 생성(자격 증명 확인 등)은 잠금 밖에서 수행합니다. 같은 키를 동시에 만들면 먼저 등록된 것을 사용합니다.
+        created = factory()
+        with self._lock:
+            client = self._clients.setdefault(key, created)
+            self._clients.move_to_end(key)
+            self.misses += 1
+            while len(self._clients) > self.max_size:
+                evicted_key, _ = self._clients.popitem(last=False)
+                self.evictions += 1
+                logger.debug(f"LLM 클라이언트 캐시에서 제거: {evicted_key}")
+        return client
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clients.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"size": len(self._clients), "max_size": self.max_size, "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+def credential_fingerprint(secret: str | None) -> str | None:
+    """캐시 키에 넣을 API 키의 지문. 키 자체는 캐시 키나 로그에 남기지 않습니다."""
+    return hashlib.sha256(secret.encode("utf-8")).hexdigest()[:16] if secret else None
+
+
+_CLIENT_CACHE: BoundedClientCache | None = None
+_CLIENT_CACHE_LOCK = threading.Lock()
+
+
+def get_client_cache() -> BoundedClientCache:
+    """서비스 설정(`memory.client_cache_max_size`)의 크기로 만든 프로세스 단위 클라이언트 캐시"""
+    global _CLIENT_CACHE
+    if _CLIENT_CACHE is None:
+        with _CLIENT_CACHE_LOCK:
+            if _CLIENT_CACHE is None:
+                max_size = int(get_service_config("memory").get("client_cache_max_size", DEFAULT_CLIENT_CACHE_SIZE))
+                _CLIENT_CACHE = BoundedClientCache(max_size)
+    return _CLIENT_CACHE
+
+
+register_cache_size("llm_clients", lambda: len(_CLIENT_CACHE) if _CLIENT_CACHE is not None else 0)
@@ -0,0 +1,94 @@
+import hashlib
+import logging
+import os
+import time
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+
+from app.schemas import KeywordSentiment, ReviewAnalysisOutput, ReviewInputs
+from app.tracing import start_span
+from models.prompt_loader import get_format_instructions, get_output_parser, render_prompt
+
+logger = logging.getLogger(__name__)
+
+# 가짜 LLM의 응답 지연(초). 부하 테스트 등에서 환경 변수로 제공자 왕복 시간을 흉내냅니다.
+FAKE_LLM_LATENCY_ENV = "FAKE_LLM_LATENCY_SECONDS"
+# 응답 1건당 보고할 출력 토큰 수
+FAKE_COMPLETION_TOKENS = 180
+
+
+
+def warm_up() -> None:
+    """서비스 시작 시 호출되어 format instructions를 미리 생성합니다."""
+    get_format_instructions()
+
+
+def _estimate_tokens(text: str) -> int:
+    """실제 토크나이저 없이 사용량 집계를 흉내내기 위한 대략적인 토큰 수 (4글자당 1토큰)"""
+    return max(1, len(text) // 4)
+
+
+def build_fake_analysis(params: ReviewInputs) -> ReviewAnalysisOutput:
+    """
+    리뷰 입력만으로 결정되는 분석 결과를 만듭니다. 같은 입력에는 항상 같은 결과를 반환합니다.
+    점수는 평점(0~5)을 0~1로 정규화한 값에 리뷰 텍스트 해시로 작은 변화를 더해 계산합니다.
+    """
+    digest = hashlib.sha256(params.review_text.encode("utf-8")).digest()
+    jitter = (digest[0] / 255.0 - 0.5) * 0.1
+    score = round(min(max(params.rating / 5.0 + jitter, 0.0), 1.0), 2)
+    if score < 0.4:
+        sentiment = "NEGATIVE"
+    elif score < 0.7:
+        sentiment = "NEUTRAL"
+    else:
+        sentiment = "POSITIVE"
+
+    return ReviewAnalysisOutput(
+        score=score,
+        summary=params.review_text[:50],
+        is_question_review="?" in params.review_text,
+        overall_sentiment=sentiment,
+        keywords=[KeywordSentiment(keyword=item, sentiment=sentiment) for item in params.ordered_items[:3]],
+        reply="소중한 리뷰 감사합니다.",
+        analysis_score=f"평점 {params.rating} 기준 결정적 점수",
+        analysis_reply="가짜 LLM 제공자의 고정 답변",
+    )
+
+
+def invoke_fake_with_structured_output(
+    prompt_file_path: str,
+    params: ReviewInputs,
+    model_name: str,
+    temperature: float,
+    timeout: float | None = None,
+    format_instructions_mode: str | None = None,
+    prompt_variables: dict | None = None,
+) -> ReviewAnalysisOutput:
+    """
+    실제 제공자를 호출하지 않는 결정적 가짜 LLM 클라이언트 (부하 테스트, 벤치마크용).
+    실제 클라이언트와 같은 인터페이스로 프롬프트를 렌더링하고, `FAKE_LLM_LATENCY_SECONDS`만큼 기다린 뒤
+    입력으로 결정되는 분석 결과를 반환합니다. 토큰 사용량은 LangChain 콜백으로 보고되어 지표와 비용 집계에 반영됩니다.
+    """
+    if not model_name or temperature is None:
+        raise ValueError("model_name and temperature must be provided.")
+
+    with start_span("prompt.render", {"prompt.path": prompt_file_path}):
+        full_prompt = render_prompt(prompt_file_path, params, format_instructions_mode, prompt_variables)
+
+    latency_seconds = float(os.getenv(FAKE_LLM_LATENCY_ENV, "0"))
+    if timeout is not None and latency_seconds > timeout:
+        time.sleep(timeout)
+        raise TimeoutError(f"가짜 LLM 응답 지연({latency_seconds}초)이 타임아웃({timeout}초)을 넘었습니다.")
+    if latency_seconds > 0:
+        time.sleep(latency_seconds)
+
+    analysis = build_fake_analysis(params)
+    usage = {
+        "input_tokens": _estimate_tokens(full_prompt),
+        "output_tokens": FAKE_COMPLETION_TOKENS,
+        "total_tokens": _estimate_tokens(full_prompt) + FAKE_COMPLETION_TOKENS,
+    }
+    fake_llm = GenericFakeChatModel(messages=iter([AIMessage(content=analysis.model_dump_json(), usage_metadata=usage)]))
+    response = fake_llm.invoke([HumanMessage(content=full_prompt)])
+    return get_output_parser().parse(response.content)
@@ -1,24 +1,34 @@
-from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import HumanMessage
-from langchain_core.output_parsers import PydanticOutputParser
 from langchain_core.exceptions import OutputParserException
 from app.schemas import ReviewAnalysisOutput, ReviewInputs
+from app.tracing import start_span
+from models.client_cache import credential_fingerprint, get_client_cache
+from models.prompt_loader import build_prompt_variables, ensure_dotenv_loaded, get_format_instructions, get_output_parser, load_prompt_template
 import logging
-
-load_dotenv()
+import os
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-# Initialize PydanticOutputParser at the module level
-output_parser = PydanticOutputParser(pydantic_object=ReviewAnalysisOutput)
+
+def warm_up() -> None:
+    """
+    서비스 시작 시 호출되어 Google GenAI SDK 임포트, .env 로드, format instructions 생성을 미리 수행합니다.
+    `langchain_google_genai`는 이 모듈을 임포트할 때가 아니라 실제로 사용할 때 로드됩니다.
+    """
+    ensure_dotenv_loaded()
+    import langchain_google_genai  # noqa: F401
+
+    get_format_instructions()
 
 def invoke_gemini_with_structured_output(
     prompt_file_path: str,
     params: ReviewInputs,
     model_name: str,
-    temperature: float
+    temperature: float,
+    timeout: float | None = None,
+    format_instructions_mode: str | None = None,
+    prompt_variables: dict | None = None,
 ) -> ReviewAnalysisOutput:
     """
     지정된 프롬프트 파일, 파라미터, 모델명, 온도를 사용하여 Gemini 모델을 동적으로 생성 및 호출하고,
@@ -29,6 +39,9 @@ def invoke_gemini_with_structured_output(
         params: 프롬프트 포맷팅에 사용될 `app.schemas.ReviewInputs` Pydantic 모델.
         model_name: 사용할 Gemini 모델의 이름 (예: "gemini-1.5-flash-latest"). 필수 입력.
         temperature: 모델의 생성 온도. 필수 입력.
+        timeout: API 호출 타임아웃(초). 요청 처리 기한이 있을 때 남은 시간이 전달됩니다. 일시적 오류(429/5xx)의 재시도는 SDK 기본값을 따릅니다.
+        format_instructions_mode: 응답 형식 지침의 형태 (`full`, `compact`, `none`). 모델 설정의 `format_instructions` 값이며 기본은 전체 스키마입니다.
+        prompt_variables: 선택 기능이 채우는 추가 프롬프트 변수 (예: 로컬 키워드 추출의 `keyword_guidance`).
 
     Returns:
         ReviewAnalysisOutput: Gemini 모델의 응답을 파싱한 Pydantic 객체.
@@ -47,28 +60,34 @@ def invoke_gemini_with_structured_output(
     logging.info(f"Invoking Gemini with prompt file: {prompt_file_path}, param fields: {param_field_keys}, model: {model_name}, temperature: {temperature}")
     
     try:
-        llm = ChatGoogleGenerativeAI(
-            model=model_name,
-            temperature=temperature
-        )
-        logging.info(f"Dynamically initialized ChatGoogleGenerativeAI with model: {model_name}, temperature: {temperature}")
+        # 프롬프트를 먼저 렌더링하여, 프롬프트 파일 오류는 SDK 클라이언트 생성(자격 증명 확인) 전에 드러나도록 합니다.
+        with start_span("prompt.render", {"prompt.path": prompt_file_path}):
+            prompt_template_str = load_prompt_template(prompt_file_path)
 
-        with open(prompt_file_path, 'r', encoding='utf-8') as f:
-            prompt_template_str = f.read()
-        logging.info(f"Successfully loaded prompt template from {prompt_file_path}")
+            full_prompt = prompt_template_str.format(**build_prompt_variables(params, format_instructions_mode, prompt_variables))
+            logging.info("Prompt formatted successfully.")
 
-        format_instructions = output_parser.get_format_instructions()
+        ensure_dotenv_loaded()
+        from langchain_google_genai import ChatGoogleGenerativeAI
 
-        full_prompt = prompt_template_str.format(**params.model_dump(), format_instructions=format_instructions)
-        logging.info("Prompt formatted successfully.")
+        # 클라이언트는 (모델, 온도, API 키 지문)별로 크기 제한 캐시에서 재사용하고, 요청별 타임아웃은 호출에만 바인딩합니다.
+        # ChatGoogleGenerativeAI는 GOOGLE_API_KEY 환경 변수에서 키를 읽습니다.
+        llm = get_client_cache().get_or_create(
+            ("gemini", model_name, temperature, credential_fingerprint(os.getenv("GOOGLE_API_KEY"))),
+            lambda: ChatGoogleGenerativeAI(
+                model=model_name,
+                temperature=temperature,
+            ),
+        )
+        logging.info(f"Using ChatGoogleGenerativeAI with model: {model_name}, temperature: {temperature}")
 
         message = HumanMessage(content=full_prompt)
 
         logging.info(f"Sending request to Gemini LLM (model: {model_name})...")
-        response = llm.invoke([message])
+        response = (llm.bind(timeout=timeout) if timeout is not None else llm).invoke([message])
         logging.info(f"Received response from Gemini LLM (model: {model_name}). Content length: {len(response.content)}")
 
-        parsed_output = output_parser.parse(response.content)
+        parsed_output = get_output_parser().parse(response.content)
         logging.info(f"Successfully parsed LLM response into Pydantic object for model: {model_name}")
         return parsed_output
 
@@ -1,29 +1,41 @@
 import os
 import logging
-from dotenv import load_dotenv
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
 from langchain_core.exceptions import OutputParserException
-from langchain_core.output_parsers import PydanticOutputParser
 from app.schemas import ReviewAnalysisOutput, ReviewInputs
+from app.tracing import start_span
+from models.client_cache import credential_fingerprint, get_client_cache
+from models.prompt_loader import build_prompt_variables, ensure_dotenv_loaded, get_format_instructions, load_prompt_template
 
-load_dotenv()
 logger = logging.getLogger(__name__)
 
-# PydanticOutputParser를 ReviewAnalysisOutput 스키마로 초기화
-output_parser = PydanticOutputParser(pydantic_object=ReviewAnalysisOutput)
+
+def warm_up() -> None:
+    """
+    서비스 시작 시 호출되어 OpenAI SDK 임포트, .env 로드, format instructions 생성을 미리 수행합니다.
+    `langchain_openai`는 이 모듈을 임포트할 때가 아니라 실제로 사용할 때 로드됩니다.
+    """
+    ensure_dotenv_loaded()
+    import langchain_openai  # noqa: F401
+
+    get_format_instructions()
+
 
 def invoke_openai_with_structured_output(
     prompt_file_path: str,
     params: ReviewInputs,
     model_name: str,
     temperature: float,
+    timeout: float | None = None,
+    format_instructions_mode: str | None = None,
+    prompt_variables: dict | None = None,
 ) -> ReviewAnalysisOutput:
     if not model_name or temperature is None:
         error_msg = "ValueError: model_name and temperature must be provided."
         logger.error(error_msg)
         raise ValueError(error_msg)
 
+    ensure_dotenv_loaded()
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         error_msg = "ValueError: OPENAI_API_KEY environment variable not set."
@@ -34,37 +46,43 @@ def invoke_openai_with_structured_output(
     logger.info(f"OpenAI call started: model='{model_name}', temperature={temperature}, prompt_file='{prompt_file_path}', input_param_fields={param_field_keys}")
 
     try:
-        try:
-            with open(prompt_file_path, 'r', encoding='utf-8') as f:
-                prompt_template_str = f.read()
-            logger.info(f"Prompt template loaded successfully: {prompt_file_path}")
-
-        except FileNotFoundError:
-            logger.error(f"FileNotFoundError: Prompt file not found: {prompt_file_path}")
-            raise
-        
-        prompt_template = ChatPromptTemplate.from_template(prompt_template_str)
+        with start_span("prompt.render", {"prompt.path": prompt_file_path}):
+            try:
+                prompt_template_str = load_prompt_template(prompt_file_path)
+
+            except FileNotFoundError:
+                logger.error(f"FileNotFoundError: Prompt file not found: {prompt_file_path}")
+                raise
+
+            prompt_template = ChatPromptTemplate.from_template(prompt_template_str)
 
-        llm = ChatOpenAI(
-            model=model_name,
-            openai_api_key=api_key,
-            temperature=temperature,
+            # PydanticOutputParser를 사용하여 format_instructions 생성 및 주입
+            # with_structured_output이 스키마를 API로 전달하므로, 모델 설정에서 `none`으로 프롬프트의 중복 스키마를 뺄 수 있습니다.
+            invoke_args = build_prompt_variables(params, format_instructions_mode, prompt_variables)
+            format_instructions_str = invoke_args["format_instructions"]
+            logger.debug(f"Generated format_instructions for OpenAI prompt (length: {len(format_instructions_str)})")
+
+        # 요청 처리 기한이 있으면 남은 시간을 HTTP 타임아웃으로 사용합니다. 일시적 오류(429/5xx)는 SDK 기본값대로 재시도하며,
+        # 기한이 지나면 호출하는 쪽(run_with_deadline)이 결과를 기다리지 않고 DEADLINE_EXCEEDED로 응답합니다.
+        from langchain_openai import ChatOpenAI
+
+        # 클라이언트와 구조화 출력 래퍼는 (모델, 온도, API 키 지문)별로 크기 제한 캐시에서 재사용합니다.
+        structured_llm = get_client_cache().get_or_create(
+            ("openai", model_name, temperature, credential_fingerprint(api_key)),
+            lambda: ChatOpenAI(
+                model=model_name,
+                openai_api_key=api_key,
+                temperature=temperature,
+            ).with_structured_output(ReviewAnalysisOutput),
         )
-        logger.info(f"ChatOpenAI initialized: model='{model_name}', temperature={temperature}")
+        logger.info(f"ChatOpenAI ready: model='{model_name}', temperature={temperature}")
 
-        structured_llm = llm.with_structured_output(ReviewAnalysisOutput)
-        chain = prompt_template | structured_llm
-        
         logger.info(f"Sending request to OpenAI LLM ({model_name})...")
-        
-        invoke_args = params.model_dump()
-        
-        # PydanticOutputParser를 사용하여 format_instructions 생성 및 주입
-        format_instructions_str = output_parser.get_format_instructions()
-        invoke_args["format_instructions"] = format_instructions_str 
-        logger.debug(f"Generated format_instructions for OpenAI prompt (length: {len(format_instructions_str)})")
-            
-        response_pydantic = chain.invoke(invoke_args)
+
+        # 요청별 타임아웃은 호출 인자로 전달합니다. 구조화 출력 체인은 호출 인자를 첫 단계(모델 호출)에만 넘기므로
+        # 프롬프트는 먼저 렌더링합니다. 모델 호출은 이 값을 OpenAI 요청의 timeout으로 사용합니다.
+        invoke_kwargs = {"timeout": timeout} if timeout is not None else {}
+        response_pydantic = structured_llm.invoke(prompt_template.invoke(invoke_args), **invoke_kwargs)
         logger.info(f"Response received from OpenAI LLM ({model_name}).")
         
         if isinstance(response_pydantic, ReviewAnalysisOutput):
@@ -0,0 +1,132 @@
+import functools
+import logging
+import threading
+
+from langchain_core.output_parsers import PydanticOutputParser
+
+from app.memory import register_cache_size
+from app.schemas import ReviewAnalysisOutput, ReviewInputs
+
+logger = logging.getLogger(__name__)
+
+_dotenv_lock = threading.Lock()
+_dotenv_loaded = False
+
+
+def ensure_dotenv_loaded() -> None:
+    """
+    .env 파일을 프로세스에서 한 번만 읽어 환경 변수로 적용합니다.
+    모듈 임포트 시점이 아니라 제공자 클라이언트를 처음 사용할 때(또는 서비스 워밍업 때) 호출합니다.
+    """
+    global _dotenv_loaded
+    if _dotenv_loaded:
+        return
+    with _dotenv_lock:
+        if not _dotenv_loaded:
+            from dotenv import load_dotenv
+
+            load_dotenv()
+            _dotenv_loaded = True
+
+
+@functools.lru_cache(maxsize=32)
+def load_prompt_template(prompt_file_path: str) -> str:
+    """
+    프롬프트 파일 내용을 읽어 반환합니다. 경로별로 캐시하므로 프롬프트 파일을 수정하면 프로세스를 재시작해야 합니다.
+    파일이 없으면 `FileNotFoundError`가 발생하며, 실패한 결과는 캐시되지 않습니다.
+    """
+    with open(prompt_file_path, "r", encoding="utf-8") as f:
+        prompt_template_str = f.read()
+    logger.info(f"Prompt template loaded: {prompt_file_path}")
+    return prompt_template_str
+
+
+register_cache_size("prompt_templates", lambda: load_prompt_template.cache_info().currsize)
+
+
+@functools.lru_cache(maxsize=1)
+def get_output_parser() -> PydanticOutputParser:
+    """ReviewAnalysisOutput 스키마용 PydanticOutputParser를 처음 사용할 때 한 번 생성합니다."""
+    return PydanticOutputParser(pydantic_object=ReviewAnalysisOutput)
+
+
+@functools.lru_cache(maxsize=1)
+def get_format_instructions() -> str:
+    """프롬프트에 주입할 format instructions. 스키마가 바뀌지 않으므로 생성 결과(JSON 스키마 직렬화)를 재사용합니다."""
+    return get_output_parser().get_format_instructions()
+
+
+# 모델 설정의 `format_instructions` 값: 프롬프트의 {format_instructions}에 넣을 응답 형식 지침의 형태
+# full: PydanticOutputParser의 전체 JSON 스키마, compact: 필드 이름, 타입, 설명만 담은 짧은 목록,
+# none: 넣지 않음 (`with_structured_output`처럼 제공자 API가 스키마를 따로 받는 경우)
+FORMAT_INSTRUCTIONS_MODES = ("full", "compact", "none")
+
+
+def _describe_schema_type(schema: dict, definitions: dict) -> str:
+    if "$ref" in schema:
+        schema = definitions[schema["$ref"].split("/")[-1]]
+    if "enum" in schema:
+        return "|".join(str(value) for value in schema["enum"])
+    if schema.get("type") == "array":
+        return f"[{_describe_schema_type(schema.get('items', {}), definitions)}, ...]"
+    if schema.get("type") == "object" and "properties" in schema:
+        fields = ", ".join(f'"{name}": {_describe_schema_type(field, definitions)}' for name, field in schema["properties"].items())
+        return "{" + fields + "}"
+    type_name = schema.get("type", "any")
+    if "minimum" in schema or "maximum" in schema:
+        return f"{type_name} {schema.get('minimum', '')}~{schema.get('maximum', '')}"
+    return type_name
+
+
+@functools.lru_cache(maxsize=1)
+def get_compact_format_instructions() -> str:
+    """
+    ReviewAnalysisOutput 스키마를 필드별 한 줄(이름: 타입 - 설명)로 줄인 응답 형식 지침.
+    전체 JSON 스키마보다 토큰이 훨씬 적으며, 응답은 같은 출력 파서로 검증합니다.
+    """
+    schema = ReviewAnalysisOutput.model_json_schema()
+    definitions = schema.get("$defs", {})
+    lines = ["Respond with only a JSON object with these keys:"]
+    for name, field in schema["properties"].items():
+        lines.append(f"- {name}: {_describe_schema_type(field, definitions)} - {field.get('description', '')}")
+    return "\n".join(lines)
+
+
+def get_format_instructions_for(mode: str | None) -> str:
+    """모델 설정의 `format_instructions` 값에 해당하는 응답 형식 지침. 값이 없으면 전체 스키마(`full`)를 사용합니다."""
+    if mode is None or mode == "full":
+        return get_format_instructions()
+    if mode == "compact":
+        return get_compact_format_instructions()
+    if mode == "none":
+        return ""
+    raise ValueError(f"Unknown format_instructions mode: {mode} (expected one of {', '.join(FORMAT_INSTRUCTIONS_MODES)})")
+
+
+# 선택 기능이 채우는 프롬프트 변수와 기본값. 기능을 켜지 않은 모델 설정에서도 이 변수를 쓰는 템플릿을 렌더링할 수 있습니다.
+# keyword_guidance: 로컬 키워드 추출(`keyword_extraction`)의 후보 또는 지시문 (app.keyword_extractor)
+OPTIONAL_PROMPT_VARIABLES = {"keyword_guidance": ""}
+
+
+def build_prompt_variables(
+    params: ReviewInputs,
+    format_instructions_mode: str | None = None,
+    prompt_variables: dict | None = None,
+) -> dict:
+    """리뷰 입력, 응답 형식 지침, 선택 기능의 변수(없으면 기본값)를 합친 프롬프트 변수"""
+    return {
+        **OPTIONAL_PROMPT_VARIABLES,
+        **params.model_dump(),
+        "format_instructions": get_format_instructions_for(format_instructions_mode),
+        **(prompt_variables or {}),
+    }
+
+
+def render_prompt(
+    prompt_file_path: str,
+    params: ReviewInputs,
+    format_instructions_mode: str | None = None,
+    prompt_variables: dict | None = None,
+) -> str:
+    """프롬프트 템플릿에 리뷰 입력과 응답 형식 지침을 넣어 렌더링합니다 (템플릿에 없는 변수는 무시됩니다)."""
+    return load_prompt_template(prompt_file_path).format(**build_prompt_variables(params, format_instructions_mode, prompt_variables))
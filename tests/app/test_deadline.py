@@ -0,0 +1,77 @@
+import time
+
+import pytest
+
+from app import analyze_review_node, deadline
+from app.analyze_review_node import analyze_review_for_graph
+from app.deadline import DeadlineExceeded, compute_deadline, run_with_deadline
+from app.schemas import AgentState, ReviewInputs
+
+RECEIVED_TIMEOUTS = []
+
+
+def slow_client(prompt_file_path, params, model_name, temperature, timeout=None):
+    """처리 기한보다 오래 걸리는 LLM 클라이언트 함수를 흉내냅니다."""
+    RECEIVED_TIMEOUTS.append(timeout)
+    time.sleep(0.5)
+    raise AssertionError("기한 초과 후의 결과는 사용되지 않아야 합니다.")
+
+
+@pytest.fixture
+def slow_model_config(monkeypatch):
+    config = {
+        "client_module": __name__,
+        "client_function_name": "slow_client",
+        "llm_params": {"model_name": "slow-model", "temperature": 0.0},
+        "prompt_path": "models/review_analysis_prompt/v0.2.md",
+    }
+    monkeypatch.setattr(analyze_review_node, "get_model_config", lambda config_key=None: config)
+    return config
+
+
+@pytest.fixture
+def review_inputs() -> ReviewInputs:
+    return ReviewInputs(review_text="맛있어요", rating=5.0, ordered_items=["피자"])
+
+
+def test_run_with_deadline_returns_result_within_budget():
+    assert run_with_deadline(lambda x: x * 2, compute_deadline(1.0), 21) == 42
+    assert run_with_deadline(lambda x: x * 2, None, 21) == 42
+
+
+def test_run_with_deadline_raises_when_budget_runs_out():
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        run_with_deadline(time.sleep, compute_deadline(0.05), 1.0)
+    assert time.monotonic() - started < 0.5
+
+
+def test_executor_size_comes_from_service_config(monkeypatch):
+    monkeypatch.setattr(deadline, "_EXECUTORS", {})
+    monkeypatch.setattr(deadline, "get_service_config", lambda section: {"executor_max_workers": {"llm": 3}})
+
+    assert run_with_deadline(lambda: "ok", compute_deadline(1.0)) == "ok"
+    assert deadline._EXECUTORS["llm"]._max_workers == 3
+
+
+def test_analyze_node_returns_structured_timeout(slow_model_config, review_inputs: ReviewInputs):
+    RECEIVED_TIMEOUTS.clear()
+    state = AgentState(review_inputs=review_inputs, selected_model_config_key="slow", deadline_at=compute_deadline(0.1))
+
+    started = time.monotonic()
+    result_dict = analyze_review_for_graph(state)
+
+    assert time.monotonic() - started < 0.4
+    assert result_dict["error_code"] == "DEADLINE_EXCEEDED"
+    assert result_dict["analysis_output"] is None
+    assert 0 < RECEIVED_TIMEOUTS[0] <= 0.1
+
+
+def test_analyze_node_skips_llm_when_deadline_already_passed(slow_model_config, review_inputs: ReviewInputs):
+    RECEIVED_TIMEOUTS.clear()
+    state = AgentState(review_inputs=review_inputs, selected_model_config_key="slow", deadline_at=time.time() - 1)
+
+    result_dict = analyze_review_for_graph(state)
+
+    assert result_dict["error_code"] == "DEADLINE_EXCEEDED"
+    assert RECEIVED_TIMEOUTS == []
@@ -0,0 +1,92 @@
+import pytest
+
+import models.fake_model as fake_model
+from app.analyze_review_node import analyze_review_for_graph
+from app.keyword_extractor import AhoCorasick, build_keyword_guidance, get_keyword_lexicon, load_keyword_lexicon
+from app.schemas import AgentState, ReviewInputs
+from benchmarks.prompt_ab import register_prompt_variant, unregister_prompt_variant
+from models.fake_model import FAKE_LLM_LATENCY_ENV
+
+LEXICON_YAML = """
+version: "test-1"
+exclusions: ["짜장"]
+keywords:
+  - keyword: "짜다"
+    sentiment: "NEGATIVE"
+    variants: ["짜요", "짭짤"]
+  - keyword: "친절하다"
+    sentiment: "POSITIVE"
+    variants: ["친절"]
+  - keyword: "불친절하다"
+    sentiment: "NEGATIVE"
+    variants: ["불친절"]
+"""
+
+
+@pytest.fixture
+def lexicon(tmp_path):
+    path = tmp_path / "lexicon.yaml"
+    path.write_text(LEXICON_YAML, encoding="utf-8")
+    return load_keyword_lexicon(str(path))
+
+
+def test_automaton_finds_overlapping_matches():
+    automaton = AhoCorasick([("he", "he"), ("she", "she"), ("his", "his"), ("hers", "hers")])
+
+    matches = sorted(automaton.find_all("ushers"))
+
+    assert matches == [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")]
+    assert automaton.find_all("xyz") == []
+
+
+def test_extract_applies_exclusions_and_longest_match(lexicon):
+    assert lexicon.version == "test-1"
+    assert [c.keyword for c in lexicon.extract("국물이 너무  짜요. 사장님은 친절해요")] == ["짜다", "친절하다"]
+    # 불친절 안의 친절은 더 긴 일치에 포함되므로 버리고, 짜장 안의 짜는 제외 단어와 겹치므로 버립니다.
+    assert [c.keyword for c in lexicon.extract("짜장면은 괜찮은데 배달원이 불친절")] == ["불친절하다"]
+    assert [c.keyword for c in lexicon.extract("짜요 짭짤 짜요")] == ["짜다"]
+    assert lexicon.extract("아무 관련 없는 문장") == []
+
+
+def test_default_lexicon_is_versioned():
+    lexicon = get_keyword_lexicon()
+
+    assert lexicon.version == "v1"
+    assert lexicon.pattern_count > len(lexicon.entries)
+    assert [c.keyword for c in lexicon.extract("안 맛있어요")] == ["맛없다"]
+    with pytest.raises(ValueError):
+        build_keyword_guidance([], "unknown")
+
+
+def _analyze(config_key: str) -> dict:
+    inputs = ReviewInputs(review_text="양이 많고 국물이 짜요", rating=3.0, ordered_items=["라면", "김밥", "만두"])
+    return analyze_review_for_graph(AgentState(review_inputs=inputs, selected_model_config_key=config_key))
+
+
+def test_lean_mode_uses_candidates_as_keywords(monkeypatch):
+    monkeypatch.delenv(FAKE_LLM_LATENCY_ENV, raising=False)
+    variant_key = register_prompt_variant("fake_deterministic", "v0.3", overrides={"keyword_extraction": "lean"})
+    try:
+        result = _analyze(variant_key)
+    finally:
+        unregister_prompt_variant(variant_key)
+
+    assert result["analysis_error_message"] is None
+    expected = get_keyword_lexicon().extract("양이 많고 국물이 짜요")
+    assert expected and result["analysis_output"].keywords == expected
+
+
+def test_hint_mode_passes_candidates_to_prompt(monkeypatch):
+    monkeypatch.delenv(FAKE_LLM_LATENCY_ENV, raising=False)
+    prompts = []
+    render = fake_model.render_prompt
+    monkeypatch.setattr(fake_model, "render_prompt", lambda *args: prompts.append(render(*args)) or prompts[-1])
+    variant_key = register_prompt_variant("fake_deterministic", "v0.3", overrides={"keyword_extraction": "hint"})
+    try:
+        result = _analyze(variant_key)
+    finally:
+        unregister_prompt_variant(variant_key)
+
+    assert result["analysis_error_message"] is None
+    assert "사전 추출 키워드 후보: " in prompts[0] and "짜다(NEGATIVE)" in prompts[0]
+    assert "{keyword_guidance}" not in prompts[0]
@@ -0,0 +1,114 @@
+import tracemalloc
+from types import SimpleNamespace
+
+import langchain_openai
+
+import models.openai_model as openai_model
+from app.memory import count_allocations, register_cache_size, take_memory_snapshot
+from app.schemas import ReviewInputs
+from models.client_cache import BoundedClientCache
+from models.fake_model import build_fake_analysis
+
+
+def test_snapshot_reports_rss_and_registered_cache_sizes():
+    register_cache_size("test_cache", lambda: 3)
+
+    snapshot = take_memory_snapshot()
+
+    assert snapshot.rss_bytes > 0
+    assert snapshot.cache_sizes["test_cache"] == 3
+    assert snapshot.tracemalloc_enabled == tracemalloc.is_tracing()
+
+
+def test_diff_snapshot_and_allocation_counter_with_tracemalloc():
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    try:
+        take_memory_snapshot(top=0)
+        with count_allocations() as counter:
+            retained = [bytearray(1024) for _ in range(256)]
+            transient = bytearray(512 * 1024)
+            del transient
+        snapshot = take_memory_snapshot(top=5, diff=True)
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+
+    assert counter.peak_bytes >= 512 * 1024 + 256 * 1024
+    assert 256 * 1024 <= counter.retained_bytes < 512 * 1024
+    assert snapshot.diff and snapshot.top_allocations[0].size_bytes >= 256 * 1024
+    assert "test_memory.py" in snapshot.top_allocations[0].location
+    assert len(retained) == 256
+
+
+def test_client_cache_evicts_least_recently_used():
+    cache = BoundedClientCache(max_size=2)
+    created = []
+
+    def factory(name):
+        return lambda: created.append(name) or name
+
+    cache.get_or_create("a", factory("a"))
+    cache.get_or_create("b", factory("b"))
+    cache.get_or_create("a", factory("a"))
+    cache.get_or_create("c", factory("c"))
+    cache.get_or_create("b", factory("b"))
+
+    assert created == ["a", "b", "c", "b"]
+    assert cache.stats() == {"size": 2, "max_size": 2, "hits": 1, "misses": 4, "evictions": 2}
+
+
+def test_openai_client_is_reused_across_request_timeouts(monkeypatch):
+    created, invocations = [], []
+    review = ReviewInputs(review_text="맛있어요", rating=5.0, ordered_items=["피자"])
+
+    class FakeStructuredModel:
+        def invoke(self, prompt_value, **kwargs):
+            invocations.append(kwargs)
+            return build_fake_analysis(review)
+
+    class FakeChatOpenAI:
+        def __init__(self, **kwargs):
+            created.append(kwargs)
+
+        def with_structured_output(self, schema):
+            return FakeStructuredModel()
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(langchain_openai, "ChatOpenAI", FakeChatOpenAI)
+    cache = BoundedClientCache(max_size=2)
+    monkeypatch.setattr(openai_model, "get_client_cache", lambda: cache)
+
+    for timeout in (59.7, 41.2, None):
+        openai_model.invoke_openai_with_structured_output(
+            "models/review_analysis_prompt/v0.2.md", review, "gpt-4o-mini", 0.0, timeout=timeout
+        )
+
+    assert len(created) == 1 and "timeout" not in created[0]
+    assert cache.stats()["hits"] == 2
+    assert invocations == [{"timeout": 59.7}, {"timeout": 41.2}, {}]
+
+
+def test_openai_client_is_recreated_when_api_key_changes(monkeypatch):
+    created = []
+    review = ReviewInputs(review_text="맛있어요", rating=5.0, ordered_items=["피자"])
+
+    class FakeChatOpenAI:
+        def __init__(self, **kwargs):
+            created.append(kwargs["openai_api_key"])
+
+        def with_structured_output(self, schema):
+            return SimpleNamespace(invoke=lambda prompt_value, **kwargs: build_fake_analysis(review))
+
+    monkeypatch.setattr(langchain_openai, "ChatOpenAI", FakeChatOpenAI)
+    cache = BoundedClientCache(max_size=4)
+    monkeypatch.setattr(openai_model, "get_client_cache", lambda: cache)
+
+    for api_key in ("old-key", "new-key", "new-key"):
+        monkeypatch.setenv("OPENAI_API_KEY", api_key)
+        openai_model.invoke_openai_with_structured_output("models/review_analysis_prompt/v0.2.md", review, "gpt-4o-mini", 0.0)
+
+    assert created == ["old-key", "new-key"]
+    # 캐시 키에는 API 키 대신 지문만 남습니다.
+    assert all(api_key not in repr(list(cache._clients)) for api_key in ("old-key", "new-key"))
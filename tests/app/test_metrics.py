@@ -0,0 +1,90 @@
+import pytest
+from langchain_core.exceptions import OutputParserException
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from prometheus_client import REGISTRY
+
+from app import analyze_review_node
+from app.analyze_review_node import analyze_review_for_graph
+from app.metrics import get_provider_name, instrument_node
+from app.schemas import AgentState, ReviewAnalysisOutput, ReviewInputs
+
+
+def fake_client(prompt_file_path, params, model_name, temperature, timeout=None):
+    """토큰 사용량을 보고하는 가짜 채팅 모델을 호출한 뒤 고정된 분석 결과를 반환합니다."""
+    usage = {"input_tokens": 120, "output_tokens": 30, "total_tokens": 150}
+    GenericFakeChatModel(messages=iter([AIMessage(content="{}", usage_metadata=usage)])).invoke("리뷰")
+    return ReviewAnalysisOutput(
+        score=0.9,
+        summary="맛있다는 리뷰",
+        is_question_review=False,
+        overall_sentiment="POSITIVE",
+        keywords=[],
+        reply="감사합니다",
+        analysis_score="긍정 표현",
+        analysis_reply="감사 인사",
+    )
+
+
+def unparsable_client(prompt_file_path, params, model_name, temperature, timeout=None):
+    raise OutputParserException("JSON이 아닙니다")
+
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.fixture
+def fake_model_config(monkeypatch):
+    config = {
+        "provider": "fake",
+        "client_module": __name__,
+        "client_function_name": "fake_client",
+        "llm_params": {"model_name": "fake-model", "temperature": 0.0},
+        "prompt_path": "models/review_analysis_prompt/v0.2.md",
+    }
+    monkeypatch.setattr(analyze_review_node, "get_model_config", lambda config_key=None: config)
+    return config
+
+
+@pytest.fixture
+def state() -> AgentState:
+    return AgentState(
+        review_inputs=ReviewInputs(review_text="맛있어요", rating=5.0, ordered_items=["피자"]),
+        selected_model_config_key="metrics_test",
+    )
+
+
+def test_llm_call_records_latency_and_tokens(fake_model_config, state: AgentState):
+    labels = {"provider": "fake", "model_config_key": "metrics_test"}
+    prompt_before = _sample("review_analysis_llm_prompt_tokens_total", **labels)
+    calls_before = _sample("review_analysis_llm_call_latency_seconds_count", outcome="success", **labels)
+
+    result_dict = analyze_review_for_graph(state)
+
+    assert result_dict["analysis_output"] is not None
+    assert _sample("review_analysis_llm_prompt_tokens_total", **labels) - prompt_before == 120
+    assert _sample("review_analysis_llm_completion_tokens_total", **labels) >= 30
+    assert _sample("review_analysis_llm_call_latency_seconds_count", outcome="success", **labels) - calls_before == 1
+
+
+def test_parse_failure_is_counted_by_exception_class(fake_model_config, state: AgentState):
+    fake_model_config["client_function_name"] = "unparsable_client"
+    labels = {"provider": "fake", "model_config_key": "metrics_test"}
+    failures_before = _sample("review_analysis_llm_parse_failures_total", exception="OutputParserException", **labels)
+    errors_before = _sample("review_analysis_errors_total", stage="analyze_review_node", exception="OutputParserException")
+
+    result_dict = analyze_review_for_graph(state)
+
+    assert result_dict["analysis_error_message"] is not None
+    assert _sample("review_analysis_llm_parse_failures_total", exception="OutputParserException", **labels) - failures_before == 1
+    assert _sample("review_analysis_errors_total", stage="analyze_review_node", exception="OutputParserException") - errors_before == 1
+
+
+def test_instrument_node_and_provider_name():
+    before = _sample("review_analysis_graph_node_latency_seconds_count", node="test_node")
+    assert instrument_node("test_node", lambda state: {"value": state})(1) == {"value": 1}
+    assert _sample("review_analysis_graph_node_latency_seconds_count", node="test_node") - before == 1
+
+    assert get_provider_name({"client_module": "models.gemini_model"}) == "gemini"
+    assert get_provider_name({"provider": "openai", "client_module": "models.openai_model"}) == "openai"
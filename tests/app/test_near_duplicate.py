@@ -0,0 +1,118 @@
+import pytest
+
+import models.fake_model as fake_model
+from app.analyze_review_node import analyze_review_for_graph
+from app.graph import get_compiled_graph
+from app.near_duplicate import NearDuplicateConfig, NearDuplicateIndex, set_near_duplicate_index
+from app.schemas import AgentState, ReviewInputs
+from models.fake_model import FAKE_LLM_LATENCY_ENV, build_fake_analysis
+
+
+def _inputs(text: str, rating: float = 5.0, items=("떡볶이", "순대")) -> ReviewInputs:
+    return ReviewInputs(review_text=text, rating=rating, ordered_items=list(items))
+
+
+def _indexed(config: NearDuplicateConfig, review: ReviewInputs) -> NearDuplicateIndex:
+    index = NearDuplicateIndex(config)
+    index.add(review, build_fake_analysis(review), "fake", "v0.2")
+    return index
+
+
+def test_punctuation_emoji_and_intensifier_variants_match():
+    index = _indexed(NearDuplicateConfig(mode="shadow"), _inputs("너무 맛있어요!! 떡볶이가 쫄깃해요"))
+
+    for text in ("정말 맛있어요~ 떡볶이가 쫄깃해요 😋", "맛있어요. 떡볶이가 쫄깃해요"):
+        match = index.find(_inputs(text), "fake", "v0.2")
+        assert match is not None and match.similarity == 1.0
+    assert index.find(_inputs("배달이 너무 늦었고 국물이 식었어요"), "fake", "v0.2") is None
+    assert index.stats().hits_total == 2 and index.stats().lookups_total == 3
+
+
+def test_rating_band_items_and_scope_must_agree():
+    index = _indexed(NearDuplicateConfig(mode="shadow"), _inputs("맛있어요 또 시킬게요", rating=5.0))
+
+    assert index.find(_inputs("맛있어요 또 시킬게요", rating=4.0), "fake", "v0.2") is not None
+    assert index.find(_inputs("맛있어요 또 시킬게요", rating=3.0), "fake", "v0.2") is None
+    assert index.find(_inputs("맛있어요 또 시킬게요", items=["김밥"]), "fake", "v0.2") is None
+    assert index.find(_inputs("맛있어요 또 시킬게요"), "fake", "v0.3") is None
+    assert index.stats().filtered_total == 2
+
+
+def test_capacity_evicts_oldest_entries():
+    index = NearDuplicateIndex(NearDuplicateConfig(mode="shadow", max_entries=2))
+    texts = ["국물이 짜요 다시는 안 시켜요", "배달이 빨라서 좋았어요", "양이 많고 가성비가 좋아요"]
+    for text in texts:
+        index.add(_inputs(text), build_fake_analysis(_inputs(text)), "fake", "v0.2")
+
+    assert index.stats().entries == 2 and index.stats().evictions_total == 1
+    assert index.find(_inputs(texts[0]), "fake", "v0.2") is None
+    assert index.find(_inputs(texts[2]), "fake", "v0.2") is not None
+    with pytest.raises(ValueError):
+        NearDuplicateIndex(NearDuplicateConfig(num_perm=64, bands=10))
+
+
+@pytest.fixture
+def near_duplicate_index(monkeypatch):
+    monkeypatch.delenv(FAKE_LLM_LATENCY_ENV, raising=False)
+
+    def _install(**config) -> NearDuplicateIndex:
+        index = NearDuplicateIndex(NearDuplicateConfig(**config))
+        set_near_duplicate_index(index)
+        return index
+
+    yield _install
+    set_near_duplicate_index(None)
+
+
+def _analyze(text: str) -> dict:
+    return analyze_review_for_graph(AgentState(review_inputs=_inputs(text), selected_model_config_key="fake_deterministic"))
+
+
+def test_reuse_mode_skips_llm_call(near_duplicate_index):
+    index = near_duplicate_index(mode="reuse", audit_sample_rate=0.0, regenerate_reply=False)
+
+    first = _analyze("너무 맛있어요!! 순대도 좋아요")
+    second = _analyze("정말 맛있어요~ 순대도 좋아요")
+
+    assert first["near_duplicate_similarity"] is None and first["token_usage"] is not None
+    assert second["near_duplicate_similarity"] == 1.0 and second["token_usage"] is None
+    assert second["analysis_output"] == first["analysis_output"]
+    assert index.stats().reused_total == 1 and index.stats().entries == 1
+
+
+def test_regenerate_reply_keeps_reused_scores(near_duplicate_index, monkeypatch):
+    near_duplicate_index(mode="reuse", audit_sample_rate=0.0, regenerate_reply=True)
+    prompts = []
+    render = fake_model.render_prompt
+    monkeypatch.setattr(fake_model, "render_prompt", lambda *args: prompts.append(render(*args)) or prompts[-1])
+
+    first = _analyze("너무 맛있어요!! 순대도 좋아요")
+    second = _analyze("정말 맛있어요~ 순대도 좋아요 😋")
+
+    assert "확정된 분석 값" in prompts[1] and f'"score":{first["analysis_output"].score}' in prompts[1]
+    assert second["token_usage"] is not None and second["near_duplicate_similarity"] == 1.0
+    assert second["analysis_output"].score == first["analysis_output"].score
+    assert second["analysis_output"].summary == "정말 맛있어요~ 순대도 좋아요 😋"
+
+
+def test_shadow_mode_audits_against_fresh_result(near_duplicate_index):
+    index = near_duplicate_index(mode="shadow")
+
+    _analyze("너무 맛있어요!! 순대도 좋아요")
+    result = _analyze("정말 맛있어요~ 순대도 좋아요")
+
+    stats = index.stats()
+    assert result["near_duplicate_similarity"] is None and result["token_usage"] is not None
+    assert stats.audits_total == 1 and stats.reused_total == 0 and stats.entries == 2
+    assert stats.false_matches_total == len(stats.recent_false_matches)
+
+
+def test_graph_without_near_duplicate_leaves_index_untouched(near_duplicate_index):
+    index = near_duplicate_index(mode="reuse", audit_sample_rate=0.0)
+    graph = get_compiled_graph(save_result=False, near_duplicate=False)
+
+    for text in ["너무 맛있어요!! 순대도 좋아요", "정말 맛있어요~ 순대도 좋아요"]:
+        result = graph.invoke(AgentState(review_inputs=_inputs(text), selected_model_config_key="fake_deterministic"))
+        assert result["near_duplicate_similarity"] is None and result["token_usage"] is not None
+
+    assert index.stats().lookups_total == 0 and index.stats().entries == 0
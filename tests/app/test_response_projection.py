@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from app.response_projection import RESULT_ONLY_FIELDS, resolve_projection, serialize_state, serialize_states
+from app.schemas import AgentState, ReviewAnalysisOutput, ReviewInputs
+
+
+@pytest.fixture
+def state() -> AgentState:
+    return AgentState(
+        review_inputs=ReviewInputs(review_text="파스타가 맛있어요", rating=5.0, ordered_items=["파스타"]),
+        selected_model_config_key="fake_deterministic",
+        analysis_output=ReviewAnalysisOutput(
+            score=0.9,
+            summary="맛있는 파스타",
+            is_question_review=False,
+            overall_sentiment="POSITIVE",
+            keywords=[],
+            reply="감사합니다.",
+            analysis_score="긍정",
+            analysis_reply="감사",
+        ),
+        saved_record_id="20250101T000000-000000-abcd1234",
+    )
+
+
+def test_result_shape_drops_inputs_and_empty_fields(state: AgentState):
+    payload = json.loads(serialize_state(state, response_shape="result"))
+
+    assert set(payload) == {"analysis_output", "saved_record_id"}
+    assert set(payload) <= set(RESULT_ONLY_FIELDS)
+    assert payload["analysis_output"]["summary"] == "맛있는 파스타"
+
+
+def test_field_selection_and_full_shape_match_pydantic(state: AgentState):
+    assert json.loads(serialize_state(state, fields=["error_code", "saved_record_id"])) == {
+        "error_code": None,
+        "saved_record_id": state.saved_record_id,
+    }
+    assert json.loads(serialize_state(state, response_shape="full")) == state.model_dump(mode="json")
+    assert json.loads(serialize_states([state, state], response_shape="result"))[1]["saved_record_id"] == state.saved_record_id
+
+
+def test_unknown_field_or_shape_is_rejected():
+    with pytest.raises(ValueError):
+        resolve_projection(["not_a_field"], None)
+    with pytest.raises(ValueError):
+        resolve_projection(None, "compact")
+    assert resolve_projection(None, None) == (None, False)
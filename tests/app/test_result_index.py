@@ -0,0 +1,121 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.result_index import ResultIndex
+from app.result_store import StoredResultRef
+
+
+def _record(saved_at: datetime, model_key: str, sentiment: str, score: float, is_question: bool, items: list) -> dict:
+    return {
+        "saved_at": saved_at.isoformat(timespec="microseconds"),
+        "model_key_used": model_key,
+        "actual_model_name_used": model_key.replace("_", "-"),
+        "review_inputs": {"review_text": "리뷰", "rating": 4.0, "ordered_items": items},
+        "analysis_output": {
+            "score": score,
+            "summary": "요약",
+            "is_question_review": is_question,
+            "overall_sentiment": sentiment,
+            "keywords": [],
+            "reply": "답변",
+            "analysis_score": "근거",
+            "analysis_reply": "근거",
+        },
+        "analysis_error_message": None,
+    }
+
+
+@pytest.fixture
+def populated_index(tmp_path) -> ResultIndex:
+    index = ResultIndex(str(tmp_path / "index.sqlite3"))
+    base = datetime(2025, 1, 1)
+    rows = [
+        ("gpt_4o_mini", "POSITIVE", 0.9, False, ["피자", "콜라"]),
+        ("gpt_4o_mini", "NEGATIVE", 0.1, True, ["치킨"]),
+        ("gemini_flash_zero_temp", "NEUTRAL", 0.5, False, ["피자"]),
+        ("gemini_flash_zero_temp", "POSITIVE", 0.8, True, ["치킨", "콜라"]),
+    ]
+    for i, (model_key, sentiment, score, is_question, items) in enumerate(rows):
+        index.add(
+            StoredResultRef(record_id=f"00000001-{i:010d}", location="segment_00000001.jsonl"),
+            _record(base + timedelta(hours=i), model_key, sentiment, score, is_question, items),
+        )
+    return index
+
+
+def test_query_filters(populated_index: ResultIndex):
+    assert [item.record_id for item in populated_index.query(menu_item="피자").items] == [
+        "00000001-0000000002",
+        "00000001-0000000000",
+    ]
+    assert len(populated_index.query(model_key="gpt_4o_mini").items) == 2
+    assert [item.score for item in populated_index.query(overall_sentiment="POSITIVE", min_score=0.85).items] == [0.9]
+    assert all(item.is_question_review for item in populated_index.query(is_question_review=True).items)
+
+    window = populated_index.query(saved_from=datetime(2025, 1, 1, 1), saved_to=datetime(2025, 1, 1, 3))
+    assert [item.record_id for item in window.items] == ["00000001-0000000002", "00000001-0000000001"]
+    assert window.items[0].ordered_items == ["피자"]
+
+
+def test_query_paginates_newest_first(populated_index: ResultIndex):
+    first_page = populated_index.query(limit=3)
+    assert len(first_page.items) == 3
+    assert first_page.items[0].record_id == "00000001-0000000003"
+    assert first_page.next_cursor is not None
+
+    second_page = populated_index.query(limit=3, cursor=first_page.next_cursor)
+    assert [item.record_id for item in second_page.items] == ["00000001-0000000000"]
+    assert second_page.next_cursor is None
+
+
+def test_add_is_idempotent(populated_index: ResultIndex):
+    duplicate = _record(datetime(2025, 1, 2), "gpt_4o_mini", "POSITIVE", 0.9, False, ["피자"])
+    assert populated_index.add_many([(StoredResultRef(record_id="00000001-0000000000", location="x"), duplicate)]) == 0
+    assert populated_index.count() == 4
+
+
+def test_usage_summary_groups_by_model_and_prompt_version(tmp_path):
+    index = ResultIndex(str(tmp_path / "index.sqlite3"))
+    base = datetime(2025, 1, 1)
+    usages = [
+        ("v0.1", 1000, 0.0010),
+        ("v0.1", 1200, 0.0012),
+        ("v0.2", 2000, 0.0030),
+    ]
+    for i, (prompt_version, prompt_tokens, cost) in enumerate(usages):
+        record = _record(base + timedelta(minutes=i), "gpt_4o_mini", "POSITIVE", 0.9, False, ["피자"])
+        record["prompt_version"] = prompt_version
+        record["token_usage"] = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": 100,
+            "cached_prompt_tokens": 0,
+            "estimated_cost_usd": cost,
+        }
+        index.add(StoredResultRef(record_id=f"00000001-{i:010d}", location="segment"), record)
+
+    groups = index.usage_summary(base, base + timedelta(hours=1))
+
+    assert [group.prompt_version for group in groups] == ["v0.2", "v0.1"]
+    assert groups[0].avg_cost_per_review_usd == pytest.approx(0.0030)
+    assert groups[1].analyses == 2
+    assert groups[1].prompt_tokens == 2200
+    assert groups[1].avg_cost_per_review_usd == pytest.approx(0.0011)
+    assert index.usage_summary(base + timedelta(hours=1), base + timedelta(hours=2)) == []
+
+
+def test_existing_index_is_migrated(tmp_path):
+    db_path = str(tmp_path / "legacy.sqlite3")
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE results (seq INTEGER PRIMARY KEY AUTOINCREMENT, record_id TEXT NOT NULL UNIQUE, location TEXT,"
+        " saved_at REAL NOT NULL, model_key TEXT, model_name TEXT, overall_sentiment TEXT, score REAL,"
+        " is_question_review INTEGER, rating REAL, summary TEXT, analysis_error_message TEXT)"
+    )
+    conn.commit()
+    conn.close()
+
+    index = ResultIndex(db_path)
+    index.add(StoredResultRef(record_id="r1", location="segment"), _record(datetime(2025, 1, 1), "gpt_4o_mini", "POSITIVE", 0.9, False, []))
+    assert index.count() == 1
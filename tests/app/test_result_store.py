@@ -0,0 +1,119 @@
+import os
+from datetime import datetime
+
+import pytest
+
+from app.result_store import (
+    MarkdownResultStore,
+    ResultStore,
+    SegmentedJsonlResultStore,
+    build_result_record,
+    render_result_markdown,
+    set_result_store,
+)
+from app.result_index import ResultIndex, set_result_index
+from app.save_result_node import save_analysis_result_node
+from app.schemas import AgentState, KeywordSentiment, ReviewAnalysisOutput, ReviewInputs
+
+
+@pytest.fixture
+def analyzed_state() -> AgentState:
+    """분석이 완료된 AgentState를 제공합니다."""
+    return AgentState(
+        review_inputs=ReviewInputs(review_text="맛있어요", rating=5.0, ordered_items=["피자", "콜라"]),
+        selected_model_config_key="gpt_4o_mini",
+        model_key_used="gpt_4o_mini",
+        actual_model_name_used="gpt-4o-mini",
+        analysis_output=ReviewAnalysisOutput(
+            score=0.9,
+            summary="맛있다는 리뷰",
+            is_question_review=False,
+            overall_sentiment="POSITIVE",
+            keywords=[KeywordSentiment(keyword="맛있다", sentiment="POSITIVE")],
+            reply="감사합니다",
+            analysis_score="긍정 표현",
+            analysis_reply="감사 표현",
+        ),
+    )
+
+
+def test_segmented_store_append_and_get(tmp_path, analyzed_state: AgentState):
+    store = SegmentedJsonlResultStore(str(tmp_path))
+    record = build_result_record(analyzed_state, saved_at=datetime(2025, 1, 1, 12, 0, 0))
+
+    first = store.append(record)
+    second = store.append(record)
+
+    assert first.record_id != second.record_id
+    assert first.location == second.location
+    assert store.get(second.record_id) == record
+    assert store.get("99999999-0000000000") is None
+    assert [record_id for record_id, _ in store.iter_records()] == [first.record_id, second.record_id]
+
+
+def test_segmented_store_rotates_by_size(tmp_path, analyzed_state: AgentState):
+    record = build_result_record(analyzed_state, saved_at=datetime.now())
+    store = SegmentedJsonlResultStore(str(tmp_path), max_segment_bytes=1, max_segment_age_seconds=None)
+
+    refs = [store.append(record) for _ in range(3)]
+
+    assert store.list_segments() == [1, 2, 3]
+    assert len({ref.location for ref in refs}) == 3
+    assert all(store.get(ref.record_id) == record for ref in refs)
+
+
+def test_segmented_store_recovers_torn_write(tmp_path, analyzed_state: AgentState):
+    record = build_result_record(analyzed_state, saved_at=datetime.now())
+    store = SegmentedJsonlResultStore(str(tmp_path))
+    ref = store.append(record)
+    store.close()
+
+    # 인덱스에 기록되지 못한 온전한 레코드 1건과 잘린 레코드 조각을 흉내냅니다.
+    with open(ref.location, "ab") as f:
+        f.write(b'{"saved_at": "2025-01-01T00:00:00.000000"}\n{"saved_at": "20')
+
+    reopened = SegmentedJsonlResultStore(str(tmp_path))
+    new_ref = reopened.append(record)
+
+    assert [record_id for record_id, _ in reopened.iter_records()][-1] == new_ref.record_id
+    assert reopened.get("00000001-0000000001") == {"saved_at": "2025-01-01T00:00:00.000000"}
+    assert reopened.get(new_ref.record_id) == record
+
+
+def test_markdown_backend_keeps_legacy_layout(tmp_path, analyzed_state: AgentState):
+    record = build_result_record(analyzed_state, saved_at=datetime(2025, 1, 1, 12, 0, 0, 123456))
+    ref = MarkdownResultStore(str(tmp_path)).append(record)
+
+    assert os.path.basename(ref.location) == "20250101_120000_123456_result.md"
+    with open(ref.location, encoding="utf-8") as f:
+        content = f.read()
+    assert content == render_result_markdown(record)
+    assert "- **사용된 모델**: `gpt-4o-mini`" in content
+    assert "- keyword='맛있다' sentiment='POSITIVE'" in content
+
+
+def test_backend_without_get_fails_at_construction():
+    class AppendOnlyStore(ResultStore):
+        def append(self, record):
+            raise AssertionError("not reached")
+
+    with pytest.raises(TypeError):
+        AppendOnlyStore()
+
+
+def test_save_node_writes_to_configured_store(tmp_path, analyzed_state: AgentState):
+    store = SegmentedJsonlResultStore(str(tmp_path / "segments"))
+    index = ResultIndex(str(tmp_path / "index.sqlite3"))
+    set_result_store(store)
+    set_result_index(index)
+    try:
+        result_dict = save_analysis_result_node(analyzed_state)
+    finally:
+        set_result_store(None)
+        set_result_index(None)
+
+    assert result_dict["save_error_message"] is None
+    saved = store.get(result_dict["saved_record_id"])
+    assert saved["analysis_output"]["score"] == 0.9
+    assert saved["review_inputs"]["ordered_items"] == ["피자", "콜라"]
+    assert [item.record_id for item in index.query(menu_item="피자").items] == [result_dict["saved_record_id"]]
@@ -0,0 +1,77 @@
+from datetime import datetime
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from app import analyze_review_node
+from app.analyze_review_node import analyze_review_for_graph
+from app.result_store import build_result_record
+from app.schemas import AgentState, ReviewAnalysisOutput, ReviewInputs
+from app.token_usage import estimate_cost_usd, get_prompt_version
+
+
+def cached_prompt_client(prompt_file_path, params, model_name, temperature, timeout=None):
+    """프롬프트 캐시 적중을 포함한 토큰 사용량을 보고하는 가짜 채팅 모델을 호출합니다."""
+    usage = {
+        "input_tokens": 1000,
+        "output_tokens": 200,
+        "total_tokens": 1200,
+        "input_token_details": {"cache_read": 400},
+    }
+    GenericFakeChatModel(messages=iter([AIMessage(content="{}", usage_metadata=usage)])).invoke("리뷰")
+    return ReviewAnalysisOutput(
+        score=0.9,
+        summary="맛있다는 리뷰",
+        is_question_review=False,
+        overall_sentiment="POSITIVE",
+        keywords=[],
+        reply="감사합니다",
+        analysis_score="긍정 표현",
+        analysis_reply="감사 인사",
+    )
+
+
+@pytest.fixture
+def priced_model_config(monkeypatch):
+    config = {
+        "provider": "openai",
+        "client_module": __name__,
+        "client_function_name": "cached_prompt_client",
+        "llm_params": {"model_name": "gpt-4o-mini", "temperature": 0.2},
+        "prompt_path": "models/review_analysis_prompt/v0.2.md",
+    }
+    monkeypatch.setattr(analyze_review_node, "get_model_config", lambda config_key=None: config)
+    return config
+
+
+def test_estimate_cost_applies_cached_input_price():
+    pricing = {"input": 0.15, "cached_input": 0.075, "output": 0.60}
+    expected = (600 * 0.15 + 400 * 0.075 + 200 * 0.60) / 1_000_000
+    assert estimate_cost_usd(1000, 200, 400, pricing) == pytest.approx(expected)
+    assert estimate_cost_usd(1000, 200, 0, {"input": 1.0, "output": 2.0}) == pytest.approx(0.0014)
+    assert estimate_cost_usd(1000, 200, 0, None) is None
+
+
+def test_prompt_version_from_path():
+    assert get_prompt_version("models/review_analysis_prompt/v0.2.md") == "v0.2"
+    assert get_prompt_version(None) is None
+
+
+def test_analyze_node_records_token_usage_and_cost(priced_model_config):
+    state = AgentState(
+        review_inputs=ReviewInputs(review_text="맛있어요", rating=5.0, ordered_items=["피자"]),
+        selected_model_config_key="gpt_4o_mini",
+    )
+
+    result_state = state.model_copy(update=analyze_review_for_graph(state))
+
+    assert result_state.prompt_version == "v0.2"
+    assert result_state.token_usage.prompt_tokens == 1000
+    assert result_state.token_usage.cached_prompt_tokens == 400
+    assert result_state.token_usage.completion_tokens == 200
+    assert result_state.token_usage.estimated_cost_usd == pytest.approx((600 * 0.15 + 400 * 0.075 + 200 * 0.60) / 1_000_000)
+
+    record = build_result_record(result_state, saved_at=datetime(2025, 1, 1))
+    assert record["prompt_version"] == "v0.2"
+    assert record["token_usage"]["prompt_tokens"] == 1000
@@ -0,0 +1,100 @@
+import json
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from app import analyze_review_node
+from app.graph import get_compiled_graph
+from app.result_index import ResultIndex, set_result_index
+from app.result_store import SegmentedJsonlResultStore, set_result_store
+from app.schemas import AgentState, ReviewAnalysisOutput, ReviewInputs
+from app.tracing import configure_tracing, extract_context, get_finished_spans, start_span
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+TRACEPARENT = f"00-{TRACE_ID}-00f067aa0ba902b7-01"
+
+
+def fake_client(prompt_file_path, params, model_name, temperature, timeout=None):
+    """토큰 사용량을 보고하는 가짜 채팅 모델을 호출한 뒤 고정된 분석 결과를 반환합니다."""
+    usage = {"input_tokens": 80, "output_tokens": 20, "total_tokens": 100}
+    GenericFakeChatModel(messages=iter([AIMessage(content="{}", usage_metadata=usage)])).invoke("리뷰")
+    return ReviewAnalysisOutput(
+        score=0.9,
+        summary="맛있다는 리뷰",
+        is_question_review=False,
+        overall_sentiment="POSITIVE",
+        keywords=[],
+        reply="감사합니다",
+        analysis_score="긍정 표현",
+        analysis_reply="감사 인사",
+    )
+
+
+@pytest.fixture
+def memory_exporter():
+    exporter = configure_tracing("memory")
+    yield exporter
+    configure_tracing("none")
+
+
+@pytest.fixture
+def fake_environment(monkeypatch, tmp_path):
+    config = {
+        "provider": "fake",
+        "client_module": __name__,
+        "client_function_name": "fake_client",
+        "llm_params": {"model_name": "fake-model", "temperature": 0.3},
+        "prompt_path": "models/review_analysis_prompt/v0.2.md",
+    }
+    monkeypatch.setattr(analyze_review_node, "get_model_config", lambda config_key=None: config)
+    set_result_store(SegmentedJsonlResultStore(str(tmp_path / "segments")))
+    set_result_index(ResultIndex(str(tmp_path / "index.sqlite3")))
+    yield config
+    set_result_store(None)
+    set_result_index(None)
+
+
+def test_graph_spans_follow_incoming_trace_context(memory_exporter, fake_environment):
+    parent_context = extract_context({"TraceParent": TRACEPARENT})
+    state = AgentState(
+        review_inputs=ReviewInputs(review_text="맛있어요", rating=5.0, ordered_items=["피자"]),
+        selected_model_config_key="tracing_test",
+    )
+
+    with start_span("test.request", context=parent_context):
+        get_compiled_graph().invoke(state)
+
+    spans = {span.name: span for span in get_finished_spans()}
+    assert {
+        "graph.analyze_review_node",
+        "graph.save_result_node",
+        "config.load_model_config",
+        "llm.invoke",
+        "result_store.append",
+        "result_index.add",
+    } <= set(spans)
+    assert all(format(span.context.trace_id, "032x") == TRACE_ID for span in spans.values())
+
+    assert spans["llm.invoke"].parent.span_id == spans["graph.analyze_review_node"].context.span_id
+    assert spans["result_store.append"].parent.span_id == spans["graph.save_result_node"].context.span_id
+
+    llm_attributes = spans["llm.invoke"].attributes
+    assert llm_attributes["gen_ai.request.model"] == "fake-model"
+    assert llm_attributes["gen_ai.request.temperature"] == 0.3
+    assert llm_attributes["gen_ai.usage.input_tokens"] == 80
+    assert llm_attributes["gen_ai.usage.output_tokens"] == 20
+
+
+def test_file_exporter_writes_json_lines(tmp_path):
+    file_path = tmp_path / "spans.jsonl"
+    configure_tracing("file", file_path=str(file_path))
+    try:
+        with start_span("test.file_export", {"answer": 42}):
+            pass
+    finally:
+        configure_tracing("none")
+
+    exported = [json.loads(line) for line in file_path.read_text(encoding="utf-8").splitlines()]
+    assert exported[0]["name"] == "test.file_export"
+    assert exported[0]["attributes"]["answer"] == 42
@@ -0,0 +1,24 @@
+import subprocess
+import sys
+
+from app.warmup import warm_up_service
+from models.prompt_loader import load_prompt_template
+
+
+def test_warm_up_service_runs_enabled_stages(monkeypatch):
+    monkeypatch.setenv("FAKE_LLM_LATENCY_SECONDS", "0")
+    load_prompt_template.cache_clear()
+
+    timings = warm_up_service("fake_deterministic", {"warmup_request": True})
+
+    assert set(timings) == {"preload_prompts", "warm_up_client", "warmup_request"}
+    assert load_prompt_template.cache_info().currsize >= 1
+
+
+def test_provider_sdks_are_not_loaded_on_import():
+    code = (
+        "import sys, models.openai_model, models.gemini_model, models.fake_model; "
+        "print(sorted(m for m in ('langchain_openai', 'langchain_google_genai') if m in sys.modules))"
+    )
+    completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert completed.stdout.strip() == "[]"
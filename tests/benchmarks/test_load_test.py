@@ -0,0 +1,40 @@
+import asyncio
+
+import pytest
+
+from benchmarks.load_test import RequestSample, ResourceSamples, make_review, percentiles_ms, run_open_loop, summarize_run
+
+
+def test_make_review_is_deterministic():
+    assert make_review(7) == make_review(7)
+    assert make_review(7) != make_review(8)
+
+
+def test_summarize_run_reports_percentiles_and_error_rate():
+    samples = [RequestSample(started_at=0.0, latency_seconds=(i + 1) / 100, reviews=2, errors=0, status_code=200) for i in range(99)]
+    samples.append(RequestSample(started_at=0.0, latency_seconds=5.0, reviews=2, errors=2, status_code=503))
+    resources = ResourceSamples(cpu_percent=[10.0, 30.0], rss_bytes=[100 * 2**20, 120 * 2**20])
+
+    summary = summarize_run("batch", 10.0, 10.0, 10.0, samples, resources)
+
+    assert summary["requests"] == 100
+    assert summary["error_rate"] == pytest.approx(0.01)
+    assert summary["reviews_per_second"] == pytest.approx(19.8)
+    assert summary["latency_ms"]["p50"] == pytest.approx(505.0)
+    assert summary["latency_ms"]["max"] == pytest.approx(5000.0)
+    assert summary["status_codes"] == {"200": 99, "503": 1}
+    assert summary["rss_mb"]["max"] == pytest.approx(120.0)
+    assert percentiles_ms([])["p99"] is None
+
+
+def test_open_loop_does_not_wait_for_responses(monkeypatch):
+    async def slow_send(client, endpoint, request_index, batch_size):
+        await asyncio.sleep(0.3)
+        return RequestSample(started_at=0.0, latency_seconds=0.3, reviews=1, errors=0, status_code=200)
+
+    monkeypatch.setattr("benchmarks.load_test.send_request", slow_send)
+    summary = asyncio.run(run_open_loop("http://127.0.0.1:1", "single", 50.0, 0.2, 1, "constant", 0, None, 1.0))
+
+    # 응답(0.3초)을 기다리지 않고 도착률대로 요청을 시작하므로 0.2초 동안 10건이 모두 시작됩니다.
+    assert summary["requests"] == 10
+    assert summary["elapsed_seconds"] < 0.6
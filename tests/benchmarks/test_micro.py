@@ -0,0 +1,29 @@
+import os
+
+from benchmarks.micro import compare_to_baseline, run_benchmarks
+from models.fake_model import FAKE_LLM_LATENCY_ENV
+
+
+def test_compare_to_baseline_reports_only_regressions():
+    baseline = {"results": {"fast": {"median_us": 12.0, "min_us": 10.0}, "slow": {"median_us": 12.0, "min_us": 10.0}}}
+    results = {
+        "fast": {"median_us": 13.0, "min_us": 14.0},
+        "slow": {"median_us": 30.0, "min_us": 25.0},
+        "new": {"median_us": 1000.0, "min_us": 1000.0},
+    }
+
+    regressions = compare_to_baseline(results, baseline, tolerance=0.5)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("slow:")
+
+
+def test_run_benchmarks_covers_hot_path_with_zero_latency_model(monkeypatch):
+    monkeypatch.delenv(FAKE_LLM_LATENCY_ENV, raising=False)
+
+    results = run_benchmarks(rounds=1, scale=0.01)
+
+    assert {"get_model_config", "agent_state_validation_x2", "markdown_file_write", "graph_invoke_zero_latency"} <= set(results)
+    assert all(result["min_us"] > 0 for result in results.values())
+    assert results["graph_invoke_zero_latency"]["alloc_peak_kib"] > 0
+    assert FAKE_LLM_LATENCY_ENV not in os.environ
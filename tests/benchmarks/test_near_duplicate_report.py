@@ -0,0 +1,26 @@
+from benchmarks.near_duplicate import PERTURBATIONS, build_stream, run
+from benchmarks.prompt_ab import load_sample
+from models.fake_model import FAKE_LLM_LATENCY_ENV
+
+
+def test_stream_starts_with_originals_then_mixes_variants():
+    reviews, _ = load_sample(None, sample_size=10)
+
+    stream = build_stream(reviews, variants_per_review=2, seed=3)
+
+    assert len(stream) == 30
+    assert {kind for kind, _ in stream} <= {"original", *PERTURBATIONS}
+    assert [kind for kind, _ in stream[:5]] == ["original"] * 5
+
+
+def test_report_reuse_rate_falls_as_threshold_rises(monkeypatch):
+    monkeypatch.delenv(FAKE_LLM_LATENCY_ENV, raising=False)
+    reviews, _ = load_sample(None, sample_size=20)
+
+    results = run(reviews, thresholds=[0.6, 0.95], variants_per_review=2, concurrency=2)
+
+    loose, strict = results
+    assert loose["lookups"] == strict["lookups"] == 60
+    assert loose["reuse_rate"] >= strict["reuse_rate"]
+    assert loose["audits"] == round(loose["reuse_rate"] * loose["lookups"])
+    assert loose["hit_rate_by_kind"]["emoji"] > 0.5
@@ -0,0 +1,96 @@
+import json
+
+from app.config_loader import get_model_config, load_model_configurations
+from benchmarks.prompt_ab import (
+    compare_to_baseline,
+    format_table,
+    get_tokenizer,
+    load_sample,
+    register_prompt_variant,
+    run_prompt_ab,
+    unregister_prompt_variant,
+)
+from models.fake_model import FAKE_LLM_LATENCY_ENV
+
+
+def test_prompt_versions_are_measured_side_by_side_with_accuracy(tmp_path, monkeypatch):
+    monkeypatch.delenv(FAKE_LLM_LATENCY_ENV, raising=False)
+    reviews_path = tmp_path / "labeled.jsonl"
+    with open(reviews_path, "w", encoding="utf-8") as f:
+        for index, (rating, pre_score) in enumerate([(5.0, 0.95), (1.0, 0.1), (3.0, 0.5), (4.5, 0.2)]):
+            f.write(json.dumps({
+                "review_id": f"r{index}",
+                "review_text": f"리뷰 {index}: 음식이 괜찮았어요",
+                "rating": rating,
+                "ordered_items": ["김치찌개"],
+                "pre_score": pre_score,
+            }, ensure_ascii=False) + "\n")
+    reviews, labeled = load_sample(str(reviews_path), sample_size=10)
+    tokenizer = get_tokenizer("estimate")
+
+    results = run_prompt_ab(["v0.1", "v0.2"], reviews, labeled, tokenizer, "fake_deterministic", concurrency=2)
+
+    v01, v02 = results["v0.1"], results["v0.2"]
+    assert labeled and v01["reviews"] == v02["reviews"] == 4 and v01["failed"] == 0
+    # v0.1은 JSON 스키마(format instructions)를 포함하므로 입력 토큰이 더 많습니다.
+    assert v01["input_tokens_mean"] > v02["input_tokens_mean"] > 0
+    assert v01["provider_prompt_tokens_mean"] > v02["provider_prompt_tokens_mean"]
+    assert v02["output_tokens_mean"] > 0 and v02["latency_p95_ms"] is not None
+    assert v02["accuracy"] == 0.75
+    # 파생 설정은 실행 후 제거됩니다.
+    assert get_model_config("fake_deterministic@v0.2") is None
+
+    table = format_table(results)
+    assert "input tokens (mean)" in table and "accuracy" in table
+
+
+def test_token_growth_beyond_tolerance_is_reported():
+    baseline = {"tokenizer": "estimate", "results": {"v0.2": {"input_tokens_mean": 600.0}, "v0.1": {"input_tokens_mean": 1600.0}}}
+    results = {"v0.2": {"input_tokens_mean": 700.0}, "v0.1": {"input_tokens_mean": 1580.0}, "v0.3": {"input_tokens_mean": 9000.0}}
+
+    regressions = compare_to_baseline(results, baseline, "estimate", tolerance=0.05)
+
+    assert len(regressions) == 1 and regressions[0].startswith("v0.2:")
+    assert compare_to_baseline(results, baseline, "tiktoken:o200k_base") == []
+
+
+def test_synthetic_sample_skips_accuracy():
+    reviews, labeled = load_sample(None, sample_size=3)
+
+    results = run_prompt_ab(["v0.2"], reviews, labeled, get_tokenizer("estimate"), model_config_key=None)
+
+    assert not labeled and len(reviews) == 3
+    assert set(results["v0.2"]) == {"input_tokens_mean", "input_tokens_p95", "input_tokens_max", "template_chars"}
+
+
+def test_empty_sample_returns_empty_results():
+    results = run_prompt_ab(["v0.2"], [], False, get_tokenizer("estimate"), "fake_deterministic")
+
+    assert results["v0.2"]["reviews"] == 0 and results["v0.2"]["input_tokens_mean"] is None
+    assert "input tokens (mean)" not in format_table(results)
+
+
+def test_token_count_follows_format_instructions_mode():
+    reviews, _ = load_sample(None, sample_size=2)
+    tokenizer = get_tokenizer("estimate")
+
+    full = run_prompt_ab(["v0.1"], reviews, False, tokenizer, model_config_key=None, format_instructions_mode="full")
+    compact = run_prompt_ab(["v0.1"], reviews, False, tokenizer, model_config_key=None, format_instructions_mode="compact")
+
+    assert compact["v0.1"]["input_tokens_mean"] < full["v0.1"]["input_tokens_mean"]
+
+
+def test_prompt_variant_does_not_mutate_shared_configurations():
+    configurations_before = load_model_configurations()["model_configurations"]
+    keys_before = set(configurations_before)
+
+    variant_key = register_prompt_variant("fake_deterministic", "v0.1")
+    assert get_model_config(variant_key)["prompt_path"].endswith("v0.1.md")
+    assert set(configurations_before) == keys_before
+    nested_key = register_prompt_variant("fake_deterministic", "v0.1", overrides={"format_instructions": "compact"})
+    unregister_prompt_variant(nested_key)
+    # 같은 키로 다시 등록했다가 해제하면 먼저 등록한 설정이 되돌아옵니다.
+    assert get_model_config(variant_key).get("format_instructions") != "compact"
+    unregister_prompt_variant(variant_key)
+
+    assert get_model_config(variant_key) is None
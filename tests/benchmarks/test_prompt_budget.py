@@ -0,0 +1,100 @@
+import pytest
+
+from app.config_loader import get_model_config
+from app.schemas import ReviewInputs
+from benchmarks.prompt_ab import get_tokenizer, load_sample
+from benchmarks.prompt_budget import (
+    analyze_prompt_budget,
+    compact_prompt_template,
+    schema_channel,
+    split_prompt_sections,
+    template_fields,
+    validate_outputs,
+)
+from models.fake_model import FAKE_LLM_LATENCY_ENV
+from models.prompt_loader import get_compact_format_instructions, get_format_instructions, load_prompt_template, render_prompt
+
+TEMPLATE = """## 지침
+-   **score:**   리뷰 점수
+    - 키워드 예시:
+      ```
+      맛있다, 짜다,
+      늦다
+      ```
+
+
+리뷰: "{review_text}" (평점 {rating}, 메뉴 {ordered_items})
+
+{format_instructions}"""
+
+
+def _inputs() -> ReviewInputs:
+    return ReviewInputs(review_text="배달이 늦었어요", rating=2.0, ordered_items=["떡볶이"])
+
+
+def test_sections_cover_the_rendered_prompt():
+    inputs = _inputs()
+
+    sections = split_prompt_sections(TEMPLATE, inputs, "SCHEMA")
+
+    assert sections["schema"] == "SCHEMA"
+    assert sections["variables"] == "배달이 늦었어요2.0['떡볶이']"
+    assert "맛있다, 짜다," in sections["lexicon"] and "```" in sections["lexicon"]
+    assert "맛있다" not in sections["instructions"]
+    rendered = TEMPLATE.format(**inputs.model_dump(), format_instructions="SCHEMA")
+    assert sum(len(text) for text in sections.values()) == len(rendered)
+
+
+def test_compaction_keeps_variables_and_lexicon_items():
+    compacted = compact_prompt_template(TEMPLATE)
+
+    assert template_fields(compacted) == template_fields(TEMPLATE)
+    assert "**" not in compacted and "  " not in compacted and "\n\n\n" not in compacted
+    assert "```맛있다, 짜다, 늦다```" in compacted
+    with pytest.raises(ValueError):
+        compact_prompt_template("```\n열린 코드 블록 {review_text}")
+
+
+def test_compact_format_instructions_cut_schema_tokens():
+    reviews, _ = load_sample(None, sample_size=5)
+    tokenizer = get_tokenizer("estimate")
+    template = load_prompt_template("models/review_analysis_prompt/v0.1.md")
+
+    full = analyze_prompt_budget(template, reviews, tokenizer, "full")
+    compact = analyze_prompt_budget(compact_prompt_template(template), reviews, tokenizer, "compact")
+
+    assert compact["sections"]["schema"]["tokens_mean"] < full["sections"]["schema"]["tokens_mean"] / 2
+    assert compact["sections"]["variables"]["tokens_mean"] == full["sections"]["variables"]["tokens_mean"]
+    assert compact["total_tokens_mean"] < full["total_tokens_mean"]
+    for field in ("score", "keywords", "overall_sentiment", "NEGATIVE|NEUTRAL|POSITIVE"):
+        assert field in get_compact_format_instructions()
+    assert get_format_instructions() not in render_prompt("models/review_analysis_prompt/v0.1.md", _inputs(), "none")
+
+
+def test_schema_channel_follows_client_and_config():
+    with_placeholder, without_placeholder = "{review_text} {format_instructions}", "{review_text}"
+
+    assert schema_channel(get_model_config("gpt_4o_mini"), without_placeholder) == "native"
+    assert schema_channel({"client_module": "models.gemini_model"}, with_placeholder) == "prompt"
+    assert schema_channel({"client_module": "models.gemini_model", "format_instructions": "none"}, with_placeholder) == "missing"
+    assert schema_channel({"client_module": "models.gemini_model"}, without_placeholder) == "missing"
+
+
+def test_compacted_variant_outputs_stay_schema_valid(tmp_path, monkeypatch):
+    monkeypatch.delenv(FAKE_LLM_LATENCY_ENV, raising=False)
+    compact_path = tmp_path / "v0.1.compact.md"
+    compact_path.write_text(compact_prompt_template(load_prompt_template("models/review_analysis_prompt/v0.1.md")), encoding="utf-8")
+    reviews, _ = load_sample(None, sample_size=4)
+
+    validation = validate_outputs("fake_deterministic", str(compact_path), "compact", reviews, concurrency=2)
+
+    assert validation["schema_valid"] == 4 and validation["valid_rate"] == 1.0
+    assert get_model_config("fake_deterministic@budget-validation") is None
+
+
+def test_keyword_guidance_counts_as_lexicon():
+    sections = split_prompt_sections("지침 {keyword_guidance}\n{review_text}", _inputs(), "", {"keyword_guidance": "후보: 늦다"})
+
+    assert sections["lexicon"] == "후보: 늦다"
+    assert sections["variables"] == "배달이 늦었어요"
+    assert split_prompt_sections("{keyword_guidance}{review_text}", _inputs(), "")["lexicon"] == ""
@@ -0,0 +1,35 @@
+import os
+
+from app.near_duplicate import get_near_duplicate_index
+from app.result_index import ResultIndex, get_result_index, set_result_index
+from app.result_store import SegmentedJsonlResultStore, get_result_store, set_result_store
+from benchmarks.soak import run_soak
+from models.fake_model import FAKE_LLM_LATENCY_ENV
+
+
+def test_short_soak_keeps_rss_flat(monkeypatch):
+    monkeypatch.delenv(FAKE_LLM_LATENCY_ENV, raising=False)
+
+    result = run_soak(requests=400, concurrency=4, warmup_requests=100, sample_every=100)
+
+    assert len(result["samples"]) == 5
+    # 512Mi 한도에 비해 작은 상한. 누수가 있으면 요청 수에 비례하여 늘어나므로 더 긴 실행은 benchmarks.soak로 확인합니다.
+    assert result["rss_growth_mb"] < 16
+    assert result["cache_sizes"]["near_duplicate_entries"] == 0
+    assert FAKE_LLM_LATENCY_ENV not in os.environ
+    assert get_near_duplicate_index() is None
+
+
+def test_soak_restores_previous_store_and_index(tmp_path, monkeypatch):
+    monkeypatch.delenv(FAKE_LLM_LATENCY_ENV, raising=False)
+    store = SegmentedJsonlResultStore(str(tmp_path / "segments"))
+    index = ResultIndex(str(tmp_path / "index.sqlite3"))
+    set_result_store(store)
+    set_result_index(index)
+    try:
+        run_soak(requests=10, concurrency=2, warmup_requests=5, sample_every=5)
+
+        assert get_result_store() is store and get_result_index() is index
+    finally:
+        set_result_store(None)
+        set_result_index(None)
@@ -0,0 +1,133 @@
+import threading
+import time
+
+import pytest
+
+from bentos.admission import AdmissionController, AdmissionRejected, LaneConfig
+
+
+def _hold_slot(controller: AdmissionController, release_event: threading.Event, latency: float = 0.0):
+    with controller.admit():
+        release_event.wait(timeout=5)
+        time.sleep(latency)
+
+
+def test_rejects_when_queue_is_full():
+    controller = AdmissionController(initial_limit=1, max_queue_size=0)
+    release = threading.Event()
+    holder = threading.Thread(target=_hold_slot, args=(controller, release))
+    holder.start()
+    time.sleep(0.05)
+
+    with pytest.raises(AdmissionRejected) as excinfo:
+        controller.acquire()
+    assert excinfo.value.reason == "queue_full"
+    assert excinfo.value.retry_after_seconds >= 1
+
+    release.set()
+    holder.join()
+    assert controller.stats().rejected_total["queue_full"] == 1
+
+
+def test_queued_request_times_out():
+    controller = AdmissionController(initial_limit=1, max_queue_size=4, max_queue_time_seconds=0.05)
+    release = threading.Event()
+    holder = threading.Thread(target=_hold_slot, args=(controller, release))
+    holder.start()
+    time.sleep(0.05)
+
+    with pytest.raises(AdmissionRejected) as excinfo:
+        controller.acquire()
+    assert excinfo.value.reason == "queue_timeout"
+    assert controller.stats().queue_length == 0
+
+    release.set()
+    holder.join()
+
+
+def test_queued_request_is_admitted_when_slot_frees():
+    controller = AdmissionController(initial_limit=1, max_queue_size=4, max_queue_time_seconds=5)
+    release = threading.Event()
+    holder = threading.Thread(target=_hold_slot, args=(controller, release))
+    holder.start()
+    time.sleep(0.05)
+
+    threading.Timer(0.05, release.set).start()
+    with controller.admit():
+        assert controller.stats().in_flight == 1
+    holder.join()
+
+    stats = controller.stats()
+    assert stats.admitted_total == 2
+    assert stats.completed_total == 2
+    assert stats.in_flight == 0
+
+
+def test_limit_adapts_to_observed_latency():
+    controller = AdmissionController(initial_limit=2, max_limit=4, target_latency_seconds=0.05)
+
+    # 한도를 가득 채워 쓰는 동안 빠른 응답이 이어지면 한도가 늘어납니다.
+    for _ in range(20):
+        in_use = controller.concurrency_limit
+        for _ in range(in_use):
+            controller.acquire()
+        for _ in range(in_use):
+            controller.release(0.01)
+    assert controller.concurrency_limit == 4
+
+    controller.acquire()
+    controller.release(0.5)
+    assert controller.concurrency_limit < 4
+
+    with controller.admit() as ticket:
+        ticket.mark_failed()
+    assert controller.stats().failed_total == 1
+
+
+def test_lanes_share_slots_by_weight():
+    controller = AdmissionController(
+        initial_limit=1,
+        max_limit=1,
+        lanes={
+            "interactive": LaneConfig(weight=3, max_queue_size=10, max_queue_time_seconds=5),
+            "bulk": LaneConfig(weight=1, max_queue_size=10, max_queue_time_seconds=5),
+        },
+    )
+    controller.acquire()
+
+    # 대량 작업이 먼저 대기열을 채운 뒤 대화형 요청이 들어와도, 가중치 비율(3:1)로 차례를 받습니다.
+    order = []
+    order_lock = threading.Lock()
+
+    def _queued(lane: str):
+        with controller.admit(lane=lane):
+            with order_lock:
+                order.append(lane)
+
+    threads = []
+    for lane in ["bulk"] * 4 + ["interactive"] * 4:
+        thread = threading.Thread(target=_queued, args=(lane,))
+        thread.start()
+        threads.append(thread)
+        time.sleep(0.02)
+
+    controller.release(0.0)
+    for thread in threads:
+        thread.join()
+
+    assert order[:5].count("interactive") == 4
+    lane_stats = controller.stats().lanes
+    assert lane_stats["bulk"].admitted_total == 4
+    assert lane_stats["interactive"].queue_wait_p95_seconds < lane_stats["bulk"].queue_wait_p95_seconds
+
+
+def test_provider_rate_limit_paces_admissions():
+    controller = AdmissionController(initial_limit=8, max_limit=8, max_queue_time_seconds=2, rate_limit_per_second=20, rate_limit_burst=1)
+
+    started = time.monotonic()
+    for _ in range(4):
+        with controller.admit():
+            pass
+    # 버킷에 토큰이 하나뿐이므로 나머지 3건은 초당 20건 속도로 배분됩니다.
+    assert time.monotonic() - started >= 0.12
+    assert controller.stats().rate_limit_per_second == 20
@@ -0,0 +1,74 @@
+import asyncio
+import json
+
+import bentoml
+import pytest
+
+from app.result_index import ResultIndex, set_result_index
+from app.result_store import SegmentedJsonlResultStore, set_result_store
+from app.schemas import ReviewInputs
+from bentos.service import ReviewAnalysisService
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setenv("FAKE_LLM_LATENCY_SECONDS", "0")
+    set_result_store(SegmentedJsonlResultStore(str(tmp_path / "segments")))
+    set_result_index(ResultIndex(str(tmp_path / "index.sqlite3")))
+    instance = ReviewAnalysisService.inner()
+    instance.model_config_key = "fake_deterministic"
+    yield instance
+    set_result_store(None)
+    set_result_index(None)
+
+
+async def _collect(stream):
+    return [line async for line in stream]
+
+
+@pytest.fixture
+def reviews():
+    return [
+        ReviewInputs(review_text=f"리뷰 {i}", rating=float(i % 5 + 1), ordered_items=["피자"])
+        for i in range(5)
+    ]
+
+
+def test_batch_returns_results_in_input_order(service, reviews):
+    results = service.analyze_reviews_batch(reviews)
+
+    assert [result.review_inputs.review_text for result in results] == [review.review_text for review in reviews]
+    assert all(result.analysis_output is not None and result.saved_record_id for result in results)
+
+
+def test_stream_yields_one_json_line_per_review(service, reviews):
+    lines = asyncio.run(_collect(service.analyze_reviews_stream(reviews)))
+
+    indexes = sorted(json.loads(line)["index"] for line in lines)
+    assert indexes == list(range(len(reviews)))
+    assert all(line.endswith("\n") for line in lines)
+
+
+def test_batch_result_shape_returns_compact_json(service, reviews):
+    response = service.analyze_reviews_batch(reviews, response_shape="result")
+
+    payload = json.loads(response.body)
+    assert len(payload) == len(reviews)
+    assert all("review_inputs" not in item and item["saved_record_id"] for item in payload)
+
+
+def test_invalid_projection_is_rejected_before_analysis(service, reviews):
+    with pytest.raises(bentoml.exceptions.InvalidArgument):
+        service.analyze_reviews_batch(reviews, fields=["unknown"])
+
+
+def test_stream_rejects_oversized_batch_before_streaming(service, reviews):
+    service.max_batch_size = len(reviews) - 1
+
+    with pytest.raises(bentoml.exceptions.InvalidArgument):
+        service.analyze_reviews_stream(reviews)
+
+
+def test_stream_rejects_invalid_projection_before_streaming(service, reviews):
+    with pytest.raises(bentoml.exceptions.InvalidArgument):
+        service.analyze_reviews_stream(reviews, fields=["unknown"])
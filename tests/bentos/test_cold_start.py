@@ -0,0 +1,13 @@
+from benchmarks.load_test import write_service_config
+from benchmarks.startup import measure_time_to_ready
+
+# 레플리카 한 개가 준비 완료까지 걸려도 되는 시간(초). 공유 CI 머신의 편차를 고려해 여유를 둡니다.
+TIME_TO_READY_BUDGET_SECONDS = 10.0
+
+
+def test_service_time_to_ready_stays_within_budget(tmp_path):
+    result = measure_time_to_ready(write_service_config(str(tmp_path), keep_rate_limit=True))
+
+    assert result["time_to_ready_seconds"] < TIME_TO_READY_BUDGET_SECONDS
+    assert {"graph_compile", "preload_prompts", "warm_up_client"} <= set(result["warmup_seconds"])
+    assert result["provider_modules_loaded_at_import"] == []
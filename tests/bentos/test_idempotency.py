@@ -0,0 +1,120 @@
+import threading
+import time
+
+import pytest
+
+from app.schemas import AgentState
+from bentos.idempotency import (
+    IdempotencyKeyConflict,
+    IdempotencyStore,
+    IdempotencyWaitTimeout,
+    compute_request_fingerprint,
+)
+
+
+@pytest.fixture
+def store(tmp_path) -> IdempotencyStore:
+    return IdempotencyStore(str(tmp_path / "idempotency.sqlite3"), ttl_seconds=60, wait_timeout_seconds=5)
+
+
+def test_completed_result_is_replayed(store: IdempotencyStore):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return '{"score": 0.9}', True
+
+    fingerprint = compute_request_fingerprint({"review_text": "맛있어요"})
+    assert store.execute("key-1", fingerprint, compute) == ('{"score": 0.9}', False)
+    assert store.execute("key-1", fingerprint, compute) == ('{"score": 0.9}', True)
+    assert len(calls) == 1
+
+
+def test_key_reuse_with_different_payload_conflicts(store: IdempotencyStore):
+    store.execute("key-1", compute_request_fingerprint({"a": 1}), lambda: ("{}", True))
+    with pytest.raises(IdempotencyKeyConflict):
+        store.execute("key-1", compute_request_fingerprint({"a": 2}), lambda: ("{}", True))
+
+
+def test_failed_or_uncacheable_runs_are_retried(store: IdempotencyStore):
+    def failing():
+        raise RuntimeError("LLM 오류")
+
+    with pytest.raises(RuntimeError):
+        store.execute("key-1", "fp", failing)
+    assert store.execute("key-1", "fp", lambda: ("error", False)) == ("error", False)
+    assert store.execute("key-1", "fp", lambda: ("ok", True)) == ("ok", False)
+
+
+def test_expired_result_is_recomputed(tmp_path):
+    store = IdempotencyStore(str(tmp_path / "idempotency.sqlite3"), ttl_seconds=0.01)
+    store.execute("key-1", "fp", lambda: ("first", True))
+    time.sleep(0.02)
+    assert store.execute("key-1", "fp", lambda: ("second", True)) == ("second", False)
+
+
+def test_concurrent_requests_wait_for_in_progress_run(store: IdempotencyStore):
+    started = threading.Event()
+    calls = []
+
+    def slow_compute():
+        calls.append(1)
+        started.set()
+        time.sleep(0.2)
+        return "result", True
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(store.execute("key-1", "fp", slow_compute)))
+    leader.start()
+    started.wait(timeout=5)
+    follower_result = store.execute("key-1", "fp", slow_compute)
+    leader.join()
+
+    assert len(calls) == 1
+    assert results == [("result", False)]
+    assert follower_result == ("result", True)
+
+
+def test_expired_claim_cannot_overwrite_takeover_result(tmp_path):
+    store = IdempotencyStore(str(tmp_path / "idempotency.sqlite3"), lease_seconds=0.05)
+    started, release_original = threading.Event(), threading.Event()
+
+    def slow_original():
+        started.set()
+        release_original.wait(timeout=5)
+        return "original", True
+
+    original = threading.Thread(target=lambda: store.execute("key-1", "fp", slow_original))
+    original.start()
+    started.wait(timeout=5)
+    time.sleep(0.1) # 원래 요청의 선점 기간이 지나도록 기다립니다.
+    assert store.execute("key-1", "fp", lambda: ("takeover", True)) == ("takeover", False)
+    release_original.set()
+    original.join()
+
+    assert store.execute("key-1", "fp", lambda: ("third", True)) == ("takeover", True)
+
+
+def test_follower_wait_is_bounded_by_max_wait_seconds(store: IdempotencyStore):
+    started, release_leader = threading.Event(), threading.Event()
+
+    def slow_compute():
+        started.set()
+        release_leader.wait(timeout=5)
+        return "result", True
+
+    leader = threading.Thread(target=lambda: store.execute("key-1", "fp", slow_compute))
+    leader.start()
+    started.wait(timeout=5)
+    begun = time.monotonic()
+    with pytest.raises(IdempotencyWaitTimeout):
+        store.execute("key-1", "fp", slow_compute, max_wait_seconds=0.1)
+    assert time.monotonic() - begun < 1.0
+    release_leader.set()
+    leader.join()
+
+
+def test_conflict_error_code_is_kept_in_agent_state():
+    state = AgentState(analysis_error_message="conflict", error_code="IDEMPOTENCY_KEY_CONFLICT")
+
+    assert AgentState.model_validate_json(state.model_dump_json()).error_code == "IDEMPOTENCY_KEY_CONFLICT"
@@ -0,0 +1,64 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import bentos.service
+
+from app.result_index import ResultIndex, set_result_index
+from app.result_store import SegmentedJsonlResultStore, set_result_store
+from bentos.idempotency import IdempotencyStore
+from bentos.service import ReviewAnalysisService
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setenv("FAKE_LLM_LATENCY_SECONDS", "0")
+    set_result_store(SegmentedJsonlResultStore(str(tmp_path / "segments")))
+    set_result_index(ResultIndex(str(tmp_path / "index.sqlite3")))
+    instance = ReviewAnalysisService.inner()
+    instance.model_config_key = "fake_deterministic"
+    yield instance
+    set_result_store(None)
+    set_result_index(None)
+
+
+@pytest.fixture
+def ctx():
+    # bentoml.Context는 요청 처리 중에만 사용할 수 있으므로 엔드포인트가 쓰는 속성만 흉내 냅니다.
+    return SimpleNamespace(request=None, response=SimpleNamespace(status_code=200, headers={}))
+
+
+def test_list_analyses_rejects_malformed_cursor_with_400(service, ctx):
+    page = service.list_analyses(ctx, cursor="not-a-cursor")
+
+    assert ctx.response.status_code == 400
+    assert page.items == [] and "not-a-cursor" in page.error_message
+
+
+def test_analyze_review_projection_keeps_status_and_headers(service, tmp_path, monkeypatch):
+    store = IdempotencyStore(str(tmp_path / "idempotency.sqlite3"))
+    monkeypatch.setattr(bentos.service, "get_idempotency_store", lambda: store)
+    responses = []
+    for _ in range(2):
+        ctx = SimpleNamespace(request=None, response=SimpleNamespace(status_code=200, headers={}))
+        response = service.analyze_review(
+            "맛있어요", 5.0, ["피자"], ctx, idempotency_key="key-1", fields=["analysis_output", "saved_record_id"]
+        )
+        responses.append((json.loads(response.body), ctx.response))
+
+    (first, first_ctx), (replayed, replayed_ctx) = responses
+    assert set(first) == {"analysis_output", "saved_record_id"} and first["saved_record_id"]
+    assert replayed == first
+    assert first_ctx.status_code == replayed_ctx.status_code == 200
+    assert first_ctx.headers == {"Idempotent-Replayed": "false"}
+    assert replayed_ctx.headers == {"Idempotent-Replayed": "true"}
+
+
+def test_analyze_review_projection_keeps_deadline_status(service, ctx, monkeypatch):
+    monkeypatch.setenv("FAKE_LLM_LATENCY_SECONDS", "0.5")
+
+    response = service.analyze_review("맛있어요", 5.0, ["피자"], ctx, timeout_seconds=0.05, response_shape="result")
+
+    assert json.loads(response.body)["error_code"] == "DEADLINE_EXCEEDED"
+    assert ctx.response.status_code == 504
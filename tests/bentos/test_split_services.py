@@ -0,0 +1,75 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.result_index import ResultIndex, set_result_index
+from app.result_store import SegmentedJsonlResultStore, set_result_store
+from app.schemas import AgentState, ReviewInputs
+from bentos.admission import OVERLOADED_ERROR_CODE
+from bentos.api_service import LLM_GATEWAY_ERROR_CODE, ReviewAnalysisAPIService
+
+
+@pytest.fixture
+def api_service(tmp_path, monkeypatch):
+    monkeypatch.setenv("FAKE_LLM_LATENCY_SECONDS", "0")
+    set_result_store(SegmentedJsonlResultStore(str(tmp_path / "segments")))
+    set_result_index(ResultIndex(str(tmp_path / "index.sqlite3")))
+    instance = ReviewAnalysisAPIService.inner()
+    instance.model_config_key = "fake_deterministic"
+    yield instance
+    set_result_store(None)
+    set_result_index(None)
+
+
+def test_api_service_delegates_llm_calls_to_gateway(api_service):
+    reviews = [ReviewInputs(review_text=f"리뷰 {i}", rating=4.0, ordered_items=["피자"]) for i in range(3)]
+    admitted_before = api_service.llm_gateway.admission_stats().admitted_total
+
+    results = api_service.analyze_reviews_batch(reviews)
+
+    assert all(result.analysis_output is not None and result.saved_record_id for result in results)
+    assert all(result.token_usage is not None for result in results)
+    assert api_service.llm_gateway.admission_stats().admitted_total == admitted_before + len(reviews)
+    # 제공자 호출 예산은 게이트웨이만 가집니다.
+    assert api_service.admission_controller.stats().rate_limit_per_second is None
+
+
+def test_gateway_failure_becomes_structured_error(api_service, monkeypatch):
+    def broken_analyze(state):
+        raise ConnectionError("gateway unreachable")
+
+    monkeypatch.setattr(api_service.llm_gateway, "analyze", broken_analyze)
+    state = AgentState(review_inputs=ReviewInputs(review_text="맛있어요", rating=5.0, ordered_items=["피자"]), selected_model_config_key="fake_deterministic")
+
+    result_dict = api_service._analyze_via_gateway(state)
+
+    assert result_dict["error_code"] == LLM_GATEWAY_ERROR_CODE
+    assert result_dict["analysis_output"] is None
+
+
+def test_gateway_overload_passes_retry_after_to_client(api_service, monkeypatch):
+    def overloaded_analyze(state):
+        return state.model_copy(update={"error_code": OVERLOADED_ERROR_CODE, "retry_after_seconds": 7, "analysis_error_message": "overloaded"})
+
+    monkeypatch.setattr(api_service.llm_gateway, "analyze", overloaded_analyze)
+    ctx = SimpleNamespace(request=None, response=SimpleNamespace(status_code=200, headers={}))
+
+    result = api_service.analyze_review("맛있어요", 5.0, ["피자"], ctx)
+
+    assert result.error_code == OVERLOADED_ERROR_CODE and result.retry_after_seconds == 7
+    assert ctx.response.status_code == 503
+    assert ctx.response.headers["Retry-After"] == "7"
+    assert result.saved_record_id is None
+
+
+def test_gateway_failure_is_not_saved_as_analysis(api_service, monkeypatch):
+    def broken_analyze(state):
+        raise ConnectionError("gateway unreachable")
+
+    monkeypatch.setattr(api_service.llm_gateway, "analyze", broken_analyze)
+    ctx = SimpleNamespace(request=None, response=SimpleNamespace(status_code=200, headers={}))
+
+    result = api_service.analyze_review("맛있어요", 5.0, ["피자"], ctx)
+
+    assert ctx.response.status_code == 502
+    assert result.saved_record_id is None and result.saved_filepath is None
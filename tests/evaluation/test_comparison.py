@@ -0,0 +1,76 @@
+import json
+
+import numpy as np
+import pytest
+
+from evaluation.comparison import compare_models, load_systems, paired_bootstrap
+from evaluation.llm_accuracy_evaluator import evaluate_llm_accuracy_by_sentiment_bin
+from evaluation.reporter import generate_comparison_report
+
+
+def _write_predictions(path, review_ids, human_scores, llm_scores, model_config_key):
+    with open(path, "w", encoding="utf-8") as f:
+        for review_id, human_score, llm_score in zip(review_ids, human_scores, llm_scores):
+            f.write(json.dumps({
+                "review_id": review_id,
+                "pre_score": human_score,
+                "score": llm_score,
+                "model_config_key": model_config_key,
+                "prompt_version": "v0.2",
+            }) + "\n")
+
+
+@pytest.fixture
+def prediction_files(tmp_path):
+    rng = np.random.default_rng(7)
+    count = 600
+    review_ids = [f"r{index}" for index in range(count)]
+    human_scores = rng.random(count)
+    paths = {}
+    for name, accuracy in [("strong", 0.9), ("weak", 0.6)]:
+        llm_scores = np.where(rng.random(count) < accuracy, human_scores, rng.random(count))
+        order = rng.permutation(count)[: count - 10] # 순서가 다르고 일부 리뷰가 빠진 파일
+        path = tmp_path / f"{name}.jsonl"
+        _write_predictions(path, [review_ids[i] for i in order], human_scores[order], llm_scores[order], name)
+        paths[name] = str(path)
+    return paths
+
+
+def test_compare_models_aligns_on_review_id_and_ranks(prediction_files, tmp_path):
+    systems = load_systems([f"weak-model={prediction_files['weak']}", prediction_files["strong"]])
+    assert [system.label for system in systems] == ["weak-model", "strong@v0.2"]
+
+    comparison = compare_models(systems, n_resamples=500)
+
+    strong_ids = set(systems[1].review_ids)
+    assert comparison.aligned_reviews == len(strong_ids & set(systems[0].review_ids))
+    assert [model.label for model in comparison.models] == ["strong@v0.2", "weak-model"]
+    weak = comparison.models[1]
+    assert weak.difference_from_best < 0 and weak.difference_from_best_ci[1] < 0
+    assert comparison.models[0].probability_best > 0.95
+
+    # 모델별 범주 결과는 정렬된 리뷰만 담은 파일을 평가기로 평가한 결과와 같습니다.
+    common = [review_id for review_id in systems[0].review_ids if review_id in strong_ids]
+    aligned_path = tmp_path / "strong_aligned.jsonl"
+    positions = {review_id: index for index, review_id in enumerate(systems[1].review_ids)}
+    rows = [positions[review_id] for review_id in common]
+    _write_predictions(aligned_path, common, systems[1].human_scores[rows], systems[1].llm_scores[rows], "strong")
+    assert comparison.models[0].bin_results == evaluate_llm_accuracy_by_sentiment_bin(str(aligned_path))
+
+    report_path = generate_comparison_report(comparison.model_dump(), output_dir=str(tmp_path / "reports"))
+    with open(report_path, encoding="utf-8") as f:
+        report = f.read()
+    assert "| 1 | `strong@v0.2`" in report and "| 2 | `weak-model`" in report
+
+
+def test_paired_bootstrap_is_deterministic_and_matches_point_estimate():
+    rng = np.random.default_rng(0)
+    correct = rng.random((3, 2000)) < np.array([[0.8], [0.7], [0.5]])
+    human_bins = rng.integers(0, 3, 2000)
+
+    accuracy, balanced = paired_bootstrap(correct, human_bins, n_resamples=300, seed=1, max_workers=4)
+    accuracy_again, _ = paired_bootstrap(correct, human_bins, n_resamples=300, seed=1, max_workers=1)
+
+    assert accuracy.shape == balanced.shape == (300, 3)
+    np.testing.assert_array_equal(accuracy, accuracy_again)
+    np.testing.assert_allclose(accuracy.mean(axis=0), correct.mean(axis=1), atol=0.01)
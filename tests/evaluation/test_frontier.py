@@ -0,0 +1,57 @@
+import json
+
+import numpy as np
+
+from evaluation.frontier import ConfigMetrics, build_frontier, pareto_frontier
+from evaluation.reporter import generate_frontier_report
+
+
+def _write_predictions(path, accuracy, latency_seconds, cost_usd, seed, count=300):
+    rng = np.random.default_rng(seed)
+    human_scores = rng.random(count)
+    llm_scores = np.where(rng.random(count) < accuracy, human_scores, rng.random(count))
+    with open(path, "w", encoding="utf-8") as f:
+        for index in range(count):
+            f.write(json.dumps({
+                "review_id": f"r{index}",
+                "pre_score": human_scores[index],
+                "score": llm_scores[index],
+                "latency_seconds": latency_seconds * (1 + index / count),
+                "prompt_tokens": 400,
+                "completion_tokens": 150,
+                "estimated_cost_usd": cost_usd,
+            }) + "\n")
+    return str(path)
+
+
+def test_frontier_metrics_and_dominance(tmp_path):
+    accurate = _write_predictions(tmp_path / "accurate.jsonl", 0.95, 2.0, 0.0004, seed=1)
+    cheap = _write_predictions(tmp_path / "cheap.jsonl", 0.7, 0.5, 0.0001, seed=2)
+    dominated = _write_predictions(tmp_path / "dominated.jsonl", 0.6, 2.5, 0.0005, seed=3)
+
+    frontier = build_frontier([f"accurate={accurate}", f"cheap={cheap}", f"dominated={dominated}"])
+
+    by_label = {config.label: config for config in frontier.configs}
+    assert [config.label for config in frontier.configs] == ["accurate", "cheap", "dominated"]
+    assert frontier.frontier == ["cheap", "accurate"]
+    assert set(by_label["dominated"].dominated_by) == {"accurate", "cheap"}
+    assert by_label["cheap"].cost_per_1k_reviews_usd == 0.1
+    assert by_label["accurate"].latency_p50_ms < by_label["accurate"].latency_p95_ms <= 4000
+    assert by_label["accurate"].avg_prompt_tokens == 400
+
+    markdown_path, json_path = generate_frontier_report(frontier.model_dump(), output_dir=str(tmp_path / "reports"))
+    with open(json_path, encoding="utf-8") as f:
+        saved = json.load(f)
+    assert saved["frontier"] == ["cheap", "accurate"] and saved["schema_version"] == 1
+    with open(markdown_path, encoding="utf-8") as f:
+        assert "`dominated`: `accurate`, `cheap`에 지배됨" in f.read()
+
+
+def test_missing_cost_is_left_out_of_dominance():
+    priced = ConfigMetrics(label="priced", path="a", reviews=10, balanced_accuracy=0.8, latency_p95_ms=100.0, cost_per_1k_reviews_usd=0.5)
+    unpriced = ConfigMetrics(label="unpriced", path="b", reviews=10, balanced_accuracy=0.7, latency_p95_ms=200.0)
+
+    frontier = pareto_frontier([unpriced, priced])
+
+    assert frontier.frontier == ["priced"]
+    assert frontier.configs[1].dominated_by == ["priced"]
@@ -0,0 +1,96 @@
+import json
+
+import numpy as np
+
+from evaluation.incremental import default_state_path, evaluate_incrementally, load_state
+from evaluation.llm_accuracy_evaluator import evaluate_llm_accuracy_by_sentiment_bin
+
+
+def _rows(start: int, count: int, seed: int):
+    rng = np.random.default_rng(seed)
+    return [
+        {"review_id": start + index, "pre_score": round(float(human), 3), "score": round(float(llm), 3)}
+        for index, (human, llm) in enumerate(rng.random((count, 2)))
+    ]
+
+
+def _append_lines(path, rows, trailing_newline=True):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("\n".join(json.dumps(row) for row in rows) + ("\n" if trailing_newline else ""))
+
+
+def test_incremental_matches_full_evaluation_and_reads_only_new_records(tmp_path):
+    data_path = str(tmp_path / "labeled.jsonl")
+    state_path = str(tmp_path / "state.json")
+    _append_lines(data_path, _rows(0, 500, seed=1))
+
+    results, state, info = evaluate_incrementally(data_path, state_path, chunk_size=64)
+    assert info.full_recompute and info.new_records == 500
+    assert results == evaluate_llm_accuracy_by_sentiment_bin(data_path)
+
+    # 마지막 줄이 기록 중(줄바꿈 없이 잘림)이면 그 줄은 다음 실행으로 미룹니다.
+    _append_lines(data_path, _rows(500, 120, seed=2))
+    with open(data_path, "a", encoding="utf-8") as f:
+        f.write('{"review_id": 620, "pre_sc')
+    results, state, info = evaluate_incrementally(data_path, state_path, chunk_size=64)
+    assert not info.full_recompute and info.new_records == 120
+    assert state.records_processed == 620
+
+    with open(data_path, "a", encoding="utf-8") as f:
+        f.write('ore": 0.9, "score": 0.8}\n')
+    results, state, info = evaluate_incrementally(data_path, state_path)
+    assert info.new_records == 1 and state.records_processed == 621
+    assert results == evaluate_llm_accuracy_by_sentiment_bin(data_path)
+    assert load_state(state_path) == state
+
+    # 추가된 데이터가 없으면 집계는 그대로입니다.
+    _, _, info = evaluate_incrementally(data_path, state_path)
+    assert info.new_records == 0 and not info.full_recompute
+
+
+def test_replaced_file_is_recomputed_from_scratch(tmp_path):
+    data_path = str(tmp_path / "labeled.jsonl")
+    state_path = str(tmp_path / "state.json")
+    _append_lines(data_path, _rows(0, 300, seed=3))
+    evaluate_incrementally(data_path, state_path)
+
+    (tmp_path / "labeled.jsonl").unlink()
+    _append_lines(data_path, _rows(0, 400, seed=4))
+    results, state, info = evaluate_incrementally(data_path, state_path)
+
+    assert info.full_recompute and state.records_processed == 400
+    assert results == evaluate_llm_accuracy_by_sentiment_bin(data_path)
+
+
+def test_unchanged_json_array_is_not_reread(tmp_path):
+    data_path = tmp_path / "labeled.json"
+    state_path = str(tmp_path / "state.json")
+    data_path.write_text(json.dumps(_rows(0, 200, seed=5)), encoding="utf-8")
+
+    first, _, info = evaluate_incrementally(str(data_path), state_path)
+    assert info.full_recompute and info.new_records == 200
+    second, state, info = evaluate_incrementally(str(data_path), state_path)
+    assert not info.full_recompute and info.new_records == 0
+    assert first == second and state.records_processed == 200
+
+
+def test_state_from_another_data_file_is_not_reused(tmp_path):
+    state_path = str(tmp_path / "state.json")
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    first_path, second_path = str(tmp_path / "a" / "labeled.jsonl"), str(tmp_path / "b" / "labeled.jsonl")
+    _append_lines(first_path, _rows(0, 300, seed=6))
+    _append_lines(second_path, _rows(0, 200, seed=7))
+    evaluate_incrementally(first_path, state_path)
+
+    results, state, info = evaluate_incrementally(second_path, state_path)
+    assert info.full_recompute and info.reason == "데이터 파일 경로 변경"
+    assert state.records_processed == 200
+    assert results == evaluate_llm_accuracy_by_sentiment_bin(second_path)
+
+
+def test_default_state_path_keys_on_full_path(tmp_path):
+    first_path, second_path = str(tmp_path / "a" / "labeled.jsonl"), str(tmp_path / "b" / "labeled.jsonl")
+
+    assert default_state_path(first_path) != default_state_path(second_path)
+    assert default_state_path(first_path) == default_state_path(str(tmp_path / "a" / ".." / "a" / "labeled.jsonl"))
@@ -0,0 +1,98 @@
+import json
+import math
+import random
+
+import pytest
+from scipy.stats import binomtest
+
+from evaluation.llm_accuracy_evaluator import (
+    evaluate_llm_accuracy_by_sentiment_bin,
+    get_sentiment_bin_label,
+    wilson_interval,
+)
+
+
+def _legacy_evaluate(data, human_score_key="pre_score", llm_score_key="score", confidence_level=0.95):
+    """스트리밍/벡터화 이전의 항목별 반복 구현 (결과 비교용)"""
+    labels = ["Negative", "Neutral", "Positive"]
+    bins = {label: {"total": 0, "matched": 0, "dist": {l: 0 for l in labels}} for label in labels}
+    for item in data:
+        try:
+            human_score = float(item.get(human_score_key, -1))
+            llm_score = float(item.get(llm_score_key, -1))
+            if not (0.0 <= human_score <= 1.0 and 0.0 <= llm_score <= 1.0):
+                continue
+            human_bin, llm_bin = get_sentiment_bin_label(human_score), get_sentiment_bin_label(llm_score)
+            bins[human_bin]["total"] += 1
+            bins[human_bin]["dist"][llm_bin] += 1
+            if human_bin == llm_bin:
+                bins[human_bin]["matched"] += 1
+        except (TypeError, ValueError):
+            continue
+
+    results = []
+    for label in labels:
+        total, matched = bins[label]["total"], bins[label]["matched"]
+        if total == 0:
+            match_rate, lower, upper = 0.0, 0.0, 0.0
+        else:
+            match_rate = matched / total
+            interval = binomtest(k=matched, n=total).proportion_ci(confidence_level=confidence_level, method="wilson")
+            lower, upper = interval.low, interval.high
+            if math.isnan(lower) or lower < 0: lower = 0.0
+            if math.isnan(upper) or upper > 1: upper = 1.0
+        results.append({
+            "human_sentiment_bin_label": label,
+            "total_reviews_in_bin": total,
+            "matched_reviews_in_bin": matched,
+            "match_rate": match_rate,
+            "wilson_lower_bound": lower,
+            "wilson_upper_bound": upper,
+            "llm_score_distribution": bins[label]["dist"],
+        })
+    return results
+
+
+@pytest.fixture
+def messy_items():
+    rng = random.Random(7)
+    edge_values = [0.0, 1 / 3, 2 / 3, 1.0, -0.1, 1.5, None, "0.5", "abc", True, False, float("nan"), 1]
+    items = []
+    for _ in range(3000):
+        item = {"pre_score": round(rng.random(), 3), "score": round(rng.random(), 3)}
+        if rng.random() < 0.2:
+            item[rng.choice(["pre_score", "score"])] = rng.choice(edge_values)
+        if rng.random() < 0.02:
+            del item["score"]
+        items.append(item)
+    return items
+
+
+@pytest.mark.parametrize("file_format", ["json", "jsonl"])
+def test_streaming_evaluation_matches_legacy_results(tmp_path, messy_items, file_format):
+    path = tmp_path / f"predictions.{file_format}"
+    with open(path, "w", encoding="utf-8") as f:
+        if file_format == "json":
+            json.dump(messy_items, f, indent=2)
+        else:
+            f.writelines(json.dumps(item) + "\n" for item in messy_items)
+
+    results = evaluate_llm_accuracy_by_sentiment_bin(str(path), chunk_size=257)
+
+    assert results == _legacy_evaluate(messy_items)
+
+
+def test_wilson_interval_matches_scipy_exactly():
+    for n in [1, 2, 5, 17, 100, 1234]:
+        for k in sorted({0, 1, n // 3, n // 2, n - 1, n}):
+            for confidence_level in [0.9, 0.95, 0.99]:
+                interval = binomtest(k=k, n=n).proportion_ci(confidence_level=confidence_level, method="wilson")
+                assert wilson_interval(k, n, confidence_level) == (interval.low, interval.high)
+
+
+def test_invalid_file_returns_empty_results(tmp_path):
+    broken = tmp_path / "broken.json"
+    broken.write_text('[{"pre_score": 0.1, "score": 0.2}, {"pre_score": ', encoding="utf-8")
+
+    assert evaluate_llm_accuracy_by_sentiment_bin(str(broken)) == []
+    assert evaluate_llm_accuracy_by_sentiment_bin(str(tmp_path / "missing.json")) == []
@@ -0,0 +1,137 @@
+import json
+
+import pytest
+
+from app.config_loader import get_model_config
+from app.graph import get_compiled_graph
+from app.result_index import set_result_index
+from app.result_store import ResultStore, SegmentedJsonlResultStore, set_result_store
+from evaluation.llm_accuracy_evaluator import evaluate_llm_accuracy_by_sentiment_bin
+from evaluation.prediction_runner import (
+    PredictionCache,
+    generate_predictions,
+    load_labeled_reviews,
+    predictions_file_path,
+    write_predictions_file,
+)
+from evaluation.reporter import generate_markdown_report
+from models.fake_model import FAKE_LLM_LATENCY_ENV
+
+MODEL_KEY = "fake_deterministic"
+
+
+class CountingGraph:
+    """그래프 실행 횟수를 세는 래퍼"""
+
+    def __init__(self):
+        self.graph = get_compiled_graph()
+        self.calls = 0
+
+    def invoke(self, state):
+        self.calls += 1
+        return self.graph.invoke(state)
+
+
+@pytest.fixture
+def isolated_store(tmp_path, monkeypatch):
+    monkeypatch.setenv(FAKE_LLM_LATENCY_ENV, "0")
+    set_result_store(SegmentedJsonlResultStore(str(tmp_path / "segments")))
+    set_result_index(None)
+    monkeypatch.setattr("app.save_result_node.get_result_index", lambda: None)
+    yield
+    set_result_store(None)
+
+
+@pytest.fixture
+def reviews_path(tmp_path):
+    path = tmp_path / "labeled.jsonl"
+    rows = [
+        {"review_id": "r1", "review_text": "정말 맛있어요", "rating": 5.0, "ordered_items": ["피자"], "pre_score": 0.9},
+        {"review_id": "r2", "review_text": "식어서 왔어요", "rating": 1.0, "ordered_items": ["치킨"], "pre_score": 0.1},
+        {"review_text": "무난했어요", "rating": 3.0, "ordered_items": ["떡볶이"], "pre_score": 0.5},
+        {"review_id": "broken", "review_text": "점수 없음", "rating": 4.0, "ordered_items": ["콜라"]},
+    ]
+    path.write_text("\n".join(json.dumps(row, ensure_ascii=False) for row in rows), encoding="utf-8")
+    return str(path)
+
+
+def test_generate_predictions_reuses_cache_on_rerun(isolated_store, reviews_path, tmp_path):
+    reviews = load_labeled_reviews(reviews_path)
+    assert [review.review_id for review in reviews][:2] == ["r1", "r2"]
+    assert len(reviews) == 3 # 사람 점수가 없는 항목은 건너뜁니다.
+
+    cache_path = str(tmp_path / "cache.jsonl")
+    graph = CountingGraph()
+    predictions, statistics = generate_predictions(reviews, MODEL_KEY, PredictionCache(cache_path), concurrency=4, graph=graph)
+    assert graph.calls == 3
+    assert statistics.generated == 3 and statistics.cache_hits == 0 and statistics.failed == 0
+    assert statistics.wall_clock_seconds > 0 and statistics.reviews_per_second > 0
+
+    # 캐시 파일을 다시 읽은 새 실행은 그래프를 호출하지 않고 같은 예측을 반환합니다.
+    rerun_graph = CountingGraph()
+    cached_predictions, rerun_statistics = generate_predictions(reviews, MODEL_KEY, PredictionCache(cache_path), graph=rerun_graph)
+    assert rerun_graph.calls == 0
+    assert rerun_statistics.cache_hits == 3 and rerun_statistics.generated == 0
+    assert [p.score for p in cached_predictions] == [p.score for p in predictions]
+
+    # 리뷰 내용이 바뀌면 해당 리뷰만 다시 생성합니다.
+    reviews[0].review_inputs.review_text = "다시 먹어도 맛있어요"
+    changed_graph = CountingGraph()
+    _, changed_statistics = generate_predictions(reviews, MODEL_KEY, PredictionCache(cache_path), graph=changed_graph)
+    assert changed_graph.calls == 1 and changed_statistics.cache_hits == 2
+
+
+def test_model_change_misses_prediction_cache(isolated_store, reviews_path, tmp_path, monkeypatch):
+    reviews = load_labeled_reviews(reviews_path)
+    cache_path = str(tmp_path / "cache.jsonl")
+    generate_predictions(reviews, MODEL_KEY, PredictionCache(cache_path), graph=CountingGraph())
+
+    # 같은 설정 키라도 모델 이름이 바뀌면 캐시된 예측을 재사용하지 않습니다.
+    model_config = get_model_config(MODEL_KEY)
+    changed_config = {**model_config, "llm_params": {**model_config["llm_params"], "model_name": "fake-deterministic-v2"}}
+    monkeypatch.setattr("evaluation.prediction_runner.get_model_config", lambda key: changed_config)
+    changed_graph = CountingGraph()
+    _, statistics = generate_predictions(reviews, MODEL_KEY, PredictionCache(cache_path), graph=changed_graph)
+    assert changed_graph.calls == 3 and statistics.cache_hits == 0
+
+
+def test_predictions_feed_evaluator_and_report(isolated_store, reviews_path, tmp_path):
+    reviews = load_labeled_reviews(reviews_path)
+    predictions, statistics = generate_predictions(reviews, MODEL_KEY, PredictionCache(None), concurrency=2)
+
+    predictions_path = predictions_file_path(reviews_path, MODEL_KEY, output_dir=str(tmp_path / "predictions"))
+    assert write_predictions_file(reviews, predictions, predictions_path) == 3
+
+    results = evaluate_llm_accuracy_by_sentiment_bin(predictions_path)
+    assert sum(result["total_reviews_in_bin"] for result in results) == 3
+
+    report_path = generate_markdown_report(
+        results, reviews_path, MODEL_KEY, run_statistics=statistics.model_dump(), output_dir=str(tmp_path / "reports")
+    )
+    with open(report_path, encoding="utf-8") as f:
+        report = f.read()
+    assert "예측 생성 실행 통계" in report
+    assert "총 소요 시간 (wall-clock)" in report and "처리량 (완료 리뷰/초)" in report
+
+
+def test_default_graph_does_not_write_to_result_store(reviews_path, monkeypatch):
+    class RecordingStore(ResultStore):
+        def __init__(self):
+            self.records = []
+
+        def append(self, record):
+            self.records.append(record)
+
+        def get(self, record_id):
+            return None
+
+    monkeypatch.setenv(FAKE_LLM_LATENCY_ENV, "0")
+    store = RecordingStore()
+    set_result_store(store)
+    try:
+        predictions, _ = generate_predictions(load_labeled_reviews(reviews_path), MODEL_KEY, PredictionCache(None))
+    finally:
+        set_result_store(None)
+
+    assert all(prediction.score is not None for prediction in predictions)
+    assert store.records == []
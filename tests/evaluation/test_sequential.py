@@ -0,0 +1,68 @@
+import hashlib
+
+import numpy as np
+
+from app.schemas import ReviewInputs
+from evaluation.llm_accuracy_evaluator import confusion_matrix_from_scores, summarize_confusion_matrix
+from evaluation.prediction_runner import LabeledReview, PredictionCache
+from evaluation.sequential import run_sequential_evaluation
+from models.fake_model import build_fake_analysis
+
+
+class NoisyGraph:
+    """사람 점수를 약 75% 확률로 맞히는 결정적 가짜 그래프"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, state):
+        self.calls += 1
+        review_text = state.review_inputs.review_text
+        human_score = float(review_text.split("|")[1])
+        digest = hashlib.sha256(review_text.encode("utf-8")).digest()[0]
+        score = human_score if digest < 192 else (human_score + 0.4) % 1.0
+        analysis = build_fake_analysis(state.review_inputs).model_copy(update={"score": round(score, 2)})
+        return {"review_inputs": state.review_inputs, "analysis_output": analysis}
+
+
+def _labeled_reviews(count: int):
+    reviews = []
+    for index in range(count):
+        human_score = [0.1, 0.5, 0.9][index % 3]
+        reviews.append(LabeledReview(
+            review_id=f"r{index}",
+            review_inputs=ReviewInputs(review_text=f"리뷰 {index}|{human_score}", rating=3.0, ordered_items=["피자"]),
+            human_score=human_score,
+        ))
+    return reviews
+
+
+def test_sequential_evaluation_stops_before_exhausting_data():
+    reviews = _labeled_reviews(3000)
+    graph = NoisyGraph()
+
+    result, sampled_reviews, predictions = run_sequential_evaluation(
+        reviews, "fake_deterministic", PredictionCache(None), target_width=0.15, round_size=25, graph=graph
+    )
+
+    assert graph.calls == result.llm_calls == len(sampled_reviews) < len(reviews) / 2
+    for progress in result.bins:
+        assert progress.stop_reason == "target_width"
+        assert progress.interval_width <= 0.15
+        assert progress.sampled_reviews % 25 == 0
+
+    # 라운드마다 누적한 결과는 표본 전체를 한 번에 평가한 결과와 같습니다.
+    human_scores = np.array([review.human_score for review in sampled_reviews])
+    llm_scores = np.array([prediction.score for prediction in predictions])
+    assert result.evaluation_results == summarize_confusion_matrix(confusion_matrix_from_scores(human_scores, llm_scores))
+
+
+def test_sequential_evaluation_exhausts_small_bins():
+    reviews = _labeled_reviews(30)
+    result, sampled_reviews, _ = run_sequential_evaluation(
+        reviews, "fake_deterministic", PredictionCache(None), target_width=0.01, round_size=4, graph=NoisyGraph()
+    )
+
+    assert len(sampled_reviews) == 30
+    assert {progress.stop_reason for progress in result.bins} == {"exhausted"}
+    assert result.rounds == 3
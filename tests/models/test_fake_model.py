@@ -0,0 +1,27 @@
+from app.schemas import ReviewInputs
+from models.fake_model import build_fake_analysis, invoke_fake_with_structured_output
+
+PROMPT_PATH = "models/review_analysis_prompt/v0.2.md"
+
+
+def test_fake_model_is_deterministic(monkeypatch):
+    monkeypatch.setenv("FAKE_LLM_LATENCY_SECONDS", "0")
+    review = ReviewInputs(review_text="피자가 식어서 왔어요", rating=1.0, ordered_items=["피자", "콜라"])
+
+    first = invoke_fake_with_structured_output(PROMPT_PATH, review, "fake-deterministic", 0.0)
+    second = invoke_fake_with_structured_output(PROMPT_PATH, review, "fake-deterministic", 0.0)
+
+    assert first == second == build_fake_analysis(review)
+    assert first.overall_sentiment == "NEGATIVE"
+    assert [keyword.keyword for keyword in first.keywords] == ["피자", "콜라"]
+
+
+def test_fake_model_respects_timeout(monkeypatch):
+    monkeypatch.setenv("FAKE_LLM_LATENCY_SECONDS", "5")
+    review = ReviewInputs(review_text="맛있어요", rating=5.0, ordered_items=["피자"])
+    try:
+        invoke_fake_with_structured_output(PROMPT_PATH, review, "fake-deterministic", 0.0, timeout=0.01)
+    except TimeoutError:
+        pass
+    else:
+        raise AssertionError("지연이 타임아웃보다 길면 TimeoutError가 발생해야 합니다.")